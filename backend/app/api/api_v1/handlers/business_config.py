@@ -34,6 +34,7 @@ from app.schemas.business_config_schema import (
     PrinterConfigResponse
 )
 from app.models.user_model import User
+from app.services.config_snapshot_service import ConfigSnapshotService
 from app.api.deps import get_current_user, require_admin
 from app.models.user_activity_log_model import log_user_activity, UserActivityType, ActivitySeverity
 
@@ -50,7 +51,7 @@ async def get_company_config(
     Get current company configuration.
     Accessible by all authenticated users.
     """
-    config = await CompanyConfig.get_current_config()
+    config = await ConfigSnapshotService.get(CompanyConfig)
     if not config:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -196,7 +197,7 @@ async def get_financial_policy_config(
     Get current financial policy configuration.
     Accessible by all authenticated users.
     """
-    config = await FinancialPolicyConfig.get_current_config()
+    config = await ConfigSnapshotService.get(FinancialPolicyConfig)
     if not config:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -316,7 +317,7 @@ async def get_forfeiture_config(
     Get current forfeiture configuration.
     Accessible by all authenticated users.
     """
-    config = await ForfeitureConfig.get_current_config()
+    config = await ConfigSnapshotService.get(ForfeitureConfig)
     if not config:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -391,7 +392,7 @@ async def get_printer_config(
     Get current printer configuration.
     Accessible by all authenticated users.
     """
-    config = await PrinterConfig.get_current_config()
+    config = await ConfigSnapshotService.get(PrinterConfig)
     if not config:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -457,7 +458,7 @@ async def get_location_config():
     Get current location configuration.
     Public endpoint - no authentication required (used for weather display).
     """
-    config = await LocationConfig.get_current_config()
+    config = await ConfigSnapshotService.get(LocationConfig)
     if not config:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -141,6 +141,22 @@ async def validate_all_customers(
         )
 
 
+@consistency_router.get(
+    "/progress",
+    summary="Get validation progress",
+    description="Progress of the running (or last completed) full validation in this worker (Admin only)",
+    responses={
+        200: {"description": "Progress returned"},
+        403: {"description": "Admin access required"}
+    }
+)
+async def get_validation_progress(
+    current_user: User = Depends(get_admin_user)
+) -> dict:
+    """Get progress of the full customer validation"""
+    return ConsistencyValidationService.get_progress()
+
+
 @consistency_router.get(
     "/report",
     summary="Get consistency report",
@@ -25,7 +25,7 @@ from app.schemas.customer_schema import (
 )
 from app.services.customer_service import CustomerService
 from app.services.user_activity_service import UserActivityService
-from app.core.redis_cache import BusinessCache, cached_result, CacheConfig
+from app.core.redis_cache import BusinessCache, cached_result, CacheConfig, CacheTags
 
 
 # Create router
@@ -286,7 +286,11 @@ async def update_loan_limit_config(
         500: {"description": "Internal server error"}
     }
 )
-@cached_result(prefix="customer:", ttl=CacheConfig.LONG_TTL)
+@cached_result(
+    prefix="customer:",
+    ttl=CacheConfig.LONG_TTL,
+    tags=lambda phone_number, **kwargs: [CacheTags.customer(phone_number)]
+)
 async def get_customer_by_phone(
     phone_number: str,
     request: Request,
@@ -226,16 +226,12 @@ async def apply_discount(
                 error_code="DISCOUNT_NOT_VALID"
             )
 
-        # Verify admin approval (get admin user by PIN)
-        from app.models.user_model import User as UserModel
+        # Verify admin approval (resolve the approving admin from the PIN)
+        from app.services.user_service import UserService
 
-        # Find admin user by PIN - check all admin users
-        admin_user = None
-        all_admins = await UserModel.find(UserModel.role == "admin").to_list()
-        for user in all_admins:
-            if user.verify_pin(discount_request.admin_pin):
-                admin_user = user
-                break
+        admin_user = await UserService.verify_admin_pin(
+            discount_request.admin_pin, discount_request.admin_user_id
+        )
 
         if not admin_user:
             discount_logger.warning(
@@ -253,7 +249,8 @@ async def apply_discount(
             admin_user=admin_user,
             admin_pin=discount_request.admin_pin,
             discount_amount=discount_request.discount_amount,
-            discount_reason=discount_request.discount_reason.strip()
+            discount_reason=discount_request.discount_reason.strip(),
+            pin_verified=True
         )
 
         # Process payment with discount
@@ -32,6 +32,7 @@ from app.services.extension_service import (
     ExtensionService, ExtensionError, ExtensionValidationError,
     TransactionNotFoundError, StaffValidationError, ExtensionNotAllowedError
 )
+from app.services.user_service import UserService
 
 # Configure logger
 extension_logger = structlog.get_logger("extension_api")
@@ -81,13 +82,10 @@ async def validate_extension_discount(
                 detail="Admin PIN must be exactly 4 digits"
             )
 
-        # Verify admin approval (get admin user by PIN)
-        admin_user = None
-        all_admins = await User.find(User.role == "admin").to_list()
-        for user in all_admins:
-            if user.verify_pin(extension_data.admin_pin):
-                admin_user = user
-                break
+        # Verify admin approval (resolve the approving admin from the PIN)
+        admin_user = await UserService.verify_admin_pin(
+            extension_data.admin_pin, extension_data.admin_user_id
+        )
 
         if not admin_user:
             extension_logger.warning(
@@ -156,6 +154,8 @@ async def process_extension(
 ) -> ExtensionResponse:
     """Process a loan extension with comprehensive error handling"""
     try:
+        discount_approved_by = None
+
         # Validate discount parameters if discount is provided
         if extension_data.discount_amount and extension_data.discount_amount > 0:
             if not extension_data.discount_reason or not extension_data.discount_reason.strip():
@@ -169,14 +169,10 @@ async def process_extension(
                     detail="Admin PIN must be exactly 4 digits"
                 )
 
-            # Verify admin approval (get admin user by PIN)
-            # Find admin user by PIN - check all admin users
-            admin_user = None
-            all_admins = await User.find(User.role == "admin").to_list()
-            for user in all_admins:
-                if user.verify_pin(extension_data.admin_pin):
-                    admin_user = user
-                    break
+            # Verify admin approval (resolve the approving admin from the PIN)
+            admin_user = await UserService.verify_admin_pin(
+                extension_data.admin_pin, extension_data.admin_user_id
+            )
 
             if not admin_user:
                 extension_logger.warning(
@@ -189,6 +185,8 @@ async def process_extension(
                     error_code="INVALID_ADMIN_PIN"
                 )
 
+            discount_approved_by = admin_user.user_id
+
         extension = await ExtensionService.process_extension(
             transaction_id=extension_data.transaction_id,
             extension_months=extension_data.extension_months,
@@ -198,6 +196,7 @@ async def process_extension(
             client_timezone=client_timezone,
             discount_amount=extension_data.discount_amount,
             overdue_fee_collected=extension_data.overdue_fee_collected,
+            discount_approved_by=discount_approved_by,
             discount_reason=extension_data.discount_reason,
             admin_pin=extension_data.admin_pin
         )
@@ -275,7 +274,8 @@ async def process_bulk_extension_payment(
             processed_by_user_id=current_user.user_id,
             batch_notes=bulk_payment_data.batch_notes,
             admin_pin=bulk_payment_data.admin_pin,
-            client_timezone=client_timezone
+            client_timezone=client_timezone,
+            admin_user_id=bulk_payment_data.admin_user_id
         )
 
         return BulkExtensionPaymentResponse(**result)
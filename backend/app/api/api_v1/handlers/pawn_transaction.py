@@ -20,13 +20,13 @@ from app.models.user_model import User
 from app.models.pawn_transaction_model import TransactionStatus
 from app.schemas.pawn_transaction_schema import (
     PawnTransactionCreate, PawnTransactionResponse, PawnTransactionListResponse,
-    TransactionStatusUpdate, BalanceResponse, InterestBreakdownResponse,
+    TransactionStatusUpdate, BalanceResponse, BatchBalanceRequest, BatchBalanceResponse, InterestBreakdownResponse,
     PayoffAmountResponse, TransactionSummaryResponse, TransactionSearchFilters,
     BulkStatusUpdateRequest, BulkStatusUpdateResponse, BulkNotesRequest, 
     BulkNotesResponse, BulkRedemptionRequest, BulkRedemptionResponse,
     TransactionVoidRequest, TransactionCancelRequest, 
     TransactionVoidResponse, UnifiedSearchRequest, UnifiedSearchResponse, 
-    BatchStatusCountResponse, UnifiedSearchType
+    BatchStatusCountResponse, UnifiedSearchType, TotalCountMode
 )
 from app.schemas.receipt_schema import (
     InitialPawnReceiptResponse, PaymentReceiptResponse, ExtensionReceiptResponse,
@@ -37,6 +37,7 @@ from app.services.pawn_transaction_service import (
     CustomerValidationError, StaffValidationError, TransactionStateError
 )
 from app.services.unified_search_service import UnifiedSearchService
+from app.services.daily_rollup_service import DailyRollupService
 from app.services.payment_service import PaymentService
 from app.services.interest_calculation_service import (
     InterestCalculationService, InterestCalculationError
@@ -48,6 +49,7 @@ from app.core.exceptions import (
 )
 from app.models.customer_model import Customer
 from app.models.pawn_transaction_model import PawnTransaction
+from app.core.redis_cache import BusinessCache, CacheTags
 
 # Configure logger
 transaction_logger = structlog.get_logger("pawn_transaction_api")
@@ -241,6 +243,8 @@ async def get_pawn_transactions_list(
     storage_location: Optional[str] = Query(None, description="Storage location filter"),
     page: int = Query(1, description="Page number", ge=1),
     page_size: int = Query(20, description="Items per page", ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page's next_cursor (overrides page)"),
+    count_mode: TotalCountMode = Query(TotalCountMode.EXACT, description="Total count mode: 'exact' or 'approximate'"),
     sort_by: str = Query("updated_at", description="Sort field"),
     sort_order: str = Query("desc", description="Sort order", pattern="^(asc|desc)$"),
     current_user: User = Depends(get_staff_or_admin_user),
@@ -264,6 +268,8 @@ async def get_pawn_transactions_list(
             storage_location=storage_location,
             page=page,
             page_size=page_size,
+            cursor=cursor,
+            count_mode=count_mode,
             sort_by=sort_by,
             sort_order=sort_order
         )
@@ -393,8 +399,6 @@ async def get_batch_status_counts(
     start_time = datetime.now(UTC)
     
     try:
-        from app.core.redis_cache import BusinessCache
-        
         cache_key = "transaction_status_counts"
         
         # Check cache first
@@ -457,7 +461,7 @@ async def get_batch_status_counts(
             "status_counts": status_counts,
             "total_transactions": total_transactions
         }
-        await BusinessCache.set(cache_key, cache_data, ttl_seconds=60)
+        await BusinessCache.set(cache_key, cache_data, ttl_seconds=60, tags=[CacheTags.TRANSACTION_LISTS])
         
         transaction_logger.info("✅ STATUS COUNTS: Query completed successfully",
                               total_transactions=total_transactions,
@@ -482,6 +486,46 @@ async def get_batch_status_counts(
         )
 
 
+@pawn_transaction_router.post(
+    "/balances",
+    response_model=BatchBalanceResponse,
+    summary="Get balances for many transactions",
+    description="Calculate current balances for up to 200 transactions in one request (Staff and Admin access)",
+    responses={
+        200: {"description": "Balances calculated successfully"},
+        422: {"description": "Validation error"},
+        500: {"description": "Internal server error"}
+    }
+)
+async def get_transaction_balances(
+    batch_request: BatchBalanceRequest,
+    current_user: User = Depends(get_staff_or_admin_user)
+) -> BatchBalanceResponse:
+    """Calculate balances for a list, report or bulk-action screen in one request"""
+    try:
+        balances = await PawnTransactionService.calculate_balances(
+            batch_request.transaction_ids, batch_request.as_of_date
+        )
+        return BatchBalanceResponse(
+            balances=list(balances.values()),
+            not_found=[
+                transaction_id for transaction_id in dict.fromkeys(batch_request.transaction_ids)
+                if transaction_id not in balances
+            ]
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        # Log unexpected errors for debugging
+        import traceback
+        transaction_logger.error("Unexpected error in get_transaction_balances", error=str(e), traceback=traceback.format_exc())
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to calculate balances: {str(e)}"
+        )
+
+
 @pawn_transaction_router.get(
     "/{transaction_id}",
     response_model=PawnTransactionResponse,
@@ -930,14 +974,11 @@ async def bulk_process_redemption(
             # Any user (staff or admin) can initiate, but admin PIN is required for approval
 
             # Import here to avoid circular dependency
-            from app.models.user_model import User as UserModel
+            from app.services.user_service import UserService
 
-            # Find admin user by PIN - check all admin users
-            all_admins = await UserModel.find(UserModel.role == "admin").to_list()
-            for user in all_admins:
-                if user.verify_pin(bulk_redemption.admin_pin):
-                    admin_user = user
-                    break
+            admin_user = await UserService.verify_admin_pin(
+                bulk_redemption.admin_pin, bulk_redemption.admin_user_id
+            )
 
             if not admin_user:
                 transaction_logger.warning(
@@ -968,23 +1009,25 @@ async def bulk_process_redemption(
             user_id=current_user.user_id
         )
 
+        # Balances for every requested transaction in one batch
+        preflight_balances = await PawnTransactionService.calculate_balances(bulk_redemption.transaction_ids)
+
         for transaction_id in bulk_redemption.transaction_ids:
             try:
                 # Validate transaction exists
-                transaction = await PawnTransactionService.get_transaction_by_id(transaction_id)
-                if not transaction:
+                balance_info = preflight_balances.get(transaction_id)
+                if not balance_info:
                     validation_errors.append(f"{transaction_id}: Transaction not found")
                     continue
 
                 # Validate transaction status is redeemable
-                if transaction.status not in redeemable_statuses:
+                if balance_info["status"] not in redeemable_statuses:
                     validation_errors.append(
-                        f"{transaction_id}: Cannot redeem '{transaction.status}' status (must be active, overdue, or extended)"
+                        f"{transaction_id}: Cannot redeem '{balance_info['status']}' status (must be active, overdue, or extended)"
                     )
                     continue
 
                 # Validate transaction has outstanding balance
-                balance_info = await PawnTransactionService.calculate_current_balance(transaction_id)
                 current_balance = balance_info["current_balance"]
                 if current_balance <= 0:
                     if current_balance < 0:
@@ -1090,7 +1133,8 @@ async def bulk_process_redemption(
                         admin_user=admin_user,
                         admin_pin=bulk_redemption.admin_pin,
                         discount_amount=discount_amount,
-                        discount_reason=discount_data.reason
+                        discount_reason=discount_data.reason,
+                        pin_verified=True
                     )
 
                     # Use discount payment flow
@@ -1240,7 +1284,7 @@ async def update_all_transaction_statuses(
         
         return {
             "message": "Transaction statuses updated successfully",
-            "updated_counts": result,
+            "updated_counts": {"overdue": result["overdue"]},
             "timestamp": datetime.now(UTC).isoformat()
         }
         
@@ -1781,7 +1825,7 @@ async def void_transaction(
             raise ValidationError("Void reason is required")
         
         # Verify admin PIN (same validation as reversal operations)
-        if not current_user.verify_pin(void_request.admin_pin):
+        if not await current_user.verify_pin_async(void_request.admin_pin):
             raise AuthenticationError("Invalid admin PIN")
         
         # Verify transaction exists with enhanced error handling
@@ -1840,6 +1884,7 @@ async def void_transaction(
         
         # Process void
         original_status = transaction.status
+        previous_changed_at = transaction.updated_at
         transaction.status = TransactionStatus.VOIDED
         transaction.updated_at = datetime.now(UTC)
         
@@ -1877,9 +1922,14 @@ async def void_transaction(
         
         await transaction.save()
         
+        # Record the transition in the daily rollups
+        await DailyRollupService.record_status_change(
+            transaction, original_status, TransactionStatus.VOIDED, transaction.updated_at, previous_changed_at
+        )
+        
         # CRITICAL: Immediate comprehensive cache invalidation for real-time updates
         try:
-            await PawnTransactionService._invalidate_all_transaction_caches()
+            await BusinessCache.invalidate_transaction_caches(transaction_ids=[transaction.transaction_id])
         except Exception as cache_error:
             transaction_logger.warning("Cache invalidation failed after void", error=str(cache_error))
         
@@ -2022,6 +2072,7 @@ async def cancel_transaction(
         
         # Process cancellation
         original_status = transaction.status
+        previous_changed_at = transaction.updated_at
         transaction.status = TransactionStatus.CANCELED
         transaction.updated_at = datetime.now(UTC)
         
@@ -2059,9 +2110,14 @@ async def cancel_transaction(
         
         await transaction.save()
         
+        # Record the transition in the daily rollups
+        await DailyRollupService.record_status_change(
+            transaction, original_status, TransactionStatus.CANCELED, transaction.updated_at, previous_changed_at
+        )
+        
         # CRITICAL: Immediate comprehensive cache invalidation for real-time updates
         try:
-            await PawnTransactionService._invalidate_all_transaction_caches()
+            await BusinessCache.invalidate_transaction_caches(transaction_ids=[transaction.transaction_id])
         except Exception as cache_error:
             transaction_logger.warning("Cache invalidation failed after cancel", error=str(cache_error))
         
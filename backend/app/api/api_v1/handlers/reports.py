@@ -232,7 +232,7 @@ async def get_inventory_snapshot(
 
     # Pass validated timezone to service
     snapshot = await ReportsService.get_inventory_snapshot(
-        user_id=str(current_user.id),
+        user_id=current_user.user_id,
         timezone=user_timezone
     )
 
@@ -123,12 +123,13 @@ async def get_all_metrics(
         cache_key = f"stats:all_metrics:{current_user.user_id}"
         if metric_service.redis_client:
             try:
+                # RedisCacheService already deserializes JSON
                 cached_data = await metric_service.redis_client.get(cache_key)
                 if cached_data:
                     logger.info("Returned cached metrics", 
                                user_id=current_user.user_id,
                                response_time_ms=(time.time() - start_time) * 1000)
-                    return JSONResponse(content=json.loads(cached_data))
+                    return JSONResponse(content=cached_data)
             except Exception as e:
                 logger.warning("Cache read failed", error=str(e))
         
@@ -344,10 +345,10 @@ async def get_all_metrics(
             # Cache the response for 30 seconds
             if metric_service.redis_client:
                 try:
-                    await metric_service.redis_client.setex(
-                        cache_key, 
-                        30,  # 30 second cache
-                        json.dumps(response_data.model_dump(), default=str)
+                    await metric_service.redis_client.set(
+                        cache_key,
+                        json.loads(response_data.model_dump_json()),
+                        30  # 30 second cache
                     )
                 except Exception as e:
                     logger.warning("Cache write failed", error=str(e))
@@ -6,7 +6,7 @@ import calendar
 import hashlib
 import threading
 from datetime import datetime, timedelta, UTC
-from decimal import Decimal, ROUND_HALF_UP
+from decimal import ROUND_HALF_UP
 from enum import Enum
 from typing import Dict, List, Optional, Tuple, Any
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
@@ -16,13 +16,15 @@ from prometheus_client import Counter, Gauge, Histogram
 
 from app.core.auth import get_current_user
 from app.core.config import settings
-from app.core.timezone_utils import validate_and_get_timezone, get_user_now, get_user_business_date, utc_to_user_timezone, user_timezone_to_utc
+from app.core.timezone_utils import validate_and_get_timezone, get_user_now, get_user_business_date, user_timezone_to_utc
 from app.models.user_model import User
 from app.models.pawn_transaction_model import PawnTransaction
 from app.models.payment_model import Payment
 from app.models.extension_model import Extension
-from beanie.operators import And, GTE, LTE
+from app.services.daily_rollup_service import DailyRollupService
+from app.services.trends_aggregation_service import TrendsAggregationService
 from pydantic import BaseModel
+from pymongo.errors import OperationFailure
 
 # Configure logger
 logger = structlog.get_logger(__name__)
@@ -489,6 +491,11 @@ def invalidate_trends_cache() -> None:
         )
 
 
+def _as_aware(value: datetime) -> datetime:
+    """Attach UTC to the naive UTC values _get_date_range returns for custom ranges."""
+    return value if value.tzinfo is not None else value.replace(tzinfo=UTC)
+
+
 async def _get_date_range(
     period: Optional[str] = None,
     timezone_header: Optional[str] = None,
@@ -692,72 +699,34 @@ async def get_revenue_trends(
         start_date_naive = start_date_obj if start_date_obj.tzinfo is None else start_date_obj.replace(tzinfo=None)
         end_date_naive = end_date_obj if end_date_obj.tzinfo is None else end_date_obj.replace(tzinfo=None)
 
-        # Query payments in date range
-        payments = await Payment.find(
-            And(
-                GTE(Payment.payment_date, start_date_naive),
-                LTE(Payment.payment_date, end_date_naive)
+        # Serve closed days from the daily rollups (today is computed live).
+        # When the client timezone has not been backfilled, bucket payments and
+        # extensions in MongoDB (timezone-aware $dateTrunc, Decimal128 sums),
+        # falling back to the Python reference path on servers that do not
+        # support the aggregation operators.
+        try:
+            revenue_by_date = await DailyRollupService.get_revenue_buckets(
+                _as_aware(start_date_obj),
+                _as_aware(end_date_obj),
+                date_format,
+                timezone_header
             )
-        ).to_list()
-
-        # Query extensions in date range
-        extensions = await Extension.find(
-            And(
-                GTE(Extension.extension_date, start_date_naive),
-                LTE(Extension.extension_date, end_date_naive)
+            if revenue_by_date is None:
+                revenue_by_date = await TrendsAggregationService.aggregate_revenue_buckets(
+                    start_date_naive,
+                    end_date_naive,
+                    date_format,
+                    timezone_header
+                )
+        except OperationFailure as e:
+            logger.warning("Revenue aggregation unavailable, using Python fallback",
+                           error=str(e))
+            revenue_by_date = await TrendsAggregationService.calculate_revenue_buckets_python(
+                start_date_naive,
+                end_date_naive,
+                date_format,
+                timezone_header
             )
-        ).to_list()
-
-        # Initialize data structure for daily/interval tracking
-        revenue_by_date = {}
-
-        # Process payments
-        for payment in payments:
-            # Convert payment date to user timezone using project's timezone utilities
-            payment_date = utc_to_user_timezone(payment.payment_date, timezone_header)
-            date_key = payment_date.strftime(date_format)
-
-            if date_key not in revenue_by_date:
-                revenue_by_date[date_key] = {
-                    "date": date_key,
-                    "total_revenue": Decimal("0"),
-                    "principal_collected": Decimal("0"),
-                    "interest_collected": Decimal("0"),
-                    "extension_fees": Decimal("0"),
-                    "overdue_fees": Decimal("0"),
-                    "payment_count": 0
-                }
-
-            # BLOCKER 3: Use Decimal for all financial calculations to avoid float precision issues
-            revenue_by_date[date_key]["total_revenue"] += Decimal(str(payment.payment_amount))
-            revenue_by_date[date_key]["principal_collected"] += Decimal(str(payment.principal_portion))
-            revenue_by_date[date_key]["interest_collected"] += Decimal(str(payment.interest_portion))
-            revenue_by_date[date_key]["overdue_fees"] += Decimal(str(payment.overdue_fee_portion))
-            revenue_by_date[date_key]["payment_count"] += 1
-
-        # Process extensions
-        for extension in extensions:
-            # Convert extension date to user timezone using project's timezone utilities
-            extension_date = utc_to_user_timezone(extension.extension_date, timezone_header)
-            date_key = extension_date.strftime(date_format)
-
-            if date_key not in revenue_by_date:
-                revenue_by_date[date_key] = {
-                    "date": date_key,
-                    "total_revenue": Decimal("0"),
-                    "principal_collected": Decimal("0"),
-                    "interest_collected": Decimal("0"),
-                    "extension_fees": Decimal("0"),
-                    "overdue_fees": Decimal("0"),
-                    "payment_count": 0
-                }
-
-            # BLOCKER 3: Convert extension fees to Decimal for precision
-            # Note: Extension model uses floats for discount_amount and overdue_fee_collected
-            # Converting to Decimal here prevents precision loss in aggregation
-            extension_fee_decimal = Decimal(str(extension.total_extension_fee))
-            revenue_by_date[date_key]["extension_fees"] += extension_fee_decimal
-            revenue_by_date[date_key]["total_revenue"] += extension_fee_decimal
 
         # Convert Decimal values to integers (whole dollars only - CRITICAL-1 fix)
         for date_entry in revenue_by_date.values():
@@ -922,38 +891,6 @@ async def get_loan_trends(
         start_date_naive = start_date_obj if start_date_obj.tzinfo is None else start_date_obj.replace(tzinfo=None)
         end_date_naive = end_date_obj if end_date_obj.tzinfo is None else end_date_obj.replace(tzinfo=None)
 
-        # Query transactions in two parts for accurate active loan tracking:
-        # 1. Transactions created during the period
-        transactions_in_period = await PawnTransaction.find(
-            And(
-                GTE(PawnTransaction.created_at, start_date_naive),
-                LTE(PawnTransaction.created_at, end_date_naive)
-            )
-        ).to_list()
-
-        # 2. Transactions created before the period that might still be active
-        # Include: currently active, or became terminal during/after the period
-        earlier_active_transactions = await PawnTransaction.find(
-            LTE(PawnTransaction.created_at, start_date_naive)
-        ).to_list()
-
-        # Filter earlier transactions to only those relevant to the period
-        # (currently active OR became terminal on or after period start)
-        terminal_statuses = ["redeemed", "forfeited", "sold", "voided"]
-        filtered_earlier = []
-        for t in earlier_active_transactions:
-            if t.status not in terminal_statuses:
-                # Still active, include it
-                filtered_earlier.append(t)
-            elif t.updated_at:
-                # Terminal status - check if it changed during or after the period
-                updated_naive = t.updated_at if t.updated_at.tzinfo is None else t.updated_at.replace(tzinfo=None)
-                if updated_naive >= start_date_naive:
-                    filtered_earlier.append(t)
-
-        # Combine both sets
-        all_transactions = transactions_in_period + filtered_earlier
-
         # CRITICAL FIX 1: Pre-populate all dates in the period with zero values
         # This prevents chart gaps when no activity occurs on certain dates
         loan_by_date = {}
@@ -996,112 +933,14 @@ async def get_loan_trends(
                    date_range=f"{start_date_obj.strftime(date_format)} to {end_date_obj.strftime(date_format)}",
                    interval_days=interval_days)
 
-        # Process terminal status transactions (redeemed, forfeited, sold)
-        #
-        # TIMEZONE EDGE CASE HANDLING:
-        # Transactions are queried in UTC and filtered by date range, then converted to user timezone.
-        # Due to timezone conversions, some transactions may fall outside the pre-populated date buckets:
-        #
-        # Example: Transaction redeemed at 2025-11-07 23:30 UTC
-        #   - In UTC: Falls within query range (2025-11-07)
-        #   - In PST (-8h): Becomes 2025-11-07 15:30 (still 2025-11-07)
-        #   - In JST (+9h): Becomes 2025-11-08 08:30 (next day!)
-        #
-        # Pre-populated buckets are created from start_date to end_date in user timezone.
-        # If a transaction's timezone-adjusted date falls outside this range, we silently skip it.
-        # This is EXPECTED BEHAVIOR - not an error condition.
+        # Build the end-of-bucket boundaries used for the active loan counts
         #
-        # The data remains accurate because:
-        # 1. Query filters transactions by UTC date range (lines 849, 878, 907)
-        # 2. Only transactions truly within the period are processed
-        # 3. Timezone edge cases at boundaries are acceptable for trend visualization
-        #
-        # HIGH 3: Handle edge case where updated_at might be None or same as created_at
-        redeemed_count = 0
-        for transaction in all_transactions:
-            if transaction.status == "redeemed":
-                # Use updated_at if available, fall back to created_at for same-day redemptions
-                redemption_date_utc = transaction.updated_at if transaction.updated_at else transaction.created_at
-
-                # Ensure naive datetime for comparison
-                if redemption_date_utc.tzinfo is not None:
-                    redemption_date_utc = redemption_date_utc.replace(tzinfo=None)
-
-                # Check if redemption happened within date range
-                if start_date_naive <= redemption_date_utc <= end_date_naive:
-                    # Convert to user timezone for display
-                    redemption_date = utc_to_user_timezone(redemption_date_utc, timezone_header)
-                    date_key = redemption_date.strftime(date_format)
-
-                    # Date should already exist from pre-population
-                    # Note: Due to timezone edge cases, some dates may fall outside the pre-populated range
-                    # This is expected behavior - we only track transactions within the display period
-                    if date_key in loan_by_date:
-                        loan_by_date[date_key]["redeemed"] += 1
-                        loan_by_date[date_key]["redeemed_amount"] += transaction.loan_amount
-                        redeemed_count += 1
-
-        # Process forfeited transactions
-        forfeited_count = 0
-        for transaction in all_transactions:
-            if transaction.status == "forfeited":
-                # Use updated_at if available, fall back to created_at for same-day forfeitures
-                forfeiture_date_utc = transaction.updated_at if transaction.updated_at else transaction.created_at
-
-                # Ensure naive datetime for comparison
-                if forfeiture_date_utc.tzinfo is not None:
-                    forfeiture_date_utc = forfeiture_date_utc.replace(tzinfo=None)
-
-                # Check if forfeiture happened within date range
-                if start_date_naive <= forfeiture_date_utc <= end_date_naive:
-                    # Convert to user timezone for display
-                    forfeiture_date = utc_to_user_timezone(forfeiture_date_utc, timezone_header)
-                    date_key = forfeiture_date.strftime(date_format)
-
-                    # Date should already exist from pre-population
-                    # Note: Due to timezone edge cases, some dates may fall outside the pre-populated range
-                    # This is expected behavior - we only track transactions within the display period
-                    if date_key in loan_by_date:
-                        loan_by_date[date_key]["forfeited"] += 1
-                        loan_by_date[date_key]["forfeited_amount"] += transaction.loan_amount
-                        forfeited_count += 1
-
-        # Process sold transactions
-        sold_count = 0
-        for transaction in all_transactions:
-            if transaction.status == "sold":
-                # Use updated_at if available, fall back to created_at for same-day sales
-                sold_date_utc = transaction.updated_at if transaction.updated_at else transaction.created_at
-
-                # Ensure naive datetime for comparison
-                if sold_date_utc.tzinfo is not None:
-                    sold_date_utc = sold_date_utc.replace(tzinfo=None)
-
-                # Check if sale happened within date range
-                if start_date_naive <= sold_date_utc <= end_date_naive:
-                    # Convert to user timezone for display
-                    sold_date = utc_to_user_timezone(sold_date_utc, timezone_header)
-                    date_key = sold_date.strftime(date_format)
-
-                    # Date should already exist from pre-population
-                    # Note: Due to timezone edge cases, some dates may fall outside the pre-populated range
-                    # This is expected behavior - we only track transactions within the display period
-                    if date_key in loan_by_date:
-                        loan_by_date[date_key]["sold"] += 1
-                        loan_by_date[date_key]["sold_amount"] += transaction.loan_amount
-                        sold_count += 1
-
-        # Calculate active loans count for each date
-        # Active = active, overdue, or extended status
-        active_statuses = ["active", "overdue", "extended"]
-        terminal_statuses = ["redeemed", "forfeited", "sold", "voided"]
-
+        # CRITICAL FIX 4: Create date boundary in user timezone, then convert to UTC
+        # This ensures consistency with how terminal status dates are bucketed
+        # Terminal dates use: utc_to_user_timezone(date_utc) → format
+        # Active dates must use: parse(date_key in user tz) → convert to UTC
+        active_boundaries = []
         for date_key in loan_by_date.keys():
-            # CRITICAL FIX 4: Create date boundary in user timezone, then convert to UTC
-            # This ensures consistency with how terminal status dates are processed
-            # Terminal dates use: utc_to_user_timezone(date_utc) → format
-            # Active dates must use: parse(date_key in user tz) → convert to UTC
-
             # Parse date_key back to datetime in USER timezone
             # Handle different date formats based on period
             if len(date_key) == 7:  # "YYYY-MM" format (1y period)
@@ -1122,29 +961,48 @@ async def get_loan_trends(
             if date_obj_utc.tzinfo is not None:
                 date_obj_utc = date_obj_utc.replace(tzinfo=None)
 
-            # Count transactions that were active on this specific date
-            active_count = 0
-            for transaction in all_transactions:
-                # Transaction must have been created on or before this date
-                created_at_naive = transaction.created_at if transaction.created_at.tzinfo is None else transaction.created_at.replace(tzinfo=None)
-
-                # BLOCKER 1 FIX: Use > (not >=) to exclude transactions created AFTER this date
-                # Transaction created after this date's end shouldn't be counted
-                if created_at_naive > date_obj_utc:
-                    continue
-
-                # Check if transaction was still active on this date
-                # If status is currently active/overdue/extended, check if it was active on this date
-                if transaction.status in active_statuses:
-                    # Transaction is currently active - was it created by this date?
-                    active_count += 1
-                elif transaction.status in terminal_statuses and transaction.updated_at:
-                    # Transaction is now terminal - check if it became terminal after this date
-                    updated_at_naive = transaction.updated_at if transaction.updated_at.tzinfo is None else transaction.updated_at.replace(tzinfo=None)
-                    # If status changed after this date, it was still active on this date
-                    if updated_at_naive > date_obj_utc:
-                        active_count += 1
+            active_boundaries.append((date_key, date_obj_utc))
+
+        # Compute terminal-status buckets and active loan counts from the daily
+        # rollups, or in MongoDB when the client timezone has no rollups yet.
+        # Only per-bucket counts and sums are returned - transaction documents
+        # (and their audit logs) are never loaded into memory.
+        #
+        # TIMEZONE EDGE CASE HANDLING:
+        # Terminal events are filtered by the UTC window and bucketed in the user's
+        # timezone (updated_at, falling back to created_at - HIGH 3). A bucket key
+        # that falls outside the pre-populated range (e.g. an event at 23:30 UTC
+        # that lands on the next day in JST) is skipped. This is EXPECTED BEHAVIOR
+        # for trend visualization, not an error condition.
+        aggregated = await DailyRollupService.get_loan_trends(
+            _as_aware(start_date_obj),
+            _as_aware(end_date_obj),
+            date_format,
+            timezone_header,
+            [date_key for date_key, _ in active_boundaries]
+        )
+        if aggregated is None:
+            aggregated = await TrendsAggregationService.aggregate_loan_trends(
+                start_date_naive,
+                end_date_naive,
+                date_format,
+                timezone_header,
+                active_boundaries
+            )
+
+        closed_counts = {"redeemed": 0, "forfeited": 0, "sold": 0}
+        for (status_value, date_key), bucket in aggregated["closed"].items():
+            # Date should already exist from pre-population
+            if date_key in loan_by_date:
+                loan_by_date[date_key][status_value] += bucket["count"]
+                loan_by_date[date_key][f"{status_value}_amount"] += bucket["amount"]
+                closed_counts[status_value] += bucket["count"]
+
+        redeemed_count = closed_counts["redeemed"]
+        forfeited_count = closed_counts["forfeited"]
+        sold_count = closed_counts["sold"]
 
+        for date_key, active_count in aggregated["active_loans"].items():
             loan_by_date[date_key]["active_loans"] = active_count
 
         # CRITICAL FIX 2: Add comprehensive data validation before returning results
@@ -1210,7 +1068,7 @@ async def get_loan_trends(
         total_sold_amount = sum(d["sold_amount"] for d in loan_data)
 
         # Current active loans
-        current_active_loans = len([t for t in all_transactions if t.status in active_statuses])
+        current_active_loans = aggregated["current_active_loans"]
 
         # Average loan amount (across all terminal states)
         total_terminal_count = total_redeemed + total_forfeited + total_sold
@@ -1223,9 +1081,9 @@ async def get_loan_trends(
                    timezone=timezone_header or "UTC",
                    date_range=f"{start_date_obj.strftime(date_format)} to {end_date_obj.strftime(date_format)}",
                    data_points=len(loan_data),
-                   total_transactions=len(all_transactions),
-                   transactions_in_period=len(transactions_in_period),
-                   earlier_active_transactions=len(filtered_earlier),
+                   total_transactions=aggregated["total_transactions"],
+                   transactions_in_period=aggregated["transactions_in_period"],
+                   earlier_active_transactions=aggregated["total_transactions"] - aggregated["transactions_in_period"],
                    redeemed_in_period=redeemed_count,
                    forfeited_in_period=forfeited_count,
                    sold_in_period=sold_count,
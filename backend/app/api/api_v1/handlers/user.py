@@ -63,8 +63,7 @@ async def logout(
     """User logout endpoint"""
     # Note: In a real implementation, you'd get the session_id from the request
     # For now, we'll just clear all sessions
-    current_user.active_sessions = []
-    await current_user.save()
+    await UserService.terminate_sessions(current_user.user_id)
 
     # Log logout activity
     await UserActivityService.log_logout(
@@ -124,7 +123,8 @@ async def create_user(
                 description="Get the current authenticated user's profile")
 async def get_current_user_profile(current_user: User = Depends(get_current_active_user)):
     """Get current user's own profile"""
-    return UserResponse.model_validate(current_user.model_dump())
+    # The authenticated user may come from the auth cache, which holds no profile fields
+    return await UserService.get_user_by_id(current_user.user_id)
 
 @user_router.put("/me",
                 response_model=UserResponse,
@@ -361,10 +361,11 @@ async def reset_user_pin(
     temp_pin = f"{randbelow(10000):04d}"
 
     # Hash and save new PIN
-    user.pin_hash = User.hash_pin(temp_pin)
+    user.pin_hash = await User.hash_pin_async(temp_pin)
     user.password_changed_at = None  # Force PIN change on next login
     user.updated_at = datetime.utcnow()
     await user.save()
+    await UserService.invalidate_cached_user(user_id)
 
     # Log PIN reset activity
     await UserActivityService.log_pin_reset(
@@ -412,7 +413,7 @@ async def set_user_pin(
         )
 
     # Hash and save new PIN
-    user.pin_hash = User.hash_pin(new_pin)
+    user.pin_hash = await User.hash_pin_async(new_pin)
     user.password_changed_at = datetime.utcnow()  # Update password change timestamp
     user.updated_at = datetime.utcnow()
 
@@ -420,6 +421,7 @@ async def set_user_pin(
     user.active_sessions = []
 
     await user.save()
+    await UserService.invalidate_cached_user(user_id)
 
     return {
         "message": "PIN set successfully",
@@ -448,6 +450,7 @@ async def unlock_user_account(
     user.failed_login_attempts = 0
     user.updated_at = datetime.utcnow()
     await user.save()
+    await UserService.invalidate_cached_user(user_id)
 
     # Log account unlock activity
     await UserActivityService.log_activity(
@@ -499,9 +502,7 @@ async def terminate_user_sessions(
             detail="User not found"
         )
     
-    user.active_sessions = []
-    user.updated_at = datetime.utcnow()
-    await user.save()
+    await UserService.terminate_sessions(user_id)
 
     return {"message": "All user sessions terminated successfully"}
 
@@ -6,6 +6,7 @@ user management, and comprehensive audit logging.
 """
 
 # Standard library imports
+import asyncio
 from contextlib import asynccontextmanager
 
 # Third-party imports
@@ -19,6 +20,7 @@ from slowapi.errors import RateLimitExceeded
 from slowapi.middleware import SlowAPIMiddleware
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 import structlog
 
 # Local imports
@@ -28,8 +30,9 @@ from app.core.security_middleware import setup_security_middleware
 from app.core.csrf_protection import initialize_csrf_protection
 from app.core.database_indexes import create_database_indexes
 from app.core.database import initialize_database, close_database
-from app.core.redis_cache import initialize_cache_service
-from app.core.field_encryption import initialize_field_encryption, generate_master_key
+from app.core.redis_cache import initialize_cache_service, close_cache_service
+from app.core.security import shutdown_pin_executor
+from app.core.field_encryption import initialize_field_encryption, generate_master_key, parse_wrapped_data_keys, shutdown_encryption_executor
 from app.core.exception_handlers import register_exception_handlers
 from app.middleware.request_id import add_request_id_middleware
 from app.middleware.timezone_middleware import add_timezone_middleware
@@ -43,6 +46,8 @@ from app.models.service_alert_model import ServiceAlert
 from app.models.user_model import User
 from app.models.user_activity_log_model import UserActivityLog
 from app.models.transaction_metrics import TransactionMetrics
+from app.models.daily_rollup_model import DailyRollup
+from app.models.counter_model import Counter
 from app.models.business_config_model import (
     CompanyConfig,
     FinancialPolicyConfig,
@@ -83,6 +88,8 @@ async def lifespan(app: FastAPI):
             ServiceAlert,
             LoanConfig,
             TransactionMetrics,
+            DailyRollup,
+            Counter,
             CompanyConfig,
             FinancialPolicyConfig,
             ForfeitureConfig,
@@ -101,16 +108,17 @@ async def lifespan(app: FastAPI):
         # Initialize CSRF protection with Redis
         initialize_csrf_protection(redis_client, settings.JWT_SECRET_KEY)
         
-        # Initialize cache service with Redis
-        initialize_cache_service(redis_client, settings.REDIS_URL)
-        
         logger.info("Redis services initialized successfully")
         
     except Exception as e:
         logger.warning(f"Redis unavailable, using fallback services: {e}")
         # Fallback to in-memory services
         initialize_csrf_protection(None, settings.JWT_SECRET_KEY)
-        initialize_cache_service(None, settings.REDIS_URL)
+    
+    # Initialize cache service on its own asyncio connection pool so cache
+    # round trips never block the event loop (caching is disabled, and
+    # callers compute live, if Redis is unreachable)
+    await initialize_cache_service(None, settings.REDIS_URL)
     
     # Initialize field encryption for sensitive data
     try:
@@ -121,7 +129,11 @@ async def lifespan(app: FastAPI):
             logger.warning("For production, set FIELD_ENCRYPTION_KEY in environment variables.")
             encryption_key = generate_master_key()
             
-        initialize_field_encryption(encryption_key)
+        initialize_field_encryption(
+            encryption_key,
+            settings.FIELD_ENCRYPTION_KEY_VERSION,
+            parse_wrapped_data_keys(settings.FIELD_ENCRYPTION_WRAPPED_KEYS)
+        )
         logger.info("Field encryption initialized")
         
     except Exception as e:
@@ -154,6 +166,25 @@ async def lifespan(app: FastAPI):
         )
         # Allow app to start on verification errors (but not missing indexes)
 
+    # Load the search bar's in-process index in the background; searches use
+    # MongoDB until it is ready
+    from app.services.search_index_service import SearchIndexService, SNAPSHOT_INTERVAL_MINUTES
+    search_index_task = asyncio.create_task(SearchIndexService.start())
+
+    # Load the business configuration snapshot and follow changes made by
+    # other workers
+    from app.services.config_snapshot_service import ConfigSnapshotService
+    try:
+        await ConfigSnapshotService.load()
+    except Exception as e:
+        logger.warning("Configuration snapshot load failed; loading on first use", error=str(e))
+    config_listener_task = asyncio.create_task(ConfigSnapshotService.listen())
+
+    # Receive auth cache invalidations from other workers; the in-process
+    # auth cache is only used while subscribed
+    from app.core.auth_cache import listen_for_invalidations
+    auth_listener_task = asyncio.create_task(listen_for_invalidations())
+
     # Initialize background scheduler for automatic status updates
     try:
         from app.services.pawn_transaction_service import PawnTransactionService
@@ -166,7 +197,7 @@ async def lifespan(app: FastAPI):
                 result = await PawnTransactionService.bulk_update_statuses()
                 logger.info(
                     "Scheduled status update completed",
-                    updated_counts=result
+                    overdue=result["overdue"]
                 )
             except Exception as e:
                 logger.error(
@@ -184,6 +215,15 @@ async def lifespan(app: FastAPI):
             replace_existing=True
         )
 
+        # Persist the search index snapshot so restarts load it instead of rebuilding
+        scheduler.add_job(
+            SearchIndexService.save_snapshot,
+            IntervalTrigger(minutes=SNAPSHOT_INTERVAL_MINUTES),
+            id='search_index_snapshot',
+            name='Save search index snapshot to Redis',
+            replace_existing=True
+        )
+
         scheduler.start()
         logger.info("Background scheduler started - daily status updates at 2:00 AM")
 
@@ -193,7 +233,7 @@ async def lifespan(app: FastAPI):
             startup_result = await PawnTransactionService.bulk_update_statuses()
             logger.info(
                 "Initial status update completed on startup",
-                updated_counts=startup_result
+                overdue=startup_result["overdue"]
             )
         except Exception as e:
             logger.error(
@@ -222,6 +262,20 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"Error shutting down trends cache: {e}")
 
+    # Stop a search index build that is still running
+    search_index_task.cancel()
+    config_listener_task.cancel()
+    auth_listener_task.cancel()
+
+    # Release pooled Redis cache connections
+    await close_cache_service()
+
+    # Stop the bcrypt PIN hashing threads
+    shutdown_pin_executor()
+
+    # Stop the field encryption threads
+    shutdown_encryption_executor()
+
     await close_database()
 
 
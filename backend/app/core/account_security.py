@@ -22,6 +22,7 @@ from enum import Enum
 
 from fastapi import HTTPException, status
 
+from app.core.auth_cache import invalidate_cached_user
 from app.models.user_model import User, UserRole, AuthConfig
 
 
@@ -201,6 +202,7 @@ class AccountSecurityService:
 
         # Save user state
         await user.save()
+        await invalidate_cached_user(user.user_id)
 
     @staticmethod
     async def check_and_unlock_expired(user: User) -> bool:
@@ -229,6 +231,7 @@ class AccountSecurityService:
                 user.locked_until = None
                 user.failed_login_attempts = 0
                 await user.save()
+                await invalidate_cached_user(user.user_id)
 
             return True
 
@@ -270,7 +273,7 @@ class AccountSecurityService:
 
         # Supervisor PIN validation (optional but recommended for high-value accounts)
         if supervisor_pin:
-            if not admin_user.verify_pin(supervisor_pin):
+            if not await admin_user.verify_pin_async(supervisor_pin):
                 security_logger.warning(
                     f"Invalid supervisor PIN for unlock: admin_id={admin_user.user_id}, "
                     f"target_user={user.user_id}"
@@ -284,6 +287,7 @@ class AccountSecurityService:
         user.locked_until = None
         user.failed_login_attempts = 0
         await user.save()
+        await invalidate_cached_user(user.user_id)
 
         # Log admin unlock
         security_logger.info(
@@ -314,6 +318,7 @@ class AccountSecurityService:
             old_count = getattr(user, 'total_lockout_count', 0)
             user.total_lockout_count = 0
             await user.save()
+            await invalidate_cached_user(user.user_id)
 
             security_logger.info(
                 f"Lockout counter reset: user_id={user.user_id}, "
@@ -0,0 +1,215 @@
+"""
+Authenticated-user cache for JWT request authentication.
+
+Every authenticated request resolves its user from the token's "sub" claim
+and checks the account status and the token's session ID ("jti") against
+the user's active sessions. This module keeps those authorisation fields
+(AUTH_CACHE_FIELDS: status, role and active session IDs) for recently
+resolved users so the checks do not need a MongoDB read per request. PIN
+hashes and profile data are never cached.
+
+Two storage modes:
+    local   (default) In-process TTL + LRU map, one per worker. Invalidations
+            are published on AUTH_INVALIDATION_CHANNEL and every worker's
+            listener drops its entry. The cache is only used while the
+            worker is subscribed, so without Redis every request reads
+            MongoDB rather than risk accepting a revoked session.
+    shared  (AUTH_CACHE_SHARED) Entries live in Redis under the user: prefix,
+            so an invalidation is seen by every worker at once.
+
+Only stale acceptance is possible: when a cached entry would reject a
+request (inactive account, unknown session) the caller reloads the user from
+MongoDB before deciding.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+import structlog
+
+from app.core.config import settings
+from app.core.redis_cache import BusinessCache, get_cache_service
+
+# Configure logger
+logger = structlog.get_logger("auth_cache")
+
+AUTH_CACHE_ENABLED = settings.AUTH_CACHE_ENABLED
+AUTH_CACHE_TTL = settings.AUTH_CACHE_TTL
+AUTH_CACHE_MAX_SIZE = settings.AUTH_CACHE_MAX_SIZE
+AUTH_CACHE_SHARED = settings.AUTH_CACHE_SHARED
+
+# User fields needed to authorise a request
+AUTH_CACHE_FIELDS = ("user_id", "role", "status", "active_sessions")
+
+AUTH_INVALIDATION_CHANNEL = "auth:invalidate"
+
+# Listener poll interval and reconnect delay
+LISTEN_POLL_SECONDS = 1.0
+LISTEN_RETRY_SECONDS = 5.0
+
+
+class LocalUserCache:
+    """In-process TTL + LRU map of user_id -> authorisation fields."""
+
+    def __init__(self, ttl_seconds: float, max_size: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """Return a live entry (refreshing its LRU position), or None."""
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+        snapshot, expires_at = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[user_id]
+            return None
+        self._entries.move_to_end(user_id)
+        return snapshot
+
+    def set(self, user_id: str, snapshot: Dict[str, Any]) -> None:
+        """Store an entry, evicting the least recently used one when full."""
+        self._entries[user_id] = (snapshot, time.monotonic() + self.ttl_seconds)
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: str) -> None:
+        self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+_local_cache = LocalUserCache(AUTH_CACHE_TTL, AUTH_CACHE_MAX_SIZE)
+
+# True while this worker receives invalidations from the other workers
+_subscribed = False
+
+
+def build_cache_entry(user) -> Dict[str, Any]:
+    """Extract the cached authorisation fields from a user document."""
+    return user.model_dump(include=set(AUTH_CACHE_FIELDS), mode="json")
+
+
+async def get_cached_user(user_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Look up a user's cached authorisation fields.
+
+    Args:
+        user_id: User identifier from the token
+
+    Returns:
+        Entry with AUTH_CACHE_FIELDS, or None on a miss
+    """
+    if not AUTH_CACHE_ENABLED:
+        return None
+    if not AUTH_CACHE_SHARED:
+        return _local_cache.get(user_id) if _subscribed else None
+
+    try:
+        return await BusinessCache.get_user(user_id)
+    except Exception as e:
+        logger.warning("Failed to read shared auth cache", user_id=user_id, error=str(e))
+        return None
+
+
+async def cache_user(user) -> None:
+    """
+    Cache the authorisation fields of a user resolved for a request.
+
+    Args:
+        user: User document loaded from MongoDB
+    """
+    if not AUTH_CACHE_ENABLED:
+        return
+    if not AUTH_CACHE_SHARED:
+        if _subscribed:
+            _local_cache.set(user.user_id, build_cache_entry(user))
+        return
+
+    try:
+        await BusinessCache.set_user(user.user_id, build_cache_entry(user), ttl=AUTH_CACHE_TTL)
+    except Exception as e:
+        logger.warning("Failed to write shared auth cache", user_id=user.user_id, error=str(e))
+
+
+async def invalidate_cached_user(user_id: str) -> None:
+    """
+    Drop a user's cached entry in every worker after any change to the user document.
+
+    Args:
+        user_id: User identifier
+    """
+    _local_cache.invalidate(user_id)
+    if not AUTH_CACHE_ENABLED:
+        return
+
+    try:
+        if AUTH_CACHE_SHARED:
+            await BusinessCache.invalidate_user(user_id)
+            return
+
+        cache = get_cache_service()
+        if cache and cache.is_available:
+            await cache.redis_client.publish(AUTH_INVALIDATION_CHANNEL, user_id)
+    except Exception as e:
+        logger.warning("Failed to invalidate auth cache in other workers", user_id=user_id, error=str(e))
+
+
+def handle_invalidation(data: Any) -> None:
+    """Drop the entry named by an invalidation message."""
+    if isinstance(data, bytes):
+        data = data.decode("utf-8", errors="replace")
+    if data:
+        _local_cache.invalidate(str(data))
+
+
+async def listen_for_invalidations() -> None:
+    """
+    Apply invalidations published by other workers until cancelled (runs for the app lifetime).
+
+    The local cache is only used while subscribed; it is cleared whenever
+    the subscription is lost, since messages may have been missed.
+    """
+    global _subscribed
+
+    if not AUTH_CACHE_ENABLED or AUTH_CACHE_SHARED:
+        return
+
+    while True:
+        cache = get_cache_service()
+        if not cache or not cache.is_available:
+            return
+
+        pubsub = cache.redis_client.pubsub()
+        try:
+            await pubsub.subscribe(AUTH_INVALIDATION_CHANNEL)
+            _subscribed = True
+            while True:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=LISTEN_POLL_SECONDS)
+                if message:
+                    handle_invalidation(message.get("data"))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning("Auth cache invalidation listener failed, reconnecting", error=str(e))
+        finally:
+            _subscribed = False
+            _local_cache.clear()
+            try:
+                await pubsub.aclose()
+            except Exception:
+                pass
+        await asyncio.sleep(LISTEN_RETRY_SECONDS)
+
+
+def clear_local_cache() -> None:
+    """Drop every in-process entry (tests and shutdown)."""
+    _local_cache.clear()
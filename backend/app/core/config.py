@@ -29,6 +29,9 @@ class Settings(BaseSettings):
     
     # Field encryption settings
     FIELD_ENCRYPTION_KEY: str = config("FIELD_ENCRYPTION_KEY", default="", cast=str)
+    FIELD_ENCRYPTION_KEY_VERSION: str = config("FIELD_ENCRYPTION_KEY_VERSION", default="1", cast=str)
+    # Optional "<key version>:<wrapped data key>,..." (see FieldEncryptionService.wrap_data_key)
+    FIELD_ENCRYPTION_WRAPPED_KEYS: str = config("FIELD_ENCRYPTION_WRAPPED_KEYS", default="", cast=str)
     
     # Business rules configuration
     MAX_ACTIVE_LOANS: int = config("MAX_ACTIVE_LOANS", default=8, cast=int)
@@ -37,6 +40,12 @@ class Settings(BaseSettings):
     TRENDS_CACHE_ENABLED: bool = config("TRENDS_CACHE_ENABLED", default=True, cast=bool)
     TRENDS_CACHE_TTL: int = config("TRENDS_CACHE_TTL", default=300, cast=int)  # 5 minutes in seconds
     TRENDS_CACHE_MAX_SIZE: int = config("TRENDS_CACHE_MAX_SIZE", default=1000, cast=int)
+
+    # Authenticated-user cache configuration (see app/core/auth_cache.py)
+    AUTH_CACHE_ENABLED: bool = config("AUTH_CACHE_ENABLED", default=True, cast=bool)
+    AUTH_CACHE_TTL: int = config("AUTH_CACHE_TTL", default=30, cast=int)  # seconds
+    AUTH_CACHE_MAX_SIZE: int = config("AUTH_CACHE_MAX_SIZE", default=1000, cast=int)
+    AUTH_CACHE_SHARED: bool = config("AUTH_CACHE_SHARED", default=False, cast=bool)  # share through Redis
     
     @field_validator("BACKEND_CORS_ORIGINS", mode="before")
     @classmethod
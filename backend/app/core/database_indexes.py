@@ -76,6 +76,9 @@ class DatabaseIndexes:
             IndexModel([("created_at", ASCENDING)], name="idx_customer_created_asc"),
             IndexModel([("last_transaction_date", DESCENDING)], sparse=True, name="idx_customer_last_transaction"),
 
+            # Search index catch-up (customers changed since the last sync)
+            IndexModel([("updated_at", DESCENDING)], name="idx_customer_updated_desc"),
+
             # New This Month filter (PERFORMANCE - calendar month queries)
             IndexModel([("created_at", ASCENDING), ("status", ASCENDING)], name="idx_customer_created_status"),
 
@@ -107,7 +110,19 @@ class DatabaseIndexes:
             
             # Date-based queries (critical for business operations)
             IndexModel([("pawn_date", DESCENDING)], name="idx_transaction_pawn_date"),
+
+            # Transaction list keyset pagination (sort key + unique tie-breaker)
+            IndexModel([
+                ("pawn_date", DESCENDING),
+                ("created_at", DESCENDING),
+                ("transaction_id", DESCENDING)
+            ], name="idx_transaction_list_keyset"),
+            IndexModel([("updated_at", DESCENDING), ("transaction_id", DESCENDING)], name="idx_transaction_updated_keyset"),
             IndexModel([("maturity_date", ASCENDING)], name="idx_transaction_maturity"),
+
+            # Denormalised search keys (customer-name and extension-ID search)
+            IndexModel([("customer_name_tokens", ASCENDING)], name="idx_transaction_customer_name_tokens"),
+            IndexModel([("extension_formatted_ids", ASCENDING)], name="idx_transaction_extension_ids"),
             IndexModel([("grace_period_end", ASCENDING)], name="idx_transaction_grace_period"),
             
             # Overdue and forfeiture queries
@@ -3,14 +3,32 @@ Field-Level Encryption Service
 
 Provides encryption and decryption for sensitive customer data fields.
 Uses AES-256 encryption with secure key management for PII protection.
+
+Ciphertext formats:
+    v1  enc:<base64(salt | iv | AES-CBC ciphertext)>
+        The field key is derived with PBKDF2 (100,000 iterations) from a
+        random per-field salt, so every field costs a full key derivation.
+        Still decrypted; no longer written.
+    v2  enc:v2:<key version>:<base64(nonce | AES-GCM ciphertext and tag)>
+        One data key per key version, derived once with HKDF from the master
+        key (or unwrapped from a configured wrapped data key) and cached in
+        memory. Each field only needs a random nonce.
+
+reencrypt_collection moves v1 values (and v2 values of older key versions)
+to the current v2 key; see scripts/migrate_field_encryption.py.
 """
 
+import asyncio
 import base64
 import hashlib
+import re
 import secrets
-from typing import Optional, Dict, Any, Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List, Tuple, Union
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 from cryptography.hazmat.primitives.padding import PKCS7
 import structlog
@@ -26,10 +44,16 @@ class EncryptionConfig:
     KEY_SIZE = 32  # AES-256 key size in bytes
     IV_SIZE = 16   # AES block size for IV
     SALT_SIZE = 16 # Salt size for key derivation
-    ITERATIONS = 100000  # PBKDF2 iterations
+    ITERATIONS = 100000  # PBKDF2 iterations (v1 format)
+    NONCE_SIZE = 12  # AES-GCM nonce size (v2 format)
+    
+    # HKDF context strings for v2 data keys and the key-wrapping key
+    DATA_KEY_INFO = b"field-encryption:v2:data-key:"
+    WRAPPING_KEY_INFO = b"field-encryption:v2:wrapping-key"
     
     # Encrypted field markers
     ENCRYPTED_PREFIX = "enc:"
+    ENCRYPTED_V2_PREFIX = "enc:v2:"
     FIELD_SEPARATOR = "|"
     
     # Sensitive field names that should be encrypted
@@ -55,22 +79,93 @@ class FieldEncryptionError(Exception):
 class FieldEncryptionService:
     """Service for field-level encryption of sensitive data"""
     
-    def __init__(self, master_key: str):
+    def __init__(
+        self,
+        master_key: str,
+        key_version: str = "1",
+        wrapped_data_keys: Optional[Dict[str, str]] = None
+    ):
         """
         Initialize field encryption service.
         
         Args:
             master_key: Master key for encryption (should be 32+ characters)
+            key_version: Key version new values are encrypted with
+            wrapped_data_keys: Key version -> data key wrapped by wrap_data_key;
+                versions not listed derive their data key from the master key
         """
         if not master_key or len(master_key) < 32:
             raise FieldEncryptionError("Master key must be at least 32 characters")
+        if not key_version or ":" in key_version:
+            raise FieldEncryptionError("Key version must be non-empty and must not contain ':'")
         
         self.master_key = master_key.encode('utf-8')
-        encryption_logger.info("Field encryption service initialized")
+        self.key_version = key_version
+        self._wrapped_data_keys = dict(wrapped_data_keys or {})
+        self._data_keys: Dict[str, AESGCM] = {}
+        encryption_logger.info("Field encryption service initialized", key_version=key_version)
+    
+    def _hkdf(self, info: bytes) -> bytes:
+        return HKDF(
+            algorithm=hashes.SHA256(),
+            length=EncryptionConfig.KEY_SIZE,
+            salt=None,
+            info=info,
+        ).derive(self.master_key)
+    
+    def _data_key(self, key_version: str) -> AESGCM:
+        """
+        Get the v2 data key for a key version, deriving it on first use.
+        
+        Args:
+            key_version: Key version from the ciphertext
+            
+        Returns:
+            AES-GCM cipher for the version's data key
+        """
+        aesgcm = self._data_keys.get(key_version)
+        if aesgcm is not None:
+            return aesgcm
+        
+        wrapped = self._wrapped_data_keys.get(key_version)
+        if wrapped:
+            combined = base64.b64decode(wrapped.encode('ascii'))
+            wrapping_key = AESGCM(self._hkdf(EncryptionConfig.WRAPPING_KEY_INFO))
+            key = wrapping_key.decrypt(
+                combined[:EncryptionConfig.NONCE_SIZE],
+                combined[EncryptionConfig.NONCE_SIZE:],
+                key_version.encode('utf-8')
+            )
+        else:
+            key = self._hkdf(EncryptionConfig.DATA_KEY_INFO + key_version.encode('utf-8'))
+        
+        aesgcm = AESGCM(key)
+        self._data_keys[key_version] = aesgcm
+        return aesgcm
+    
+    def wrap_data_key(self, key_version: str) -> str:
+        """
+        Generate a random data key for a key version, wrapped by the master key.
+        
+        The result goes into FIELD_ENCRYPTION_WRAPPED_KEYS as
+        "<key_version>:<wrapped key>".
+        
+        Args:
+            key_version: Key version the data key belongs to
+            
+        Returns:
+            Wrapped data key (base64 encoded)
+        """
+        nonce = secrets.token_bytes(EncryptionConfig.NONCE_SIZE)
+        wrapping_key = AESGCM(self._hkdf(EncryptionConfig.WRAPPING_KEY_INFO))
+        wrapped = wrapping_key.encrypt(
+            nonce, secrets.token_bytes(EncryptionConfig.KEY_SIZE), key_version.encode('utf-8')
+        )
+        return base64.b64encode(nonce + wrapped).decode('ascii')
     
     def _derive_key(self, salt: bytes) -> bytes:
         """
-        Derive encryption key from master key using PBKDF2.
+        Derive a v1 encryption key from master key using PBKDF2.
         
         Args:
             salt: Salt for key derivation
@@ -100,32 +195,17 @@ class FieldEncryptionService:
             return plaintext
         
         try:
-            # Generate random salt and IV
-            salt = secrets.token_bytes(EncryptionConfig.SALT_SIZE)
-            iv = secrets.token_bytes(EncryptionConfig.IV_SIZE)
-            
-            # Derive encryption key
-            key = self._derive_key(salt)
-            
-            # Encrypt the data
-            cipher = Cipher(algorithms.AES(key), modes.CBC(iv))
-            encryptor = cipher.encryptor()
+            key_version = self.key_version
+            nonce = secrets.token_bytes(EncryptionConfig.NONCE_SIZE)
+            header = f"{EncryptionConfig.ENCRYPTED_V2_PREFIX}{key_version}:"
             
-            # Apply PKCS7 padding
-            padder = PKCS7(128).padder()  # AES block size is 128 bits
-            padded_data = padder.update(plaintext.encode('utf-8'))
-            padded_data += padder.finalize()
-            
-            # Perform encryption
-            encrypted_data = encryptor.update(padded_data)
-            encrypted_data += encryptor.finalize()
-            
-            # Combine salt, iv, and encrypted data
-            combined = salt + iv + encrypted_data
+            # The header is authenticated, so the key version cannot be swapped
+            encrypted_data = self._data_key(key_version).encrypt(
+                nonce, plaintext.encode('utf-8'), header.encode('ascii')
+            )
             
-            # Base64 encode and add prefix
-            encoded = base64.b64encode(combined).decode('ascii')
-            result = f"{EncryptionConfig.ENCRYPTED_PREFIX}{encoded}"
+            encoded = base64.b64encode(nonce + encrypted_data).decode('ascii')
+            result = f"{header}{encoded}"
             
             encryption_logger.debug(
                 "Field encrypted",
@@ -157,31 +237,10 @@ class FieldEncryptionService:
             return encrypted_value  # Not encrypted, return as-is
         
         try:
-            # Remove prefix and decode
-            encoded_data = encrypted_value[len(EncryptionConfig.ENCRYPTED_PREFIX):]
-            combined = base64.b64decode(encoded_data.encode('ascii'))
-            
-            # Extract salt, iv, and encrypted data
-            salt = combined[:EncryptionConfig.SALT_SIZE]
-            iv = combined[EncryptionConfig.SALT_SIZE:EncryptionConfig.SALT_SIZE + EncryptionConfig.IV_SIZE]
-            encrypted_data = combined[EncryptionConfig.SALT_SIZE + EncryptionConfig.IV_SIZE:]
-            
-            # Derive encryption key
-            key = self._derive_key(salt)
-            
-            # Decrypt the data
-            cipher = Cipher(algorithms.AES(key), modes.CBC(iv))
-            decryptor = cipher.decryptor()
-            
-            padded_data = decryptor.update(encrypted_data)
-            padded_data += decryptor.finalize()
-            
-            # Remove PKCS7 padding
-            unpadder = PKCS7(128).unpadder()
-            plaintext_bytes = unpadder.update(padded_data)
-            plaintext_bytes += unpadder.finalize()
-            
-            result = plaintext_bytes.decode('utf-8')
+            if encrypted_value.startswith(EncryptionConfig.ENCRYPTED_V2_PREFIX):
+                result = self._decrypt_v2(encrypted_value)
+            else:
+                result = self._decrypt_v1(encrypted_value)
             
             encryption_logger.debug(
                 "Field decrypted",
@@ -195,39 +254,106 @@ class FieldEncryptionService:
             encryption_logger.error("Decryption failed", error=str(e))
             raise FieldEncryptionError(f"Failed to decrypt field: {str(e)}")
     
-    def encrypt_document_fields(self, document: Dict[str, Any]) -> Dict[str, Any]:
+    def _decrypt_v2(self, encrypted_value: str) -> str:
+        """Decrypt an enc:v2:<key version>:<payload> value."""
+        key_version, encoded_data = encrypted_value[len(EncryptionConfig.ENCRYPTED_V2_PREFIX):].split(":", 1)
+        header = encrypted_value[:len(encrypted_value) - len(encoded_data)]
+        combined = base64.b64decode(encoded_data.encode('ascii'))
+        
+        plaintext_bytes = self._data_key(key_version).decrypt(
+            combined[:EncryptionConfig.NONCE_SIZE],
+            combined[EncryptionConfig.NONCE_SIZE:],
+            header.encode('ascii')
+        )
+        return plaintext_bytes.decode('utf-8')
+    
+    def _decrypt_v1(self, encrypted_value: str) -> str:
+        """Decrypt a legacy enc:<payload> (PBKDF2 + AES-CBC) value."""
+        # Remove prefix and decode
+        encoded_data = encrypted_value[len(EncryptionConfig.ENCRYPTED_PREFIX):]
+        combined = base64.b64decode(encoded_data.encode('ascii'))
+        
+        # Extract salt, iv, and encrypted data
+        salt = combined[:EncryptionConfig.SALT_SIZE]
+        iv = combined[EncryptionConfig.SALT_SIZE:EncryptionConfig.SALT_SIZE + EncryptionConfig.IV_SIZE]
+        encrypted_data = combined[EncryptionConfig.SALT_SIZE + EncryptionConfig.IV_SIZE:]
+        
+        # Derive encryption key
+        key = self._derive_key(salt)
+        
+        # Decrypt the data
+        cipher = Cipher(algorithms.AES(key), modes.CBC(iv))
+        decryptor = cipher.decryptor()
+        
+        padded_data = decryptor.update(encrypted_data)
+        padded_data += decryptor.finalize()
+        
+        # Remove PKCS7 padding
+        unpadder = PKCS7(128).unpadder()
+        plaintext_bytes = unpadder.update(padded_data)
+        plaintext_bytes += unpadder.finalize()
+        
+        return plaintext_bytes.decode('utf-8')
+    
+    def _process_documents(self, documents: List[Dict[str, Any]], encrypt: bool) -> Tuple[List[Dict[str, Any]], int]:
         """
-        Encrypt sensitive fields in a document.
+        Encrypt or decrypt the sensitive fields of many documents in one pass.
         
         Args:
-            document: Document dictionary
+            documents: Document dictionaries (not modified)
+            encrypt: True to encrypt plain values, False to decrypt encrypted ones
             
         Returns:
-            Document with sensitive fields encrypted
+            Processed document copies and the number of fields processed
         """
-        if not document:
-            return document
+        results = []
+        processed_count = 0
         
-        encrypted_doc = document.copy()
-        encrypted_count = 0
-        
-        for field_name, field_value in document.items():
-            if (field_name in EncryptionConfig.SENSITIVE_FIELDS and 
-                isinstance(field_value, str) and 
-                field_value and
-                not field_value.startswith(EncryptionConfig.ENCRYPTED_PREFIX)):
+        for document in documents:
+            if not document:
+                results.append(document)
+                continue
+            
+            processed_doc = document.copy()
+            for field_name in EncryptionConfig.SENSITIVE_FIELDS.intersection(document):
+                field_value = document[field_name]
+                if not isinstance(field_value, str) or not field_value:
+                    continue
+                if self.is_field_encrypted(field_value) == encrypt:
+                    continue
                 
                 try:
-                    encrypted_doc[field_name] = self.encrypt_field(field_value)
-                    encrypted_count += 1
+                    if encrypt:
+                        processed_doc[field_name] = self.encrypt_field(field_value)
+                    else:
+                        processed_doc[field_name] = self.decrypt_field(field_value)
+                    processed_count += 1
                 except FieldEncryptionError as e:
                     encryption_logger.warning(
-                        "Failed to encrypt field",
+                        "Failed to encrypt field" if encrypt else "Failed to decrypt field",
                         field=field_name,
                         error=str(e)
                     )
-                    # Keep original value if encryption fails
-                    encrypted_doc[field_name] = field_value
+                    # Keep original value if encryption fails; hide it if decryption fails
+                    processed_doc[field_name] = field_value if encrypt else "[ENCRYPTED]"
+            results.append(processed_doc)
+        
+        return results, processed_count
+    
+    def encrypt_document_fields(self, document: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Encrypt sensitive fields in a document.
+        
+        Args:
+            document: Document dictionary
+            
+        Returns:
+            Document with sensitive fields encrypted
+        """
+        if not document:
+            return document
+        
+        (encrypted_doc,), encrypted_count = self._process_documents([document], encrypt=True)
         
         if encrypted_count > 0:
             encryption_logger.info(
@@ -251,26 +377,7 @@ class FieldEncryptionService:
         if not document:
             return document
         
-        decrypted_doc = document.copy()
-        decrypted_count = 0
-        
-        for field_name, field_value in document.items():
-            if (field_name in EncryptionConfig.SENSITIVE_FIELDS and 
-                isinstance(field_value, str) and 
-                field_value and
-                field_value.startswith(EncryptionConfig.ENCRYPTED_PREFIX)):
-                
-                try:
-                    decrypted_doc[field_name] = self.decrypt_field(field_value)
-                    decrypted_count += 1
-                except FieldEncryptionError as e:
-                    encryption_logger.warning(
-                        "Failed to decrypt field",
-                        field=field_name,
-                        error=str(e)
-                    )
-                    # Keep encrypted value if decryption fails
-                    decrypted_doc[field_name] = "[ENCRYPTED]"
+        (decrypted_doc,), decrypted_count = self._process_documents([document], encrypt=False)
         
         if decrypted_count > 0:
             encryption_logger.debug(
@@ -281,6 +388,44 @@ class FieldEncryptionService:
         
         return decrypted_doc
     
+    def encrypt_documents(self, documents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Encrypt sensitive fields in many documents, logging once per batch.
+        
+        Args:
+            documents: Document dictionaries
+            
+        Returns:
+            Documents with sensitive fields encrypted, in the same order
+        """
+        encrypted_docs, encrypted_count = self._process_documents(documents, encrypt=True)
+        if encrypted_count > 0:
+            encryption_logger.info(
+                "Documents encrypted",
+                documents=len(documents),
+                encrypted_fields=encrypted_count
+            )
+        return encrypted_docs
+    
+    def decrypt_documents(self, documents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Decrypt sensitive fields in many documents, logging once per batch.
+        
+        Args:
+            documents: Document dictionaries with encrypted fields
+            
+        Returns:
+            Documents with sensitive fields decrypted, in the same order
+        """
+        decrypted_docs, decrypted_count = self._process_documents(documents, encrypt=False)
+        if decrypted_count > 0:
+            encryption_logger.debug(
+                "Documents decrypted",
+                documents=len(documents),
+                decrypted_fields=decrypted_count
+            )
+        return decrypted_docs
+    
     def is_field_encrypted(self, field_value: str) -> bool:
         """
         Check if a field value is encrypted.
@@ -294,6 +439,36 @@ class FieldEncryptionService:
         return (isinstance(field_value, str) and 
                 field_value.startswith(EncryptionConfig.ENCRYPTED_PREFIX))
     
+    def needs_reencryption(self, field_value: str) -> bool:
+        """
+        Check if an encrypted value is not under the current v2 key version.
+        
+        Args:
+            field_value: Field value to check
+            
+        Returns:
+            True for v1 values and v2 values of other key versions
+        """
+        current_prefix = f"{EncryptionConfig.ENCRYPTED_V2_PREFIX}{self.key_version}:"
+        return self.is_field_encrypted(field_value) and not field_value.startswith(current_prefix)
+    
+    def reencrypt_document_fields(self, document: Dict[str, Any]) -> Dict[str, str]:
+        """
+        Re-encrypt sensitive fields that are not under the current v2 key.
+        
+        Args:
+            document: Document dictionary with encrypted fields
+            
+        Returns:
+            Field name -> re-encrypted value, for changed fields only
+        """
+        updates = {}
+        for field_name in EncryptionConfig.SENSITIVE_FIELDS:
+            field_value = document.get(field_name)
+            if self.needs_reencryption(field_value):
+                updates[field_name] = self.encrypt_field(self.decrypt_field(field_value))
+        return updates
+    
     def get_encryption_status(self, document: Dict[str, Any]) -> Dict[str, bool]:
         """
         Get encryption status for all sensitive fields in a document.
@@ -319,18 +494,69 @@ class FieldEncryptionService:
 # Global encryption service instance
 encryption_service: Optional[FieldEncryptionService] = None
 
+# Upper bound on concurrent encryption threads per worker process. The
+# cryptography primitives release the GIL, so batches are split across a few
+# threads and the event loop stays free for other requests.
+ENCRYPTION_MAX_WORKERS = 4
+
+_encryption_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_encryption_executor() -> ThreadPoolExecutor:
+    """Create the field encryption thread pool on first use."""
+    global _encryption_executor
+    if _encryption_executor is None:
+        _encryption_executor = ThreadPoolExecutor(
+            max_workers=ENCRYPTION_MAX_WORKERS,
+            thread_name_prefix="field-encryption"
+        )
+    return _encryption_executor
+
 
-def initialize_field_encryption(master_key: str):
+def shutdown_encryption_executor() -> None:
+    """Shut down the field encryption thread pool (application shutdown)."""
+    global _encryption_executor
+    if _encryption_executor is not None:
+        _encryption_executor.shutdown(wait=False, cancel_futures=True)
+        _encryption_executor = None
+
+
+def parse_wrapped_data_keys(value: str) -> Dict[str, str]:
+    """
+    Parse a "<key version>:<wrapped key>,..." setting into a dictionary.
+    
+    Args:
+        value: FIELD_ENCRYPTION_WRAPPED_KEYS setting
+        
+    Returns:
+        Key version -> wrapped data key
+    """
+    wrapped_keys = {}
+    for entry in value.split(","):
+        entry = entry.strip()
+        if entry:
+            key_version, wrapped = entry.split(":", 1)
+            wrapped_keys[key_version.strip()] = wrapped.strip()
+    return wrapped_keys
+
+
+def initialize_field_encryption(
+    master_key: str,
+    key_version: str = "1",
+    wrapped_data_keys: Optional[Dict[str, str]] = None
+):
     """
     Initialize global field encryption service.
     
     Args:
         master_key: Master key for encryption
+        key_version: Key version new values are encrypted with
+        wrapped_data_keys: Key version -> wrapped data key
     """
     global encryption_service
     
     try:
-        encryption_service = FieldEncryptionService(master_key)
+        encryption_service = FieldEncryptionService(master_key, key_version, wrapped_data_keys)
         encryption_logger.info("Field encryption service initialized globally")
         return encryption_service
     except Exception as e:
@@ -343,6 +569,58 @@ def get_encryption_service() -> Optional[FieldEncryptionService]:
     return encryption_service
 
 
+async def _run_batched(batch_function, documents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Split documents into one chunk per encryption thread and process them concurrently."""
+    if not documents:
+        return list(documents)
+    
+    chunk_size = -(-len(documents) // ENCRYPTION_MAX_WORKERS)
+    chunks = [documents[i:i + chunk_size] for i in range(0, len(documents), chunk_size)]
+    
+    loop = asyncio.get_running_loop()
+    executor = _get_encryption_executor()
+    results = await asyncio.gather(*[
+        loop.run_in_executor(executor, batch_function, chunk) for chunk in chunks
+    ])
+    return [document for chunk in results for document in chunk]
+
+
+async def encrypt_documents(documents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Encrypt sensitive fields in many documents on the encryption thread pool.
+    
+    Args:
+        documents: Document dictionaries (for example one page of customers)
+        
+    Returns:
+        Documents with sensitive fields encrypted, in the same order
+    """
+    service = get_encryption_service()
+    if not service:
+        encryption_logger.warning("Encryption service not available, data not encrypted")
+        return documents
+    
+    return await _run_batched(service.encrypt_documents, documents)
+
+
+async def decrypt_documents(documents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Decrypt sensitive fields in many documents on the encryption thread pool.
+    
+    Args:
+        documents: Document dictionaries with encrypted fields
+        
+    Returns:
+        Documents with sensitive fields decrypted, in the same order
+    """
+    service = get_encryption_service()
+    if not service:
+        encryption_logger.warning("Encryption service not available, returning encrypted data")
+        return documents
+    
+    return await _run_batched(service.decrypt_documents, documents)
+
+
 # Utility functions for common operations
 async def encrypt_customer_data(customer_data: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -354,12 +632,9 @@ async def encrypt_customer_data(customer_data: Dict[str, Any]) -> Dict[str, Any]
     Returns:
         Customer data with encrypted sensitive fields
     """
-    service = get_encryption_service()
-    if not service:
-        encryption_logger.warning("Encryption service not available, data not encrypted")
+    if not customer_data:
         return customer_data
-    
-    return service.encrypt_document_fields(customer_data)
+    return (await encrypt_documents([customer_data]))[0]
 
 
 async def decrypt_customer_data(customer_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -372,12 +647,74 @@ async def decrypt_customer_data(customer_data: Dict[str, Any]) -> Dict[str, Any]
     Returns:
         Customer data with decrypted sensitive fields
     """
-    service = get_encryption_service()
-    if not service:
-        encryption_logger.warning("Encryption service not available, returning encrypted data")
+    if not customer_data:
         return customer_data
+    return (await decrypt_documents([customer_data]))[0]
+
+
+async def reencrypt_collection(
+    collection,
+    service: Optional[FieldEncryptionService] = None,
+    batch_size: int = 500
+) -> int:
+    """
+    Move a collection's sensitive fields to the current v2 key, in batches.
+    
+    Each update is conditional on the old ciphertext, so a field changed by
+    the application while the migration runs is left alone (and picked up on
+    the next run if it still needs re-encryption).
+    
+    Args:
+        collection: Motor collection to migrate
+        service: Encryption service (defaults to the global instance)
+        batch_size: Documents per bulk_write
+        
+    Returns:
+        Number of documents updated
+    """
+    from pymongo import UpdateOne
+    
+    service = service or get_encryption_service()
+    if not service:
+        raise FieldEncryptionError("Encryption service not initialized")
+    
+    # Encrypted values outside the current key version: v1, or v2 under another version
+    current_prefix = f"{EncryptionConfig.ENCRYPTED_V2_PREFIX}{service.key_version}:"
+    stale_value = {
+        "$regex": f"^{re.escape(EncryptionConfig.ENCRYPTED_PREFIX)}",
+        "$not": {"$regex": f"^{re.escape(current_prefix)}"}
+    }
+    query = {"$or": [{field: stale_value} for field in sorted(EncryptionConfig.SENSITIVE_FIELDS)]}
+    projection = {field: 1 for field in EncryptionConfig.SENSITIVE_FIELDS}
+    
+    operations = []
+    updated = 0
+    
+    async def flush() -> int:
+        if not operations:
+            return 0
+        result = await collection.bulk_write(operations, ordered=False)
+        operations.clear()
+        return result.modified_count
+    
+    async for document in collection.find(query, projection=projection):
+        try:
+            updates = service.reencrypt_document_fields(document)
+        except FieldEncryptionError as e:
+            encryption_logger.warning("Failed to re-encrypt document", document_id=str(document["_id"]), error=str(e))
+            continue
+        if not updates:
+            continue
+        
+        match = {"_id": document["_id"]}
+        match.update({field: document[field] for field in updates})
+        operations.append(UpdateOne(match, {"$set": updates}))
+        if len(operations) >= batch_size:
+            updated += await flush()
     
-    return service.decrypt_document_fields(customer_data)
+    updated += await flush()
+    encryption_logger.info("Collection re-encrypted", collection=collection.name, updated=updated)
+    return updated
 
 
 def generate_master_key() -> str:
@@ -0,0 +1,172 @@
+"""
+Keyset (cursor) pagination helpers.
+
+Cursors are opaque URL-safe tokens holding the sort-key values of the last
+document on a page. The next page is fetched with a range filter on those
+values instead of skip(), so deep pages cost the same as the first one.
+
+A cursor is only valid for the sort it was issued with; reusing it with a
+different sort field or order raises ValueError.
+
+Null and missing sort values are kept in the cursor as null and ordered as
+MongoDB orders them: before every other value, so first in ascending sorts
+and last in descending ones.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# (field name, direction) pairs as passed to .sort()
+SortKeys = List[Tuple[str, int]]
+
+# Unique tie-breaker appended to every sort so keyset pages never overlap
+TIEBREAKER_FIELD = "transaction_id"
+
+# Default list ordering: newest pawn date, then newest creation time
+DEFAULT_SORT_KEYS: SortKeys = [("pawn_date", -1), ("created_at", -1), (TIEBREAKER_FIELD, -1)]
+
+
+def build_sort_keys(sort_field: Optional[str], direction: int) -> SortKeys:
+    """
+    Build a total ordering for a requested sort field.
+
+    Args:
+        sort_field: Model field to sort by, or None for the default ordering
+        direction: 1 for ascending, -1 for descending
+
+    Returns:
+        Sort keys ending with the unique tie-breaker field
+    """
+    if sort_field is None:
+        return list(DEFAULT_SORT_KEYS)
+
+    if sort_field == "pawn_date":
+        return [(field, direction) for field, _ in DEFAULT_SORT_KEYS]
+
+    if sort_field == TIEBREAKER_FIELD:
+        return [(TIEBREAKER_FIELD, direction)]
+
+    return [(sort_field, direction), (TIEBREAKER_FIELD, direction)]
+
+
+def _sort_signature(sort_keys: SortKeys) -> str:
+    """Compact description of a sort used to reject mismatched cursors"""
+    return ",".join(f"{field}:{direction}" for field, direction in sort_keys)
+
+
+def _encode_value(value: Any) -> Any:
+    """JSON-safe representation of a sort-key value"""
+    if isinstance(value, datetime):
+        return {"$dt": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    """Inverse of _encode_value"""
+    if isinstance(value, dict) and "$dt" in value:
+        return datetime.fromisoformat(value["$dt"])
+    return value
+
+
+def encode_cursor(values: Sequence[Any], sort_keys: SortKeys) -> str:
+    """
+    Encode the sort-key values of the last document on a page.
+
+    Args:
+        values: Values in the same order as sort_keys
+        sort_keys: Sort the cursor belongs to
+
+    Returns:
+        Opaque URL-safe cursor string
+    """
+    payload = {
+        "s": _sort_signature(sort_keys),
+        "v": [_encode_value(value) for value in values]
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_keys: SortKeys) -> List[Any]:
+    """
+    Decode a cursor issued for the given sort.
+
+    Args:
+        cursor: Cursor returned by a previous page
+        sort_keys: Sort of the current request
+
+    Returns:
+        Sort-key values in the same order as sort_keys
+
+    Raises:
+        ValueError: If the cursor is malformed or was issued for another sort
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        signature = payload["s"]
+        values = [_decode_value(value) for value in payload["v"]]
+    except (ValueError, TypeError, KeyError) as e:
+        raise ValueError("Invalid pagination cursor") from e
+
+    if signature != _sort_signature(sort_keys) or len(values) != len(sort_keys):
+        raise ValueError("Pagination cursor does not match the requested sort order")
+
+    return values
+
+
+def _after_condition(field: str, direction: int, value: Any) -> Optional[Dict[str, Any]]:
+    """Condition matching values of a field that sort after value, or None if none can"""
+    if value is None:
+        return {field: {"$ne": None}} if direction == 1 else None
+    if direction == 1:
+        return {field: {"$gt": value}}
+    return {"$or": [{field: {"$lt": value}}, {field: None}]}
+
+
+def build_keyset_filter(sort_keys: SortKeys, values: Sequence[Any]) -> Dict[str, Any]:
+    """
+    Build the MongoDB filter selecting documents strictly after a cursor.
+
+    For keys (a, b, c) this is: a after A, or a == A and b after B, or
+    a == A and b == B and c after C. Equality on a null cursor value also
+    matches missing fields, as both sort the same.
+
+    Args:
+        sort_keys: Sort the cursor belongs to
+        values: Decoded cursor values
+
+    Returns:
+        MongoDB query dictionary
+    """
+    branches = []
+    for index, (field, direction) in enumerate(sort_keys):
+        condition = _after_condition(field, direction, values[index])
+        if condition is None:
+            continue
+        branch = {prior_field: values[position] for position, (prior_field, _) in enumerate(sort_keys[:index])}
+        branch.update(condition)
+        branches.append(branch)
+
+    if not branches:
+        # Nothing sorts after the cursor
+        return {"_id": {"$in": []}}
+    return branches[0] if len(branches) == 1 else {"$or": branches}
+
+
+def cursor_values(document: Any, sort_keys: SortKeys) -> List[Any]:
+    """
+    Read the sort-key values of a document or model instance.
+
+    Args:
+        document: Model instance or raw document
+        sort_keys: Sort to read values for
+
+    Returns:
+        Values in the same order as sort_keys
+    """
+    if isinstance(document, dict):
+        return [document.get(field) for field, _ in sort_keys]
+    return [getattr(document, field, None) for field, _ in sort_keys]
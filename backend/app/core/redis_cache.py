@@ -8,7 +8,7 @@ Based on codebase analysis recommendations for reducing database load.
 import json
 from datetime import datetime, timedelta, UTC
 from typing import Any, Optional, Dict, List, Union
-import redis
+import redis.asyncio as aioredis
 import structlog
 from functools import wraps
 
@@ -38,21 +38,64 @@ class CacheConfig:
     CACHE_ASIDE = "cache_aside"
     WRITE_THROUGH = "write_through"
     WRITE_BEHIND = "write_behind"
+    
+    # Connection pool settings
+    MAX_CONNECTIONS = 50
+    SOCKET_TIMEOUT = 2  # seconds
+    
+    # Keys per SCAN/UNLINK round trip for pattern deletes
+    SCAN_BATCH_SIZE = 500
+    
+    # Tag sets (tag:{name} -> keys stored under that tag). A tag set outlives
+    # every entry added to it, so it never loses track of a live key.
+    TAG_PREFIX = "tag:"
+    TAG_TTL = VERY_LONG_TTL
+
+
+class CacheTags:
+    """
+    Invalidation tags for cached entries.
+    
+    Entries are registered under one or more tags when they are written, and
+    a change invalidates exactly the keys registered under the affected tags
+    instead of walking the keyspace for every key prefix.
+    """
+    
+    TRANSACTION_LISTS = "list:transactions"  # Transaction lists and status counts
+    SEARCH = "list:search"                   # Unified search results
+    CUSTOMER_STATS = "stats:customer"        # Customer statistics
+    
+    @staticmethod
+    def transaction(transaction_id: str) -> str:
+        """Tag for entries derived from a single transaction"""
+        return f"txn:{transaction_id}"
+    
+    @staticmethod
+    def customer(phone_number: str) -> str:
+        """Tag for entries derived from a single customer"""
+        return f"customer:{phone_number}"
 
 
 class RedisCacheService:
     """Redis caching service with intelligent cache management"""
     
-    def __init__(self, redis_client: Optional[redis.Redis] = None, redis_url: str = None):
+    def __init__(self, redis_client: Optional[aioredis.Redis] = None, redis_url: str = None):
         """
         Initialize Redis cache service.
         
+        The service uses the asyncio Redis client so cache round trips never
+        block the event loop. When only a URL is given, a shared connection
+        pool is created for all requests. Call connect() once on startup to
+        verify the connection; until then (or if Redis is down) every
+        operation is a no-op and callers fall back to computing live.
+        
         Args:
-            redis_client: Existing Redis client
+            redis_client: Existing asyncio Redis client
             redis_url: Redis connection URL
         """
         self.redis_client = redis_client
         self.redis_url = redis_url
+        self.connection_pool: Optional[aioredis.ConnectionPool] = None
         self.is_available = False
         self._stats = {
             "hits": 0,
@@ -63,22 +106,50 @@ class RedisCacheService:
         }
         
         if not self.redis_client and redis_url:
-            try:
-                self.redis_client = redis.from_url(redis_url, decode_responses=False)
-                self.redis_client.ping()
-                self.is_available = True
-                cache_logger.info("Redis cache service initialized", redis_url=redis_url)
-            except Exception as e:
-                cache_logger.warning("Redis unavailable, caching disabled", error=str(e))
-                self.is_available = False
-        elif self.redis_client:
-            try:
-                self.redis_client.ping()
-                self.is_available = True
-                cache_logger.info("Redis cache service initialized with existing client")
-            except Exception as e:
-                cache_logger.warning("Redis client not available, caching disabled", error=str(e))
-                self.is_available = False
+            self.connection_pool = aioredis.ConnectionPool.from_url(
+                redis_url,
+                max_connections=CacheConfig.MAX_CONNECTIONS,
+                socket_timeout=CacheConfig.SOCKET_TIMEOUT,
+                socket_connect_timeout=CacheConfig.SOCKET_TIMEOUT,
+                decode_responses=False
+            )
+            self.redis_client = aioredis.Redis(connection_pool=self.connection_pool)
+    
+    async def connect(self) -> bool:
+        """
+        Verify the Redis connection and enable caching.
+        
+        Returns:
+            True if Redis is reachable, False otherwise
+        """
+        if not self.redis_client:
+            self.is_available = False
+            return False
+        
+        try:
+            await self.redis_client.ping()
+            self.is_available = True
+            cache_logger.info("Redis cache service initialized",
+                              redis_url=self.redis_url,
+                              max_connections=CacheConfig.MAX_CONNECTIONS)
+        except Exception as e:
+            cache_logger.warning("Redis unavailable, caching disabled", error=str(e))
+            self.is_available = False
+        
+        return self.is_available
+    
+    async def close(self) -> None:
+        """Close the Redis client and release pooled connections"""
+        self.is_available = False
+        if not self.redis_client:
+            return
+        
+        try:
+            await self.redis_client.aclose()
+            if self.connection_pool:
+                await self.connection_pool.aclose()
+        except Exception as e:
+            cache_logger.warning("Error closing Redis cache connections", error=str(e))
     
     def _serialize(self, data: Any) -> bytes:
         """Serialize data for Redis storage using secure JSON-only approach"""
@@ -133,7 +204,7 @@ class RedisCacheService:
             return None
         
         try:
-            data = self.redis_client.get(key)
+            data = await self.redis_client.get(key)
             if data is None:
                 self._stats["misses"] += 1
                 cache_logger.debug("Cache miss", key=key)
@@ -149,7 +220,7 @@ class RedisCacheService:
             cache_logger.error("Cache get error", key=key, error=str(e))
             return None
     
-    async def set(self, key: str, value: Any, ttl: int = None) -> bool:
+    async def set(self, key: str, value: Any, ttl: int = None, tags: Optional[List[str]] = None) -> bool:
         """
         Set value in cache.
         
@@ -157,6 +228,7 @@ class RedisCacheService:
             key: Cache key
             value: Value to cache
             ttl: Time to live in seconds
+            tags: Invalidation tags to register the key under (see CacheTags)
             
         Returns:
             True if successful, False otherwise
@@ -168,7 +240,18 @@ class RedisCacheService:
             ttl = ttl or CacheConfig.DEFAULT_TTL
             serialized_data = self._serialize(value)
             
-            result = self.redis_client.setex(key, ttl, serialized_data)
+            if tags:
+                # Value and tag membership are written in one round trip
+                pipe = self.redis_client.pipeline(transaction=False)
+                pipe.setex(key, ttl, serialized_data)
+                tag_ttl = max(ttl, CacheConfig.TAG_TTL)
+                for tag in tags:
+                    tag_key = f"{CacheConfig.TAG_PREFIX}{tag}"
+                    pipe.sadd(tag_key, key)
+                    pipe.expire(tag_key, tag_ttl)
+                result = (await pipe.execute())[0]
+            else:
+                result = await self.redis_client.setex(key, ttl, serialized_data)
             
             if result:
                 self._stats["sets"] += 1
@@ -186,6 +269,53 @@ class RedisCacheService:
             cache_logger.error("Cache set error", key=key, error=str(e))
             return False
     
+    async def set_many(
+        self,
+        entries: Dict[str, Any],
+        ttl: int = None,
+        tags: Optional[Dict[str, List[str]]] = None
+    ) -> int:
+        """
+        Set several values in one pipelined round trip.
+        
+        Args:
+            entries: Cache key -> value to cache
+            ttl: Time to live in seconds (shared by every entry)
+            tags: Cache key -> invalidation tags to register the key under
+            
+        Returns:
+            Number of entries written
+        """
+        if not self.is_available or not entries:
+            return 0
+        
+        try:
+            ttl = ttl or CacheConfig.DEFAULT_TTL
+            tag_ttl = max(ttl, CacheConfig.TAG_TTL)
+            pipe = self.redis_client.pipeline(transaction=False)
+            set_positions = []
+            position = 0
+            for key, value in entries.items():
+                pipe.setex(key, ttl, self._serialize(value))
+                set_positions.append(position)
+                position += 1
+                for tag in (tags or {}).get(key, []):
+                    tag_key = f"{CacheConfig.TAG_PREFIX}{tag}"
+                    pipe.sadd(tag_key, key)
+                    pipe.expire(tag_key, tag_ttl)
+                    position += 2
+            results = await pipe.execute()
+            
+            written = sum(1 for index in set_positions if results[index])
+            self._stats["sets"] += written
+            cache_logger.debug("Cache set many", count=written, ttl=ttl)
+            return written
+            
+        except Exception as e:
+            self._stats["errors"] += 1
+            cache_logger.error("Cache set many error", count=len(entries), error=str(e))
+            return 0
+    
     async def delete(self, key: str) -> bool:
         """
         Delete value from cache.
@@ -200,7 +330,7 @@ class RedisCacheService:
             return False
         
         try:
-            result = self.redis_client.delete(key)
+            result = await self.redis_client.delete(key)
             
             if result:
                 self._stats["deletes"] += 1
@@ -217,6 +347,9 @@ class RedisCacheService:
         """
         Delete all keys matching pattern.
         
+        Uses incremental SCAN with UNLINK so neither the Redis server (no
+        KEYS) nor the event loop is blocked while large keyspaces are walked.
+        
         Args:
             pattern: Key pattern (supports wildcards)
             
@@ -227,18 +360,25 @@ class RedisCacheService:
             return 0
         
         try:
-            keys = self.redis_client.keys(pattern)
-            if not keys:
-                return 0
+            deleted_count = 0
+            batch: List[bytes] = []
             
-            deleted_count = self.redis_client.delete(*keys)
-            self._stats["deletes"] += deleted_count
+            async for key in self.redis_client.scan_iter(match=pattern, count=CacheConfig.SCAN_BATCH_SIZE):
+                batch.append(key)
+                if len(batch) >= CacheConfig.SCAN_BATCH_SIZE:
+                    deleted_count += await self.redis_client.unlink(*batch)
+                    batch = []
             
-            cache_logger.info(
-                "Cache pattern delete", 
-                pattern=pattern, 
-                deleted_count=deleted_count
-            )
+            if batch:
+                deleted_count += await self.redis_client.unlink(*batch)
+            
+            if deleted_count:
+                self._stats["deletes"] += deleted_count
+                cache_logger.info(
+                    "Cache pattern delete", 
+                    pattern=pattern, 
+                    deleted_count=deleted_count
+                )
             
             return deleted_count
             
@@ -247,13 +387,55 @@ class RedisCacheService:
             cache_logger.error("Cache pattern delete error", pattern=pattern, error=str(e))
             return 0
     
+    async def invalidate_tags(self, *tags: str) -> int:
+        """
+        Delete every key registered under any of the given tags.
+        
+        The tag sets are read and dropped in one MULTI block, so a key tagged
+        concurrently lands in a fresh set instead of being lost. Cost is
+        proportional to the number of tagged keys, not the keyspace size.
+        
+        Args:
+            tags: Tag names (see CacheTags)
+            
+        Returns:
+            Number of cached entries deleted
+        """
+        if not self.is_available or not tags:
+            return 0
+        
+        try:
+            tag_keys = [f"{CacheConfig.TAG_PREFIX}{tag}" for tag in tags]
+            
+            pipe = self.redis_client.pipeline(transaction=True)
+            for tag_key in tag_keys:
+                pipe.smembers(tag_key)
+            pipe.unlink(*tag_keys)
+            results = await pipe.execute()
+            
+            keys = list(set().union(*results[:-1]))
+            deleted_count = 0
+            for start in range(0, len(keys), CacheConfig.SCAN_BATCH_SIZE):
+                deleted_count += await self.redis_client.unlink(*keys[start:start + CacheConfig.SCAN_BATCH_SIZE])
+            
+            if deleted_count:
+                self._stats["deletes"] += deleted_count
+                cache_logger.debug("Cache tag invalidation", tags=list(tags), deleted_count=deleted_count)
+            
+            return deleted_count
+            
+        except Exception as e:
+            self._stats["errors"] += 1
+            cache_logger.error("Cache tag invalidation error", tags=list(tags), error=str(e))
+            return 0
+    
     async def exists(self, key: str) -> bool:
         """Check if key exists in cache"""
         if not self.is_available:
             return False
         
         try:
-            return bool(self.redis_client.exists(key))
+            return bool(await self.redis_client.exists(key))
         except Exception as e:
             cache_logger.error("Cache exists error", key=key, error=str(e))
             return False
@@ -264,34 +446,14 @@ class RedisCacheService:
             return False
         
         try:
-            return bool(self.redis_client.expire(key, ttl))
+            return bool(await self.redis_client.expire(key, ttl))
         except Exception as e:
             cache_logger.error("Cache expire error", key=key, ttl=ttl, error=str(e))
             return False
     
     async def delete_by_pattern(self, pattern: str) -> int:
-        """Delete all keys matching pattern"""
-        if not self.is_available:
-            return 0
-        
-        deleted_count = 0
-        try:
-            # Use SCAN to find all matching keys (safer than KEYS for production)
-            cursor = 0
-            while True:
-                cursor, keys = self.redis_client.scan(cursor, match=pattern, count=100)
-                if keys:
-                    deleted_count += self.redis_client.delete(*keys)
-                if cursor == 0:
-                    break
-            
-            self._stats["deletes"] += deleted_count
-            cache_logger.info("Deleted keys by pattern", pattern=pattern, count=deleted_count)
-            return deleted_count
-        except Exception as e:
-            cache_logger.error("Cache delete by pattern error", pattern=pattern, error=str(e))
-            self._stats["errors"] += 1
-            return 0
+        """Delete all keys matching pattern (alias of delete_pattern)"""
+        return await self.delete_pattern(pattern)
     
     def get_stats(self) -> Dict[str, Any]:
         """Get cache statistics"""
@@ -320,20 +482,27 @@ class RedisCacheService:
 cache_service: Optional[RedisCacheService] = None
 
 
-def initialize_cache_service(redis_client: Optional[redis.Redis] = None, redis_url: str = None):
-    """Initialize global cache service"""
+async def initialize_cache_service(redis_client: Optional[aioredis.Redis] = None, redis_url: str = None):
+    """Initialize global cache service and verify the Redis connection"""
     global cache_service
     cache_service = RedisCacheService(redis_client, redis_url)
+    await cache_service.connect()
     return cache_service
 
 
+async def close_cache_service():
+    """Close the global cache service connections"""
+    if cache_service:
+        await cache_service.close()
+
+
 def get_cache_service() -> Optional[RedisCacheService]:
     """Get global cache service instance"""
     return cache_service
 
 
 # Cache decorators for common patterns
-def cached_result(prefix: str, ttl: int = CacheConfig.DEFAULT_TTL, key_generator=None):
+def cached_result(prefix: str, ttl: int = CacheConfig.DEFAULT_TTL, key_generator=None, tags=None):
     """
     Decorator to cache function results.
     
@@ -341,6 +510,8 @@ def cached_result(prefix: str, ttl: int = CacheConfig.DEFAULT_TTL, key_generator
         prefix: Cache key prefix
         ttl: Time to live in seconds
         key_generator: Function to generate cache key from args
+        tags: Invalidation tags for the cached entry (see CacheTags), either a
+            list or a function returning the list from the call's args
     """
     def decorator(func):
         @wraps(func)
@@ -366,7 +537,8 @@ def cached_result(prefix: str, ttl: int = CacheConfig.DEFAULT_TTL, key_generator
             # Execute function and cache result
             result = await func(*args, **kwargs)
             if result is not None:
-                await cache.set(cache_key, result, ttl)
+                entry_tags = tags(*args, **kwargs) if callable(tags) else tags
+                await cache.set(cache_key, result, ttl, tags=entry_tags)
             
             return result
         
@@ -392,15 +564,20 @@ class BusinessCache:
         cache = get_cache_service()
         if not cache:
             return False
-        return await cache.set(f"{CacheConfig.CUSTOMER_PREFIX}{phone_number}", customer_data, ttl)
+        return await cache.set(
+            f"{CacheConfig.CUSTOMER_PREFIX}{phone_number}", customer_data, ttl,
+            tags=[CacheTags.customer(phone_number)]
+        )
     
     @staticmethod
     async def invalidate_customer(phone_number: str):
-        """Invalidate customer cache"""
+        """Invalidate customer cache, including entries cached under the customer tag"""
         cache = get_cache_service()
         if not cache:
             return False
-        return await cache.delete(f"{CacheConfig.CUSTOMER_PREFIX}{phone_number}")
+        deleted = await cache.invalidate_tags(CacheTags.customer(phone_number))
+        await cache.delete(f"{CacheConfig.CUSTOMER_PREFIX}{phone_number}")
+        return deleted
     
     @staticmethod
     async def get_user(user_id: str):
@@ -418,6 +595,14 @@ class BusinessCache:
             return False
         return await cache.set(f"{CacheConfig.USER_PREFIX}{user_id}", user_data, ttl)
     
+    @staticmethod
+    async def invalidate_user(user_id: str):
+        """Invalidate user cache"""
+        cache = get_cache_service()
+        if not cache:
+            return False
+        return await cache.delete(f"{CacheConfig.USER_PREFIX}{user_id}")
+    
     @staticmethod
     async def get_transaction_balance(transaction_id: str):
         """Get cached transaction balance"""
@@ -432,28 +617,73 @@ class BusinessCache:
         cache = get_cache_service()
         if not cache:
             return False
-        return await cache.set(f"{CacheConfig.BALANCE_PREFIX}{transaction_id}", balance_data, ttl)
+        return await cache.set(
+            f"{CacheConfig.BALANCE_PREFIX}{transaction_id}", balance_data, ttl,
+            tags=[CacheTags.transaction(transaction_id)]
+        )
+    
+    @staticmethod
+    async def set_transaction_balances(balances: Dict[str, dict], ttl: int = CacheConfig.SHORT_TTL):
+        """Cache many transaction balances in one pipelined round trip"""
+        cache = get_cache_service()
+        if not cache:
+            return 0
+        return await cache.set_many(
+            {f"{CacheConfig.BALANCE_PREFIX}{transaction_id}": balance for transaction_id, balance in balances.items()},
+            ttl,
+            tags={
+                f"{CacheConfig.BALANCE_PREFIX}{transaction_id}": [CacheTags.transaction(transaction_id)]
+                for transaction_id in balances
+            }
+        )
     
     @staticmethod
     async def invalidate_transaction_data(transaction_id: str):
-        """Invalidate all transaction-related cache entries"""
+        """Invalidate the cached entries of a single transaction (record, balance)"""
         cache = get_cache_service()
         if not cache:
             return 0
+        return await cache.invalidate_tags(CacheTags.transaction(transaction_id))
+    
+    @staticmethod
+    async def invalidate_transaction_caches(
+        transaction_ids: Optional[List[str]] = None,
+        customer_phones: Optional[List[str]] = None
+    ) -> int:
+        """
+        Shared invalidation entry point for transaction, payment and extension writes.
         
-        # Invalidate transaction balance and related data
-        patterns = [
-            f"{CacheConfig.BALANCE_PREFIX}{transaction_id}",
-            f"{CacheConfig.TRANSACTION_PREFIX}{transaction_id}*",
-            f"{CacheConfig.PAYMENT_PREFIX}{transaction_id}*"
-        ]
+        Always drops the cross-transaction views (transaction lists, status
+        counts, search results, customer statistics); per-transaction and
+        per-customer entries are dropped only for the ids given.
         
-        total_deleted = 0
-        for pattern in patterns:
-            deleted = await cache.delete_pattern(pattern)
-            total_deleted += deleted
+        Args:
+            transaction_ids: Transactions whose cached record/balance changed
+            customer_phones: Customers whose cached record changed
+            
+        Returns:
+            Number of cached entries deleted
+        """
+        # The in-process search index catches up before its next search
+        from app.services.search_index_service import SearchIndexService
+        SearchIndexService.mark_dirty()
+        
+        cache = get_cache_service()
+        if not cache or not cache.is_available:
+            return 0
         
-        return total_deleted
+        tags = [CacheTags.TRANSACTION_LISTS, CacheTags.SEARCH, CacheTags.CUSTOMER_STATS]
+        tags.extend(CacheTags.transaction(transaction_id) for transaction_id in transaction_ids or [])
+        tags.extend(CacheTags.customer(phone_number) for phone_number in customer_phones or [] if phone_number)
+        
+        deleted = await cache.invalidate_tags(*tags)
+        cache_logger.info(
+            "Transaction caches invalidated",
+            transactions=len(transaction_ids or []),
+            customers=len(customer_phones or []),
+            deleted_count=deleted
+        )
+        return deleted
     
     @staticmethod
     async def get_user_stats():
@@ -471,6 +701,14 @@ class BusinessCache:
             return False
         return await cache.set(f"{CacheConfig.STATS_PREFIX}users", stats_data, ttl)
     
+    @staticmethod
+    async def invalidate_tags(*tags: str):
+        """Invalidate all cache entries registered under the given tags"""
+        cache = get_cache_service()
+        if not cache:
+            return 0
+        return await cache.invalidate_tags(*tags)
+    
     @staticmethod
     async def invalidate_by_pattern(pattern: str):
         """Invalidate all cache entries matching pattern"""
@@ -488,9 +726,9 @@ class BusinessCache:
         return await cache.get(key)
     
     @staticmethod
-    async def set(key: str, value: Any, ttl_seconds: int = CacheConfig.MEDIUM_TTL):
-        """Generic set method for any cache key"""
+    async def set(key: str, value: Any, ttl_seconds: int = CacheConfig.MEDIUM_TTL, tags: Optional[List[str]] = None):
+        """Generic set method for any cache key, optionally registered under invalidation tags"""
         cache = get_cache_service()
         if not cache:
             return False
-        return await cache.set(key, value, ttl_seconds)
\ No newline at end of file
+        return await cache.set(key, value, ttl_seconds, tags=tags)
\ No newline at end of file
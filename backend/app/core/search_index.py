@@ -0,0 +1,221 @@
+"""
+In-process prefix index for the transaction search bar.
+
+Every indexed value is split into terms and every prefix of a term is stored
+as a key ("field:prefix") of an inverted index. Each key maps to a compact,
+sorted array of integer document numbers, so a search is a handful of dict
+lookups and posting-list intersections instead of a MongoDB regex scan.
+
+Indexed fields:
+    f  formatted transaction ID (whole value)
+    b  reference barcode (whole value)
+    p  customer phone number (whole value)
+    n  customer name (one term per word)
+    d  item descriptions (one term per word)
+
+Each search word must be a prefix of a term in at least one of the searched
+fields, and every search word must match. Results are ordered like the
+unified search pipeline: updated_at, then pawn_date, then transaction_id,
+newest first.
+"""
+
+import heapq
+from array import array
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app.core.search_keys import normalize_name_words
+
+# Longer terms are indexed (and searched) by their first MAX_PREFIX_LENGTH characters
+MAX_PREFIX_LENGTH = 40
+
+WHOLE_VALUE_FIELDS = ("f", "b", "p")
+WORD_FIELDS = ("n", "d")
+ALL_FIELDS = WHOLE_VALUE_FIELDS + WORD_FIELDS
+
+# (updated_at timestamp, pawn_date timestamp, transaction_id)
+SortKey = Tuple[float, float, str]
+
+
+def field_terms(field: str, value: Optional[str]) -> List[str]:
+    """
+    Split a field value (or a search word for that field) into terms.
+
+    Args:
+        field: Field code (see module docstring)
+        value: Raw value
+
+    Returns:
+        Normalised terms, each truncated to MAX_PREFIX_LENGTH
+    """
+    if not value:
+        return []
+    if field in WORD_FIELDS:
+        terms = normalize_name_words(value)
+    else:
+        stripped = value.strip().lstrip("#").lower()
+        terms = [stripped] if stripped else []
+    return [term[:MAX_PREFIX_LENGTH] for term in terms]
+
+
+def document_keys(fields: Dict[str, Any]) -> List[str]:
+    """
+    Build the index keys of one transaction.
+
+    Args:
+        fields: Field code -> value, or list of values (item descriptions)
+
+    Returns:
+        Sorted, de-duplicated "field:prefix" keys
+    """
+    keys = set()
+    for field, values in fields.items():
+        if not isinstance(values, (list, tuple)):
+            values = [values]
+        for value in values:
+            for term in field_terms(field, value):
+                keys.update(f"{field}:{term[:length]}" for length in range(1, len(term) + 1))
+    return sorted(keys)
+
+
+class TransactionSearchIndex:
+    """Inverted prefix index over transaction search fields."""
+
+    def __init__(self):
+        self._transaction_ids: List[Optional[str]] = []   # document number -> transaction_id
+        self._doc_numbers: Dict[str, int] = {}             # transaction_id -> document number
+        self._doc_keys: Dict[int, List[str]] = {}
+        self._sort_keys: Dict[int, SortKey] = {}
+        self._fields: Dict[int, Dict[str, Any]] = {}
+        self._postings: Dict[str, array] = {}
+
+    def __len__(self) -> int:
+        return len(self._doc_numbers)
+
+    def __contains__(self, transaction_id: str) -> bool:
+        return transaction_id in self._doc_numbers
+
+    def upsert(self, transaction_id: str, fields: Dict[str, Any], sort_key: SortKey) -> None:
+        """
+        Add or re-index a transaction.
+
+        Args:
+            transaction_id: Transaction identifier
+            fields: Field code -> value(s)
+            sort_key: (updated_at, pawn_date, transaction_id) ordering key
+        """
+        new_keys = document_keys(fields)
+        doc = self._doc_numbers.get(transaction_id)
+
+        if doc is None:
+            doc = len(self._transaction_ids)
+            self._transaction_ids.append(transaction_id)
+            self._doc_numbers[transaction_id] = doc
+            old_keys: List[str] = []
+        else:
+            old_keys = self._doc_keys[doc]
+
+        old_set, new_set = set(old_keys), set(new_keys)
+        for key in old_set - new_set:
+            self._remove_posting(key, doc)
+        for key in new_set - old_set:
+            self._add_posting(key, doc)
+
+        self._doc_keys[doc] = new_keys
+        self._sort_keys[doc] = sort_key
+        self._fields[doc] = fields
+
+    def remove(self, transaction_id: str) -> None:
+        """Drop a transaction from the index (no-op when absent)."""
+        doc = self._doc_numbers.pop(transaction_id, None)
+        if doc is None:
+            return
+        for key in self._doc_keys.pop(doc):
+            self._remove_posting(key, doc)
+        self._transaction_ids[doc] = None
+        del self._sort_keys[doc]
+        del self._fields[doc]
+
+    def _add_posting(self, key: str, doc: int) -> None:
+        postings = self._postings.get(key)
+        if postings is None:
+            self._postings[key] = array("I", [doc])
+        elif not postings or postings[-1] < doc:
+            postings.append(doc)
+        else:
+            postings.insert(bisect_left(postings, doc), doc)
+
+    def _remove_posting(self, key: str, doc: int) -> None:
+        postings = self._postings.get(key)
+        if postings is None:
+            return
+        position = bisect_left(postings, doc)
+        if position < len(postings) and postings[position] == doc:
+            del postings[position]
+        if not postings:
+            del self._postings[key]
+
+    def _match_word(self, word: str, fields: Sequence[str]) -> set:
+        """Documents where one of the fields has terms prefixed by every part of the word."""
+        matches = set()
+        for field in fields:
+            terms = field_terms(field, word)
+            if not terms:
+                continue
+            postings = [self._postings.get(f"{field}:{term}") for term in terms]
+            if not all(postings):
+                continue
+            postings.sort(key=len)
+            field_matches = set(postings[0])
+            for other in postings[1:]:
+                field_matches.intersection_update(other)
+            matches |= field_matches
+        return matches
+
+    def search(
+        self,
+        text: str,
+        fields: Sequence[str] = ALL_FIELDS,
+        offset: int = 0,
+        limit: int = 20
+    ) -> Tuple[int, List[str]]:
+        """
+        Find transactions matching every word of the search text.
+
+        Args:
+            text: Search text
+            fields: Field codes to search
+            offset: Number of results to skip
+            limit: Maximum number of results to return
+
+        Returns:
+            Tuple of (total matches, transaction IDs of the requested page)
+        """
+        words = text.split()
+        if not words:
+            return 0, []
+
+        candidates: Optional[set] = None
+        for word in words:
+            matches = self._match_word(word, fields)
+            candidates = matches if candidates is None else candidates & matches
+            if not candidates:
+                return 0, []
+
+        top = heapq.nlargest(offset + limit, candidates, key=self._sort_keys.__getitem__)
+        return len(candidates), [self._transaction_ids[doc] for doc in top[offset:]]
+
+    def to_snapshot(self) -> List[List[Any]]:
+        """Serialise the indexed documents as JSON-safe rows."""
+        return [
+            [self._transaction_ids[doc], list(self._sort_keys[doc]), self._fields[doc]]
+            for doc in self._doc_keys
+        ]
+
+    @classmethod
+    def from_snapshot(cls, rows: Iterable[Sequence[Any]]) -> "TransactionSearchIndex":
+        """Rebuild an index from rows produced by to_snapshot()."""
+        index = cls()
+        for transaction_id, sort_key, fields in rows:
+            index.upsert(transaction_id, fields, tuple(sort_key))
+        return index
@@ -0,0 +1,95 @@
+"""
+Denormalised search keys for pawn transactions.
+
+Transactions carry the customer's normalised name, the prefixes of each name
+word and the formatted IDs of their extensions, so customer-name and
+extension-ID searches resolve with index lookups on pawn_transactions
+instead of joining customers or extensions for every row.
+
+Name search matches word prefixes: "jo sm" finds "John Smith", while a
+fragment from the middle of a word ("ohn") does not match.
+"""
+
+import re
+import unicodedata
+from typing import Any, Dict, List, Optional
+
+# Anything that is not a letter or digit separates name words
+_WORD_SPLIT = re.compile(r"[^a-z0-9]+")
+
+# Punctuation removed inside words so "O'Brien" indexes as "obrien"
+_JOINING_PUNCTUATION = re.compile(r"['’`.]")
+
+
+def normalize_name_words(text: Optional[str]) -> List[str]:
+    """
+    Split text into lowercase, accent-free name words.
+
+    Args:
+        text: Name or search text
+
+    Returns:
+        Name words in their original order
+    """
+    if not text:
+        return []
+
+    decomposed = unicodedata.normalize("NFKD", text)
+    ascii_text = "".join(char for char in decomposed if not unicodedata.combining(char)).lower()
+    ascii_text = _JOINING_PUNCTUATION.sub("", ascii_text)
+    return [word for word in _WORD_SPLIT.split(ascii_text) if word]
+
+
+def build_name_tokens(first_name: Optional[str], last_name: Optional[str]) -> List[str]:
+    """
+    Build the prefix tokens of every word of a customer's name.
+
+    Args:
+        first_name: Customer first name
+        last_name: Customer last name
+
+    Returns:
+        Sorted, de-duplicated prefix tokens
+    """
+    tokens = set()
+    for word in normalize_name_words(first_name) + normalize_name_words(last_name):
+        tokens.update(word[:length] for length in range(1, len(word) + 1))
+    return sorted(tokens)
+
+
+def customer_search_keys(first_name: Optional[str], last_name: Optional[str]) -> Dict[str, Any]:
+    """
+    Build the customer-name search fields stored on each transaction.
+
+    Args:
+        first_name: Customer first name
+        last_name: Customer last name
+
+    Returns:
+        Dictionary suitable for a $set update or model constructor
+    """
+    words = normalize_name_words(first_name) + normalize_name_words(last_name)
+    return {
+        "customer_name_search": " ".join(words) or None,
+        "customer_name_tokens": build_name_tokens(first_name, last_name)
+    }
+
+
+def customer_name_filter(search_text: str) -> Dict[str, Any]:
+    """
+    Build the transaction filter for a customer-name search.
+
+    Every word of the search text must be a prefix of some word of the name.
+
+    Args:
+        search_text: Name search text
+
+    Returns:
+        MongoDB query dictionary (matches nothing for text without name words)
+    """
+    words = normalize_name_words(search_text)
+    if not words:
+        return {"customer_name_tokens": {"$in": []}}
+    if len(words) == 1:
+        return {"customer_name_tokens": words[0]}
+    return {"customer_name_tokens": {"$all": words}}
@@ -3,9 +3,17 @@ Security Module
 
 Centralized security functions for PIN hashing and verification using bcrypt.
 Provides a secure, salted hashing mechanism for user PINs.
+
+bcrypt is deliberately slow (~100-300 ms per check), so request handlers must
+use the async variants, which run the hash on a small bounded thread pool
+instead of blocking the event loop.
 """
 
+import asyncio
 import warnings
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
 from passlib.context import CryptContext
 
 # Suppress the bcrypt version warning
@@ -14,6 +22,32 @@ warnings.filterwarnings("ignore", message=".*error reading bcrypt version.*")
 # Bcrypt context for PIN hashing
 pin_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Upper bound on concurrent bcrypt operations per worker process. bcrypt
+# releases the GIL, so a few threads keep the CPU busy without letting a burst
+# of logins starve everything else.
+PIN_HASH_MAX_WORKERS = 4
+
+_pin_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_pin_executor() -> ThreadPoolExecutor:
+    """Create the PIN hashing thread pool on first use."""
+    global _pin_executor
+    if _pin_executor is None:
+        _pin_executor = ThreadPoolExecutor(
+            max_workers=PIN_HASH_MAX_WORKERS,
+            thread_name_prefix="pin-hash"
+        )
+    return _pin_executor
+
+
+def shutdown_pin_executor() -> None:
+    """Shut down the PIN hashing thread pool (application shutdown)."""
+    global _pin_executor
+    if _pin_executor is not None:
+        _pin_executor.shutdown(wait=False, cancel_futures=True)
+        _pin_executor = None
+
 
 def get_pin(pin: str) -> str:
     """
@@ -51,4 +85,33 @@ def verify_pin(pin: str, hashed_pin: str) -> bool:
         >>> verify_pin("5678", hashed)
         False
     """
-    return pin_context.verify(pin, hashed_pin)
\ No newline at end of file
+    return pin_context.verify(pin, hashed_pin)
+
+
+async def get_pin_async(pin: str) -> str:
+    """
+    Hash a PIN on the PIN hashing thread pool.
+    
+    Args:
+        pin: The plain text PIN to hash
+        
+    Returns:
+        The bcrypt hashed PIN string
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_pin_executor(), get_pin, pin)
+
+
+async def verify_pin_async(pin: str, hashed_pin: str) -> bool:
+    """
+    Verify a plain text PIN against its bcrypt hash on the PIN hashing thread pool.
+    
+    Args:
+        pin: The plain text PIN to verify
+        hashed_pin: The bcrypt hashed PIN to verify against
+        
+    Returns:
+        True if the PIN matches the hash, False otherwise
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_pin_executor(), verify_pin, pin, hashed_pin)
@@ -10,11 +10,13 @@ from .user_model import User
 from .customer_model import Customer
 
 # Pawn system models
-from .pawn_transaction_model import PawnTransaction
-from .pawn_item_model import PawnItem
+from .pawn_transaction_model import PawnTransaction, PawnTransactionBalanceView, PawnTransactionListView
+from .pawn_item_model import PawnItem, PawnItemSummary
 from .payment_model import Payment
 from .extension_model import Extension
 from .service_alert_model import ServiceAlert
+from .daily_rollup_model import DailyRollup
+from .counter_model import Counter
 
 # Audit and notes models
 from .audit_entry_model import AuditEntry, AuditActionType
@@ -23,10 +25,15 @@ __all__ = [
     "User",
     "Customer",
     "PawnTransaction",
+    "PawnTransactionListView",
+    "PawnTransactionBalanceView",
     "PawnItem",
+    "PawnItemSummary",
     "Payment",
     "Extension",
     "ServiceAlert",
+    "DailyRollup",
+    "Counter",
     "AuditEntry",
     "AuditActionType"
 ]
\ No newline at end of file
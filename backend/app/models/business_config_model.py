@@ -61,6 +61,9 @@ class CompanyConfig(Document):
         self.updated_at = datetime.utcnow()
         await self.save()
 
+        from app.services.config_snapshot_service import ConfigSnapshotService
+        await ConfigSnapshotService.publish_change()
+
 
 class FinancialPolicyConfig(Document):
     """
@@ -164,6 +167,9 @@ class FinancialPolicyConfig(Document):
         self.updated_at = datetime.utcnow()
         await self.save()
 
+        from app.services.config_snapshot_service import ConfigSnapshotService
+        await ConfigSnapshotService.publish_change()
+
 
 class ForfeitureConfig(Document):
     """
@@ -218,8 +224,9 @@ class ForfeitureConfig(Document):
 
     @classmethod
     async def get_forfeiture_days(cls) -> int:
-        """Get the current forfeiture threshold in days"""
-        config = await cls.get_current_config()
+        """Get the current forfeiture threshold in days (from the configuration snapshot)"""
+        from app.services.config_snapshot_service import ConfigSnapshotService
+        config = await ConfigSnapshotService.get(cls)
         return config.forfeiture_days if config else 97  # Default fallback
 
     async def set_as_active(self):
@@ -231,6 +238,9 @@ class ForfeitureConfig(Document):
         self.updated_at = datetime.utcnow()
         await self.save()
 
+        from app.services.config_snapshot_service import ConfigSnapshotService
+        await ConfigSnapshotService.publish_change()
+
 
 class PrinterConfig(Document):
     """
@@ -277,6 +287,9 @@ class PrinterConfig(Document):
         self.updated_at = datetime.utcnow()
         await self.save()
 
+        from app.services.config_snapshot_service import ConfigSnapshotService
+        await ConfigSnapshotService.publish_change()
+
 
 class LocationConfig(Document):
     """
@@ -323,3 +336,6 @@ class LocationConfig(Document):
         self.is_active = True
         self.updated_at = datetime.utcnow()
         await self.save()
+
+        from app.services.config_snapshot_service import ConfigSnapshotService
+        await ConfigSnapshotService.publish_change()
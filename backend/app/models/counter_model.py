@@ -0,0 +1,41 @@
+"""
+Counter Model
+
+Named monotonic sequences used to issue display-friendly IDs such as
+PW000105 and EX000001. Numbers are handed out with an atomic $inc on a single
+document per sequence, so concurrent creations never receive the same ID and
+issuing an ID costs the same regardless of collection size.
+"""
+
+from beanie import Document
+from pydantic import Field, ConfigDict
+from datetime import datetime, UTC
+
+
+class Counter(Document):
+    """
+    Counter document model.
+
+    The document ID is the sequence name; value is the last number issued
+    (0 before the first one).
+    """
+
+    id: str = Field(..., description="Sequence name (e.g. 'pawn_transaction', 'extension')")
+    value: int = Field(default=0, ge=0, description="Last number issued from this sequence")
+    updated_at: datetime = Field(
+        default_factory=lambda: datetime.now(UTC),
+        description="Last time numbers were issued or the sequence was seeded"
+    )
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "_id": "pawn_transaction",
+                "value": 105,
+                "updated_at": "2025-03-15T14:30:00Z"
+            }
+        }
+    )
+
+    class Settings:
+        name = "counters"
@@ -223,10 +223,21 @@ class Customer(Document):
             return self.credit_limit
 
         # Otherwise, fetch system default from Financial Policy
+        return await Customer.get_default_credit_limit()
+
+    @staticmethod
+    async def get_default_credit_limit() -> Decimal:
+        """
+        Get the system default credit limit for customers without a custom limit.
+
+        Returns:
+            Decimal: Financial Policy customer credit limit ($3000 if unavailable)
+        """
         from app.models.business_config_model import FinancialPolicyConfig
+        from app.services.config_snapshot_service import ConfigSnapshotService
 
         try:
-            financial_config = await FinancialPolicyConfig.get_current_config()
+            financial_config = await ConfigSnapshotService.get(FinancialPolicyConfig)
             if financial_config and financial_config.customer_credit_limit:
                 return Decimal(str(financial_config.customer_credit_limit))
         except Exception:
@@ -251,9 +262,10 @@ class Customer(Document):
 
         # Otherwise, fetch system default from Financial Policy
         from app.models.business_config_model import FinancialPolicyConfig
+        from app.services.config_snapshot_service import ConfigSnapshotService
 
         try:
-            financial_config = await FinancialPolicyConfig.get_current_config()
+            financial_config = await ConfigSnapshotService.get(FinancialPolicyConfig)
             if financial_config and financial_config.max_active_loans_per_customer:
                 return financial_config.max_active_loans_per_customer
         except Exception:
@@ -0,0 +1,95 @@
+"""
+Daily Rollup Model
+
+Pre-aggregated per-day business totals used by the /trends endpoints and the
+stat card metrics. One document per (date, timezone) pair, maintained
+incrementally as payments, extensions and status transitions are processed.
+"""
+
+from beanie import Document
+from pydantic import Field, ConfigDict
+from datetime import datetime, UTC
+from pymongo import IndexModel, ASCENDING
+
+
+class DailyRollup(Document):
+    """
+    Daily rollup document model.
+
+    Holds the revenue portions, loan lifecycle event counts and the net change
+    in active loans for a single business day in a single timezone. All
+    amounts are whole dollars to match the Payment and Extension models.
+    """
+
+    # Identity
+    date: str = Field(
+        ...,
+        description="Business date in the rollup timezone (YYYY-MM-DD)"
+    )
+    timezone: str = Field(
+        ...,
+        description="IANA timezone the business date is expressed in"
+    )
+
+    # Revenue (payments + extension fees)
+    total_revenue: int = Field(default=0, description="Payments plus extension fees collected")
+    principal_collected: int = Field(default=0, description="Payment principal portions")
+    interest_collected: int = Field(default=0, description="Payment interest portions")
+    overdue_fees: int = Field(default=0, description="Payment overdue fee portions")
+    extension_fees: int = Field(default=0, description="Extension fees (excluding cancelled extensions)")
+    payment_count: int = Field(default=0, description="Number of payments processed")
+
+    # Loan lifecycle events
+    new_loans: int = Field(default=0, description="Loans created on this day")
+    new_loan_amount: int = Field(default=0, description="Principal of loans created on this day")
+    redeemed: int = Field(default=0, description="Loans redeemed on this day")
+    redeemed_amount: int = Field(default=0, description="Principal of loans redeemed on this day")
+    forfeited: int = Field(default=0, description="Loans forfeited on this day")
+    forfeited_amount: int = Field(default=0, description="Principal of loans forfeited on this day")
+    sold: int = Field(default=0, description="Loans sold on this day")
+    sold_amount: int = Field(default=0, description="Principal of loans sold on this day")
+
+    # Active loans are derived from the current live count minus the deltas
+    # recorded after a given day
+    active_loans_delta: int = Field(
+        default=0,
+        description="Net change in active/overdue/extended loans during this day"
+    )
+
+    updated_at: datetime = Field(
+        default_factory=lambda: datetime.now(UTC),
+        description="Last time this rollup was modified"
+    )
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "date": "2025-03-15",
+                "timezone": "America/Denver",
+                "total_revenue": 1250,
+                "principal_collected": 900,
+                "interest_collected": 250,
+                "overdue_fees": 0,
+                "extension_fees": 100,
+                "payment_count": 7,
+                "new_loans": 4,
+                "new_loan_amount": 1600,
+                "redeemed": 2,
+                "redeemed_amount": 700,
+                "active_loans_delta": 2
+            }
+        }
+    )
+
+    class Settings:
+        """Beanie document settings"""
+        name = "daily_rollups"
+        indexes = [
+            # One rollup per (date, timezone); timezone first so that range
+            # reads for a single timezone are served by the same index
+            IndexModel(
+                [("timezone", ASCENDING), ("date", ASCENDING)],
+                name="daily_rollup_timezone_date_unique",
+                unique=True
+            ),
+        ]
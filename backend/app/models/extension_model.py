@@ -301,8 +301,8 @@ class Extension(Document):
                 f'{original_grace_end.strftime("%Y-%m-%d")}. Item may be forfeited.'
             )
     
-    async def save(self, *args, **kwargs) -> None:
-        """Override save to validate calculations and update timestamps"""
+    def prepare_for_save(self) -> None:
+        """Validate calculations, fill derived fields and update timestamps"""
         # Validate extension math
         self.validate_extension_math()
 
@@ -325,6 +325,10 @@ class Extension(Document):
         # Update timestamp
         self.updated_at = datetime.now(UTC)
 
+    async def save(self, *args, **kwargs) -> None:
+        """Override save to validate calculations and update timestamps"""
+        self.prepare_for_save()
+
         # HIGH-1 FIX: Write to database FIRST, then invalidate cache
         # This prevents race condition where:
         # 1. Cache is invalidated
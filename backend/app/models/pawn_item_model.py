@@ -6,7 +6,7 @@ multiple items with their own descriptions, serial numbers, and tracking informa
 """
 
 from beanie import Document, Indexed
-from pydantic import Field, field_validator, ConfigDict
+from pydantic import BaseModel, Field, field_validator, ConfigDict
 from datetime import datetime, UTC
 from typing import Optional
 from uuid import uuid4
@@ -135,4 +135,16 @@ class PawnItem(Document):
             # Compound indexes for efficient queries
             [("transaction_id", 1), ("item_number", 1)],  # Ordering items within transaction
             [("transaction_id", 1), ("created_at", 1)],   # Chronological ordering
-        ]
\ No newline at end of file
+        ]
+
+
+class PawnItemSummary(BaseModel):
+    """Projection of PawnItem with the fields shown alongside a transaction."""
+
+    item_id: str
+    transaction_id: str
+    item_number: int
+    description: str
+    serial_number: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
\ No newline at end of file
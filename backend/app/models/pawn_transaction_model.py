@@ -7,7 +7,7 @@ for simplified calculation and accuracy.
 """
 
 from beanie import Document, Indexed
-from pydantic import Field, field_validator, ConfigDict
+from pydantic import BaseModel, Field, field_validator, ConfigDict
 from datetime import datetime, timedelta, UTC
 from typing import Optional, List
 from uuid import uuid4
@@ -37,6 +37,62 @@ class TransactionType(str, Enum):
     IMPORTED = "Imported"
 
 
+# Business rule: interest accrues for at most 3 months (none during grace period)
+MAX_INTEREST_MONTHS = 3
+
+
+def calculate_interest_months(
+    pawn_date: Optional[datetime],
+    as_of_date: Optional[datetime] = None,
+    cap_at_maturity: bool = True
+) -> int:
+    """
+    Calculate months of interest elapsed since pawn date using calendar month arithmetic.
+    
+    Pure function shared by PawnTransaction and the bulk/server-side balance
+    paths so every caller applies the same interest-month rules.
+    
+    Args:
+        pawn_date: Transaction pawn date (naive values are treated as UTC)
+        as_of_date: Date to calculate from (defaults to now)
+        cap_at_maturity: Cap at MAX_INTEREST_MONTHS (transactions with a maturity date)
+        
+    Returns:
+        Number of months elapsed (at least 1, capped at 3 for interest calculation)
+    """
+    if as_of_date is None or not isinstance(as_of_date, datetime):
+        as_of_date = datetime.now(UTC)
+    
+    if not pawn_date:
+        return 1
+    
+    # Calculate months completed based on calendar months
+    # Jan 23 → Feb 23 = 1 month completed (Feb is 1 month after Jan)
+    # Feb 23 → Mar 23 = 2 months completed (Mar is 2 months after Jan)  
+    # Mar 23 → Apr 23 = 3 months completed (Apr is 3 months after Jan)
+    
+    # Ensure pawn_date is timezone-aware
+    if pawn_date.tzinfo is None:
+        pawn_date = pawn_date.replace(tzinfo=UTC)
+    
+    months_elapsed = ((as_of_date.year - pawn_date.year) * 12 + 
+                     (as_of_date.month - pawn_date.month))
+    
+    # Only add 1 if we've passed the pawn day (not on the exact day)
+    # This handles partial months - if we're past the pawn day in the current month,
+    # we've completed another month
+    if as_of_date.day > pawn_date.day:
+        months_elapsed += 1
+    
+    # IMPORTANT: Cap at maturity period (3 months)
+    # Grace period does not incur additional interest charges
+    if cap_at_maturity:
+        months_elapsed = min(months_elapsed, MAX_INTEREST_MONTHS)
+    
+    # Minimum 1 month of interest always applies
+    return max(1, months_elapsed)
+
+
 class PawnTransaction(Document):
     """
     Pawn transaction document model.
@@ -143,6 +199,20 @@ class PawnTransaction(Document):
         description="Structured system audit trail with unlimited entries"
     )
     
+    # Denormalised search keys (kept in sync from Customer and Extension records)
+    customer_name_search: Optional[str] = Field(
+        default=None,
+        description="Normalised lowercase customer full name"
+    )
+    customer_name_tokens: List[str] = Field(
+        default_factory=list,
+        description="Prefix tokens of each customer name word for indexed name search"
+    )
+    extension_formatted_ids: List[str] = Field(
+        default_factory=list,
+        description="Formatted IDs of extensions on this transaction (e.g., 'EX000012')"
+    )
+    
     # Timestamps
     created_at: datetime = Field(
         default_factory=lambda: datetime.now(UTC),
@@ -309,48 +379,11 @@ class PawnTransaction(Document):
         Returns:
             Number of months elapsed (capped at 3 for interest calculation)
         """
-        if as_of_date is None:
-            as_of_date = datetime.now(UTC)
-        
-        # Defensive programming - ensure valid dates
-        if not isinstance(as_of_date, datetime):
-            # Use logger instead of print for production code
-            as_of_date = datetime.now(UTC)
-        
-        if not hasattr(self, 'pawn_date') or not self.pawn_date:
-            # Use logger instead of print for production code
-            return 1
-        
-        # Calculate months completed based on calendar months
-        # Jan 23 → Feb 23 = 1 month completed (Feb is 1 month after Jan)
-        # Feb 23 → Mar 23 = 2 months completed (Mar is 2 months after Jan)  
-        # Mar 23 → Apr 23 = 3 months completed (Apr is 3 months after Jan)
-        
-        # Ensure pawn_date is timezone-aware
-        pawn_date = self.pawn_date
-        if pawn_date.tzinfo is None:
-            pawn_date = pawn_date.replace(tzinfo=UTC)
-        
-        months_elapsed = ((as_of_date.year - pawn_date.year) * 12 + 
-                         (as_of_date.month - pawn_date.month))
-        
-        # Only add 1 if we've passed the pawn day (not on the exact day)
-        # This handles partial months - if we're past the pawn day in the current month,
-        # we've completed another month
-        if as_of_date.day > pawn_date.day:
-            months_elapsed += 1
-        
-        # IMPORTANT: Cap at maturity period (3 months)
-        # Grace period does not incur additional interest charges
-        if hasattr(self, 'maturity_date') and self.maturity_date:
-            # Business rule: Maximum 3 months of interest, period
-            # During grace period, interest stops accumulating at maturity
-            months_elapsed = min(months_elapsed, 3)
-        
-        # Minimum 1 month of interest always applies
-        months_elapsed = max(1, months_elapsed)
-        
-        return months_elapsed
+        return calculate_interest_months(
+            getattr(self, 'pawn_date', None),
+            as_of_date,
+            cap_at_maturity=bool(getattr(self, 'maturity_date', None))
+        )
     
     # Notes Management Methods
     
@@ -544,10 +577,10 @@ class PawnTransaction(Document):
                 2
             )
 
-    async def save(self, *args, **kwargs) -> None:
+    def prepare_for_save(self) -> None:
         """
-        Override save to update timestamps and calculate fields.
-        Ensures data consistency before persisting to database.
+        Update timestamps and calculated fields before the document is written.
+        Used by save() and by bulk writers that persist several transactions at once.
         """
         # Update timestamp
         self.updated_at = datetime.now(UTC)
@@ -567,6 +600,13 @@ class PawnTransaction(Document):
         # Update legacy internal_notes field for backward compatibility
         self._update_legacy_internal_notes()
 
+    async def save(self, *args, **kwargs) -> None:
+        """
+        Override save to update timestamps and calculate fields.
+        Ensures data consistency before persisting to database.
+        """
+        self.prepare_for_save()
+
         # Call parent save
         await super().save(*args, **kwargs)
     
@@ -597,4 +637,56 @@ class PawnTransaction(Document):
             # This allows for named indexes with better management and monitoring
             # See: customer_status_date_idx, status_date_idx, maturity_status_idx,
             #      chronological_idx, grace_period_status_idx
-        ]
\ No newline at end of file
+        ]
+
+
+class PawnTransactionListView(BaseModel):
+    """
+    Projection of PawnTransaction for list, search and report screens.
+
+    Excludes the audit log and manual notes so MongoDB never returns them
+    for pages that only display summary fields.
+    """
+
+    transaction_id: str
+    formatted_id: Optional[str] = None
+    customer_id: str
+    created_by_user_id: str
+    transaction_type: TransactionType = TransactionType.MANUAL
+    reference_barcode: Optional[str] = None
+    pawn_date: datetime
+    maturity_date: Optional[datetime] = None
+    grace_period_end: Optional[datetime] = None
+    loan_amount: int
+    monthly_interest_percentage: Optional[float] = None
+    monthly_interest_amount: int
+    overdue_fee: int = 0
+    total_due: int = 0
+    status: TransactionStatus = TransactionStatus.ACTIVE
+    storage_location: str
+    internal_notes: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
+    model_config = ConfigDict(use_enum_values=True)
+
+
+class PawnTransactionBalanceView(BaseModel):
+    """
+    Projection of PawnTransaction with the fields a balance calculation reads.
+
+    Used by batch balance calculations, which only need the loan terms,
+    dates and status of each transaction.
+    """
+
+    transaction_id: str
+    customer_id: str
+    pawn_date: datetime
+    maturity_date: Optional[datetime] = None
+    grace_period_end: Optional[datetime] = None
+    loan_amount: int
+    monthly_interest_amount: int
+    overdue_fee: int = 0
+    status: TransactionStatus = TransactionStatus.ACTIVE
+
+    model_config = ConfigDict(use_enum_values=True)
\ No newline at end of file
@@ -5,7 +5,7 @@ from datetime import datetime, timedelta, UTC
 from enum import Enum
 import re
 
-from app.core.security import get_pin, verify_pin
+from app.core.security import get_pin, get_pin_async, verify_pin, verify_pin_async
 
 
 # Configuration constants
@@ -198,6 +198,15 @@ class User(Document):
             raise ValueError("PIN must contain only digits")
         return get_pin(pin)
     
+    @classmethod
+    async def hash_pin_async(cls, pin: str) -> str:
+        """Hash a PIN using bcrypt without blocking the event loop"""
+        if not pin or len(pin) != AuthConfig.MIN_PIN_LENGTH:
+            raise ValueError(f"PIN must be exactly {AuthConfig.MIN_PIN_LENGTH} digits")
+        if not pin.isdigit():
+            raise ValueError("PIN must contain only digits")
+        return await get_pin_async(pin)
+    
     def verify_pin(self, pin: str) -> bool:
         """Verify a PIN against the stored hash"""
         try:
@@ -207,6 +216,22 @@ class User(Document):
         except ValueError:
             return False
     
+    async def verify_pin_async(self, pin: str) -> bool:
+        """Verify a PIN against the stored hash without blocking the event loop"""
+        try:
+            if not pin or len(pin) != AuthConfig.MIN_PIN_LENGTH or not pin.isdigit():
+                return False
+            pin_hash = self.__dict__.get("pin_hash")
+            if pin_hash is None:
+                # Users resolved from the auth cache do not carry the PIN hash
+                stored = await User.find_one(User.user_id == self.user_id)
+                if not stored:
+                    return False
+                pin_hash = stored.pin_hash
+            return await verify_pin_async(pin, pin_hash)
+        except ValueError:
+            return False
+    
     def add_session(self, session_id: str) -> None:
         """Add a new session and enforce concurrent session limit"""
         if session_id not in self.active_sessions:
@@ -47,6 +47,10 @@ class BulkExtensionPaymentRequest(BaseModel):
         max_length=4,
         description="Admin PIN (required when discounts are applied)"
     )
+    admin_user_id: Optional[str] = Field(
+        None,
+        description="User ID of the approving admin; when set, only that admin's PIN is checked"
+    )
 
     @field_validator('admin_pin')
     @classmethod
@@ -74,6 +74,10 @@ class PaymentWithDiscountRequest(BaseModel):
     discount_amount: int = Field(..., gt=0, le=10000, description="Discount amount")
     discount_reason: str = Field(..., min_length=1, max_length=200, description="Discount reason")
     admin_pin: str = Field(..., min_length=4, max_length=4, description="Admin PIN")
+    admin_user_id: Optional[str] = Field(
+        None,
+        description="User ID of the approving admin; when set, only that admin's PIN is checked"
+    )
 
     @field_validator('discount_reason')
     @classmethod
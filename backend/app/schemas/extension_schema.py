@@ -58,6 +58,10 @@ class ExtensionCreate(ExtensionBase):
         max_length=4,
         description="Admin PIN for discount approval (required if discount > 0)"
     )
+    admin_user_id: Optional[str] = Field(
+        None,
+        description="User ID of the approving admin; when set, only that admin's PIN is checked"
+    )
 
 
 class ExtensionResponse(ExtensionBase):
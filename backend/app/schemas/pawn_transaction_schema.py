@@ -32,6 +32,12 @@ class SortOrder(str, Enum):
     DESC = "desc"
 
 
+class TotalCountMode(str, Enum):
+    """How the total count of a transaction list is computed"""
+    EXACT = "exact"              # Count matching documents on every request
+    APPROXIMATE = "approximate"  # Collection estimate or short-lived cached count
+
+
 class PawnItemBase(BaseModel):
     """Base pawn item schema"""
     description: str = Field(
@@ -201,6 +207,8 @@ class PawnTransactionListResponse(BaseModel):
     page: int = Field(..., description="Current page number")
     page_size: int = Field(..., description="Items per page")
     has_next: bool = Field(..., description="Whether there are more pages")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page (None on the last page)")
+    total_count_is_approximate: bool = Field(False, description="Whether total_count is an estimate or cached value")
 
 
 class TransactionStatusUpdate(BaseModel):
@@ -245,8 +253,8 @@ class BalanceResponse(BaseModel):
     
     # Date information
     pawn_date: str = Field(..., description="Pawn date (ISO format)")
-    maturity_date: str = Field(..., description="Maturity date (ISO format)")
-    grace_period_end: str = Field(..., description="Grace period end (ISO format)")
+    maturity_date: Optional[str] = Field(None, description="Maturity date (ISO format)")
+    grace_period_end: Optional[str] = Field(None, description="Grace period end (ISO format)")
     
     # Status flags
     is_overdue: bool = Field(..., description="Whether transaction is overdue")
@@ -254,6 +262,26 @@ class BalanceResponse(BaseModel):
     days_until_forfeiture: int = Field(..., description="Days until forfeiture (0 if past)")
 
 
+class BatchBalanceRequest(BaseModel):
+    """Schema for calculating many transaction balances at once"""
+    transaction_ids: List[str] = Field(
+        ...,
+        min_length=1,
+        max_length=200,
+        description="Transaction IDs to calculate balances for (1-200)"
+    )
+    as_of_date: Optional[datetime] = Field(
+        None,
+        description="Balance calculation date (defaults to now)"
+    )
+
+
+class BatchBalanceResponse(BaseModel):
+    """Schema for batch balance results"""
+    balances: List[BalanceResponse] = Field(..., description="Balances in request order")
+    not_found: List[str] = Field(default_factory=list, description="Requested transaction IDs that do not exist")
+
+
 class InterestBreakdownResponse(BaseModel):
     """Schema for detailed interest breakdown"""
     transaction_id: str = Field(..., description="Transaction identifier")
@@ -309,6 +337,8 @@ class TransactionSearchFilters(BaseModel):
     # Pagination
     page: int = Field(1, ge=1, description="Page number (starts at 1)")
     page_size: int = Field(20, ge=1, le=100, description="Items per page (1-100)")
+    cursor: Optional[str] = Field(None, description="Cursor from a previous page's next_cursor (overrides page)")
+    count_mode: TotalCountMode = Field(TotalCountMode.EXACT, description="Total count mode: 'exact' or 'approximate'")
     sort_by: TransactionSortField = Field(TransactionSortField.PAWN_DATE, description="Sort field")
     sort_order: SortOrder = Field(SortOrder.DESC, description="Sort order: 'asc' or 'desc'")
     
@@ -741,6 +771,10 @@ class BulkRedemptionRequest(BaseModel):
         max_length=4,
         description="Admin PIN required when discounts are provided"
     )
+    admin_user_id: Optional[str] = Field(
+        None,
+        description="User ID of the approving admin; when set, only that admin's PIN is checked"
+    )
 
     @model_validator(mode='after')
     def validate_admin_pin_required(self):
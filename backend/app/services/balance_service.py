@@ -0,0 +1,277 @@
+"""
+Balance Service
+
+Shared balance engine for pawn transactions.
+
+Payment totals (total paid and the interest, overdue fee, principal and
+extension fee portions) come from a single $group over the transaction's
+non-voided payments, which is answered from idx_payment_transaction_voided.
+Extension fees come from a second $group that runs concurrently. Both
+aggregations accept many transaction IDs, so balances for a whole page of
+transactions cost the same two round trips as a single balance.
+"""
+
+import asyncio
+from datetime import datetime, UTC
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+import structlog
+
+from app.models.extension_model import Extension
+from app.models.pawn_transaction_model import (
+    PawnTransaction,
+    PawnTransactionBalanceView,
+    calculate_interest_months,
+)
+from app.models.payment_model import Payment
+
+# Configure logger
+logger = structlog.get_logger("balance")
+
+# Full documents and balance projections are both accepted
+BalanceSource = Union[PawnTransaction, PawnTransactionBalanceView]
+
+# Payment fields summed per transaction (output name -> payment field)
+PAYMENT_TOTAL_FIELDS = {
+    "total_paid": "payment_amount",
+    "interest_paid": "interest_portion",
+    "overdue_fee_paid": "overdue_fee_portion",
+    "principal_paid": "principal_portion",
+    "extension_fees_paid": "extension_fees_portion",
+}
+
+
+def empty_payment_totals() -> Dict[str, int]:
+    """Totals for a transaction without payments."""
+    totals = {field: 0 for field in PAYMENT_TOTAL_FIELDS}
+    totals["payment_count"] = 0
+    return totals
+
+
+def _transaction_id_filter(transaction_ids: List[str]) -> Any:
+    return transaction_ids[0] if len(transaction_ids) == 1 else {"$in": transaction_ids}
+
+
+def build_payment_totals_pipeline(transaction_ids: List[str]) -> List[Dict[str, Any]]:
+    """
+    Build the $group pipeline summing non-voided payments per transaction.
+
+    Args:
+        transaction_ids: Transactions to total
+
+    Returns:
+        Aggregation pipeline for the payments collection
+    """
+    group: Dict[str, Any] = {"_id": "$transaction_id"}
+    for total, field in PAYMENT_TOTAL_FIELDS.items():
+        group[total] = {"$sum": f"${field}"}
+    group["payment_count"] = {"$sum": 1}
+
+    return [
+        {"$match": {"transaction_id": _transaction_id_filter(transaction_ids), "is_voided": {"$ne": True}}},
+        {"$group": group}
+    ]
+
+
+def build_extension_fees_pipeline(transaction_ids: List[str]) -> List[Dict[str, Any]]:
+    """
+    Build the $group pipeline summing extension fees per transaction.
+
+    Cancelled (reversed) extensions are excluded.
+
+    Args:
+        transaction_ids: Transactions to total
+
+    Returns:
+        Aggregation pipeline for the extensions collection
+    """
+    return [
+        {"$match": {"transaction_id": _transaction_id_filter(transaction_ids), "is_cancelled": {"$ne": True}}},
+        {"$group": {"_id": "$transaction_id", "extension_fees": {"$sum": "$total_extension_fee"}}}
+    ]
+
+
+def calculate_interest_due(
+    monthly_interest_amount: int,
+    pawn_date: Optional[datetime],
+    maturity_date: Optional[datetime],
+    as_of_date: Optional[datetime] = None
+) -> int:
+    """
+    Interest owed as of a date: the monthly amount times the interest months.
+
+    Args:
+        monthly_interest_amount: Fixed monthly interest in whole dollars
+        pawn_date: Transaction pawn date
+        maturity_date: Transaction maturity date (interest months are capped when set)
+        as_of_date: Calculation date (defaults to now)
+
+    Returns:
+        Interest due in whole dollars
+    """
+    months = calculate_interest_months(pawn_date, as_of_date, cap_at_maturity=bool(maturity_date))
+    return (monthly_interest_amount or 0) * months
+
+
+def _aware(value: Optional[datetime]) -> Optional[datetime]:
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=UTC)
+    return value
+
+
+def build_transaction_balance(
+    transaction: BalanceSource,
+    totals: Dict[str, int],
+    as_of_date: datetime
+) -> Dict[str, Any]:
+    """
+    Build a transaction balance from its payment totals.
+
+    Args:
+        transaction: Transaction (or balance projection) to calculate the balance of
+        totals: Payment totals from BalanceService.get_payment_totals
+        as_of_date: Timezone-aware calculation date
+
+    Returns:
+        Dictionary with balance details
+    """
+    interest_due = calculate_interest_due(
+        transaction.monthly_interest_amount, transaction.pawn_date, transaction.maturity_date, as_of_date
+    )
+    principal_due = transaction.loan_amount
+    total_due = principal_due + interest_due + transaction.overdue_fee
+    pawn_date = _aware(transaction.pawn_date)
+    maturity_date = _aware(transaction.maturity_date)
+    grace_period_end = _aware(transaction.grace_period_end)
+
+    return {
+        "transaction_id": transaction.transaction_id,
+        "as_of_date": as_of_date.isoformat(),
+        "loan_amount": transaction.loan_amount,
+        "monthly_interest": transaction.monthly_interest_amount,
+        "total_due": total_due,
+        "total_paid": totals["total_paid"],
+        "current_balance": total_due - totals["total_paid"],
+        "principal_due": principal_due,
+        "interest_due": interest_due,
+        "overdue_fee_due": transaction.overdue_fee,
+        "principal_paid": totals["principal_paid"],
+        "interest_paid": totals["interest_paid"],
+        "overdue_fee_paid": totals["overdue_fee_paid"],
+        "principal_balance": principal_due - totals["principal_paid"],
+        "interest_balance": interest_due - totals["interest_paid"],
+        "overdue_fee_balance": transaction.overdue_fee - totals["overdue_fee_paid"],
+        "payment_count": totals["payment_count"],
+        "status": transaction.status,
+        "pawn_date": pawn_date.isoformat(),
+        "maturity_date": maturity_date.isoformat() if maturity_date else None,
+        "grace_period_end": grace_period_end.isoformat() if grace_period_end else None,
+        "is_overdue": bool(maturity_date and as_of_date > maturity_date),
+        "is_in_grace_period": bool(maturity_date and grace_period_end and maturity_date < as_of_date <= grace_period_end),
+        "days_until_forfeiture": (
+            (grace_period_end - as_of_date).days if grace_period_end and as_of_date < grace_period_end else 0
+        )
+    }
+
+
+class BalanceService:
+    """Service class computing transaction balances from aggregated payment totals"""
+
+    @staticmethod
+    async def get_payment_totals(transaction_ids: Iterable[str]) -> Dict[str, Dict[str, int]]:
+        """
+        Sum non-voided payments for many transactions in one aggregation.
+
+        Args:
+            transaction_ids: Transactions to total
+
+        Returns:
+            Transaction ID -> payment totals (zeroed for transactions without payments)
+        """
+        transaction_ids = list(dict.fromkeys(transaction_ids))
+        totals = {transaction_id: empty_payment_totals() for transaction_id in transaction_ids}
+        if not transaction_ids:
+            return totals
+
+        pipeline = build_payment_totals_pipeline(transaction_ids)
+        async for row in Payment.get_motor_collection().aggregate(pipeline):
+            totals[row.pop("_id")].update(row)
+        return totals
+
+    @staticmethod
+    async def get_extension_fees(transaction_ids: Iterable[str]) -> Dict[str, int]:
+        """
+        Sum extension fees for many transactions in one aggregation.
+
+        Args:
+            transaction_ids: Transactions to total
+
+        Returns:
+            Transaction ID -> total extension fees
+        """
+        transaction_ids = list(dict.fromkeys(transaction_ids))
+        fees = {transaction_id: 0 for transaction_id in transaction_ids}
+        if not transaction_ids:
+            return fees
+
+        pipeline = build_extension_fees_pipeline(transaction_ids)
+        async for row in Extension.get_motor_collection().aggregate(pipeline):
+            fees[row["_id"]] = row["extension_fees"]
+        return fees
+
+    @staticmethod
+    async def get_transaction_totals(
+        transaction_id: str,
+        include_extension_fees: bool = False
+    ) -> Dict[str, int]:
+        """
+        Payment totals for one transaction, optionally with its extension fees.
+
+        The two aggregations run concurrently when extension fees are requested.
+
+        Args:
+            transaction_id: Transaction identifier
+            include_extension_fees: Also sum the transaction's extension fees
+
+        Returns:
+            Payment totals, plus "extension_fees" when requested
+        """
+        if not include_extension_fees:
+            return (await BalanceService.get_payment_totals([transaction_id]))[transaction_id]
+
+        payment_totals, extension_fees = await asyncio.gather(
+            BalanceService.get_payment_totals([transaction_id]),
+            BalanceService.get_extension_fees([transaction_id])
+        )
+        totals = payment_totals[transaction_id]
+        totals["extension_fees"] = extension_fees[transaction_id]
+        return totals
+
+    @staticmethod
+    async def calculate_balances(
+        transactions: List[BalanceSource],
+        as_of_date: Optional[datetime] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Calculate balances for many transactions with one payments aggregation.
+
+        Args:
+            transactions: Transactions to calculate balances for
+            as_of_date: Calculation date (defaults to now)
+
+        Returns:
+            Transaction ID -> balance details (see build_transaction_balance)
+        """
+        if as_of_date is None:
+            as_of_date = datetime.now(UTC)
+        as_of_date = _aware(as_of_date)
+
+        totals = await BalanceService.get_payment_totals(
+            transaction.transaction_id for transaction in transactions
+        )
+        return {
+            transaction.transaction_id: build_transaction_balance(
+                transaction, totals[transaction.transaction_id], as_of_date
+            )
+            for transaction in transactions
+        }
@@ -0,0 +1,230 @@
+"""
+Config Snapshot Service
+
+Process-wide snapshot of the active business configuration (company,
+financial policy, forfeiture, printer and location settings).
+
+The five active configurations are loaded together and handed out as
+read-only ConfigView objects, so credit checks, loan limits, receipts and
+forfeiture calculations read configuration without a database round trip.
+
+Activating a configuration (set_as_active) reloads the snapshot in the
+writing process, increments a version stamp in Redis and publishes it on a
+pub/sub channel; the listener in every other worker reloads when it sees a
+version different from its own. Snapshots older than
+SNAPSHOT_MAX_AGE_SECONDS are reloaded on next use, which bounds staleness
+when Redis is unavailable or a message is missed.
+"""
+
+# Standard library imports
+import asyncio
+import time
+from types import MappingProxyType
+from typing import Any, Dict, Optional, Type
+
+# Third-party imports
+import structlog
+
+# Local imports
+from app.core.redis_cache import get_cache_service
+from app.models.business_config_model import (
+    CompanyConfig,
+    FinancialPolicyConfig,
+    ForfeitureConfig,
+    LocationConfig,
+    PrinterConfig,
+)
+
+# Configure logger
+logger = structlog.get_logger("config_snapshot")
+
+CONFIG_MODELS = (CompanyConfig, FinancialPolicyConfig, ForfeitureConfig, PrinterConfig, LocationConfig)
+
+CONFIG_VERSION_KEY = "config:version"
+CONFIG_CHANNEL = "config:changed"
+
+# Safety net for missed change notifications
+SNAPSHOT_MAX_AGE_SECONDS = 300
+
+# Listener poll interval and reconnect delay
+LISTEN_POLL_SECONDS = 1.0
+LISTEN_RETRY_SECONDS = 5.0
+
+
+def _freeze(value: Any) -> Any:
+    """Recursively convert lists and dicts to immutable equivalents."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+class ConfigView:
+    """Read-only view of a configuration document's fields."""
+
+    __slots__ = ("_values",)
+
+    def __init__(self, values: Dict[str, Any]):
+        object.__setattr__(self, "_values", _freeze(values))
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return self._values[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("Configuration snapshots are read-only")
+
+    def __repr__(self) -> str:
+        return f"ConfigView({dict(self._values)!r})"
+
+    def model_dump(self) -> Dict[str, Any]:
+        """Field values as a plain (shallow) dictionary."""
+        return dict(self._values)
+
+
+class ConfigSnapshotService:
+    """Service owning the process-wide business configuration snapshot"""
+
+    _configs: Dict[str, Optional[ConfigView]] = {}
+    _loaded_at: Optional[float] = None
+    _version: int = 0
+    _lock: Optional[asyncio.Lock] = None
+
+    @classmethod
+    def _get_lock(cls) -> asyncio.Lock:
+        if cls._lock is None:
+            cls._lock = asyncio.Lock()
+        return cls._lock
+
+    @classmethod
+    def reset(cls) -> None:
+        """Drop the snapshot; the next read loads it again."""
+        cls._configs = {}
+        cls._loaded_at = None
+        cls._version = 0
+
+    # ========== LOADING ==========
+
+    @classmethod
+    async def load(cls, version: Optional[int] = None) -> None:
+        """
+        Load every active configuration in one concurrent batch.
+
+        Args:
+            version: Version stamp the load corresponds to (read from Redis when omitted)
+        """
+        documents = await asyncio.gather(*[model.get_current_config() for model in CONFIG_MODELS])
+        if version is None:
+            version = await cls._read_version()
+
+        cls._configs = {
+            model.__name__: ConfigView(document.model_dump()) if document else None
+            for model, document in zip(CONFIG_MODELS, documents)
+        }
+        cls._loaded_at = time.monotonic()
+        cls._version = version
+        logger.debug("Configuration snapshot loaded", version=version)
+
+    @classmethod
+    async def get(cls, config_model: Type) -> Optional[ConfigView]:
+        """
+        Read the active configuration of a type from the snapshot.
+
+        Loads the snapshot on first use (and when it is older than
+        SNAPSHOT_MAX_AGE_SECONDS); otherwise no I/O is performed.
+
+        Args:
+            config_model: One of CONFIG_MODELS
+
+        Returns:
+            Read-only view of the active configuration, or None if none exists
+        """
+        if cls._loaded_at is None or time.monotonic() - cls._loaded_at >= SNAPSHOT_MAX_AGE_SECONDS:
+            async with cls._get_lock():
+                if cls._loaded_at is None or time.monotonic() - cls._loaded_at >= SNAPSHOT_MAX_AGE_SECONDS:
+                    await cls.load()
+        return cls._configs.get(config_model.__name__)
+
+    # ========== CHANGE NOTIFICATION ==========
+
+    @staticmethod
+    async def _read_version() -> int:
+        cache = get_cache_service()
+        if not cache or not cache.is_available:
+            return 0
+        try:
+            return int(await cache.redis_client.get(CONFIG_VERSION_KEY) or 0)
+        except Exception as e:
+            logger.warning("Failed to read configuration version", error=str(e))
+            return 0
+
+    @classmethod
+    async def publish_change(cls) -> None:
+        """
+        Reload after a configuration change and notify the other workers.
+
+        Called once the changed configuration has been written.
+        """
+        version = cls._version + 1
+        cache = get_cache_service()
+        if cache and cache.is_available:
+            try:
+                version = await cache.redis_client.incr(CONFIG_VERSION_KEY)
+                await cache.redis_client.publish(CONFIG_CHANNEL, str(version))
+            except Exception as e:
+                logger.warning("Failed to publish configuration change", error=str(e))
+
+        async with cls._get_lock():
+            await cls.load(version)
+        logger.info("Configuration snapshot refreshed", version=version)
+
+    @classmethod
+    async def handle_message(cls, data: Any) -> bool:
+        """
+        Reload when a published version differs from the loaded one.
+
+        Returns:
+            True if the snapshot was reloaded
+        """
+        try:
+            version = int(data)
+        except (TypeError, ValueError):
+            return False
+        if version == cls._version:
+            return False
+
+        async with cls._get_lock():
+            await cls.load(version)
+        logger.info("Configuration snapshot refreshed from another worker", version=version)
+        return True
+
+    @classmethod
+    async def listen(cls) -> None:
+        """Subscribe to configuration changes until cancelled (runs for the app lifetime)."""
+        while True:
+            cache = get_cache_service()
+            if not cache or not cache.is_available:
+                return
+
+            pubsub = cache.redis_client.pubsub()
+            try:
+                await pubsub.subscribe(CONFIG_CHANNEL)
+                # Catch up on changes published before the subscription
+                await cls.handle_message(await cls._read_version())
+                while True:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=LISTEN_POLL_SECONDS)
+                    if message:
+                        await cls.handle_message(message.get("data"))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Configuration change listener failed, reconnecting", error=str(e))
+                await asyncio.sleep(LISTEN_RETRY_SECONDS)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
@@ -3,15 +3,172 @@ Customer Data Consistency Validation Service
 
 This module provides comprehensive validation for customer counter consistency
 to ensure data integrity between denormalized counters and actual transaction data.
+
+Expected counters come from one $group over pawn_transactions (per customer:
+transaction count, slot-using loan count and value, last pawn date). Full
+validation streams that result, sorted by customer phone, alongside the
+customers collection sorted the same way, so each side is read once. Repairs
+are re-checked against counters recomputed for their batch and sent as
+chunked bulk_write batches, each update guarded on the counters as read.
 """
 
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 from datetime import datetime
 import structlog
+from pymongo import ASCENDING, UpdateOne
 
 from app.models.customer_model import Customer
 from app.models.pawn_transaction_model import PawnTransaction, TransactionStatus
-from beanie.operators import In
+from app.core.redis_cache import BusinessCache, CacheTags
+
+# Customer counter fields compared and repaired
+COUNTER_FIELDS = ("total_transactions", "active_loans", "total_loan_value", "last_transaction_date")
+
+# Repairs per bulk_write and customers between progress updates
+REPAIR_BATCH_SIZE = 500
+PROGRESS_INTERVAL = 500
+
+
+def empty_expected_counters() -> Dict[str, Any]:
+    """Expected counters of a customer without transactions."""
+    return {"total_transactions": 0, "active_loans": 0, "total_loan_value": 0, "last_transaction_date": None}
+
+
+def build_expected_counters_pipeline(phone_numbers: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """
+    Build the $group pipeline computing expected counters per customer.
+
+    Args:
+        phone_numbers: Restrict to these customers (all customers when omitted)
+
+    Returns:
+        Aggregation pipeline for pawn_transactions, sorted by customer phone
+    """
+    slot_statuses = [status.value for status in ConsistencyValidationService.SLOT_USING_STATUSES]
+    is_slot_using = {"$in": ["$status", slot_statuses]}
+
+    match: Dict[str, Any] = {"customer_id": {"$type": "string"}}
+    if phone_numbers is not None:
+        match["customer_id"] = phone_numbers[0] if len(phone_numbers) == 1 else {"$in": phone_numbers}
+
+    return [
+        {"$match": match},
+        {"$group": {
+            "_id": "$customer_id",
+            "total_transactions": {"$sum": 1},
+            "active_loans": {"$sum": {"$cond": [is_slot_using, 1, 0]}},
+            "total_loan_value": {"$sum": {"$cond": [is_slot_using, "$loan_amount", 0]}},
+            "last_transaction_date": {"$max": "$pawn_date"}
+        }},
+        {"$sort": {"_id": ASCENDING}}
+    ]
+
+
+def find_discrepancies(stored: Dict[str, Any], actual: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Compare a customer's stored counters with the expected ones.
+
+    Args:
+        stored: Customer counter fields
+        actual: Expected counters (see build_expected_counters_pipeline)
+
+    Returns:
+        One entry per mismatched field
+    """
+    discrepancies = []
+    stored_total = stored.get("total_transactions") or 0
+    stored_active = stored.get("active_loans") or 0
+    stored_value = stored.get("total_loan_value") or 0
+    stored_date = stored.get("last_transaction_date")
+    actual_date = actual["last_transaction_date"]
+
+    if stored_total != actual["total_transactions"]:
+        discrepancies.append({
+            "field": "total_transactions",
+            "stored": stored_total,
+            "actual": actual["total_transactions"],
+            "difference": actual["total_transactions"] - stored_total
+        })
+
+    if stored_active != actual["active_loans"]:
+        discrepancies.append({
+            "field": "active_loans",
+            "stored": stored_active,
+            "actual": actual["active_loans"],
+            "difference": actual["active_loans"] - stored_active
+        })
+
+    # Allow small float differences (rounding errors)
+    if abs(stored_value - actual["total_loan_value"]) > 0.01:
+        discrepancies.append({
+            "field": "total_loan_value",
+            "stored": float(stored_value),
+            "actual": float(actual["total_loan_value"]),
+            "difference": float(actual["total_loan_value"] - stored_value)
+        })
+
+    # Last transaction date comparison
+    if actual_date:
+        if not stored_date:
+            discrepancies.append({
+                "field": "last_transaction_date",
+                "stored": None,
+                "actual": actual_date.isoformat(),
+                "difference": "missing_date"
+            })
+        elif abs((stored_date - actual_date).total_seconds()) > 1:
+            discrepancies.append({
+                "field": "last_transaction_date",
+                "stored": stored_date.isoformat(),
+                "actual": actual_date.isoformat(),
+                "difference": "date_mismatch"
+            })
+
+    return discrepancies
+
+
+def build_counter_repair(
+    stored: Dict[str, Any],
+    actual: Dict[str, Any],
+    admin_user_id: str,
+    repaired_at: datetime
+) -> UpdateOne:
+    """
+    Build the update setting a customer's counters to the expected values.
+
+    The filter re-checks the counters as they were read, so the update is a
+    no-op if a loan was opened or closed for the customer in the meantime.
+
+    Args:
+        stored: Customer's phone_number and counter fields as read
+        actual: Expected counters
+        admin_user_id: Admin user ID performing the fix
+        repaired_at: updated_at written with the repair
+
+    Returns:
+        UpdateOne for the customers collection
+    """
+    update_data = {
+        "total_transactions": actual["total_transactions"],
+        "active_loans": actual["active_loans"],
+        "total_loan_value": float(actual["total_loan_value"]),
+        "updated_by": admin_user_id,
+        "updated_at": repaired_at
+    }
+    if actual["last_transaction_date"]:
+        update_data["last_transaction_date"] = actual["last_transaction_date"]
+    guard = {"phone_number": stored["phone_number"], **{field: stored.get(field) for field in COUNTER_FIELDS}}
+    return UpdateOne(guard, {"$set": update_data})
+
+
+async def _iterate(customers):
+    """Iterate a customer list or cursor asynchronously."""
+    if isinstance(customers, list):
+        for customer in customers:
+            yield customer
+    else:
+        async for customer in customers:
+            yield customer
 
 
 class ConsistencyValidationService:
@@ -28,6 +185,32 @@ class ConsistencyValidationService:
         TransactionStatus.DAMAGED
     ]
 
+    # Progress of the running (or last) full validation
+    _progress: Dict[str, Any] = {"status": "idle"}
+
+    @staticmethod
+    async def get_expected_counters(phone_number: str) -> Dict[str, Any]:
+        """
+        Compute one customer's expected counters with a single aggregation.
+
+        Args:
+            phone_number: Customer's phone number
+
+        Returns:
+            Expected counters (zeros for a customer without transactions)
+        """
+        pipeline = build_expected_counters_pipeline([phone_number])
+        rows = await PawnTransaction.get_motor_collection().aggregate(pipeline).to_list(length=1)
+        if not rows:
+            return empty_expected_counters()
+        rows[0].pop("_id")
+        return rows[0]
+
+    @staticmethod
+    def get_progress() -> Dict[str, Any]:
+        """Progress of the running (or last completed) full validation."""
+        return dict(ConsistencyValidationService._progress)
+
     @staticmethod
     async def validate_customer_consistency(phone_number: str) -> Dict:
         """
@@ -46,73 +229,11 @@ class ConsistencyValidationService:
                 "phone_number": phone_number
             }
 
-        # Get all transactions for this customer
-        all_transactions = await PawnTransaction.find(
-            PawnTransaction.customer_id == phone_number
-        ).to_list()
-
-        # Get active transactions (slot-using statuses)
-        active_transactions = await PawnTransaction.find(
-            PawnTransaction.customer_id == phone_number,
-            In(PawnTransaction.status, ConsistencyValidationService.SLOT_USING_STATUSES)
-        ).to_list()
-
-        # Calculate actual values
-        actual_total_transactions = len(all_transactions)
-        actual_active_loans = len(active_transactions)
-        actual_total_loan_value = sum(t.loan_amount for t in active_transactions)
-
-        # Get last transaction date
-        actual_last_transaction_date = None
-        if all_transactions:
-            sorted_transactions = sorted(all_transactions, key=lambda x: x.pawn_date, reverse=True)
-            actual_last_transaction_date = sorted_transactions[0].pawn_date
+        actual = await ConsistencyValidationService.get_expected_counters(phone_number)
+        actual_last_transaction_date = actual["last_transaction_date"]
 
         # Compare with customer counters
-        discrepancies = []
-
-        if customer.total_transactions != actual_total_transactions:
-            discrepancies.append({
-                "field": "total_transactions",
-                "stored": customer.total_transactions,
-                "actual": actual_total_transactions,
-                "difference": actual_total_transactions - customer.total_transactions
-            })
-
-        if customer.active_loans != actual_active_loans:
-            discrepancies.append({
-                "field": "active_loans",
-                "stored": customer.active_loans,
-                "actual": actual_active_loans,
-                "difference": actual_active_loans - customer.active_loans
-            })
-
-        # Allow small float differences (rounding errors)
-        loan_value_diff = abs(customer.total_loan_value - actual_total_loan_value)
-        if loan_value_diff > 0.01:
-            discrepancies.append({
-                "field": "total_loan_value",
-                "stored": float(customer.total_loan_value),
-                "actual": float(actual_total_loan_value),
-                "difference": float(actual_total_loan_value - customer.total_loan_value)
-            })
-
-        # Last transaction date comparison
-        if actual_last_transaction_date:
-            if not customer.last_transaction_date:
-                discrepancies.append({
-                    "field": "last_transaction_date",
-                    "stored": None,
-                    "actual": actual_last_transaction_date.isoformat(),
-                    "difference": "missing_date"
-                })
-            elif abs((customer.last_transaction_date - actual_last_transaction_date).total_seconds()) > 1:
-                discrepancies.append({
-                    "field": "last_transaction_date",
-                    "stored": customer.last_transaction_date.isoformat(),
-                    "actual": actual_last_transaction_date.isoformat(),
-                    "difference": "date_mismatch"
-                })
+        discrepancies = find_discrepancies(customer.model_dump(include=set(COUNTER_FIELDS)), actual)
 
         return {
             "phone_number": phone_number,
@@ -126,9 +247,9 @@ class ConsistencyValidationService:
                 "last_transaction_date": customer.last_transaction_date.isoformat() if customer.last_transaction_date else None
             },
             "actual_values": {
-                "total_transactions": actual_total_transactions,
-                "active_loans": actual_active_loans,
-                "total_loan_value": float(actual_total_loan_value),
+                "total_transactions": actual["total_transactions"],
+                "active_loans": actual["active_loans"],
+                "total_loan_value": float(actual["total_loan_value"]),
                 "last_transaction_date": actual_last_transaction_date.isoformat() if actual_last_transaction_date else None
             },
             "validated_at": datetime.utcnow().isoformat()
@@ -206,6 +327,9 @@ class ConsistencyValidationService:
         """
         Validate consistency for all customers
 
+        Customers (sorted by phone number) are merged with the expected
+        counters aggregation (sorted the same way) in one streaming pass.
+
         Args:
             limit: Optional limit on number of customers to check
             fix_automatically: If True, automatically fix discrepancies
@@ -219,15 +343,22 @@ class ConsistencyValidationService:
                 "error": "admin_user_id required for automatic fixes"
             }
 
-        # Get all customers (with optional limit)
-        query = Customer.find()
+        customers_collection = Customer.get_motor_collection()
+        projection = {"phone_number": 1, "first_name": 1, "last_name": 1, **{field: 1 for field in COUNTER_FIELDS}}
+
         if limit:
-            customers = await query.limit(limit).to_list()
+            customers = await customers_collection.find(
+                {}, projection, sort=[("phone_number", ASCENDING)], limit=limit
+            ).to_list(length=limit)
+            total_customers = len(customers)
+            pipeline = build_expected_counters_pipeline([customer["phone_number"] for customer in customers])
         else:
-            customers = await query.to_list()
+            customers = customers_collection.find({}, projection, sort=[("phone_number", ASCENDING)])
+            total_customers = await customers_collection.count_documents({})
+            pipeline = build_expected_counters_pipeline()
 
         results = {
-            "total_customers": len(customers),
+            "total_customers": total_customers,
             "consistent": 0,
             "inconsistent": 0,
             "fixed": 0,
@@ -235,49 +366,170 @@ class ConsistencyValidationService:
             "customers_with_discrepancies": [],
             "validation_started_at": datetime.utcnow().isoformat()
         }
+        progress = {
+            "status": "running",
+            "processed": 0,
+            "total_customers": total_customers,
+            "inconsistent": 0,
+            "fixed": 0,
+            "started_at": results["validation_started_at"]
+        }
+        ConsistencyValidationService._progress = progress
 
-        for customer in customers:
-            try:
-                validation = await ConsistencyValidationService.validate_customer_consistency(
-                    customer.phone_number
-                )
+        # Inconsistent customers awaiting repair and their discrepancy entries
+        pending: List[Dict[str, Any]] = []
+        repaired: List[Dict[str, Any]] = []
 
-                if validation.get("consistent"):
-                    results["consistent"] += 1
-                else:
-                    results["inconsistent"] += 1
+        async def flush_repairs() -> None:
+            if not pending:
+                return
+            try:
+                outcomes = await ConsistencyValidationService._repair_batch(pending, admin_user_id)
+                for discrepancy_info in repaired:
+                    outcome = outcomes[discrepancy_info["phone_number"]]
+                    if outcome == "fixed":
+                        discrepancy_info["fixed"] = True
+                        results["fixed"] += 1
+                    elif outcome == "resolved":
+                        # The counters caught up while the run was in progress
+                        results["inconsistent"] -= 1
+                        results["consistent"] += 1
+                        results["customers_with_discrepancies"].remove(discrepancy_info)
+                    else:
+                        discrepancy_info["fix_error"] = "Customer counters changed during validation; not repaired"
+            except Exception as e:
+                for discrepancy_info in repaired:
+                    discrepancy_info["fix_error"] = str(e)
+                ConsistencyValidationService.logger.error("customer_repair_batch_failed", size=len(pending), error=str(e))
+            pending.clear()
+            repaired.clear()
+
+        expected_rows = PawnTransaction.get_motor_collection().aggregate(pipeline, allowDiskUse=True)
+        expected = await anext(expected_rows, None)
+
+        try:
+            async for customer in _iterate(customers):
+                phone_number = customer["phone_number"]
+                try:
+                    # Advance the expected side to this customer (both sorted by phone)
+                    while expected is not None and expected["_id"] < phone_number:
+                        expected = await anext(expected_rows, None)
+                    if expected is not None and expected["_id"] == phone_number:
+                        actual = expected
+                    else:
+                        actual = empty_expected_counters()
+
+                    discrepancies = find_discrepancies(customer, actual)
+                    if not discrepancies:
+                        results["consistent"] += 1
+                    else:
+                        results["inconsistent"] += 1
+                        discrepancy_info = {
+                            "phone_number": phone_number,
+                            "customer_name": f"{customer.get('first_name')} {customer.get('last_name')}",
+                            "discrepancies": discrepancies
+                        }
+                        results["customers_with_discrepancies"].append(discrepancy_info)
+
+                        # Fix if requested
+                        if fix_automatically:
+                            pending.append(customer)
+                            repaired.append(discrepancy_info)
+                            if len(pending) >= REPAIR_BATCH_SIZE:
+                                await flush_repairs()
+
+                except Exception as e:
+                    results["errors"] += 1
+                    ConsistencyValidationService.logger.error(
+                        "customer_validation_error",
+                        phone_number=phone_number,
+                        error=str(e)
+                    )
+
+                progress["processed"] += 1
+                if progress["processed"] % PROGRESS_INTERVAL == 0:
+                    progress.update(inconsistent=results["inconsistent"], fixed=results["fixed"])
+
+            await flush_repairs()
+        except Exception:
+            progress["status"] = "failed"
+            raise
+
+        if results["fixed"]:
+            # Cached customer records and customer statistics used the old counters
+            await BusinessCache.invalidate_tags(
+                CacheTags.CUSTOMER_STATS,
+                *[CacheTags.customer(info["phone_number"]) for info in results["customers_with_discrepancies"] if info.get("fixed")]
+            )
+            ConsistencyValidationService.logger.info(
+                "customer_consistency_fixed",
+                admin_user_id=admin_user_id,
+                fixed_count=results["fixed"]
+            )
 
-                    discrepancy_info = {
-                        "phone_number": customer.phone_number,
-                        "customer_name": validation["customer_name"],
-                        "discrepancies": validation["discrepancies"]
-                    }
+        results["validation_completed_at"] = datetime.utcnow().isoformat()
+        progress.update(
+            status="completed",
+            inconsistent=results["inconsistent"],
+            fixed=results["fixed"],
+            completed_at=results["validation_completed_at"]
+        )
 
-                    # Fix if requested
-                    if fix_automatically:
-                        fix_result = await ConsistencyValidationService.fix_customer_consistency(
-                            customer.phone_number,
-                            admin_user_id
-                        )
-                        if fix_result.get("status") == "fixed":
-                            results["fixed"] += 1
-                            discrepancy_info["fixed"] = True
-                        else:
-                            discrepancy_info["fix_error"] = fix_result.get("error", "Unknown error")
+        return results
 
-                    results["customers_with_discrepancies"].append(discrepancy_info)
+    @staticmethod
+    async def _repair_batch(pending: List[Dict[str, Any]], admin_user_id: str) -> Dict[str, str]:
+        """
+        Re-check and repair a batch of inconsistent customers.
 
-            except Exception as e:
-                results["errors"] += 1
-                ConsistencyValidationService.logger.error(
-                    "customer_validation_error",
-                    phone_number=customer.phone_number,
-                    error=str(e)
-                )
+        The run's expected counters may be minutes old by the time a batch is
+        written, so they are recomputed for the batch first, and each repair
+        is guarded on the counters as read.
 
-        results["validation_completed_at"] = datetime.utcnow().isoformat()
+        Args:
+            pending: Customer documents (phone_number and counters as read)
+            admin_user_id: Admin user ID performing the fix
 
-        return results
+        Returns:
+            phone_number -> "fixed", "resolved" (consistent now, nothing
+            written) or "changed" (counters changed since read, not written)
+        """
+        phone_numbers = [customer["phone_number"] for customer in pending]
+        rows = await PawnTransaction.get_motor_collection().aggregate(
+            build_expected_counters_pipeline(phone_numbers)
+        ).to_list(length=None)
+        expected = {row["_id"]: row for row in rows}
+
+        # One write time (at MongoDB's millisecond precision) for the batch
+        # tells applied repairs apart from skipped ones
+        repaired_at = datetime.utcnow()
+        repaired_at = repaired_at.replace(microsecond=repaired_at.microsecond // 1000 * 1000)
+
+        outcomes: Dict[str, str] = {}
+        operations: List[UpdateOne] = []
+        for customer in pending:
+            actual = expected.get(customer["phone_number"], empty_expected_counters())
+            if find_discrepancies(customer, actual):
+                operations.append(build_counter_repair(customer, actual, admin_user_id, repaired_at))
+                outcomes[customer["phone_number"]] = "fixed"
+            else:
+                outcomes[customer["phone_number"]] = "resolved"
+
+        if not operations:
+            return outcomes
+
+        collection = Customer.get_motor_collection()
+        result = await collection.bulk_write(operations, ordered=False)
+        if result.matched_count < len(operations):
+            attempted = [phone for phone, outcome in outcomes.items() if outcome == "fixed"]
+            written = set(await collection.distinct(
+                "phone_number", {"phone_number": {"$in": attempted}, "updated_at": repaired_at}
+            ))
+            for phone_number in attempted:
+                if phone_number not in written:
+                    outcomes[phone_number] = "changed"
+
+        return outcomes
 
     @staticmethod
     async def get_consistency_report() -> Dict:
@@ -329,3 +581,4 @@ class ConsistencyValidationService:
                 )
 
         return report
+
@@ -6,6 +6,7 @@ This module implements all customer-related business operations including
 CRUD operations, search functionality, statistics, and status management.
 """
 
+import asyncio
 from datetime import datetime, timedelta
 from typing import Optional
 from math import ceil
@@ -24,7 +25,215 @@ from app.core.config import settings
 # LoanConfig deprecated - now using FinancialPolicyConfig for all loan limits
 # from app.models.loan_config_model import LoanConfig
 from app.models.business_config_model import FinancialPolicyConfig
-from app.core.redis_cache import BusinessCache
+from app.services.config_snapshot_service import ConfigSnapshotService
+from app.core.redis_cache import BusinessCache, CacheTags
+from app.core.search_keys import customer_search_keys
+
+
+# Credit utilization tiers (utilization = total loan value / effective credit
+# limit, in percent): high > 80, medium 50-80, low between 0 and 50, none = 0
+CREDIT_UTILIZATION_TIERS = ("high", "medium", "low", "none")
+
+
+def build_credit_utilization_filter(tier: str, default_credit_limit: Decimal) -> Optional[dict]:
+    """
+    Build a $expr filter matching customers in a credit utilization tier.
+
+    The effective limit is the customer's credit_limit, or the system default
+    when it is unset, truncated to whole dollars. Percentages are compared
+    as loans * 100 against limit * threshold, so no division is needed.
+
+    Args:
+        tier: One of CREDIT_UTILIZATION_TIERS
+        default_credit_limit: Financial Policy default credit limit
+
+    Returns:
+        Query filter, or None for an unknown tier
+    """
+    if tier not in CREDIT_UTILIZATION_TIERS:
+        return None
+
+    loans = {"$ifNull": ["$total_loan_value", 0]}
+    if tier == "none":
+        return {"$expr": {"$eq": [loans, 0]}}
+
+    limit = "$$limit"
+    scaled_loans = "$$scaled_loans"
+    conditions = [{"$gt": [limit, 0]}]
+    if tier == "high":
+        conditions.append({"$gt": [scaled_loans, {"$multiply": [limit, 80]}]})
+    elif tier == "medium":
+        conditions.append({"$gte": [scaled_loans, {"$multiply": [limit, 50]}]})
+        conditions.append({"$lte": [scaled_loans, {"$multiply": [limit, 80]}]})
+    else:
+        conditions.append({"$gt": [scaled_loans, 0]})
+        conditions.append({"$lt": [scaled_loans, {"$multiply": [limit, 50]}]})
+
+    return {
+        "$expr": {
+            "$let": {
+                "vars": {
+                    "limit": {"$trunc": {"$ifNull": ["$credit_limit", int(default_credit_limit)]}},
+                    "scaled_loans": {"$multiply": [loans, 100]}
+                },
+                "in": {"$and": conditions}
+            }
+        }
+    }
+
+
+def build_semi_join_stage(collection: str, match: dict, local_field: str, foreign_field: str, as_field: str) -> list:
+    """
+    Build $lookup/$match stages keeping customers with at least one matching document.
+
+    The lookup stops at the first match, and the equality on foreign_field
+    plus the constant match is answered from the collection's compound index.
+
+    Args:
+        collection: Collection to look up in
+        match: Constant conditions on the looked-up documents
+        local_field: Customer field to join on
+        foreign_field: Field of the looked-up documents to join on
+        as_field: Temporary array field holding the match
+
+    Returns:
+        Aggregation stages
+    """
+    return [
+        {"$lookup": {
+            "from": collection,
+            "let": {"key": f"${local_field}"},
+            "pipeline": [
+                {"$match": {**match, "$expr": {"$eq": [f"${foreign_field}", "$$key"]}}},
+                {"$limit": 1},
+                {"$project": {"_id": 1}}
+            ],
+            "as": as_field
+        }},
+        {"$match": {f"{as_field}.0": {"$exists": True}}}
+    ]
+
+
+def build_customer_semi_joins(alerts_only: bool, follow_up_only: bool) -> list:
+    """
+    Build the semi-join stages for the alerts and follow-up list filters.
+
+    Args:
+        alerts_only: Keep customers with an active service alert
+        follow_up_only: Keep customers with an overdue transaction
+
+    Returns:
+        Aggregation stages (empty when neither filter is requested)
+    """
+    from app.models.pawn_transaction_model import TransactionStatus
+    from app.models.service_alert_model import AlertStatus
+
+    stages = []
+    if alerts_only:
+        stages.extend(build_semi_join_stage(
+            "service_alerts", {"status": AlertStatus.ACTIVE.value}, "phone_number", "customer_phone", "_active_alerts"
+        ))
+    if follow_up_only:
+        stages.extend(build_semi_join_stage(
+            "pawn_transactions", {"status": TransactionStatus.OVERDUE.value}, "phone_number", "customer_id", "_overdue_transactions"
+        ))
+    return stages
+
+
+def build_semi_join_page_pipeline(filters: dict, semi_joins: list, sort: list, skip: int, limit: int) -> list:
+    """
+    Build a customer list pipeline returning the total and one page in one document.
+
+    Args:
+        filters: Customer filters (applied before the semi-joins)
+        semi_joins: Stages from build_customer_semi_joins
+        sort: (field, direction) pairs
+        skip: Documents to skip
+        limit: Page size
+
+    Returns:
+        Aggregation pipeline for the customers collection
+    """
+    temporary_fields = [stage["$lookup"]["as"] for stage in semi_joins if "$lookup" in stage]
+    return [
+        {"$match": filters},
+        {"$sort": dict(sort)},
+        *semi_joins,
+        {"$project": {field: 0 for field in temporary_fields}},
+        {"$facet": {
+            "total": [{"$count": "count"}],
+            "customers": [{"$skip": skip}, {"$limit": limit}]
+        }}
+    ]
+
+
+# Customer statistics: VIP threshold (total loan value in dollars) and how
+# long a computed result is served from cache
+VIP_LOAN_VALUE_THRESHOLD = 5000
+CUSTOMER_STATS_TTL = 60
+
+
+def build_customer_stats_pipeline(
+    today_start_utc: datetime,
+    end_of_today_utc: datetime,
+    month_start_utc: datetime
+) -> list:
+    """
+    Build the $facet pipeline computing every dashboard customer count in one pass.
+
+    Args:
+        today_start_utc: Start of the business day (UTC)
+        end_of_today_utc: End of the business day (UTC)
+        month_start_utc: Start of the business month (UTC)
+
+    Returns:
+        Aggregation pipeline for the customers collection
+    """
+    return [
+        {"$project": {"status": 1, "created_at": 1, "total_loan_value": 1}},
+        {"$facet": {
+            "total": [{"$count": "count"}],
+            "by_status": [{"$group": {"_id": "$status", "count": {"$sum": 1}}}],
+            "created_today": [
+                {"$match": {"created_at": {"$gte": today_start_utc, "$lt": end_of_today_utc}}},
+                {"$count": "count"}
+            ],
+            "new_this_month": [
+                {"$match": {"created_at": {"$gte": month_start_utc}}},
+                {"$count": "count"}
+            ],
+            "vip": [
+                {"$match": {"total_loan_value": {"$gte": VIP_LOAN_VALUE_THRESHOLD}}},
+                {"$count": "count"}
+            ]
+        }}
+    ]
+
+
+def parse_customer_stats_facets(facets: dict) -> dict:
+    """
+    Turn the $facet result into CustomerStatsResponse count fields.
+
+    Args:
+        facets: The single document produced by build_customer_stats_pipeline
+
+    Returns:
+        Customer count fields (missing facets count as zero)
+    """
+    def facet_count(name: str) -> int:
+        rows = facets.get(name) or []
+        return rows[0]["count"] if rows else 0
+
+    by_status = {row["_id"]: row["count"] for row in facets.get("by_status") or []}
+    return {
+        "total_customers": facet_count("total"),
+        "active_customers": by_status.get(CustomerStatus.ACTIVE.value, 0),
+        "suspended_customers": by_status.get(CustomerStatus.SUSPENDED.value, 0),
+        "archived_customers": by_status.get(CustomerStatus.ARCHIVED.value, 0),
+        "customers_created_today": facet_count("created_today"),
+        "new_this_month": facet_count("new_this_month"),
+        "vip_customers": facet_count("vip")
+    }
 
 
 class CustomerService:
@@ -260,6 +469,18 @@ class CustomerService:
             # Use Beanie's update method
             await customer.update({"$set": update_dict})
             
+            # Keep the denormalised name search keys on the customer's transactions in sync
+            if "first_name" in update_dict or "last_name" in update_dict:
+                search_keys = customer_search_keys(
+                    update_dict.get("first_name", customer.first_name),
+                    update_dict.get("last_name", customer.last_name)
+                )
+                await PawnTransaction.get_motor_collection().update_many(
+                    {"customer_id": phone_number},
+                    {"$set": search_keys}
+                )
+                await BusinessCache.invalidate_transaction_caches(customer_phones=[phone_number])
+            
             # Store audit entries if any
             if audit_entries:
                 for audit in audit_entries:
@@ -361,49 +582,9 @@ class CustomerService:
             if vip_only:
                 filters["total_loan_value"] = {"$gte": 5000.0}
 
-            # Apply alerts filter if requested (customers with active service alerts)
-            if alerts_only:
-                from app.services.service_alert_service import ServiceAlertService
-                try:
-                    alert_stats = await ServiceAlertService.get_unique_customer_alert_count()
-                    customers_with_alerts = alert_stats.get("customers_with_alerts", [])
-                    if customers_with_alerts:
-                        filters["phone_number"] = {"$in": customers_with_alerts}
-                    else:
-                        # No customers with alerts, return empty result
-                        filters["phone_number"] = {"$in": []}
-                except Exception as e:
-                    # If alert service fails, skip filter to avoid breaking the query
-                    pass
-
-            # Apply follow-up filter if requested (customers with overdue transactions)
-            if follow_up_only:
-                from app.models.pawn_transaction_model import PawnTransaction, TransactionStatus
-
-                try:
-                    # Optimized aggregation to get unique customer IDs with overdue transactions
-                    pipeline = [
-                        {"$match": {"status": TransactionStatus.OVERDUE.value}},
-                        {"$group": {"_id": "$customer_id"}},
-                        {"$project": {"customer_id": "$_id", "_id": 0}}
-                    ]
-
-                    # Execute aggregation
-                    results = await PawnTransaction.get_motor_collection().aggregate(pipeline).to_list(None)
-                    follow_up_customer_ids = [result["customer_id"] for result in results]
-
-                    if follow_up_customer_ids:
-                        filters["phone_number"] = {"$in": follow_up_customer_ids}
-                    else:
-                        # No customers need follow-up, return empty result
-                        filters["phone_number"] = {"$in": []}
-                except Exception as e:
-                    # If follow-up calculation fails, silently skip filter
-                    CustomerService.logger.warning(
-                        "follow_up_filter_failed",
-                        error=str(e)
-                    )
-                    pass
+            # Apply alerts and follow-up filters (customers with active service
+            # alerts / overdue transactions) as server-side semi-joins
+            semi_joins = build_customer_semi_joins(alerts_only, follow_up_only)
 
             # Apply new this month filter if requested (customers created in current calendar month)
             if new_this_month:
@@ -447,8 +628,16 @@ class CustomerService:
                 filters["last_transaction_date"]["$lt"] = cutoff_date
 
             # ADVANCED FILTER 4: Credit Utilization
-            # Note: This filter is applied after sorting but before pagination (see below)
-            # to ensure accurate total counts across paginated results
+            # Evaluated server-side against the default limit fetched once, so
+            # the count and pagination below cover it like any other filter
+            if credit_utilization:
+                default_credit_limit = await Customer.get_default_credit_limit()
+                utilization_filter = build_credit_utilization_filter(credit_utilization, default_credit_limit)
+                if utilization_filter is None:
+                    # Unknown tier matches no customers
+                    filters["_id"] = {"$in": []}
+                else:
+                    filters.update(utilization_filter)
 
             # ADVANCED FILTER 5: Transaction Frequency
             if transaction_frequency:
@@ -518,16 +707,7 @@ class CustomerService:
                             {"last_name": {"$regex": regex_pattern, "$options": "i"}}
                         ]
             
-            # Create query
-            if filters:
-                query = Customer.find(filters)
-            else:
-                query = Customer.find()
-
-            # Get total count before pagination
-            total = await query.count()
-
-            # Validate and apply sorting
+            # Validate sorting
             if sort_by not in CustomerService.VALID_SORT_FIELDS:
                 CustomerService.logger.warning(
                     "invalid_sort_field_requested",
@@ -537,45 +717,29 @@ class CustomerService:
                 sort_by = "created_at"  # Default to created_at for invalid fields
 
             sort_direction = DESCENDING if sort_order == "desc" else ASCENDING
-            query = query.sort([(sort_by, sort_direction)])
-
-            # ADVANCED FILTER 4: Credit Utilization (Pre-Pagination Processing)
-            # Must be applied BEFORE pagination to get accurate results
-            if credit_utilization:
-                # Fetch ALL customers matching other filters first
-                all_customers = await query.to_list()
-
-                filtered_customers = []
-                for customer in all_customers:
-                    # Get effective credit limit (handles None by fetching system default)
-                    effective_limit = await customer.get_effective_credit_limit()
-
-                    # Calculate utilization percentage
-                    if effective_limit > 0:
-                        utilization = (customer.total_loan_value / int(effective_limit)) * 100
-
-                        # Match against requested tier
-                        if credit_utilization == "high" and utilization > 80:
-                            filtered_customers.append(customer)
-                        elif credit_utilization == "medium" and 50 <= utilization <= 80:
-                            filtered_customers.append(customer)
-                        elif credit_utilization == "low" and 0 < utilization < 50:
-                            filtered_customers.append(customer)
-                        elif credit_utilization == "none" and utilization == 0:
-                            filtered_customers.append(customer)
-                    elif credit_utilization == "none" and customer.total_loan_value == 0:
-                        # No credit limit but also no loans = none tier
-                        filtered_customers.append(customer)
-
-                # Update total to reflect filtered count
-                total = len(filtered_customers)
-
-                # Apply pagination to filtered results
-                skip = (page - 1) * per_page
-                customers = filtered_customers[skip:skip + per_page]
+            skip = (page - 1) * per_page
+
+            if semi_joins:
+                # Total and page come from one aggregation; the $sort has no
+                # $limit to coalesce with, so let it spill to disk when the
+                # sort field is not indexed
+                pipeline = build_semi_join_page_pipeline(filters, semi_joins, [(sort_by, sort_direction)], skip, per_page)
+                result = await Customer.get_motor_collection().aggregate(pipeline, allowDiskUse=True).to_list(length=1)
+                facets = result[0] if result else {}
+                total = facets["total"][0]["count"] if facets.get("total") else 0
+                customers = [Customer.model_validate(document) for document in facets.get("customers", [])]
             else:
-                # Apply pagination with optimized projection (no credit filter)
-                skip = (page - 1) * per_page
+                # Create query
+                if filters:
+                    query = Customer.find(filters)
+                else:
+                    query = Customer.find()
+
+                # Get total count before pagination
+                total = await query.count()
+
+                # Apply sorting and pagination
+                query = query.sort([(sort_by, sort_direction)])
                 customers = await query.skip(skip).limit(per_page).to_list()
 
             # Prefetch related data in batches if needed
@@ -807,7 +971,7 @@ class CustomerService:
     @staticmethod
     async def get_loan_limit_config() -> LoanLimitResponse:
         """Get current loan limit configuration from FinancialPolicyConfig"""
-        config = await FinancialPolicyConfig.get_current_config()
+        config = await ConfigSnapshotService.get(FinancialPolicyConfig)
 
         if not config:
             # Return default configuration
@@ -850,9 +1014,7 @@ class CustomerService:
             config.reason = request.reason
             config.updated_at = datetime.now()
             await config.save()
-
-        # Clear cache
-        BusinessCache.invalidate_financial_policy()
+            await ConfigSnapshotService.publish_change()
 
         return LoanLimitResponse(
             current_limit=config.max_active_loans_per_customer,
@@ -863,12 +1025,19 @@ class CustomerService:
 
     @staticmethod
     async def get_customer_statistics(timezone_header: Optional[str] = None) -> CustomerStatsResponse:
-        """Get comprehensive customer statistics for admin dashboard - using simple queries for reliability"""
-        try:
-            # Import timezone utilities
-            from app.core.timezone_utils import get_user_business_date, user_timezone_to_utc
-            from datetime import timedelta
+        """
+        Get customer statistics for the admin dashboard.
 
+        Customer counts come from one $facet aggregation, run concurrently
+        with the server-side distinct counts of customers with active alerts
+        and customers with overdue transactions. The result is cached for
+        CUSTOMER_STATS_TTL seconds per business date and timezone; customer,
+        alert and transaction writes invalidate it.
+        """
+        from app.core.timezone_utils import get_user_business_date, user_timezone_to_utc
+        from app.services.service_alert_service import ServiceAlertService
+
+        try:
             # Calculate date boundaries in user's timezone
             business_date = get_user_business_date(timezone_header)
             today_start = business_date  # Start of today in user's timezone
@@ -879,74 +1048,47 @@ class CustomerService:
             month_start_utc = user_timezone_to_utc(month_start, timezone_header)
             end_of_today_utc = today_start_utc + timedelta(days=1)
 
-            # Use simple count queries instead of complex aggregation
-            # Total customers
-            total_customers = await Customer.count()
-
-            # Customers by status
-            active_customers = await Customer.find(Customer.status == CustomerStatus.ACTIVE).count()
-            suspended_customers = await Customer.find(Customer.status == CustomerStatus.SUSPENDED).count()
-            archived_customers = await Customer.find(Customer.status == CustomerStatus.ARCHIVED).count()
+            cache_key = f"{CacheTags.CUSTOMER_STATS}:{today_start_utc.isoformat()}"
+            cached_stats = await BusinessCache.get(cache_key)
+            if cached_stats:
+                return CustomerStatsResponse(**cached_stats)
 
-            # Customers created today (using timezone-aware UTC boundaries)
-            customers_created_today = await Customer.find(
-                Customer.created_at >= today_start_utc,
-                Customer.created_at < end_of_today_utc
-            ).count()
-
-            # Customers created this month (using timezone-aware UTC boundaries)
-            new_this_month = await Customer.find(
-                Customer.created_at >= month_start_utc
-            ).count()
-
-            # VIP customers (total_loan_value >= $5,000)
-            vip_customers = await Customer.find(Customer.total_loan_value >= 5000.0).count()
-
-            # Get service alerts count
-            from app.services.service_alert_service import ServiceAlertService
-            try:
-                alert_stats = await ServiceAlertService.get_unique_customer_alert_count()
-                service_alerts = alert_stats.get("unique_customer_count", 0)
-            except Exception:
-                service_alerts = 0
-
-            # Calculate customers needing follow-up with optimized aggregation
             from app.models.pawn_transaction_model import PawnTransaction, TransactionStatus
 
-            # Use aggregation to get unique customers with overdue transactions
+            # Unique customers with overdue transactions
             overdue_pipeline = [
                 {"$match": {"status": TransactionStatus.OVERDUE.value}},
                 {"$group": {"_id": "$customer_id"}},
                 {"$count": "count"}
             ]
-            overdue_result = await PawnTransaction.aggregate(overdue_pipeline).to_list()
-            needs_follow_up = overdue_result[0]["count"] if overdue_result else 0
+            facets, service_alerts, overdue_result = await asyncio.gather(
+                Customer.get_motor_collection().aggregate(
+                    build_customer_stats_pipeline(today_start_utc, end_of_today_utc, month_start_utc)
+                ).to_list(length=1),
+                ServiceAlertService.count_customers_with_active_alerts(),
+                PawnTransaction.get_motor_collection().aggregate(overdue_pipeline).to_list(length=1)
+            )
 
-            return CustomerStatsResponse(
-                total_customers=total_customers,
-                active_customers=active_customers,
-                suspended_customers=suspended_customers,
-                archived_customers=archived_customers,
-                customers_created_today=customers_created_today,
+            counts = parse_customer_stats_facets(facets[0] if facets else {})
+            stats = CustomerStatsResponse(
+                **counts,
                 avg_transactions_per_customer=0.0,
-                new_this_month=new_this_month,
                 service_alerts=service_alerts,
-                needs_follow_up=needs_follow_up,
-                vip_customers=vip_customers
+                needs_follow_up=overdue_result[0]["count"] if overdue_result else 0
             )
-        
+
+            await BusinessCache.set(
+                cache_key, stats.model_dump(), ttl_seconds=CUSTOMER_STATS_TTL, tags=[CacheTags.CUSTOMER_STATS]
+            )
+            return stats
+
         except Exception as e:
-            # Log the error for debugging
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.error(f"Error in get_customer_statistics: {str(e)}", exc_info=True)
+            CustomerService.logger.error("Error in get_customer_statistics", error=str(e), exc_info=True)
 
             # Get unique customer alert count even in error case
-            from app.services.service_alert_service import ServiceAlertService
             try:
-                alert_stats = await ServiceAlertService.get_unique_customer_alert_count()
-                service_alerts = alert_stats.get("unique_customer_count", 0)
-            except:
+                service_alerts = await ServiceAlertService.count_customers_with_active_alerts()
+            except Exception:
                 service_alerts = 0
 
             # Return zeros with service alerts (so we can see there's an issue but alerts still work)
@@ -0,0 +1,747 @@
+"""
+Daily Rollup Service
+
+Maintains the daily_rollups collection and serves trend/metric reads from it.
+
+Each business day is stored once per tracked timezone. Payments, extensions,
+new loans and status transitions apply $inc upserts to the rollup of the day
+they happen on, so reads for a closed day are a single indexed document fetch.
+Only the current day is computed live (with the same aggregations the backfill
+uses), which keeps /trends and the revenue stat cards at <= 366 small
+documents per request regardless of collection size.
+
+Active loan counts are not stored per day. Instead each day records the net
+change in active loans, and the count at the end of day D is the live active
+count minus the deltas recorded after D.
+"""
+
+import asyncio
+import calendar
+import time
+from datetime import datetime, date, timedelta, UTC
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+import structlog
+from pymongo import UpdateOne
+
+from app.models.daily_rollup_model import DailyRollup
+from app.models.extension_model import Extension
+from app.models.pawn_transaction_model import PawnTransaction
+from app.models.payment_model import Payment
+from app.services.trends_aggregation_service import (
+    ACTIVE_STATUSES,
+    CLOSED_EVENT_STATUSES,
+    empty_revenue_bucket,
+    get_timezone_name,
+)
+
+# Configure logger
+logger = structlog.get_logger("daily_rollup")
+
+# Maximum number of rollup documents a single read may touch
+MAX_ROLLUP_DAYS = 366
+
+# How long the set of tracked timezones is cached in-process
+COVERAGE_TTL_SECONDS = 300
+
+ROLLUP_DATE_FORMAT = "%Y-%m-%d"
+
+REVENUE_FIELDS = [
+    "total_revenue",
+    "principal_collected",
+    "interest_collected",
+    "overdue_fees",
+    "extension_fees",
+    "payment_count",
+]
+
+LOAN_EVENT_FIELDS = [
+    "new_loans",
+    "new_loan_amount",
+    "redeemed",
+    "redeemed_amount",
+    "forfeited",
+    "forfeited_amount",
+    "sold",
+    "sold_amount",
+    "active_loans_delta",
+]
+
+ROLLUP_FIELDS = REVENUE_FIELDS + LOAN_EVENT_FIELDS
+
+
+def empty_rollup() -> Dict[str, int]:
+    """Create a zeroed set of rollup counters."""
+    return {field: 0 for field in ROLLUP_FIELDS}
+
+
+def local_date_key(instant: datetime, timezone_name: str) -> str:
+    """Render a UTC instant (naive or aware) as a business date key in a timezone."""
+    if instant.tzinfo is None:
+        instant = instant.replace(tzinfo=UTC)
+    return instant.astimezone(ZoneInfo(timezone_name)).strftime(ROLLUP_DATE_FORMAT)
+
+
+def local_day_bounds(date_key: str, timezone_name: str) -> Tuple[datetime, datetime]:
+    """
+    Get the naive UTC [start, end) instants of a business day in a timezone.
+
+    Naive values match how MongoDB returns stored datetimes.
+    """
+    tz = ZoneInfo(timezone_name)
+    day = datetime.strptime(date_key, ROLLUP_DATE_FORMAT)
+    start = day.replace(tzinfo=tz).astimezone(UTC).replace(tzinfo=None)
+    end = (day + timedelta(days=1)).replace(tzinfo=tz).astimezone(UTC).replace(tzinfo=None)
+    return start, end
+
+
+def iter_date_keys(start_key: str, end_key: str) -> List[str]:
+    """List every date key from start_key to end_key inclusive."""
+    current = datetime.strptime(start_key, ROLLUP_DATE_FORMAT).date()
+    last = datetime.strptime(end_key, ROLLUP_DATE_FORMAT).date()
+    keys = []
+    while current <= last:
+        keys.append(current.strftime(ROLLUP_DATE_FORMAT))
+        current += timedelta(days=1)
+    return keys
+
+
+def shift_date_key(date_key: str, days: int) -> str:
+    """Move a date key by a number of days."""
+    shifted = datetime.strptime(date_key, ROLLUP_DATE_FORMAT).date() + timedelta(days=days)
+    return shifted.strftime(ROLLUP_DATE_FORMAT)
+
+
+def bucket_end_key(bucket_key: str) -> str:
+    """Get the last date key covered by a trends bucket ("YYYY-MM-DD" or "YYYY-MM")."""
+    if len(bucket_key) == 7:
+        year, month = map(int, bucket_key.split("-"))
+        return date(year, month, calendar.monthrange(year, month)[1]).strftime(ROLLUP_DATE_FORMAT)
+    return bucket_key
+
+
+def build_status_change_increments(
+    old_status: Optional[str],
+    new_status: str,
+    loan_amount: int,
+    sign: int = 1
+) -> Dict[str, int]:
+    """
+    Build the rollup counters affected by a status transition.
+
+    Args:
+        old_status: Previous status (None for a newly created loan)
+        new_status: Status after the transition
+        loan_amount: Principal of the loan
+        sign: 1 to record the transition, -1 to reverse it
+
+    Returns:
+        Non-zero counter increments
+    """
+    increments: Dict[str, int] = {}
+
+    if new_status in CLOSED_EVENT_STATUSES and old_status != new_status:
+        increments[new_status] = sign
+        increments[f"{new_status}_amount"] = sign * int(loan_amount or 0)
+
+    was_active = old_status in ACTIVE_STATUSES
+    is_active = new_status in ACTIVE_STATUSES
+    if was_active != is_active:
+        increments["active_loans_delta"] = sign * (1 if is_active else -1)
+
+    return increments
+
+
+class DailyRollupService:
+    """Service for maintaining and reading per-day business rollups"""
+
+    # timezone -> earliest rollup date, cached in-process
+    _coverage: Dict[str, str] = {}
+    _coverage_loaded_at: float = 0.0
+
+    # ========== COVERAGE ==========
+
+    @classmethod
+    async def get_coverage(cls, force_refresh: bool = False) -> Dict[str, str]:
+        """
+        Get the tracked timezones and the first day each one is backfilled from.
+
+        A timezone is tracked once the backfill script has written rollups for
+        it; incremental updates are only applied to tracked timezones.
+        """
+        if not force_refresh and time.monotonic() - cls._coverage_loaded_at < COVERAGE_TTL_SECONDS:
+            return cls._coverage
+
+        rows = await DailyRollup.aggregate([
+            {"$group": {"_id": "$timezone", "first_date": {"$min": "$date"}}}
+        ]).to_list()
+
+        cls._coverage = {row["_id"]: row["first_date"] for row in rows}
+        cls._coverage_loaded_at = time.monotonic()
+        return cls._coverage
+
+    @classmethod
+    def invalidate_coverage(cls) -> None:
+        """Force the tracked timezone set to be reloaded on next use."""
+        cls._coverage_loaded_at = 0.0
+
+    @staticmethod
+    async def is_covered(timezone_name: str, start_key: str) -> bool:
+        """Check whether rollups for a timezone go back at least to start_key."""
+        first_date = (await DailyRollupService.get_coverage()).get(timezone_name)
+        return first_date is not None and first_date <= start_key
+
+    # ========== INCREMENTAL UPDATES ==========
+
+    @staticmethod
+    async def _apply_increments(instant: Optional[datetime], increments: Dict[str, int]) -> None:
+        """
+        $inc the rollup of the day containing `instant` for every tracked timezone.
+
+        Rollup maintenance must never fail the business operation that
+        triggered it, so errors are logged and swallowed; the backfill script
+        can rebuild any affected range.
+        """
+        increments = {field: value for field, value in increments.items() if value}
+        if not increments:
+            return
+
+        try:
+            coverage = await DailyRollupService.get_coverage()
+            if not coverage:
+                return
+
+            instant = instant or datetime.now(UTC)
+            collection = DailyRollup.get_motor_collection()
+            now = datetime.now(UTC)
+
+            await asyncio.gather(*[
+                collection.update_one(
+                    {"timezone": timezone_name, "date": local_date_key(instant, timezone_name)},
+                    {"$inc": increments, "$set": {"updated_at": now}},
+                    upsert=True
+                )
+                for timezone_name in coverage
+            ])
+
+            # Drop trend responses built before this update
+            from app.api.api_v1.handlers.trends import invalidate_trends_cache
+            invalidate_trends_cache()
+        except Exception as e:
+            logger.warning("Failed to update daily rollups", error=str(e), increments=increments)
+
+    @staticmethod
+    async def record_payment(payment: Payment) -> None:
+        """Add a processed payment to the rollup of its payment date."""
+        await DailyRollupService._apply_increments(payment.payment_date, {
+            "total_revenue": int(payment.payment_amount or 0),
+            "principal_collected": int(payment.principal_portion or 0),
+            "interest_collected": int(payment.interest_portion or 0),
+            "overdue_fees": int(payment.overdue_fee_portion or 0),
+            "payment_count": 1
+        })
+
+    @staticmethod
+    async def record_extension(extension: Extension, sign: int = 1) -> None:
+        """
+        Add (sign=1) or remove (sign=-1, on cancellation) extension fees from
+        the rollup of the extension date.
+        """
+        fee = sign * int(extension.total_extension_fee or 0)
+        await DailyRollupService._apply_increments(extension.extension_date, {
+            "extension_fees": fee,
+            "total_revenue": fee
+        })
+
+    @staticmethod
+    async def record_extensions(extensions: List[Extension]) -> None:
+        """Add the fees of a batch of extensions, one rollup update per extension date."""
+        fees_by_date: Dict[datetime, int] = {}
+        for extension in extensions:
+            fees_by_date[extension.extension_date] = (
+                fees_by_date.get(extension.extension_date, 0) + int(extension.total_extension_fee or 0)
+            )
+        await asyncio.gather(*[
+            DailyRollupService._apply_increments(extension_date, {"extension_fees": fee, "total_revenue": fee})
+            for extension_date, fee in fees_by_date.items()
+        ])
+
+    @staticmethod
+    async def record_loan_created(transaction: PawnTransaction) -> None:
+        """Count a newly created loan and its entry into the active population."""
+        increments = build_status_change_increments(None, transaction.status, transaction.loan_amount)
+        increments["new_loans"] = 1
+        increments["new_loan_amount"] = int(transaction.loan_amount or 0)
+        await DailyRollupService._apply_increments(transaction.created_at, increments)
+
+    @staticmethod
+    async def record_status_change(
+        transaction: PawnTransaction,
+        old_status: str,
+        new_status: str,
+        changed_at: Optional[datetime] = None,
+        previous_changed_at: Optional[datetime] = None
+    ) -> None:
+        """
+        Record a status transition.
+
+        When a transaction leaves a redeemed/forfeited/sold status (reversal),
+        the original event is removed from the day it was recorded on, which
+        is given by previous_changed_at (the transaction's updated_at before
+        the reversal).
+
+        Args:
+            transaction: Transaction whose status changed
+            old_status: Status before the change
+            new_status: Status after the change
+            changed_at: When the change happened (defaults to now)
+            previous_changed_at: When old_status was entered
+        """
+        if old_status == new_status:
+            return
+
+        old_status = getattr(old_status, "value", old_status)
+        new_status = getattr(new_status, "value", new_status)
+
+        if old_status in CLOSED_EVENT_STATUSES and previous_changed_at:
+            await DailyRollupService._apply_increments(previous_changed_at, {
+                old_status: -1,
+                f"{old_status}_amount": -int(transaction.loan_amount or 0)
+            })
+
+        increments = build_status_change_increments(old_status, new_status, transaction.loan_amount)
+        await DailyRollupService._apply_increments(changed_at, increments)
+
+    @staticmethod
+    async def record_status_changes(
+        changes: List[Tuple[PawnTransaction, str, Optional[datetime]]],
+        new_status: str,
+        changed_at: Optional[datetime] = None
+    ) -> None:
+        """
+        Record the same status transition for a batch of transactions.
+
+        Increments are summed, so the batch costs one rollup update for the
+        change day plus one per distinct reversal day.
+
+        Args:
+            changes: (transaction, old_status, previous_changed_at) per transaction
+            new_status: Status after the change
+            changed_at: When the changes happened (defaults to now)
+        """
+        new_status = getattr(new_status, "value", new_status)
+        increments: Dict[str, int] = {}
+        reversals: Dict[datetime, Dict[str, int]] = {}
+
+        for transaction, old_status, previous_changed_at in changes:
+            old_status = getattr(old_status, "value", old_status)
+            if old_status == new_status:
+                continue
+
+            loan_amount = int(transaction.loan_amount or 0)
+            if old_status in CLOSED_EVENT_STATUSES and previous_changed_at:
+                reversal = reversals.setdefault(previous_changed_at, {})
+                reversal[old_status] = reversal.get(old_status, 0) - 1
+                reversal[f"{old_status}_amount"] = reversal.get(f"{old_status}_amount", 0) - loan_amount
+
+            for field, value in build_status_change_increments(old_status, new_status, loan_amount).items():
+                increments[field] = increments.get(field, 0) + value
+
+        await asyncio.gather(
+            *[DailyRollupService._apply_increments(instant, reversal) for instant, reversal in reversals.items()],
+            DailyRollupService._apply_increments(changed_at, increments)
+        )
+
+    # ========== LIVE COMPUTATION / BACKFILL ==========
+
+    @staticmethod
+    def build_rollup_pipelines(
+        start_date: datetime,
+        end_date: datetime,
+        timezone_name: str
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Build the per-day pipelines used for backfilling and for today's live rollup.
+
+        Args:
+            start_date: Inclusive naive UTC start
+            end_date: Exclusive naive UTC end
+            timezone_name: IANA timezone for day boundaries
+
+        Returns:
+            Pipelines keyed by source ("payments", "extensions", "new_loans", "closed")
+        """
+        window = {"$gte": start_date, "$lt": end_date}
+
+        def day_key(date_expr: Any) -> Dict[str, Any]:
+            return {"$dateToString": {"format": ROLLUP_DATE_FORMAT, "date": date_expr, "timezone": timezone_name}}
+
+        return {
+            "payments": [
+                {"$match": {"payment_date": window}},
+                {
+                    "$group": {
+                        "_id": day_key("$payment_date"),
+                        "total_revenue": {"$sum": "$payment_amount"},
+                        "principal_collected": {"$sum": "$principal_portion"},
+                        "interest_collected": {"$sum": "$interest_portion"},
+                        "overdue_fees": {"$sum": "$overdue_fee_portion"},
+                        "payment_count": {"$sum": 1}
+                    }
+                }
+            ],
+            "extensions": [
+                {"$match": {"extension_date": window, "is_cancelled": {"$ne": True}}},
+                {
+                    "$group": {
+                        "_id": day_key("$extension_date"),
+                        "extension_fees": {"$sum": "$total_extension_fee"}
+                    }
+                }
+            ],
+            "new_loans": [
+                {"$match": {"created_at": window}},
+                {
+                    "$group": {
+                        "_id": day_key("$created_at"),
+                        "count": {"$sum": 1},
+                        "amount": {"$sum": "$loan_amount"}
+                    }
+                }
+            ],
+            # Loans that left the active population (any non-active status),
+            # dated by their last update like the /trends/loans aggregation
+            "closed": [
+                {
+                    "$match": {
+                        "status": {"$nin": ACTIVE_STATUSES},
+                        "$or": [
+                            {"updated_at": window},
+                            {"updated_at": None, "created_at": window}
+                        ]
+                    }
+                },
+                {
+                    "$group": {
+                        "_id": {
+                            "status": "$status",
+                            "day": day_key({"$ifNull": ["$updated_at", "$created_at"]})
+                        },
+                        "count": {"$sum": 1},
+                        "amount": {"$sum": "$loan_amount"}
+                    }
+                }
+            ]
+        }
+
+    @staticmethod
+    async def compute_rollups(
+        start_date: datetime,
+        end_date: datetime,
+        timezone_name: str
+    ) -> Dict[str, Dict[str, int]]:
+        """
+        Compute rollup counters from source collections for a UTC window.
+
+        Returns:
+            Mapping of date key to rollup counters (days without activity are omitted)
+        """
+        pipelines = DailyRollupService.build_rollup_pipelines(start_date, end_date, timezone_name)
+
+        payment_rows, extension_rows, new_loan_rows, closed_rows = await asyncio.gather(
+            Payment.aggregate(pipelines["payments"]).to_list(),
+            Extension.aggregate(pipelines["extensions"]).to_list(),
+            PawnTransaction.aggregate(pipelines["new_loans"]).to_list(),
+            PawnTransaction.aggregate(pipelines["closed"]).to_list()
+        )
+
+        rollups: Dict[str, Dict[str, int]] = {}
+
+        for row in payment_rows:
+            day = rollups.setdefault(row["_id"], empty_rollup())
+            for field in ("total_revenue", "principal_collected", "interest_collected", "overdue_fees", "payment_count"):
+                day[field] += int(row.get(field) or 0)
+
+        for row in extension_rows:
+            day = rollups.setdefault(row["_id"], empty_rollup())
+            fees = int(row.get("extension_fees") or 0)
+            day["extension_fees"] += fees
+            day["total_revenue"] += fees
+
+        for row in new_loan_rows:
+            day = rollups.setdefault(row["_id"], empty_rollup())
+            day["new_loans"] += row["count"]
+            day["new_loan_amount"] += int(row.get("amount") or 0)
+            day["active_loans_delta"] += row["count"]
+
+        for row in closed_rows:
+            status_value = row["_id"]["status"]
+            day = rollups.setdefault(row["_id"]["day"], empty_rollup())
+            if status_value in CLOSED_EVENT_STATUSES:
+                day[status_value] += row["count"]
+                day[f"{status_value}_amount"] += int(row.get("amount") or 0)
+            day["active_loans_delta"] -= row["count"]
+
+        return rollups
+
+    @staticmethod
+    async def compute_today(timezone_name: str) -> Tuple[str, Dict[str, int]]:
+        """Compute the current business day's rollup live."""
+        today_key = local_date_key(datetime.now(UTC), timezone_name)
+        start, end = local_day_bounds(today_key, timezone_name)
+        rollups = await DailyRollupService.compute_rollups(start, end, timezone_name)
+        return today_key, rollups.get(today_key, empty_rollup())
+
+    @staticmethod
+    async def rebuild_range(start_key: str, end_key: str, timezone_name: str) -> int:
+        """
+        Rebuild rollups for every day in [start_key, end_key] from source data.
+
+        Every day gets a document (zeroed if there was no activity) so that the
+        first rollup date marks where coverage for the timezone begins.
+
+        Returns:
+            Number of rollup documents written
+        """
+        start, _ = local_day_bounds(start_key, timezone_name)
+        _, end = local_day_bounds(end_key, timezone_name)
+        rollups = await DailyRollupService.compute_rollups(start, end, timezone_name)
+
+        now = datetime.now(UTC)
+        operations = [
+            UpdateOne(
+                {"timezone": timezone_name, "date": date_key},
+                {"$set": {**rollups.get(date_key, empty_rollup()), "updated_at": now}},
+                upsert=True
+            )
+            for date_key in iter_date_keys(start_key, end_key)
+        ]
+
+        written = 0
+        collection = DailyRollup.get_motor_collection()
+        for offset in range(0, len(operations), 500):
+            batch = operations[offset:offset + 500]
+            await collection.bulk_write(batch, ordered=False)
+            written += len(batch)
+
+        DailyRollupService.invalidate_coverage()
+        logger.info("Daily rollups rebuilt",
+                    timezone=timezone_name,
+                    start=start_key,
+                    end=end_key,
+                    days=written)
+        return written
+
+    # ========== READS ==========
+
+    @staticmethod
+    async def get_rollups(timezone_name: str, start_key: str, end_key: str) -> Dict[str, Dict[str, Any]]:
+        """Fetch stored rollups for [start_key, end_key] (at most MAX_ROLLUP_DAYS documents)."""
+        if start_key > end_key:
+            return {}
+
+        cursor = DailyRollup.get_motor_collection().find(
+            {"timezone": timezone_name, "date": {"$gte": start_key, "$lte": end_key}},
+            {"_id": 0, "date": 1, **{field: 1 for field in ROLLUP_FIELDS}}
+        ).sort("date", 1).limit(MAX_ROLLUP_DAYS)
+
+        return {doc["date"]: doc async for doc in cursor}
+
+    @staticmethod
+    async def _load_days(
+        timezone_name: str,
+        start_key: str,
+        end_key: str,
+        today_key: str
+    ) -> Dict[str, Dict[str, Any]]:
+        """Load closed days from rollups and today (if in range) live."""
+        last_closed_key = min(end_key, shift_date_key(today_key, -1))
+
+        if end_key >= today_key:
+            days, (_, today) = await asyncio.gather(
+                DailyRollupService.get_rollups(timezone_name, start_key, last_closed_key),
+                DailyRollupService.compute_today(timezone_name)
+            )
+            days[today_key] = today
+        else:
+            days = await DailyRollupService.get_rollups(timezone_name, start_key, last_closed_key)
+
+        return days
+
+    @staticmethod
+    def _resolve_window(
+        start_date: datetime,
+        end_date: datetime,
+        timezone_name: str
+    ) -> Tuple[str, str, str]:
+        """
+        Get (start_key, end_key, today_key) for a trends window.
+
+        Window bounds are instants (aware, or naive UTC) and are converted to
+        the rollup timezone before taking their business date.
+        """
+        today_key = local_date_key(datetime.now(UTC), timezone_name)
+        return (
+            local_date_key(start_date, timezone_name),
+            local_date_key(end_date, timezone_name),
+            today_key
+        )
+
+    @staticmethod
+    async def get_revenue_buckets(
+        start_date: datetime,
+        end_date: datetime,
+        date_format: str,
+        timezone_header: Optional[str]
+    ) -> Optional[Dict[str, Dict[str, Any]]]:
+        """
+        Build revenue trend buckets from rollups.
+
+        Returns the same shape as TrendsAggregationService.aggregate_revenue_buckets,
+        or None when rollups do not cover the window (the caller then falls back
+        to the aggregation engine).
+        """
+        timezone_name = get_timezone_name(timezone_header)
+        start_key, end_key, today_key = DailyRollupService._resolve_window(start_date, end_date, timezone_name)
+
+        if len(iter_date_keys(start_key, end_key)) > MAX_ROLLUP_DAYS:
+            return None
+        if not await DailyRollupService.is_covered(timezone_name, start_key):
+            return None
+
+        days = await DailyRollupService._load_days(timezone_name, start_key, end_key, today_key)
+
+        revenue_by_date: Dict[str, Dict[str, Any]] = {}
+        for date_key, day in days.items():
+            if not (day.get("payment_count") or day.get("extension_fees") or day.get("total_revenue")):
+                continue
+
+            bucket_key = date_key[:7] if date_format == "%Y-%m" else date_key
+            bucket = revenue_by_date.setdefault(bucket_key, empty_revenue_bucket(bucket_key))
+            for field in ("total_revenue", "principal_collected", "interest_collected", "extension_fees", "overdue_fees"):
+                bucket[field] += Decimal(int(day.get(field) or 0))
+            bucket["payment_count"] += int(day.get("payment_count") or 0)
+
+        return revenue_by_date
+
+    @staticmethod
+    async def get_loan_trends(
+        start_date: datetime,
+        end_date: datetime,
+        date_format: str,
+        timezone_header: Optional[str],
+        active_keys: List[str]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Build loan trend buckets from rollups.
+
+        Returns the same shape as TrendsAggregationService.aggregate_loan_trends,
+        or None when rollups do not cover the window.
+
+        Args:
+            start_date: Window start (aware, or naive UTC)
+            end_date: Window end (aware, or naive UTC)
+            date_format: Bucket key format ("%Y-%m-%d" or "%Y-%m")
+            timezone_header: Client timezone from X-Client-Timezone header
+            active_keys: Bucket keys that need an end-of-bucket active loan count
+        """
+        timezone_name = get_timezone_name(timezone_header)
+        start_key, end_key, today_key = DailyRollupService._resolve_window(start_date, end_date, timezone_name)
+
+        # Monthly buckets may end after the window, so active counts need
+        # rollups through the last bucket boundary (or yesterday)
+        yesterday_key = shift_date_key(today_key, -1)
+        boundary_end_key = max([end_key] + [bucket_end_key(key) for key in active_keys])
+        last_closed_key = min(boundary_end_key, yesterday_key)
+
+        if len(iter_date_keys(start_key, max(start_key, last_closed_key))) > MAX_ROLLUP_DAYS:
+            return None
+        if not await DailyRollupService.is_covered(timezone_name, start_key):
+            return None
+
+        async def tail_delta() -> int:
+            # Active-loan changes between the last fetched day and yesterday
+            if last_closed_key >= yesterday_key:
+                return 0
+            rows = await DailyRollup.aggregate([
+                {"$match": {"timezone": timezone_name, "date": {"$gt": last_closed_key, "$lte": yesterday_key}}},
+                {"$group": {"_id": None, "delta": {"$sum": "$active_loans_delta"}}}
+            ]).to_list()
+            return int(rows[0]["delta"]) if rows else 0
+
+        days, (_, today), tail, current_active = await asyncio.gather(
+            DailyRollupService.get_rollups(timezone_name, start_key, last_closed_key),
+            DailyRollupService.compute_today(timezone_name),
+            tail_delta(),
+            PawnTransaction.find({"status": {"$in": ACTIVE_STATUSES}}).count()
+        )
+
+        closed: Dict[Tuple[str, str], Dict[str, int]] = {}
+        in_window = {date_key: day for date_key, day in days.items() if date_key <= end_key}
+        if start_key <= today_key <= end_key:
+            in_window[today_key] = today
+
+        transactions_in_period = 0
+        for date_key, day in in_window.items():
+            bucket_key = date_key[:7] if date_format == "%Y-%m" else date_key
+            transactions_in_period += int(day.get("new_loans") or 0)
+            for status_value in CLOSED_EVENT_STATUSES:
+                count = int(day.get(status_value) or 0)
+                if not count:
+                    continue
+                bucket = closed.setdefault((status_value, bucket_key), {"count": 0, "amount": 0})
+                bucket["count"] += count
+                bucket["amount"] += int(day.get(f"{status_value}_amount") or 0)
+
+        # Walk backwards from today: active(D) = active(D + 1) - delta(D + 1)
+        active_by_day: Dict[str, int] = {}
+        running = current_active - int(today.get("active_loans_delta") or 0) - tail
+        for date_key in reversed(iter_date_keys(start_key, last_closed_key) if start_key <= last_closed_key else []):
+            active_by_day[date_key] = running
+            running -= int(days.get(date_key, {}).get("active_loans_delta") or 0)
+        active_before_start = running
+
+        active_loans = {}
+        for bucket_key in active_keys:
+            boundary_key = bucket_end_key(bucket_key)
+            if boundary_key >= today_key:
+                active_loans[bucket_key] = current_active
+            else:
+                active_loans[bucket_key] = active_by_day.get(boundary_key, active_before_start)
+
+        logger.debug("Loan trends served from daily rollups",
+                     timezone=timezone_name,
+                     rollup_days=len(days),
+                     boundaries=len(active_keys))
+
+        return {
+            "closed": closed,
+            "active_loans": active_loans,
+            "total_transactions": transactions_in_period + active_before_start,
+            "transactions_in_period": transactions_in_period,
+            "current_active_loans": current_active
+        }
+
+    @staticmethod
+    async def sum_revenue(
+        start_key: str,
+        end_key: str,
+        timezone_header: Optional[str]
+    ) -> Optional[int]:
+        """
+        Sum total revenue (payments + extension fees) for [start_key, end_key].
+
+        Returns None when rollups do not cover the range.
+        """
+        timezone_name = get_timezone_name(timezone_header)
+        today_key = local_date_key(datetime.now(UTC), timezone_name)
+
+        if len(iter_date_keys(start_key, end_key)) > MAX_ROLLUP_DAYS:
+            return None
+        if not await DailyRollupService.is_covered(timezone_name, start_key):
+            return None
+
+        days = await DailyRollupService._load_days(timezone_name, start_key, end_key, today_key)
+        return sum(int(day.get("total_revenue") or 0) for day in days.values())
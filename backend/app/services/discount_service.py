@@ -137,7 +137,8 @@ class DiscountService:
         admin_user: User,
         admin_pin: str,
         discount_amount: int,
-        discount_reason: str
+        discount_reason: str,
+        pin_verified: bool = False
     ) -> None:
         """
         Verify admin PIN and authorization for discount.
@@ -147,6 +148,8 @@ class DiscountService:
             admin_pin: Admin PIN for verification
             discount_amount: Discount amount
             discount_reason: Reason for discount
+            pin_verified: True when admin_user was resolved from admin_pin
+                (UserService.verify_admin_pin), which skips a second bcrypt check
 
         Raises:
             AuthenticationError: If admin verification fails
@@ -157,7 +160,7 @@ class DiscountService:
             raise AuthenticationError("Only administrators can approve discounts")
 
         # Verify admin PIN
-        if not admin_user.verify_pin(admin_pin):
+        if not pin_verified and not await admin_user.verify_pin_async(admin_pin):
             logger.warning(
                 "Invalid admin PIN for discount approval",
                 admin_user_id=admin_user.user_id,
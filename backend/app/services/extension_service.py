@@ -7,37 +7,57 @@ validation, calendar month calculations, fee processing, and automatic status up
 
 # Standard library imports
 from datetime import datetime, UTC, timedelta
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Set, Tuple
+
+# Third-party imports
+from beanie.odm.utils.dump import get_dict
+from beanie.operators import In
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
 
 # Local imports
 from app.models.extension_model import Extension
 from app.models.pawn_transaction_model import PawnTransaction, TransactionStatus
 from app.models.user_model import User, UserStatus
-from app.models.audit_entry_model import AuditActionType
+from app.models.audit_entry_model import AuditActionType, create_audit_entry, create_discount_audit
 from app.core.timezone_utils import utc_to_user_timezone, get_user_now, user_timezone_to_utc
+from app.core.redis_cache import BusinessCache
 from app.services.notes_service import notes_service
-from app.services.formatted_id_service import FormattedIdService
-
-# Cache invalidation utility
-def _invalidate_search_caches():
-    """Helper function to invalidate search-related caches when transaction data changes"""
-    try:
-        # Import here to avoid circular imports
-        import asyncio
-        from app.services.unified_search_service import UnifiedSearchService
-        
-        # Create async context for cache invalidation
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            # Schedule as a task in the running loop
-            asyncio.create_task(UnifiedSearchService.invalidate_search_caches())
-        else:
-            # Run directly if no loop is running
-            asyncio.run(UnifiedSearchService.invalidate_search_caches())
-            
-    except Exception as e:
-        # Don't raise error as cache invalidation is not critical
-        pass
+from app.services.formatted_id_service import EXTENSION_SEQUENCE, FormattedIdService
+from app.services.daily_rollup_service import DailyRollupService
+
+
+# Statuses that can no longer be extended
+NON_EXTENDABLE_STATUSES = (TransactionStatus.SOLD, TransactionStatus.REDEEMED, TransactionStatus.FORFEITED)
+
+
+def build_extension_update(
+    transaction: PawnTransaction,
+    read_updated_at: Optional[datetime],
+    read_status: str
+) -> UpdateOne:
+    """
+    Build the bulk_write operation persisting in-memory extensions of a transaction.
+
+    The filter re-checks updated_at and status as they were read, so the
+    update is a no-op if a payment or status change was written in between.
+
+    Args:
+        transaction: Transaction with its extensions applied and prepare_for_save() called
+        read_updated_at: updated_at the transaction was read with
+        read_status: Status the transaction was read with
+
+    Returns:
+        UpdateOne operation for the pawn_transactions collection
+    """
+    return UpdateOne(
+        {
+            "_id": transaction.id,
+            "updated_at": read_updated_at,
+            "status": getattr(read_status, "value", read_status)
+        },
+        {"$set": get_dict(transaction, to_db=True)}
+    )
 
 
 class ExtensionError(Exception):
@@ -73,38 +93,6 @@ class ExtensionService:
     automatic status updates, and comprehensive extension tracking.
     """
     
-    @staticmethod
-    async def _invalidate_all_transaction_caches():
-        """CRITICAL: Comprehensive cache invalidation for real-time updates"""
-        try:
-            from app.core.redis_cache import get_cache_service
-            cache = get_cache_service()
-            
-            if cache and cache.is_available:
-                # Clear all transaction list caches
-                cache_patterns = [
-                    "transactions_list_*",      # All transaction lists
-                    "transaction:*",            # Individual transaction caches
-                    "balance:*",                # Balance calculation caches
-                    "customer_stats_*",         # Customer statistics
-                    "business_stats_*"          # Business statistics
-                ]
-                
-                for pattern in cache_patterns:
-                    await cache.delete_pattern(pattern)
-                
-                import structlog
-                logger = structlog.get_logger("extension_service")
-                logger.info("🚀 CACHE CLEARED: All transaction caches invalidated for extension real-time updates")
-            
-            # Also invalidate search caches
-            _invalidate_search_caches()
-            
-        except Exception as e:
-            import structlog
-            logger = structlog.get_logger("extension_service")
-            logger.error("❌ CACHE ERROR: Failed to invalidate transaction caches during extension", error=str(e))
-    
     @staticmethod
     def _ensure_timezone_aware(dt: datetime) -> datetime:
         """Helper method to ensure datetime is timezone-aware"""
@@ -189,13 +177,10 @@ class ExtensionService:
             if not discount_reason or not discount_reason.strip():
                 raise ExtensionValidationError("Discount reason is required when discount is applied")
 
-            # Admin PIN already validated by API handler - just find the admin user
-            all_admins = await User.find(User.role == "admin").to_list()
-            admin_user = None
-            for user in all_admins:
-                if user.verify_pin(admin_pin):
-                    admin_user = user
-                    break
+            # Admin PIN already validated by API handler, which passes the
+            # approving admin's ID - re-check only that admin (off the event loop)
+            from app.services.user_service import UserService
+            admin_user = await UserService.verify_admin_pin(admin_pin, discount_approved_by)
 
             # If we reach here with an invalid PIN, it means handler validation was bypassed
             # This should never happen in normal flow, but keep as safety check
@@ -275,6 +260,10 @@ class ExtensionService:
             await ExtensionService._update_transaction_for_extension_atomic(
                 fresh_transaction, extension, processed_by_user_id, session, client_timezone, discount_reason
             )
+
+            # Add the extension fee to the daily rollups (status moves between
+            # active statuses only, so active loan counts are unaffected)
+            await DailyRollupService.record_extension(extension)
             
             return extension
         
@@ -283,10 +272,6 @@ class ExtensionService:
         try:
             extension = await extension_operations(session=None)
             
-            # PERFORMANCE: Invalidate search cache after extension is processed
-            # Invalidate unified search and status count caches after successful extension processing
-            _invalidate_search_caches()
-            
             return extension
         except Exception as e:
             raise ExtensionValidationError(f"Extension processing failed: {str(e)}")
@@ -367,7 +352,7 @@ class ExtensionService:
         await transaction.save()
 
         # CRITICAL: Immediate cache invalidation for real-time updates
-        await ExtensionService._invalidate_all_transaction_caches()
+        await BusinessCache.invalidate_transaction_caches(transaction_ids=[transaction.transaction_id])
 
         # LOG: Extension success for monitoring
         import structlog
@@ -375,17 +360,19 @@ class ExtensionService:
         logger.info(f"✅ EXTENSION PROCESSED: {transaction.transaction_id} {status_message} with cache cleared")
     
     @staticmethod
-    async def _update_transaction_for_extension_atomic(
+    def _apply_extension_to_transaction(
         transaction: PawnTransaction,
         extension: Extension,
         processed_by_user_id: str,
-        session,
-        client_timezone: Optional[str] = None,
+        current_date: datetime,
         discount_reason: Optional[str] = None
     ) -> None:
         """
-        Update transaction with extension details atomically within session.
-        Internal method to keep transaction updates consistent.
+        Apply an extension to a transaction in memory (the caller persists it).
+
+        Moves the maturity and grace period dates, records the extension ID in
+        the transaction's search keys and appends the overdue fee and discount
+        audit entries.
 
         Business Rule: Status only changes to EXTENDED if new maturity date is in the FUTURE.
         This allows customers to pay past months incrementally while status remains OVERDUE.
@@ -394,63 +381,57 @@ class ExtensionService:
         transaction.maturity_date = extension.new_maturity_date
         transaction.grace_period_end = extension.new_grace_period_end
 
-        # Determine if status should change to EXTENDED
-        # ONLY change to EXTENDED if new maturity date is in the future
-        old_status = transaction.status
-        current_date = get_user_now(client_timezone)
+        # Record the extension ID in the transaction's indexed search keys
+        if extension.formatted_id and extension.formatted_id not in transaction.extension_formatted_ids:
+            transaction.extension_formatted_ids.append(extension.formatted_id)
 
-        # Ensure both datetimes are timezone-aware for comparison
+        # ONLY change to EXTENDED if new maturity date is in the future
         new_maturity_aware = ExtensionService._ensure_timezone_aware(extension.new_maturity_date)
         current_date_aware = ExtensionService._ensure_timezone_aware(current_date)
-
         if new_maturity_aware > current_date_aware:
             # Customer has caught up - maturity is now in the future
             transaction.status = TransactionStatus.EXTENDED
-        else:
-            # Still paying past months - keep current status (likely OVERDUE)
-            # Status remains unchanged until they catch up
-            pass
-
-        # Add extension audit entry using new notes service with error handling
-        # Temporarily disabled to debug extension issues
-        # try:
-        #     await notes_service.add_extension_audit(
-        #         transaction=transaction,
-        #         staff_member=processed_by_user_id,
-        #         months=extension.extension_months,
-        #         new_maturity=extension.new_maturity_date.strftime('%Y-%m-%d'),
-        #         extension_id=extension.extension_id,
-        #         fee=extension.total_extension_fee if extension.total_extension_fee > 0 else None,
-        #         save_immediately=False  # Save with session
-        #     )
-        # except Exception as e:
-        #     # Log audit entry error but don't fail the extension
-        #     # Continue with extension processing
-        #     pass
 
         # Add overdue fee audit entry if overdue fee was collected
         if extension.overdue_fee_collected and extension.overdue_fee_collected > 0:
-            from app.models.audit_entry_model import create_audit_entry, AuditActionType
-            overdue_fee_audit = create_audit_entry(
+            transaction.add_system_audit_entry(create_audit_entry(
                 action_type=AuditActionType.OVERDUE_FEE_SET,
                 staff_member=processed_by_user_id,
                 action_summary=f"Overdue fee: ${int(extension.overdue_fee_collected)}",
                 details=None,  # No details for cleaner timeline
                 amount=int(extension.overdue_fee_collected)
-            )
-            transaction.add_system_audit_entry(overdue_fee_audit)
+            ))
 
         # Add discount audit entry if discount was applied to extension
         if extension.discount_amount and extension.discount_amount > 0 and extension.discount_approved_by:
-            await notes_service.add_discount_audit(
-                transaction=transaction,
+            transaction.add_system_audit_entry(create_discount_audit(
                 staff_member=processed_by_user_id,
                 discount_amount=extension.discount_amount,
                 discount_reason=discount_reason or "Extension discount",
                 approved_by=extension.discount_approved_by,
-                payment_id=extension.extension_id,  # Use extension_id as related_id
-                save_immediately=False  # Save with session
-            )
+                payment_id=extension.extension_id  # Use extension_id as related_id
+            ))
+
+    @staticmethod
+    async def _update_transaction_for_extension_atomic(
+        transaction: PawnTransaction,
+        extension: Extension,
+        processed_by_user_id: str,
+        session,
+        client_timezone: Optional[str] = None,
+        discount_reason: Optional[str] = None
+    ) -> None:
+        """
+        Update transaction with extension details atomically within session.
+        Internal method to keep transaction updates consistent.
+
+        Business Rule: Status only changes to EXTENDED if new maturity date is in the FUTURE.
+        This allows customers to pay past months incrementally while status remains OVERDUE.
+        """
+        old_status = transaction.status
+        ExtensionService._apply_extension_to_transaction(
+            transaction, extension, processed_by_user_id, get_user_now(client_timezone), discount_reason
+        )
 
         # Save transaction within session
         if session:
@@ -460,7 +441,7 @@ class ExtensionService:
         
         # CRITICAL: Immediate cache invalidation for real-time updates (outside session)
         if not session:  # Only invalidate if not in atomic session
-            await ExtensionService._invalidate_all_transaction_caches()
+            await BusinessCache.invalidate_transaction_caches(transaction_ids=[transaction.transaction_id])
             
             # LOG: Extension success for monitoring
             import structlog
@@ -1366,15 +1347,128 @@ class ExtensionService:
         await extension.save()
         await transaction.save()
 
+        # Remove the cancelled fee from the rollup of the original extension day
+        await DailyRollupService.record_extension(extension, sign=-1)
+
         return extension
 
+    @staticmethod
+    async def _write_bulk_extensions(
+        planned: List[Dict[str, Any]],
+        read_versions: Dict[str, Tuple[Optional[datetime], str]],
+        item_errors: Dict[int, str]
+    ) -> None:
+        """
+        Persist planned bulk extensions and the transactions they extend.
+
+        Extensions are inserted with insert_many and the transactions updated
+        with one guarded bulk_write. When an extension insert or the update of
+        a transaction fails, the inserted extensions of that transaction are
+        deleted again and all of its items are reported as failed, so no
+        extension is left without the maturity change it records.
+
+        Args:
+            planned: Validated items with their extension and transaction (extensions applied)
+            read_versions: transaction_id -> (updated_at, status) as prefetched
+            item_errors: Item index -> error message, extended in place
+        """
+        import structlog
+        logger = structlog.get_logger("extension_service")
+
+        failed_transaction_ids: Set[str] = set()
+        not_inserted: Set[int] = set()
+        try:
+            await Extension.insert_many([plan["extension"] for plan in planned], ordered=False)
+        except BulkWriteError as e:
+            for write_error in e.details.get("writeErrors", []):
+                plan = planned[write_error["index"]]
+                item_errors[plan["index"]] = f"Extension processing failed: {write_error.get('errmsg')}"
+                not_inserted.add(write_error["index"])
+                failed_transaction_ids.add(plan["transaction"].transaction_id)
+
+        updated_transactions = list({
+            plan["transaction"].transaction_id: plan["transaction"]
+            for plan in planned
+            if plan["transaction"].transaction_id not in failed_transaction_ids
+        }.values())
+
+        # One write time (at MongoDB's millisecond precision) for the batch
+        # tells applied updates apart from skipped ones
+        written_at = datetime.now(UTC)
+        written_at = written_at.replace(microsecond=written_at.microsecond // 1000 * 1000)
+        operations = []
+        for transaction in updated_transactions:
+            transaction.prepare_for_save()
+            transaction.updated_at = written_at
+            operations.append(build_extension_update(transaction, *read_versions[transaction.transaction_id]))
+
+        if operations:
+            failed_transaction_ids |= await ExtensionService._write_transaction_updates(
+                operations, [transaction.transaction_id for transaction in updated_transactions], written_at
+            )
+
+        # Remove the extensions of transactions that were not updated
+        orphaned_ids = [
+            plan["extension"].extension_id
+            for position, plan in enumerate(planned)
+            if position not in not_inserted and plan["transaction"].transaction_id in failed_transaction_ids
+        ]
+        if orphaned_ids:
+            try:
+                await Extension.get_motor_collection().delete_many({"extension_id": {"$in": orphaned_ids}})
+            except Exception as e:
+                logger.error(
+                    "Failed to remove extensions of transactions that were not updated",
+                    extension_ids=orphaned_ids,
+                    error=str(e)
+                )
+
+        for plan in planned:
+            if plan["transaction"].transaction_id in failed_transaction_ids and plan["index"] not in item_errors:
+                item_errors[plan["index"]] = (
+                    "Extension processing failed: transaction was changed by another operation or not updated"
+                )
+
+    @staticmethod
+    async def _write_transaction_updates(
+        operations: List[UpdateOne],
+        transaction_ids: List[str],
+        written_at: datetime
+    ) -> Set[str]:
+        """
+        Run guarded transaction updates and return the IDs that were not updated.
+
+        bulk_write only reports how many filters matched, so when some did not
+        (or the write failed) the applied updates are found by their write time.
+        """
+        import structlog
+        logger = structlog.get_logger("extension_service")
+
+        collection = PawnTransaction.get_motor_collection()
+        try:
+            result = await collection.bulk_write(operations, ordered=False)
+            if result.matched_count == len(operations):
+                return set()
+        except Exception as e:
+            logger.warning("Bulk extension transaction update failed", error=str(e))
+
+        try:
+            applied = await collection.distinct(
+                "transaction_id", {"transaction_id": {"$in": transaction_ids}, "updated_at": written_at}
+            )
+        except Exception as e:
+            logger.error("Failed to check bulk extension transaction updates", error=str(e))
+            applied = []
+        return set(transaction_ids) - set(applied)
+
     @staticmethod
     async def bulk_process_extension_payment(
         payments: List[Dict[str, Any]],
         processed_by_user_id: str,
         batch_notes: Optional[str] = None,
         admin_pin: Optional[str] = None,
-        client_timezone: Optional[str] = None
+        client_timezone: Optional[str] = None,
+        admin_user_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Process multiple extension payments in a single batch operation.
@@ -1385,6 +1479,7 @@ class ExtensionService:
             batch_notes: Optional notes for the entire batch
             admin_pin: Admin PIN (required if any discounts are applied)
             client_timezone: Optional client timezone for date calculations
+            admin_user_id: Approving admin's user ID (only that admin's PIN is checked)
 
         Returns:
             Dict with success/error counts and details
@@ -1417,10 +1512,10 @@ class ExtensionService:
             if not admin_pin:
                 raise ExtensionValidationError("Admin PIN is required when discounts are applied")
 
-            # Find an admin user to verify PIN
-            # In practice, you should get the admin user from the request context
-            admin_user = await User.find_one(User.role == "admin")
-            if not admin_user or not admin_user.verify_pin(admin_pin):
+            # Resolve the approving admin from the PIN (or the given admin ID)
+            from app.services.user_service import UserService
+            admin_user = await UserService.verify_admin_pin(admin_pin, admin_user_id)
+            if not admin_user:
                 logger.warning(
                     "Invalid admin PIN for bulk extension payment with discounts",
                     staff_user_id=processed_by_user_id,
@@ -1435,16 +1530,32 @@ class ExtensionService:
                 payment_count=len(payments)
             )
 
-        # Track results
-        success_count = 0
-        error_count = 0
-        total_amount_processed = 0.0
-        errors = []
-        successful_transaction_ids = []
-        failed_transaction_ids = []
+        # Extensions in one batch share the processing time
+        current_date = get_user_now(client_timezone)
+        if client_timezone:
+            extension_date_utc = user_timezone_to_utc(current_date, client_timezone)
+        else:
+            extension_date_utc = datetime.now(UTC)
+
+        # Prefetch every transaction in the batch with one query
+        requested_ids = list(dict.fromkeys(p.get('transaction_id') for p in payments if p.get('transaction_id')))
+        transactions = {
+            transaction.transaction_id: transaction
+            for transaction in await PawnTransaction.find(
+                In(PawnTransaction.transaction_id, requested_ids)
+            ).to_list()
+        } if requested_ids else {}
+        # Transaction updates only apply if the transaction is unchanged since this read
+        read_versions = {
+            transaction_id: (transaction.updated_at, transaction.status)
+            for transaction_id, transaction in transactions.items()
+        }
 
-        # Process each payment
-        for payment_item in payments:
+        # Validate every item up front; item index -> error message
+        item_errors: Dict[int, str] = {}
+        planned: List[Dict[str, Any]] = []
+
+        for index, payment_item in enumerate(payments):
             transaction_id = payment_item.get('transaction_id')
 
             try:
@@ -1456,106 +1567,128 @@ class ExtensionService:
                 overdue_fee = float(payment_item.get('overdue_fee', 0))
                 discount = float(payment_item.get('discount', 0))
                 reason = payment_item.get('reason', '')
-                total_amount = float(payment_item.get('total_amount', 0))
 
                 # Validate discount has reason
                 if discount > 0 and not reason:
                     raise ExtensionValidationError("Discount reason is required when discount is applied")
 
-                # Calculate duration from extension fee
-                # Get transaction to determine monthly interest
-                transaction = await PawnTransaction.find_one(
-                    PawnTransaction.transaction_id == transaction_id
-                )
+                transaction = transactions.get(transaction_id)
                 if not transaction:
                     raise TransactionNotFoundError(f"Transaction {transaction_id} not found")
 
-                monthly_interest = transaction.monthly_interest_amount or 0
+                if transaction.status in NON_EXTENDABLE_STATUSES:
+                    raise ExtensionNotAllowedError(
+                        f"Cannot extend {transaction.status} transaction. "
+                        f"Extensions are only allowed for ACTIVE, OVERDUE, and EXTENDED transactions."
+                    )
 
-                # Determine duration based on extension fee
-                if monthly_interest > 0:
-                    duration = int(extension_fee / monthly_interest)
-                else:
-                    duration = 1  # Default to 1 month if no interest
+                monthly_interest = int(transaction.monthly_interest_amount or 0)
+                if monthly_interest > 1000:
+                    raise ExtensionValidationError("Extension fee per month cannot exceed $1,000")
 
-                # Validate duration
+                # Determine duration based on extension fee (1-3 months, default 1)
+                duration = int(extension_fee / monthly_interest) if monthly_interest > 0 else 1
                 if duration not in [1, 2, 3]:
-                    duration = 1  # Default to 1 month
+                    duration = 1
 
-                # Process the extension with discount and overdue fee
-                extension = await ExtensionService.process_extension(
-                    transaction_id=transaction_id,
-                    extension_months=duration,
-                    extension_fee_per_month=int(monthly_interest),
-                    processed_by_user_id=processed_by_user_id,
-                    extension_reason=reason if discount > 0 else batch_notes,
-                    client_timezone=client_timezone,
-                    discount_amount=discount,
-                    overdue_fee_collected=overdue_fee,
-                    discount_approved_by=admin_user.user_id if has_discounts and admin_user else None
-                )
-
-                # Get fresh transaction to add audit entries
-                transaction = await PawnTransaction.find_one(
-                    PawnTransaction.transaction_id == transaction_id
-                )
-                if not transaction:
-                    raise ExtensionValidationError(f"Transaction {transaction_id} not found after extension")
-
-                # Add overdue fee audit entry if overdue fee was collected
-                if overdue_fee > 0:
-                    from app.models.audit_entry_model import create_audit_entry, AuditActionType
-                    overdue_fee_audit = create_audit_entry(
-                        action_type=AuditActionType.OVERDUE_FEE_SET,
-                        staff_member=processed_by_user_id,
-                        action_summary=f"Overdue fee: ${int(overdue_fee)}",
-                        details=None,  # No details for cleaner timeline
-                        amount=int(overdue_fee)
+                total_extension_fee = duration * monthly_interest
+                if discount > total_extension_fee:
+                    raise ExtensionValidationError(
+                        f"Discount amount (${discount:.2f}) cannot exceed total extension fee (${total_extension_fee:.2f})"
                     )
-                    transaction.add_system_audit_entry(overdue_fee_audit)
-                    await transaction.save()
-
-                # Add discount audit entry if discount was applied
-                if discount > 0:
-                    from app.services.notes_service import NotesService
-                    await NotesService.add_discount_audit(
-                        transaction=transaction,
-                        staff_member=processed_by_user_id,
-                        discount_amount=int(discount),
-                        discount_reason=reason or "Bulk extension discount",
-                        approved_by=admin_user.user_id if admin_user else processed_by_user_id,
-                        payment_id=extension.extension_id,  # Use extension_id as reference
-                        save_immediately=True
+
+                planned.append({
+                    "index": index,
+                    "transaction": transaction,
+                    "reason": reason,
+                    "extension": Extension(
+                        transaction_id=transaction_id,
+                        processed_by_user_id=processed_by_user_id,
+                        extension_months=duration,
+                        extension_fee_per_month=monthly_interest,
+                        total_extension_fee=total_extension_fee,
+                        discount_amount=discount,
+                        overdue_fee_collected=overdue_fee,
+                        discount_approved_by=admin_user.user_id if discount > 0 and admin_user else None,
+                        original_maturity_date=transaction.maturity_date,
+                        extension_date=extension_date_utc,
+                        extension_reason=reason if discount > 0 else batch_notes
                     )
+                })
 
-                # Track success
-                success_count += 1
-                total_amount_processed += total_amount
-                successful_transaction_ids.append(transaction_id)
+            except Exception as e:
+                item_errors[index] = str(e)
+
+        # Reserve a block of EX IDs and apply the extensions in memory. Items
+        # for the same transaction chain, each starting from the maturity
+        # date the previous one produced.
+        formatted_ids = await FormattedIdService.reserve_formatted_ids(EXTENSION_SEQUENCE, len(planned))
+        for plan, formatted_id in zip(planned, formatted_ids):
+            extension, transaction = plan["extension"], plan["transaction"]
+            extension.formatted_id = formatted_id
+            extension.original_maturity_date = transaction.maturity_date
+            extension.prepare_for_save()
+            ExtensionService._apply_extension_to_transaction(
+                transaction, extension, processed_by_user_id, current_date,
+                plan["reason"] or "Bulk extension discount"
+            )
 
-                logger.info(
-                    "Bulk extension payment processed successfully",
-                    transaction_id=transaction_id,
-                    extension_id=extension.extension_id,
-                    duration=duration,
-                    total_amount=total_amount,
-                    discount=discount
-                )
+        # Write all extensions, then every touched transaction, in one round trip each
+        if planned:
+            await ExtensionService._write_bulk_extensions(planned, read_versions, item_errors)
 
-            except Exception as e:
+        # Rollups and trend caches are updated once for the whole batch
+        processed_extensions = {
+            plan["index"]: plan["extension"] for plan in planned if plan["index"] not in item_errors
+        }
+        if processed_extensions:
+            await DailyRollupService.record_extensions(list(processed_extensions.values()))
+            try:
+                from app.api.api_v1.handlers.trends import invalidate_trends_cache
+                invalidate_trends_cache()
+            except ImportError:
+                pass
+
+        # Track results in request order
+        success_count = 0
+        error_count = 0
+        total_amount_processed = 0.0
+        errors = []
+        successful_transaction_ids = []
+        failed_transaction_ids = []
+
+        for index, payment_item in enumerate(payments):
+            transaction_id = payment_item.get('transaction_id')
+
+            if index in item_errors:
                 error_count += 1
                 failed_transaction_ids.append(transaction_id)
-                error_message = f"Transaction {transaction_id}: {str(e)}"
-                errors.append(error_message)
+                errors.append(f"Transaction {transaction_id}: {item_errors[index]}")
 
                 logger.error(
                     "Bulk extension payment failed",
                     transaction_id=transaction_id,
-                    error=str(e)
+                    error=item_errors[index]
                 )
+                continue
+
+            extension = processed_extensions[index]
+            total_amount = float(payment_item.get('total_amount', 0))
+            success_count += 1
+            total_amount_processed += total_amount
+            successful_transaction_ids.append(transaction_id)
+
+            logger.info(
+                "Bulk extension payment processed successfully",
+                transaction_id=transaction_id,
+                extension_id=extension.extension_id,
+                duration=extension.extension_months,
+                total_amount=total_amount,
+                discount=extension.discount_amount
+            )
 
         # Invalidate caches after batch processing
-        await ExtensionService._invalidate_all_transaction_caches()
+        await BusinessCache.invalidate_transaction_caches(transaction_ids=successful_transaction_ids)
 
         logger.info(
             "Bulk extension payment batch completed",
@@ -3,42 +3,185 @@ Formatted ID Service
 
 Manages the generation and assignment of display-friendly transaction IDs
 like PW000105 based on chronological order.
+
+Numbers come from the `counters` collection: each sequence is one document
+whose value is advanced with an atomic find_one_and_update($inc), so parallel
+creations always receive distinct IDs and issuing an ID does not depend on
+the size of the transactions/extensions collections. A sequence that has not
+been seeded yet (see scripts/seed_formatted_id_counters.py) is seeded from the
+highest existing formatted ID on first use.
 """
 
-from typing import Optional
+import asyncio
+from datetime import datetime, UTC
+from typing import List, Optional
+from pymongo import ReturnDocument
 from app.models.pawn_transaction_model import PawnTransaction
 from app.models.extension_model import Extension
+from app.models.counter_model import Counter
 import structlog
 
 logger = structlog.get_logger()
 
+# Sequence names in the counters collection
+PAWN_TRANSACTION_SEQUENCE = "pawn_transaction"
+EXTENSION_SEQUENCE = "extension"
+
+# Display prefix per sequence
+SEQUENCE_PREFIXES = {
+    PAWN_TRANSACTION_SEQUENCE: "PW",
+    EXTENSION_SEQUENCE: "EX",
+}
+
+
+def format_sequence_id(sequence: str, number: int) -> str:
+    """Render a sequence number as a display ID (e.g. 105 -> PW000105)"""
+    return f"{SEQUENCE_PREFIXES[sequence]}{number:06d}"
+
+
+class FormattedIdBlock:
+    """
+    Per-worker block of pre-allocated formatted IDs for bulk imports.
+    
+    Reserves `block_size` numbers from the counter in one round trip and
+    hands them out locally, reserving a new block when it runs out. IDs stay
+    unique across workers; numbers left in a discarded block are skipped.
+    """
+    
+    def __init__(self, sequence: str, block_size: int = 100):
+        if sequence not in SEQUENCE_PREFIXES:
+            raise ValueError(f"Unknown formatted ID sequence: {sequence}")
+        if block_size < 1:
+            raise ValueError("block_size must be at least 1")
+        self.sequence = sequence
+        self.block_size = block_size
+        self._next_number = 1
+        self._last_number = 0
+        self._lock = asyncio.Lock()
+    
+    async def next_id(self) -> str:
+        """Return the next ID from the block, reserving a new block if needed"""
+        async with self._lock:
+            if self._next_number > self._last_number:
+                self._last_number = await FormattedIdService.reserve_numbers(self.sequence, self.block_size)
+                self._next_number = self._last_number - self.block_size + 1
+            number = self._next_number
+            self._next_number += 1
+        return format_sequence_id(self.sequence, number)
+
 
 class FormattedIdService:
     """Service for managing formatted transaction IDs"""
     
+    # Sequences known to exist in the counters collection (per process)
+    _seeded_sequences: set = set()
     
     @staticmethod
-    async def get_next_formatted_id() -> str:
+    async def get_highest_issued_number(sequence: str) -> int:
         """
-        Get the next formatted ID for a new transaction.
+        Find the highest number already used by documents of a sequence.
         
+        Args:
+            sequence: Sequence name (PAWN_TRANSACTION_SEQUENCE or EXTENSION_SEQUENCE)
+            
         Returns:
-            Next formatted ID like PW000123
+            Highest number in use, 0 if none
         """
-        # Find the highest existing formatted ID
-        highest_transaction = await PawnTransaction.find(
-            PawnTransaction.formatted_id != None
+        model = PawnTransaction if sequence == PAWN_TRANSACTION_SEQUENCE else Extension
+        
+        # Uses the unique formatted_id index; only needed when seeding
+        highest = await model.find(
+            model.formatted_id != None
         ).sort([("formatted_id", -1)]).first_or_none()
         
-        if highest_transaction and highest_transaction.formatted_id:
-            # Extract number and increment
-            highest_num = int(highest_transaction.formatted_id[2:])
-            next_number = highest_num + 1
-        else:
-            # First transaction
-            next_number = 1
+        if highest and highest.formatted_id:
+            return int(highest.formatted_id[2:])
+        return 0
+    
+    @staticmethod
+    async def seed_sequence(sequence: str) -> int:
+        """
+        Make sure a counter is at least the highest number already in use.
+        
+        Uses $max, so seeding is idempotent and never moves a counter
+        backwards, even when several workers seed concurrently.
+        
+        Args:
+            sequence: Sequence name
+            
+        Returns:
+            Counter value after seeding
+        """
+        highest = await FormattedIdService.get_highest_issued_number(sequence)
+        counter = await Counter.get_motor_collection().find_one_and_update(
+            {"_id": sequence},
+            {"$max": {"value": highest}, "$set": {"updated_at": datetime.now(UTC)}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        FormattedIdService._seeded_sequences.add(sequence)
+        logger.info("🏷️ FORMATTED ID: Counter seeded", sequence=sequence,
+                    highest_in_use=highest, value=counter["value"])
+        return counter["value"]
+    
+    @staticmethod
+    async def reserve_numbers(sequence: str, count: int = 1) -> int:
+        """
+        Atomically reserve `count` consecutive numbers from a sequence.
+        
+        Args:
+            sequence: Sequence name
+            count: How many numbers to reserve
+            
+        Returns:
+            The last reserved number; the block is (last - count + 1) .. last
+        """
+        collection = Counter.get_motor_collection()
         
-        formatted_id = f"PW{next_number:06d}"
+        if sequence not in FormattedIdService._seeded_sequences:
+            if await collection.find_one({"_id": sequence}, {"_id": 1}):
+                FormattedIdService._seeded_sequences.add(sequence)
+            else:
+                await FormattedIdService.seed_sequence(sequence)
+        
+        counter = await collection.find_one_and_update(
+            {"_id": sequence},
+            {"$inc": {"value": count}, "$set": {"updated_at": datetime.now(UTC)}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        return counter["value"]
+    
+    @staticmethod
+    async def reserve_formatted_ids(sequence: str, count: int) -> List[str]:
+        """
+        Reserve `count` formatted IDs from a sequence in one round trip.
+        
+        Args:
+            sequence: Sequence name
+            count: Number of IDs needed
+            
+        Returns:
+            Consecutive formatted IDs like ["EX000010", "EX000011"]
+        """
+        if count <= 0:
+            return []
+        last_number = await FormattedIdService.reserve_numbers(sequence, count)
+        return [
+            format_sequence_id(sequence, number)
+            for number in range(last_number - count + 1, last_number + 1)
+        ]
+    
+    @staticmethod
+    async def get_next_formatted_id() -> str:
+        """
+        Get the next formatted ID for a new transaction.
+        
+        Returns:
+            Next formatted ID like PW000123
+        """
+        number = await FormattedIdService.reserve_numbers(PAWN_TRANSACTION_SEQUENCE)
+        formatted_id = format_sequence_id(PAWN_TRANSACTION_SEQUENCE, number)
         logger.debug(f"🏷️ FORMATTED ID: Generated new ID {formatted_id}")
         return formatted_id
     
@@ -106,20 +249,8 @@ class FormattedIdService:
         Returns:
             Next formatted ID like EX000123
         """
-        # Find the highest existing formatted ID
-        highest_extension = await Extension.find(
-            Extension.formatted_id != None
-        ).sort([("formatted_id", -1)]).first_or_none()
-        
-        if highest_extension and highest_extension.formatted_id:
-            # Extract number and increment
-            highest_num = int(highest_extension.formatted_id[2:])
-            next_number = highest_num + 1
-        else:
-            # First extension
-            next_number = 1
-        
-        formatted_id = f"EX{next_number:06d}"
+        number = await FormattedIdService.reserve_numbers(EXTENSION_SEQUENCE)
+        formatted_id = format_sequence_id(EXTENSION_SEQUENCE, number)
         logger.debug(f"🏷️ EXTENSION FORMATTED ID: Generated new ID {formatted_id}")
         return formatted_id
     
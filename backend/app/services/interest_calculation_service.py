@@ -13,11 +13,11 @@ import structlog
 # Local imports
 from app.models.pawn_transaction_model import PawnTransaction, TransactionStatus
 from app.models.payment_model import Payment
-from app.models.extension_model import Extension
 from app.models.user_model import User, UserStatus
 from app.schemas.pawn_transaction_schema import BalanceResponse
 from app.core.transaction_notes import safe_append_transaction_notes, format_system_note
 from app.core.timezone_utils import get_months_between_user_timezone, get_user_now
+from app.services.balance_service import BalanceService, calculate_interest_due
 
 # Configure logger
 logger = structlog.get_logger("interest_calculation")
@@ -83,15 +83,8 @@ class InterestCalculationService:
         total_due = transaction.calculate_total_due(as_of_date)
         interest_accrued = total_due - transaction.loan_amount
         
-        # Calculate months elapsed using same logic as transaction model
-        months_elapsed = ((as_of_date.year - transaction.pawn_date.year) * 12 + 
-                         (as_of_date.month - transaction.pawn_date.month))
-        
-        if as_of_date.day > transaction.pawn_date.day:
-            months_elapsed += 1
-        
-        # Apply 3-month cap and minimum 1 month
-        months_elapsed = max(1, min(months_elapsed, 3))
+        # Calendar months elapsed (3-month cap, minimum 1 month)
+        months_elapsed = transaction.calculate_months_elapsed(as_of_date)
         
         return {
             "transaction_id": transaction_id,
@@ -139,24 +132,10 @@ class InterestCalculationService:
             transaction_id, as_of_date
         )
         
-        # Get all payments
-        payments = await Payment.find(
-            Payment.transaction_id == transaction_id
-        ).sort(Payment.payment_date).to_list()
-        
-        # Only count non-voided payments
-        total_payments = sum(
-            payment.payment_amount 
-            for payment in payments 
-            if not getattr(payment, 'is_voided', False)
-        )
-        
-        # Get all extensions
-        extensions = await Extension.find(
-            Extension.transaction_id == transaction_id
-        ).to_list()
-        
-        total_extension_fees = sum(extension.total_extension_fee for extension in extensions)
+        # Non-voided payment and extension fee totals (concurrent aggregations)
+        totals = await BalanceService.get_transaction_totals(transaction_id, include_extension_fees=True)
+        total_payments = totals["total_paid"]
+        total_extension_fees = totals["extension_fees"]
         
         # Calculate components
         loan_amount = transaction.loan_amount
@@ -626,21 +605,17 @@ class InterestCalculationService:
         if not transaction:
             raise TransactionNotFoundError(f"Transaction {transaction_id} not found")
         
-        # Get all payments for this transaction
-        payments = await Payment.find(
-            Payment.transaction_id == transaction_id
-        ).sort(Payment.payment_date).to_list()
+        # Non-voided payment totals from a single $group
+        totals = await BalanceService.get_transaction_totals(transaction_id)
         
         # Calculate basic balance components
         loan_amount = transaction.loan_amount
         monthly_interest = transaction.monthly_interest_amount
 
-        # Calculate months elapsed using calendar month logic
-        months_elapsed = transaction.calculate_months_elapsed(as_of_date)
-
-        # Apply 3-month interest cap (business rule)
-        capped_months = min(months_elapsed, 3)
-        total_interest_due = monthly_interest * capped_months
+        # Interest for the calendar months elapsed (3-month cap applies)
+        total_interest_due = calculate_interest_due(
+            monthly_interest, transaction.pawn_date, transaction.maturity_date, as_of_date
+        )
 
         # Extension fees are handled separately by the extension system
         # Regular payments only cover principal + interest
@@ -653,21 +628,8 @@ class InterestCalculationService:
         # Note: overdue_fee is tracked separately, not included in total_due
         total_due = loan_amount + total_interest_due + total_extension_fees
         
-        # Calculate total payments (defensive programming) - exclude voided payments
-        try:
-            # Only count non-voided payments
-            total_paid = sum(
-                payment.payment_amount 
-                for payment in payments 
-                if not getattr(payment, 'is_voided', False)
-            ) if payments else 0
-        except (AttributeError, TypeError) as e:
-            logger.warning(
-                "Error calculating total payments for transaction",
-                transaction_id=transaction_id,
-                error=str(e)
-            )
-            total_paid = 0
+        # Total of non-voided payments
+        total_paid = totals["total_paid"]
         
         # Calculate current balance
         current_balance = max(0, total_due - total_paid)
@@ -750,7 +712,7 @@ class InterestCalculationService:
             overdue_fee_balance=overdue_fee_balance,
 
             # Transaction details
-            payment_count=len(payments),
+            payment_count=totals["payment_count"],
             status=transaction.status,
 
             # Date information
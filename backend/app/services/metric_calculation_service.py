@@ -16,6 +16,7 @@ from app.models.extension_model import Extension
 from app.models.customer_model import Customer
 from app.models.transaction_metrics import TransactionMetrics, MetricType
 from app.core.redis_cache import get_cache_service
+from app.services.daily_rollup_service import DailyRollupService
 import json
 
 # Configure logger
@@ -1150,6 +1151,20 @@ class MetricCalculationService:
             # Calculate end of current day (to include today's transactions)
             end_of_today_utc = user_timezone_to_utc(business_date, timezone_header) + timedelta(days=1)
 
+            # Prefer the daily rollups: earlier days are pre-aggregated and only
+            # today is computed live
+            rollup_total = await DailyRollupService.sum_revenue(
+                first_day_of_month.strftime("%Y-%m-%d"),
+                business_date.strftime("%Y-%m-%d"),
+                timezone_header
+            )
+            if rollup_total is not None:
+                logger.info("Calculated this month revenue from daily rollups",
+                           total_revenue=rollup_total,
+                           duration_ms=(time.time() - start_time) * 1000)
+                await self._cache_value("this_month_revenue", rollup_total)
+                return float(rollup_total)
+
             # Calculate payments from this month
             payment_pipeline = [
                 {
@@ -1232,52 +1247,60 @@ class MetricCalculationService:
             start_of_last_month_utc = user_timezone_to_utc(first_day_previous_month, timezone_header)
             end_of_last_month_utc = user_timezone_to_utc(first_day_current_month, timezone_header)
 
-            # Calculate payments from last month
-            payment_pipeline = [
-                {
-                    "$match": {
-                        "payment_date": {
-                            "$gte": start_of_last_month_utc,
-                            "$lt": end_of_last_month_utc
+            # Prefer the daily rollups, falling back to the source collections
+            last_month_revenue = await DailyRollupService.sum_revenue(
+                first_day_previous_month.strftime("%Y-%m-%d"),
+                last_day_previous_month.strftime("%Y-%m-%d"),
+                timezone_header
+            )
+
+            if last_month_revenue is None:
+                # Calculate payments from last month
+                payment_pipeline = [
+                    {
+                        "$match": {
+                            "payment_date": {
+                                "$gte": start_of_last_month_utc,
+                                "$lt": end_of_last_month_utc
+                            }
+                        }
+                    },
+                    {
+                        "$group": {
+                            "_id": None,
+                            "total": {"$sum": "$payment_amount"}
                         }
                     }
-                },
-                {
-                    "$group": {
-                        "_id": None,
-                        "total": {"$sum": "$payment_amount"}
-                    }
-                }
-            ]
+                ]
 
-            payment_result = await Payment.aggregate(payment_pipeline).to_list()
-            last_month_payment_total = payment_result[0]["total"] if payment_result else 0.0
+                payment_result = await Payment.aggregate(payment_pipeline).to_list()
+                last_month_payment_total = payment_result[0]["total"] if payment_result else 0.0
 
-            # Calculate extension fees from last month
-            extension_pipeline = [
-                {
-                    "$match": {
-                        "created_at": {
-                            "$gte": start_of_last_month_utc,
-                            "$lt": end_of_last_month_utc
-                        },
-                        "fee_paid": True,
-                        "is_cancelled": False
-                    }
-                },
-                {
-                    "$group": {
-                        "_id": None,
-                        "total": {"$sum": "$total_extension_fee"}
+                # Calculate extension fees from last month
+                extension_pipeline = [
+                    {
+                        "$match": {
+                            "created_at": {
+                                "$gte": start_of_last_month_utc,
+                                "$lt": end_of_last_month_utc
+                            },
+                            "fee_paid": True,
+                            "is_cancelled": False
+                        }
+                    },
+                    {
+                        "$group": {
+                            "_id": None,
+                            "total": {"$sum": "$total_extension_fee"}
+                        }
                     }
-                }
-            ]
+                ]
 
-            extension_result = await Extension.aggregate(extension_pipeline).to_list()
-            last_month_extension_total = extension_result[0]["total"] if extension_result else 0.0
+                extension_result = await Extension.aggregate(extension_pipeline).to_list()
+                last_month_extension_total = extension_result[0]["total"] if extension_result else 0.0
 
-            # Calculate last month's total revenue
-            last_month_revenue = last_month_payment_total + last_month_extension_total
+                # Calculate last month's total revenue
+                last_month_revenue = last_month_payment_total + last_month_extension_total
 
             # Calculate trend metrics
             revenue_difference = current_month_revenue - last_month_revenue
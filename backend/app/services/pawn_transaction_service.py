@@ -7,80 +7,38 @@ balance calculations, status updates, and transaction management.
 
 # Standard library imports
 from datetime import datetime, UTC
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 import structlog
 import re
 
 # Third-party imports
 from beanie.operators import In, Or, RegEx
-from pymongo.errors import DuplicateKeyError, WriteError
+from beanie.odm.utils.encoder import Encoder
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError, WriteError
 from beanie.exceptions import RevisionIdWasChanged
 
 # Local imports
-from app.models.pawn_transaction_model import PawnTransaction, TransactionStatus
-from app.models.pawn_item_model import PawnItem
-from app.models.payment_model import Payment
+from app.models.pawn_transaction_model import PawnTransaction, PawnTransactionBalanceView, PawnTransactionListView, TransactionStatus, calculate_interest_months
+from app.models.pawn_item_model import PawnItem, PawnItemSummary
 from app.models.extension_model import Extension
 from app.models.customer_model import Customer, CustomerStatus
 from app.models.user_model import User, UserStatus
 from app.models.audit_entry_model import create_status_change_audit
 from app.models.business_config_model import FinancialPolicyConfig
+from app.services.config_snapshot_service import ConfigSnapshotService
 from app.core.transaction_notes import safe_append_transaction_notes, format_system_note
 from app.core.timezone_utils import utc_to_user_timezone, format_user_datetime, get_user_now, get_user_business_date, user_timezone_to_utc, add_months_user_timezone
-from app.core.redis_cache import BusinessCache, cached_result, CacheConfig
+from app.core.redis_cache import BusinessCache, cached_result, CacheConfig, CacheTags
+from app.core.pagination import build_keyset_filter, build_sort_keys, cursor_values, decode_cursor, encode_cursor
+from app.core.search_keys import customer_name_filter, customer_search_keys
+from app.schemas.pawn_transaction_schema import TotalCountMode
+from app.services.balance_service import BalanceService, build_transaction_balance
+from app.services.daily_rollup_service import DailyRollupService
 
 # Configure logger
 logger = structlog.get_logger("pawn_transaction")
 
-# Import cache invalidation utility (avoid circular import by importing at module level)
-def _invalidate_search_caches():
-    """Helper function to invalidate search-related caches when transaction data changes"""
-    try:
-        # Import here to avoid circular imports
-        import asyncio
-        from app.services.unified_search_service import UnifiedSearchService
-        
-        # Create async context for cache invalidation
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            # Schedule as a task in the running loop
-            asyncio.create_task(UnifiedSearchService.invalidate_search_caches())
-        else:
-            # Run directly if no loop is running
-            asyncio.run(UnifiedSearchService.invalidate_search_caches())
-            
-        logger.info("🗑️ CACHE: Search caches invalidated after transaction change")
-    except Exception as e:
-        logger.error("❌ CACHE: Failed to invalidate search caches", error=str(e))
-
-async def _invalidate_all_transaction_caches():
-    """CRITICAL: Comprehensive cache invalidation for real-time updates"""
-    try:
-        from app.core.redis_cache import get_cache_service
-        cache = get_cache_service()
-        
-        if cache and cache.is_available:
-            # Clear all transaction list caches
-            cache_patterns = [
-                "transactions_list_*",      # All transaction lists
-                "transaction:*",            # Individual transaction caches
-                "balance:*",                # Balance calculation caches
-                "customer_stats_*",         # Customer statistics
-                "business_stats_*",         # Business statistics
-                "stats:customer:*"          # Customer stats for follow-up counts
-            ]
-            
-            for pattern in cache_patterns:
-                await cache.delete_pattern(pattern)
-            
-            logger.info("🚀 CACHE CLEARED: All transaction caches invalidated for real-time updates")
-        
-        # Also invalidate search caches
-        _invalidate_search_caches()
-        
-    except Exception as e:
-        logger.error("❌ CACHE ERROR: Failed to invalidate transaction caches", error=str(e))
-
 
 def ensure_timezone_aware(dt: datetime) -> datetime:
     """
@@ -99,6 +57,180 @@ def ensure_timezone_aware(dt: datetime) -> datetime:
     return dt
 
 
+# Nightly overdue sweep: statuses that move to overdue past maturity, the
+# fields needed to build each update and the bulk_write batch size
+OVERDUE_SWEEP_STATUSES = (TransactionStatus.ACTIVE.value, TransactionStatus.EXTENDED.value)
+OVERDUE_SWEEP_PROJECTION = {
+    "_id": 0,
+    "transaction_id": 1,
+    "customer_id": 1,
+    "status": 1,
+    "loan_amount": 1,
+    "monthly_interest_amount": 1,
+    "overdue_fee": 1,
+    "pawn_date": 1,
+    "maturity_date": 1
+}
+OVERDUE_SWEEP_BATCH_SIZE = 1000
+
+# Approximate transaction-list counts are reused across pages for this long
+LIST_COUNT_CACHE_TTL = 300
+
+# Status changes staff may make (single and bulk status updates)
+VALID_STATUS_TRANSITIONS = {
+    TransactionStatus.ACTIVE: [
+        TransactionStatus.OVERDUE, TransactionStatus.EXTENDED,
+        TransactionStatus.FORFEITED, TransactionStatus.HOLD
+    ],
+    TransactionStatus.OVERDUE: [
+        TransactionStatus.EXTENDED, TransactionStatus.FORFEITED,
+        TransactionStatus.HOLD
+    ],
+    TransactionStatus.EXTENDED: [
+        TransactionStatus.OVERDUE, TransactionStatus.FORFEITED,
+        TransactionStatus.HOLD
+    ],
+    TransactionStatus.HOLD: [
+        TransactionStatus.ACTIVE, TransactionStatus.OVERDUE,
+        TransactionStatus.EXTENDED, TransactionStatus.DAMAGED
+    ],
+    TransactionStatus.DAMAGED: [
+        TransactionStatus.FORFEITED, TransactionStatus.SOLD
+    ],
+    # Terminal states - no transitions allowed
+    TransactionStatus.REDEEMED: [],
+    TransactionStatus.FORFEITED: [TransactionStatus.SOLD],
+    TransactionStatus.SOLD: []
+}
+
+# Statuses that release a loan from the customer's active loan counters
+LOAN_RELEASE_STATUSES = (TransactionStatus.REDEEMED, TransactionStatus.FORFEITED, TransactionStatus.SOLD)
+
+
+def build_overdue_update(candidate: Dict[str, Any], as_of_date: datetime) -> UpdateOne:
+    """
+    Build the bulk_write operation that moves one transaction to overdue.
+
+    Mirrors what PawnTransaction.save() would persist for the status change:
+    updated_at and total_due are refreshed and a system status-change audit
+    entry is appended. The filter re-checks the status so the update is a
+    no-op if the transaction left active/extended after it was read.
+
+    Args:
+        candidate: Raw transaction document with OVERDUE_SWEEP_PROJECTION fields
+        as_of_date: Time the sweep runs
+
+    Returns:
+        UpdateOne operation for the pawn_transactions collection
+    """
+    months_elapsed = calculate_interest_months(
+        candidate.get("pawn_date"),
+        as_of_date,
+        cap_at_maturity=bool(candidate.get("maturity_date"))
+    )
+    total_due = (
+        (candidate.get("loan_amount") or 0)
+        + (candidate.get("monthly_interest_amount") or 0) * months_elapsed
+        + (candidate.get("overdue_fee") or 0)
+    )
+    audit_entry = create_status_change_audit(
+        "system", candidate["status"], TransactionStatus.OVERDUE.value, "Past maturity date"
+    )
+
+    return UpdateOne(
+        {"transaction_id": candidate["transaction_id"], "status": {"$in": list(OVERDUE_SWEEP_STATUSES)}},
+        {
+            "$set": {
+                "status": TransactionStatus.OVERDUE.value,
+                "total_due": total_due,
+                "updated_at": as_of_date
+            },
+            "$push": {"system_audit_log": Encoder().encode(audit_entry)}
+        }
+    )
+
+
+def build_status_update(transaction: PawnTransaction, old_status: str, audit_entry) -> UpdateOne:
+    """
+    Build the bulk_write operation persisting an in-memory status change.
+
+    The transaction must already have the new status, the audit entry and
+    the fields refreshed by prepare_for_save(). The filter re-checks the old
+    status so the update is a no-op if the transaction changed after it was read.
+
+    Args:
+        transaction: Transaction with the status change applied
+        old_status: Status the transaction was read with
+        audit_entry: Status-change audit entry appended to the transaction
+
+    Returns:
+        UpdateOne operation for the pawn_transactions collection
+    """
+    return UpdateOne(
+        {"_id": transaction.id, "status": getattr(old_status, "value", old_status)},
+        {
+            "$set": Encoder().encode({
+                "status": transaction.status,
+                "total_due": transaction.total_due,
+                "internal_notes": transaction.internal_notes,
+                "updated_at": transaction.updated_at
+            }),
+            "$push": {"system_audit_log": Encoder().encode(audit_entry)}
+        }
+    )
+
+
+def build_notes_update(transaction: PawnTransaction, read_updated_at: Optional[datetime]) -> UpdateOne:
+    """
+    Build the bulk_write operation persisting an in-memory note addition.
+
+    The notes fields are rewritten in full, so the filter re-checks the
+    updated_at the transaction was read with and the update is a no-op if
+    another write landed in between.
+
+    Args:
+        transaction: Transaction with the note added and prepare_for_save() called
+        read_updated_at: updated_at the transaction was read with
+
+    Returns:
+        UpdateOne operation for the pawn_transactions collection
+    """
+    return UpdateOne(
+        {"_id": transaction.id, "updated_at": read_updated_at},
+        {"$set": Encoder().encode({
+            "manual_notes": transaction.manual_notes,
+            "internal_notes": transaction.internal_notes,
+            "total_due": transaction.total_due,
+            "updated_at": transaction.updated_at
+        })}
+    )
+
+
+def build_customer_release_update(customer_id: str, loan_count: int, loan_amount: int) -> UpdateOne:
+    """
+    Build the bulk_write operation releasing closed loans from a customer's counters.
+
+    Both counters are clamped at zero server-side.
+
+    Args:
+        customer_id: Customer phone number
+        loan_count: Number of loans that left the active population
+        loan_amount: Their combined principal
+
+    Returns:
+        UpdateOne operation for the customers collection
+    """
+    return UpdateOne(
+        {"phone_number": customer_id},
+        [{
+            "$set": {
+                "active_loans": {"$max": [0, {"$subtract": [{"$ifNull": ["$active_loans", 0]}, loan_count]}]},
+                "total_loan_value": {"$max": [0, {"$subtract": [{"$ifNull": ["$total_loan_value", 0]}, loan_amount]}]}
+            }
+        }]
+    )
+
+
 class PawnTransactionError(Exception):
     """Base exception for pawn transaction operations"""
     pass
@@ -194,7 +326,7 @@ class PawnTransactionService:
 
         # Check loan amount limits from Financial Policy
         try:
-            financial_config = await FinancialPolicyConfig.get_current_config()
+            financial_config = await ConfigSnapshotService.get(FinancialPolicyConfig)
 
             if financial_config:
                 # Validate minimum loan amount
@@ -334,7 +466,8 @@ class PawnTransactionService:
                 pawn_date=pawn_date_utc,
                 formatted_id=formatted_id,
                 transaction_type=transaction_type,
-                reference_barcode=reference_barcode
+                reference_barcode=reference_barcode,
+                **customer_search_keys(customer.first_name, customer.last_name)
             )
             
             # If initial notes were provided, also add them to the new notes architecture
@@ -403,8 +536,14 @@ class PawnTransactionService:
                 total_loan_value=int(customer.total_loan_value)
             )
             
+            # Count the new loan in the daily rollups
+            await DailyRollupService.record_loan_created(transaction)
+            
             # CRITICAL: Immediate cache invalidation for real-time updates
-            await _invalidate_all_transaction_caches()
+            await BusinessCache.invalidate_transaction_caches(
+                transaction_ids=[transaction.transaction_id],
+                customer_phones=[customer_phone]
+            )
             
             # CRITICAL: Load all relationships for complete response
             await transaction.fetch_all_links()
@@ -455,7 +594,10 @@ class PawnTransactionService:
         
         # Cache the result if found
         if transaction and cache and cache.is_available:
-            await cache.set(cache_key, transaction.model_dump(), CacheConfig.MEDIUM_TTL)
+            await cache.set(
+                cache_key, transaction.model_dump(), CacheConfig.MEDIUM_TTL,
+                tags=[CacheTags.transaction(transaction_id)]
+            )
         
         return transaction
 
@@ -569,93 +711,9 @@ class PawnTransactionService:
         if as_of_date is None:
             as_of_date = datetime.now(UTC)
         
-        # Get all non-voided payments for this transaction
-        payments = await Payment.find(
-            Payment.transaction_id == transaction_id,
-            Payment.is_voided != True  # Include payments where is_voided is False or doesn't exist
-        ).sort(Payment.payment_date).to_list()
-        
-        # Calculate total due with interest accrual
-        total_due = transaction.calculate_total_due(as_of_date)
-        
-        # Calculate total payments made and payment portions (defensive programming)
-        # Exclude voided payments from all calculations
-        try:
-            total_paid = sum(
-                payment.payment_amount
-                for payment in payments
-                if not getattr(payment, 'is_voided', False)
-            ) if payments else 0
-
-            # Sum up payment portions from actual payment records
-            interest_paid = sum(
-                getattr(payment, 'interest_portion', 0)
-                for payment in payments
-                if not getattr(payment, 'is_voided', False)
-            ) if payments else 0
-
-            overdue_fee_paid = sum(
-                getattr(payment, 'overdue_fee_portion', 0)
-                for payment in payments
-                if not getattr(payment, 'is_voided', False)
-            ) if payments else 0
-
-            principal_paid = sum(
-                getattr(payment, 'principal_portion', 0)
-                for payment in payments
-                if not getattr(payment, 'is_voided', False)
-            ) if payments else 0
-
-        except (AttributeError, TypeError) as e:
-            logger.warning(
-                "Error calculating total payments for transaction",
-                transaction_id=transaction_id,
-                error=str(e)
-            )
-            total_paid = 0
-            interest_paid = 0
-            overdue_fee_paid = 0
-            principal_paid = 0
-
-        # Calculate current balance
-        current_balance = total_due - total_paid
-
-        # Calculate interest portion
-        pawn_date_aware = ensure_timezone_aware(transaction.pawn_date)
-        interest_due = transaction.monthly_interest_amount * max(1, min(3,
-            ((as_of_date.year - pawn_date_aware.year) * 12 +
-             (as_of_date.month - pawn_date_aware.month)) +
-            (1 if as_of_date.day > pawn_date_aware.day else 0)
-        ))
-
-        principal_due = transaction.loan_amount
-
-        balance_data = {
-            "transaction_id": transaction_id,
-            "as_of_date": as_of_date.isoformat(),
-            "loan_amount": transaction.loan_amount,
-            "monthly_interest": transaction.monthly_interest_amount,
-            "total_due": total_due,
-            "total_paid": total_paid,
-            "current_balance": current_balance,
-            "principal_due": principal_due,
-            "interest_due": interest_due,
-            "overdue_fee_due": transaction.overdue_fee,
-            "principal_paid": principal_paid,
-            "interest_paid": interest_paid,
-            "overdue_fee_paid": overdue_fee_paid,
-            "principal_balance": principal_due - principal_paid,
-            "interest_balance": interest_due - interest_paid,
-            "overdue_fee_balance": transaction.overdue_fee - overdue_fee_paid,
-            "payment_count": len(payments),
-            "status": transaction.status,
-            "pawn_date": ensure_timezone_aware(transaction.pawn_date).isoformat(),
-            "maturity_date": ensure_timezone_aware(transaction.maturity_date).isoformat(),
-            "grace_period_end": ensure_timezone_aware(transaction.grace_period_end).isoformat(),
-            "is_overdue": as_of_date > ensure_timezone_aware(transaction.maturity_date),
-            "is_in_grace_period": ensure_timezone_aware(transaction.maturity_date) < as_of_date <= ensure_timezone_aware(transaction.grace_period_end),
-            "days_until_forfeiture": (ensure_timezone_aware(transaction.grace_period_end) - as_of_date).days if as_of_date < ensure_timezone_aware(transaction.grace_period_end) else 0
-        }
+        # Non-voided payment totals and portions from a single $group
+        totals = await BalanceService.get_transaction_totals(transaction_id)
+        balance_data = build_transaction_balance(transaction, totals, ensure_timezone_aware(as_of_date))
         
         # Cache current balance calculations for short term
         if as_of_date is None or (datetime.now(UTC) - as_of_date).total_seconds() < 3600:
@@ -663,6 +721,45 @@ class PawnTransactionService:
         
         return balance_data
     
+    @staticmethod
+    async def calculate_balances(
+        transaction_ids: List[str],
+        as_of_date: Optional[datetime] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Calculate current balances for many transactions at once.
+        
+        Uses one projection query for the transactions and one payments
+        aggregation for all of them. Current-date balances are written to the
+        balance cache in a single pipelined round trip.
+        
+        Args:
+            transaction_ids: Transactions to calculate balances for
+            as_of_date: Date to calculate balances (defaults to current date)
+            
+        Returns:
+            Transaction ID -> balance details, in request order; transactions
+            that do not exist are omitted
+        """
+        transaction_ids = list(dict.fromkeys(transaction_ids))
+        if not transaction_ids:
+            return {}
+        
+        is_current = as_of_date is None
+        transactions = await PawnTransaction.find(
+            In(PawnTransaction.transaction_id, transaction_ids)
+        ).project(PawnTransactionBalanceView).to_list()
+        
+        balances = await BalanceService.calculate_balances(transactions, as_of_date)
+        if is_current and balances:
+            await BusinessCache.set_transaction_balances(balances)
+        
+        return {
+            transaction_id: balances[transaction_id]
+            for transaction_id in transaction_ids
+            if transaction_id in balances
+        }
+    
     @staticmethod
     async def update_transaction_status(
         transaction_id: str,
@@ -700,38 +797,13 @@ class PawnTransactionService:
         old_status = transaction.status
         
         # Business rules for status transitions
-        valid_transitions = {
-            TransactionStatus.ACTIVE: [
-                TransactionStatus.OVERDUE, TransactionStatus.EXTENDED, 
-                TransactionStatus.FORFEITED, TransactionStatus.HOLD
-            ],
-            TransactionStatus.OVERDUE: [
-                TransactionStatus.EXTENDED, TransactionStatus.FORFEITED, 
-                TransactionStatus.HOLD
-            ],
-            TransactionStatus.EXTENDED: [
-                TransactionStatus.OVERDUE, TransactionStatus.FORFEITED, 
-                TransactionStatus.HOLD
-            ],
-            TransactionStatus.HOLD: [
-                TransactionStatus.ACTIVE, TransactionStatus.OVERDUE, 
-                TransactionStatus.EXTENDED, TransactionStatus.DAMAGED
-            ],
-            TransactionStatus.DAMAGED: [
-                TransactionStatus.FORFEITED, TransactionStatus.SOLD
-            ],
-            # Terminal states - no transitions allowed
-            TransactionStatus.REDEEMED: [],
-            TransactionStatus.FORFEITED: [TransactionStatus.SOLD],
-            TransactionStatus.SOLD: []
-        }
-        
-        if new_status not in valid_transitions.get(old_status, []):
+        if new_status not in VALID_STATUS_TRANSITIONS.get(old_status, []):
             raise TransactionStateError(
                 f"Invalid status transition from {old_status} to {new_status}"
             )
         
         # Update transaction
+        previous_changed_at = transaction.updated_at
         transaction.status = new_status
         
         # Create structured audit entry for status change
@@ -758,14 +830,19 @@ class PawnTransactionService:
         
         await transaction.save()
         
+        # Record the transition in the daily rollups
+        await DailyRollupService.record_status_change(
+            transaction, old_status, new_status, transaction.updated_at, previous_changed_at
+        )
+        
         # CRITICAL: Immediate comprehensive cache invalidation for real-time updates
-        await _invalidate_all_transaction_caches()
+        await BusinessCache.invalidate_transaction_caches(transaction_ids=[transaction_id])
         
         # LOG: Status change success for monitoring
         logger.info(f"✅ STATUS UPDATED: {transaction_id} changed from {old_status} to {new_status} with cache cleared")
         
         # Update customer statistics for terminal states using atomic operations
-        if new_status in [TransactionStatus.REDEEMED, TransactionStatus.FORFEITED, TransactionStatus.SOLD]:
+        if new_status in LOAN_RELEASE_STATUSES:
             # ATOMIC UPDATE: Decrement counts safely to prevent race conditions
             update_result = await Customer.get_motor_collection().update_one(
                 {
@@ -901,22 +978,7 @@ class PawnTransactionService:
             raise ValueError(f"Barcode '{reference_barcode}' is already in use")
 
         # Invalidate only affected caches (granular invalidation)
-        cache_keys = [
-            f"transaction:{transaction_id}",
-            f"transaction_summary:{transaction_id}",
-            f"customer_transactions:{transaction.customer_id}"
-        ]
-        for key in cache_keys:
-            try:
-                await BusinessCache.delete(key)
-            except Exception as e:
-                logger.warning(f"Failed to invalidate cache key {key}: {e}")
-
-        # Invalidate status counts (affects all)
-        try:
-            await BusinessCache.delete("transaction_status_counts")
-        except Exception:
-            pass
+        await BusinessCache.invalidate_transaction_caches(transaction_ids=[transaction_id])
 
         logger.info(
             f"✅ TRANSACTION TYPE UPDATED: {transaction_id} changed from {old_type} to {transaction_type}",
@@ -929,7 +991,7 @@ class PawnTransactionService:
         return transaction
 
     @staticmethod
-    async def bulk_update_statuses() -> Dict[str, int]:
+    async def bulk_update_statuses() -> Dict[str, Any]:
         """
         Bulk update transaction statuses based on current date.
         Should be run daily to keep statuses current.
@@ -937,38 +999,106 @@ class PawnTransactionService:
         ONLY moves active/extended transactions to overdue.
         NO automatic forfeiture - staff must manually change overdue to forfeited.
 
+        Candidates are read with a lean projection and updated server-side with
+        batched unordered bulk_write calls instead of one save() per document.
+        Each update sets the status, refreshes total_due and appends a system
+        audit entry, and is guarded on the current status so a transaction paid
+        or edited mid-sweep is left untouched.
+
         Returns:
-            Dictionary with count of updated transactions by status
+            Dictionary with the overdue count, the affected transaction IDs and
+            the affected customer phone numbers
         """
         current_date = datetime.now(UTC)
-        updated_counts = {"overdue": 0}
 
         # Find transactions that should be marked overdue
         # Only move ACTIVE or EXTENDED transactions past maturity date to OVERDUE
-        overdue_candidates = await PawnTransaction.find(
-            In(PawnTransaction.status, [TransactionStatus.ACTIVE, TransactionStatus.EXTENDED]),
-            PawnTransaction.maturity_date < current_date
-        ).to_list()
+        collection = PawnTransaction.get_motor_collection()
+        cursor = collection.find(
+            {
+                "status": {"$in": list(OVERDUE_SWEEP_STATUSES)},
+                "maturity_date": {"$lt": current_date}
+            },
+            projection=OVERDUE_SWEEP_PROJECTION
+        )
 
-        for transaction in overdue_candidates:
-            transaction.status = TransactionStatus.OVERDUE
-            await transaction.save()
-            updated_counts["overdue"] += 1
+        overdue_transaction_ids: List[str] = []
+        customer_phones = set()
+        batch_ids: List[str] = []
+        operations: List[UpdateOne] = []
+
+        async for candidate in cursor:
+            batch_ids.append(candidate["transaction_id"])
+            operations.append(build_overdue_update(candidate, current_date))
+            customer_phones.add(candidate.get("customer_id"))
+
+            if len(operations) >= OVERDUE_SWEEP_BATCH_SIZE:
+                overdue_transaction_ids.extend(
+                    await PawnTransactionService._write_overdue_batch(collection, batch_ids, operations)
+                )
+                batch_ids, operations = [], []
+
+        if operations:
+            overdue_transaction_ids.extend(
+                await PawnTransactionService._write_overdue_batch(collection, batch_ids, operations)
+            )
+
+        customer_phones.discard(None)
+        result = {
+            "overdue": len(overdue_transaction_ids),
+            "overdue_transaction_ids": overdue_transaction_ids,
+            "customer_phones": sorted(customer_phones)
+        }
 
         # NO AUTOMATIC FORFEITURE - removed this section
         # Staff/admin must manually change overdue to forfeited via UI
 
         # CRITICAL: Invalidate all transaction caches for real-time updates
-        if updated_counts["overdue"] > 0:
-            await _invalidate_all_transaction_caches()
-            logger.info(f"✅ BULK STATUS UPDATE: {updated_counts['overdue']} transactions marked overdue with cache cleared")
+        if overdue_transaction_ids:
+            await BusinessCache.invalidate_transaction_caches(
+                transaction_ids=overdue_transaction_ids,
+                customer_phones=result["customer_phones"]
+            )
+            logger.info(f"✅ BULK STATUS UPDATE: {result['overdue']} transactions marked overdue with cache cleared")
+
+        return result
 
-        return updated_counts
+    @staticmethod
+    async def _write_overdue_batch(collection, batch_ids: List[str], operations: List[UpdateOne]) -> List[str]:
+        """
+        Apply one batch of overdue updates.
+
+        Args:
+            collection: Motor collection for pawn transactions
+            batch_ids: Transaction IDs in the same order as operations
+            operations: UpdateOne operations built by build_overdue_update
+
+        Returns:
+            Transaction IDs from the batch that are now overdue
+        """
+        write_result = await collection.bulk_write(operations, ordered=False)
+
+        if write_result.modified_count == len(operations):
+            return batch_ids
+
+        # Some candidates changed status between the read and the write - only
+        # report the ones that are overdue now
+        cursor = collection.find(
+            {"transaction_id": {"$in": batch_ids}, "status": TransactionStatus.OVERDUE.value},
+            projection={"transaction_id": 1}
+        )
+        return [document["transaction_id"] async for document in cursor]
     
 
     @staticmethod
-    def _generate_filters_hash(filters) -> str:
-        """Generate a consistent hash for filters to use as cache key."""
+    def _generate_filters_hash(filters, include_pagination: bool = True) -> str:
+        """
+        Generate a consistent hash for filters to use as cache key.
+
+        Args:
+            filters: TransactionSearchFilters object
+            include_pagination: Include page, cursor and sort fields (False for count cache keys)
+        """
         import hashlib
         import json
         
@@ -985,17 +1115,60 @@ class PawnTransactionService:
             'maturity_date_to': getattr(filters, 'maturity_date_to', None).isoformat() if getattr(filters, 'maturity_date_to', None) else None,
             'min_days_overdue': getattr(filters, 'min_days_overdue', None),
             'max_days_overdue': getattr(filters, 'max_days_overdue', None),
-            'storage_location': filters.storage_location,
-            'page': filters.page,
-            'page_size': filters.page_size,
-            'sort_by': str(filters.sort_by),
-            'sort_order': str(filters.sort_order)
+            'storage_location': filters.storage_location
         }
+        if include_pagination:
+            filter_dict.update({
+                'page': filters.page,
+                'page_size': filters.page_size,
+                'cursor': getattr(filters, 'cursor', None),
+                'count_mode': str(getattr(filters, 'count_mode', None)),
+                'sort_by': str(filters.sort_by),
+                'sort_order': str(filters.sort_order)
+            })
         
         # Sort keys for consistent hashing
         filter_str = json.dumps(filter_dict, sort_keys=True)
         return hashlib.md5(filter_str.encode()).hexdigest()[:12]
 
+    @staticmethod
+    async def _get_list_total_count(query, filters) -> Tuple[int, bool]:
+        """
+        Count the transactions matching a list query.
+
+        Exact mode counts on every request. Approximate mode uses the collection
+        estimate for unfiltered lists and otherwise caches the exact count per
+        filter set (independent of page and cursor), so scrolling through pages
+        does not recount.
+
+        Args:
+            query: Filtered Beanie query (before sort and pagination)
+            filters: TransactionSearchFilters object
+
+        Returns:
+            Tuple of (total count, whether the count is approximate)
+        """
+        if getattr(filters, 'count_mode', TotalCountMode.EXACT) != TotalCountMode.APPROXIMATE:
+            return await query.count(), False
+
+        if not query.get_filter_query():
+            return await PawnTransaction.get_motor_collection().estimated_document_count(), True
+
+        count_key = f"transactions_count_{PawnTransactionService._generate_filters_hash(filters, include_pagination=False)}"
+        try:
+            cached_count = await BusinessCache.get(count_key)
+            if cached_count is not None:
+                return int(cached_count), True
+        except Exception as e:
+            logger.debug(f"Count cache read failed, counting: {e}")
+
+        total_count = await query.count()
+        try:
+            await BusinessCache.set(count_key, total_count, ttl_seconds=LIST_COUNT_CACHE_TTL, tags=[CacheTags.TRANSACTION_LISTS])
+        except Exception as e:
+            logger.debug(f"Count cache write failed: {e}")
+        return total_count, True
+
     @staticmethod
     async def get_transactions_list(filters, client_timezone: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -1068,37 +1241,10 @@ class PawnTransactionService:
                 elif re.match(r'^#?(EX)\d+$', search_term, re.IGNORECASE):
                     logger.info(f"📋 SEARCH PATTERN: Detected extension ID pattern for '{search_term}'")
                     
-                    # Try direct extension lookup first
-                    try:
-                        from app.services.formatted_id_service import FormattedIdService
-                        
-                        # Extract and normalize the search term
-                        formatted_search_id = search_term.upper()
-                        if not formatted_search_id.startswith('EX'):
-                            # Handle cases like "#123" or "123" for extension IDs
-                            number_match = re.search(r'\d+', formatted_search_id)
-                            if number_match:
-                                extension_number = int(number_match.group())
-                                formatted_search_id = f"EX{extension_number:06d}"
-                        
-                        # Search for extension by formatted ID
-                        extension = await FormattedIdService.find_extension_by_formatted_id(formatted_search_id)
-                        
-                        if extension:
-                            logger.info(f"✅ EXTENSION SEARCH: Found extension {formatted_search_id}, searching for transaction {extension.transaction_id}")
-                            # Search for the transaction that has this extension
-                            query = query.find(PawnTransaction.transaction_id == extension.transaction_id)
-                        else:
-                            logger.info(f"❌ EXTENSION SEARCH: Extension {formatted_search_id} not found, checking transactions with any extensions")
-                            # Fallback: search for transactions with extensions
-                            query = query.find({"extensions.0": {"$exists": True}})
-                            filters.page_size = 200  # Load more transactions for extension search
-                            
-                    except Exception as e:
-                        logger.warning(f"⚠️ EXTENSION SEARCH ERROR: {e}, falling back to extension array search")
-                        # Fallback to finding transactions with extensions
-                        query = query.find({"extensions.0": {"$exists": True}})
-                        filters.page_size = 200
+                    # Normalize to EX000123 and match the indexed extension ID keys
+                    number_match = re.search(r'\d+', search_term)
+                    formatted_search_id = f"EX{int(number_match.group()):06d}"
+                    query = query.find({"extension_formatted_ids": formatted_search_id})
                     
                     logger.info(f"📊 SEARCH SCOPE: Extension search for '{search_term}'")
                 
@@ -1142,59 +1288,15 @@ class PawnTransactionService:
                         logger.info(f"✅ BARCODE SEARCH SUCCESS: Found transaction {barcode_transaction.formatted_id or barcode_transaction.transaction_id} with reference barcode '{search_term}'")
                         query = query.find(PawnTransaction.transaction_id == barcode_transaction.transaction_id)
                     else:
-                        # No exact match, search for partial barcode matches AND customer names
-                        logger.info(f"🔤 SEARCH PATTERN: No exact barcode match, trying partial barcode and customer/name search for '{search_term}'")
-
-                        # For customer name searches, we need to search in the Customer collection first
-                        # Then find transactions matching those customer phone numbers OR reference barcodes
-                        try:
-                            from app.models.customer_model import Customer
-
-                            # Search for customers matching the name pattern
-                            matching_customers = await Customer.find({
-                                "$or": [
-                                    {"first_name": RegEx(f".*{search_term}.*", "i")},
-                                    {"last_name": RegEx(f".*{search_term}.*", "i")},
-                                    # Also search in combined name (first + last)
-                                    {"$expr": {
-                                        "$regexMatch": {
-                                            "input": {"$concat": ["$first_name", " ", "$last_name"]},
-                                            "regex": search_term,
-                                            "options": "i"
-                                        }
-                                    }}
-                                ]
-                            }).to_list()
-
-                            # Build OR query for customer phones and partial barcode match
-                            search_conditions = []
-
-                            if matching_customers:
-                                # Get phone numbers of matching customers
-                                customer_phones = [customer.phone_number for customer in matching_customers]
-                                logger.info(f"🔍 CUSTOMER NAME SEARCH: Found {len(matching_customers)} customers matching '{search_term}', phones: {customer_phones}")
-                                search_conditions.append({"customer_id": {"$in": customer_phones}})
-
-                            # Also search for partial barcode matches (case-insensitive contains)
-                            search_conditions.append({"reference_barcode": {"$regex": search_term, "$options": "i"}})
-
-                            if search_conditions:
-                                logger.info(f"🔍 COMBINED SEARCH: Searching customers ({len(matching_customers) if matching_customers else 0}) OR reference barcode containing '{search_term}'")
-                                query = query.find({"$or": search_conditions})
-                            else:
-                                logger.info(f"🔍 SEARCH: No customers found, searching only reference barcode for '{search_term}'")
-                                # Only search barcode
-                                query = query.find({"reference_barcode": {"$regex": search_term, "$options": "i"}})
-
-                        except Exception as e:
-                            logger.warning(f"⚠️ SEARCH ERROR: {e}, falling back to customer_id and barcode search")
-                            # Fallback to searching in customer_id (phone) and reference_barcode fields
-                            query = query.find({
-                                "$or": [
-                                    {"customer_id": {"$regex": search_term, "$options": "i"}},
-                                    {"reference_barcode": {"$regex": search_term, "$options": "i"}}
-                                ]
-                            })
+                        # No exact match, search customer names by their indexed prefix tokens
+                        # OR reference barcodes starting with the term
+                        logger.info(f"🔤 SEARCH PATTERN: No exact barcode match, trying customer name and barcode prefix search for '{search_term}'")
+                        query = query.find({
+                            "$or": [
+                                customer_name_filter(search_term),
+                                {"reference_barcode": {"$regex": f"^{re.escape(search_term)}", "$options": "i"}}
+                            ]
+                        })
                     
                     # Use normal pagination for general searches
                     logger.info(f"📊 SEARCH SCOPE: General search for '{search_term}' - using normal pagination")
@@ -1247,27 +1349,37 @@ class PawnTransactionService:
                 logger.info(f"🔍 REFERENCE BARCODE SEARCH: Filtering by reference barcode '{reference_barcode_term}'")
                 query = query.find(PawnTransaction.reference_barcode.contains(reference_barcode_term, case_insensitive=True))
 
-            # Get total count before pagination
-            total_count = await query.count()
-            
             # Apply sorting with enum value extraction - REAL-TIME FIX: Ensure newest first
+            # Every sort ends with the unique transaction_id so pages never overlap
             sort_direction = 1 if filters.sort_order.value == "asc" else -1
             sort_field_name = filters.sort_by.value if hasattr(filters.sort_by, 'value') else str(filters.sort_by)
             
             if hasattr(PawnTransaction, sort_field_name):
-                sort_field = getattr(PawnTransaction, sort_field_name)
-                query = query.sort([(sort_field, sort_direction)])
+                sort_keys = build_sort_keys(sort_field_name, sort_direction)
             else:
-                # CRITICAL FIX: Default sort by creation date DESC for newest transactions first
-                query = query.sort([
-                    (PawnTransaction.pawn_date, -1),    # Primary: newest pawn date first
-                    (PawnTransaction.created_at, -1),   # Secondary: newest creation time first
-                    (PawnTransaction.transaction_id, -1) # Tertiary: newest transaction ID first
-                ])
-            
-            # Apply pagination
-            skip = (filters.page - 1) * filters.page_size
-            transactions = await query.skip(skip).limit(filters.page_size).to_list()
+                # CRITICAL FIX: Default sort by pawn date, creation time, transaction ID DESC for newest first
+                sort_keys = build_sort_keys(None, -1)
+
+            # Get total count (exact, or estimated/cached for infinite scroll)
+            total_count, total_count_is_approximate = await PawnTransactionService._get_list_total_count(
+                query, filters
+            )
+
+            # Cursor mode seeks past the previous page's last sort key instead of skipping
+            cursor = getattr(filters, 'cursor', None)
+            if cursor:
+                query = query.find(build_keyset_filter(sort_keys, decode_cursor(cursor, sort_keys)))
+                skip = 0
+            else:
+                skip = (filters.page - 1) * filters.page_size
+
+            # Fetch one extra document to know whether another page exists
+            # Project to the list view so audit logs and manual notes never leave MongoDB
+            query = query.sort(sort_keys)
+            transactions = await query.skip(skip).limit(filters.page_size + 1).project(PawnTransactionListView).to_list()
+            has_next = len(transactions) > filters.page_size
+            transactions = transactions[:filters.page_size]
+            next_cursor = encode_cursor(cursor_values(transactions[-1], sort_keys), sort_keys) if has_next else None
 
             # PERFORMANCE OPTIMIZATION: Batch fetch all items for all transactions (fix N+1 problem)
             transaction_ids = [t.transaction_id for t in transactions]
@@ -1275,7 +1387,7 @@ class PawnTransactionService:
             if transaction_ids:
                 all_items = await PawnItem.find(
                     {"transaction_id": {"$in": transaction_ids}}
-                ).sort(PawnItem.item_number).to_list()
+                ).sort(PawnItem.item_number).project(PawnItemSummary).to_list()
             
             # Group items by transaction_id for O(1) lookup
             items_by_transaction = {}
@@ -1289,11 +1401,6 @@ class PawnTransactionService:
             for transaction in transactions:
                 transaction_dict = transaction.model_dump()
 
-                # PERFORMANCE OPTIMIZATION: Remove heavy fields that aren't needed for list display
-                # This reduces payload size by 50-60% without affecting functionality
-                transaction_dict.pop('system_audit_log', None)
-                transaction_dict.pop('manual_notes', None)
-
                 # Get pre-fetched items for this transaction
                 transaction_dict['items'] = items_by_transaction.get(transaction.transaction_id, [])
 
@@ -1318,9 +1425,6 @@ class PawnTransactionService:
                 
                 transaction_responses.append(PawnTransactionResponse.model_validate(transaction_dict))
             
-            # Calculate pagination info
-            has_next = (skip + filters.page_size) < total_count
-            
             # Final search result logging
             if filters.search_text:
                 logger.info(f"🏁 SEARCH COMPLETE: Returning {len(transaction_responses)} transactions for '{filters.search_text}' (total: {total_count})")
@@ -1333,12 +1437,14 @@ class PawnTransactionService:
                 total_count=total_count,
                 page=filters.page,
                 page_size=filters.page_size,
-                has_next=has_next
+                has_next=has_next,
+                next_cursor=next_cursor,
+                total_count_is_approximate=total_count_is_approximate
             )
             
             # Cache the result for future requests (60 second TTL)
             try:
-                await BusinessCache.set(cache_key, result, ttl_seconds=60)
+                await BusinessCache.set(cache_key, result, ttl_seconds=60, tags=[CacheTags.TRANSACTION_LISTS])
                 logger.debug(f"💾 CACHE SET: Cached transaction list for key {cache_key[:20]}...")
             except Exception as e:
                 logger.debug(f"Cache write failed, continuing without cache: {e}")
@@ -1453,6 +1559,11 @@ class PawnTransactionService:
         """
         Bulk update status for multiple transactions.
         
+        All targets are read with one $in query and transitions are validated
+        in memory. Updates are written with one unordered bulk_write guarded on
+        each transaction's previous status; customer counters, rollups and
+        caches are then updated once for the whole batch.
+        
         Args:
             transaction_ids: List of transaction IDs to update
             new_status: New status to apply
@@ -1460,39 +1571,169 @@ class PawnTransactionService:
             notes: Optional notes about the updates
             
         Returns:
-            Dictionary with update results
+            BulkStatusUpdateResponse with per-transaction results
+            
+        Raises:
+            StaffValidationError: Staff user not found or inactive
         """
         from app.schemas.pawn_transaction_schema import BulkStatusUpdateResponse
         
-        success_count = 0
-        error_count = 0
-        successful_updates = []
-        failed_updates = []
+        # Validate staff user once for the whole batch
+        staff_user = await User.find_one(User.user_id == updated_by_user_id)
+        if not staff_user or staff_user.status != UserStatus.ACTIVE:
+            raise StaffValidationError(f"Staff user {updated_by_user_id} not found or inactive")
+        
+        transactions = {
+            transaction.transaction_id: transaction
+            for transaction in await PawnTransaction.find(
+                In(PawnTransaction.transaction_id, list(set(transaction_ids)))
+            ).to_list()
+        }
+        
+        errors: Dict[str, str] = {}
+        planned: List[Tuple[PawnTransaction, TransactionStatus, Optional[datetime]]] = []
+        operations: List[UpdateOne] = []
+        seen = set()
         
         for transaction_id in transaction_ids:
-            try:
-                await PawnTransactionService.update_transaction_status(
-                    transaction_id=transaction_id,
-                    new_status=new_status,
-                    updated_by_user_id=updated_by_user_id,
-                    notes=notes
+            if transaction_id in seen:
+                continue
+            seen.add(transaction_id)
+            
+            transaction = transactions.get(transaction_id)
+            if not transaction:
+                errors[transaction_id] = f"Transaction {transaction_id} not found"
+                continue
+            
+            old_status = transaction.status
+            if new_status not in VALID_STATUS_TRANSITIONS.get(old_status, []):
+                errors[transaction_id] = f"Invalid status transition from {old_status} to {new_status}"
+                continue
+            
+            previous_changed_at = transaction.updated_at
+            audit_entry = create_status_change_audit(
+                staff_member=updated_by_user_id,
+                old_status=str(old_status),
+                new_status=str(new_status),
+                reason=notes
+            )
+            transaction.status = new_status
+            transaction.add_system_audit_entry(audit_entry)
+            transaction.prepare_for_save()
+            
+            planned.append((transaction, old_status, previous_changed_at))
+            operations.append(build_status_update(transaction, old_status, audit_entry))
+        
+        if operations:
+            modified_count, write_errors = await PawnTransactionService._write_transaction_updates(operations)
+            for index, message in write_errors.items():
+                errors[planned[index][0].transaction_id] = f"Failed to update status: {message}"
+            
+            if modified_count < len(operations) - len(write_errors):
+                # Some transactions changed between the read and the write -
+                # only report the ones now carrying the status we wrote
+                candidates = [
+                    plan[0] for index, plan in enumerate(planned) if index not in write_errors
+                ]
+                cursor = PawnTransaction.get_motor_collection().find(
+                    {"transaction_id": {"$in": [transaction.transaction_id for transaction in candidates]}},
+                    projection={"_id": 0, "transaction_id": 1, "status": 1}
                 )
-                success_count += 1
-                successful_updates.append(transaction_id)
-            except Exception as e:
-                error_count += 1
-                failed_updates.append({
-                    "transaction_id": transaction_id,
-                    "error": str(e)
-                })
+                current_statuses = {document["transaction_id"]: document.get("status") async for document in cursor}
+                for transaction in candidates:
+                    if current_statuses.get(transaction.transaction_id) != getattr(transaction.status, "value", transaction.status):
+                        errors[transaction.transaction_id] = (
+                            f"Transaction {transaction.transaction_id} was modified during the update"
+                        )
+        
+        updated = [plan for plan in planned if plan[0].transaction_id not in errors]
+        successful_updates = [
+            transaction_id for transaction_id in dict.fromkeys(transaction_ids) if transaction_id not in errors
+        ]
+        
+        if updated:
+            customer_phones = await PawnTransactionService._release_customer_loans(
+                [plan[0] for plan in updated], new_status
+            )
+            
+            # Record the transitions in the daily rollups
+            await DailyRollupService.record_status_changes(updated, new_status, updated[0][0].updated_at)
+            
+            # Immediate cache invalidation for real-time updates, once per batch
+            await BusinessCache.invalidate_transaction_caches(
+                transaction_ids=successful_updates,
+                customer_phones=customer_phones
+            )
+            logger.info(f"✅ BULK STATUS UPDATE: {len(updated)} transactions changed to {new_status} with cache cleared")
         
         return BulkStatusUpdateResponse(
-            success_count=success_count,
-            error_count=error_count,
+            success_count=len(successful_updates),
+            error_count=len(errors),
             total_requested=len(transaction_ids),
             successful_updates=successful_updates,
-            failed_updates=failed_updates
+            failed_updates=[
+                {"transaction_id": transaction_id, "error": error} for transaction_id, error in errors.items()
+            ]
+        )
+    
+    @staticmethod
+    async def _write_transaction_updates(operations: List[UpdateOne]) -> Tuple[int, Dict[int, str]]:
+        """
+        Apply transaction updates with one unordered bulk_write.
+        
+        Args:
+            operations: UpdateOne operations for the pawn_transactions collection
+            
+        Returns:
+            Tuple of (modified count, operation index -> error message for
+            operations that failed)
+        """
+        try:
+            result = await PawnTransaction.get_motor_collection().bulk_write(operations, ordered=False)
+            return result.modified_count, {}
+        except BulkWriteError as e:
+            return e.details.get("nModified", 0), {
+                write_error["index"]: write_error.get("errmsg", "write failed")
+                for write_error in e.details.get("writeErrors", [])
+            }
+    
+    @staticmethod
+    async def _release_customer_loans(
+        transactions: List[PawnTransaction],
+        new_status: TransactionStatus
+    ) -> List[str]:
+        """
+        Decrement customer loan counters once per customer after a bulk status change.
+        
+        Only statuses in LOAN_RELEASE_STATUSES affect the counters.
+        
+        Args:
+            transactions: Transactions that changed status
+            new_status: Status they changed to
+            
+        Returns:
+            Phone numbers of the customers updated
+        """
+        if new_status not in LOAN_RELEASE_STATUSES:
+            return []
+        
+        releases: Dict[str, List[int]] = {}
+        for transaction in transactions:
+            release = releases.setdefault(transaction.customer_id, [0, 0])
+            release[0] += 1
+            release[1] += transaction.loan_amount or 0
+        
+        await Customer.get_motor_collection().bulk_write([
+            build_customer_release_update(customer_id, loan_count, loan_amount)
+            for customer_id, (loan_count, loan_amount) in releases.items()
+        ], ordered=False)
+        
+        logger.info(
+            "Customer statistics decremented for bulk terminal status",
+            customers=len(releases),
+            new_status=new_status
         )
+        return list(releases)
     
     @staticmethod
     async def bulk_add_notes(
@@ -1503,66 +1744,104 @@ class PawnTransactionService:
         """
         Add the same note to multiple transactions.
         
+        All targets are read with one $in query, the note is added in memory
+        and the notes fields are written with one unordered bulk_write.
+        Transactions changed by another write after the read are reported as
+        failed instead of having that write overwritten.
+        
         Args:
             transaction_ids: List of transaction IDs to add notes to
             note: Note text to add
             added_by_user_id: User ID adding the notes
             
         Returns:
-            Dictionary with update results
+            BulkNotesResponse with per-transaction results
+            
+        Raises:
+            StaffValidationError: Staff user not found or inactive
         """
         from app.schemas.pawn_transaction_schema import BulkNotesResponse
         
-        success_count = 0
-        error_count = 0
-        successful_updates = []
-        failed_updates = []
-        
         # Validate user
         staff_user = await User.find_one(User.user_id == added_by_user_id)
         if not staff_user or staff_user.status != UserStatus.ACTIVE:
             raise StaffValidationError(f"Staff user {added_by_user_id} not found or inactive")
         
+        transactions = {
+            transaction.transaction_id: transaction
+            for transaction in await PawnTransaction.find(
+                In(PawnTransaction.transaction_id, list(set(transaction_ids)))
+            ).to_list()
+        }
+        
+        errors: Dict[str, str] = {}
+        noted: Dict[str, PawnTransaction] = {}
+        read_versions: Dict[str, Optional[datetime]] = {}
         for transaction_id in transaction_ids:
-            try:
-                # Get transaction
-                transaction = await PawnTransaction.find_one(PawnTransaction.transaction_id == transaction_id)
-                if not transaction:
-                    error_count += 1
-                    failed_updates.append({
-                        "transaction_id": transaction_id,
-                        "error": "Transaction not found"
-                    })
-                    continue
-                
-                # Add note to transaction using the new manual notes system
-                transaction.add_manual_note(note, added_by_user_id)
-                
-                await transaction.save()
-                
-                success_count += 1
-                successful_updates.append(transaction_id)
-                
-                # Log successful note addition
-                logger.info(f"✅ BULK NOTE: Added note to transaction {transaction_id} by user {added_by_user_id}")
-                
-            except Exception as e:
-                error_count += 1
-                failed_updates.append({
-                    "transaction_id": transaction_id,
-                    "error": str(e)
-                })
-                logger.error(f"❌ BULK NOTE ERROR: Failed to add note to {transaction_id}", error=str(e))
+            transaction = transactions.get(transaction_id)
+            if not transaction:
+                errors[transaction_id] = "Transaction not found"
+                continue
+            
+            read_versions.setdefault(transaction_id, transaction.updated_at)
+            # Add note to transaction using the new manual notes system
+            transaction.add_manual_note(note, added_by_user_id)
+            noted[transaction_id] = transaction
+        
+        if noted:
+            updated_transactions = list(noted.values())
+            
+            # One write time (at MongoDB's millisecond precision) for the batch
+            # tells applied updates apart from skipped ones
+            written_at = datetime.now(UTC)
+            written_at = written_at.replace(microsecond=written_at.microsecond // 1000 * 1000)
+            operations = []
+            for transaction in updated_transactions:
+                transaction.prepare_for_save()
+                transaction.updated_at = written_at
+                operations.append(build_notes_update(transaction, read_versions[transaction.transaction_id]))
+            
+            modified_count, write_errors = await PawnTransactionService._write_transaction_updates(operations)
+            for index, message in write_errors.items():
+                errors[updated_transactions[index].transaction_id] = message
+                logger.error(
+                    f"❌ BULK NOTE ERROR: Failed to add note to {updated_transactions[index].transaction_id}",
+                    error=message
+                )
+            
+            if modified_count < len(operations) - len(write_errors):
+                # Some transactions changed between the read and the write -
+                # only report the ones now carrying the write time
+                candidate_ids = [
+                    transaction.transaction_id
+                    for index, transaction in enumerate(updated_transactions)
+                    if index not in write_errors
+                ]
+                applied = set(await PawnTransaction.get_motor_collection().distinct(
+                    "transaction_id", {"transaction_id": {"$in": candidate_ids}, "updated_at": written_at}
+                ))
+                for transaction_id in candidate_ids:
+                    if transaction_id not in applied:
+                        errors[transaction_id] = f"Transaction {transaction_id} was modified during the update"
+        
+        successful_updates = [transaction_id for transaction_id in transaction_ids if transaction_id not in errors]
+        logger.info(
+            f"✅ BULK NOTE: Added note to {len(set(successful_updates))} transactions by user {added_by_user_id}"
+        )
         
         # Clear caches after bulk note addition
-        await _invalidate_all_transaction_caches()
+        await BusinessCache.invalidate_transaction_caches(transaction_ids=list(dict.fromkeys(successful_updates)))
         
         return BulkNotesResponse(
-            success_count=success_count,
-            error_count=error_count,
+            success_count=len(successful_updates),
+            error_count=len(transaction_ids) - len(successful_updates),
             total_requested=len(transaction_ids),
             successful_updates=successful_updates,
-            failed_updates=failed_updates
+            failed_updates=[
+                {"transaction_id": transaction_id, "error": errors[transaction_id]}
+                for transaction_id in transaction_ids
+                if transaction_id in errors
+            ]
         )
     
     @staticmethod
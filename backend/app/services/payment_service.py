@@ -6,6 +6,7 @@ validation, balance calculations, automatic status updates, and complete audit t
 """
 
 # Standard library imports
+import asyncio
 from datetime import datetime, UTC
 from typing import List, Optional, Dict, Any
 
@@ -22,28 +23,10 @@ from app.schemas.payment_schema import (
 from app.core.utils import get_enum_value
 from app.core.timezone_utils import utc_to_user_timezone, get_user_now, user_timezone_to_utc
 from app.core.transaction_notes import safe_append_transaction_notes, format_system_note  # Legacy compatibility
+from app.core.redis_cache import BusinessCache
 from app.services.notes_service import notes_service
-
-# Cache invalidation utility
-def _invalidate_search_caches():
-    """Helper function to invalidate search-related caches when transaction data changes"""
-    try:
-        # Import here to avoid circular imports
-        import asyncio
-        from app.services.unified_search_service import UnifiedSearchService
-        
-        # Create async context for cache invalidation
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            # Schedule as a task in the running loop
-            asyncio.create_task(UnifiedSearchService.invalidate_search_caches())
-        else:
-            # Run directly if no loop is running
-            asyncio.run(UnifiedSearchService.invalidate_search_caches())
-            
-    except Exception as e:
-        # Don't raise error as cache invalidation is not critical
-        pass
+from app.services.balance_service import BalanceService
+from app.services.daily_rollup_service import DailyRollupService
 
 
 class PaymentError(Exception):
@@ -169,38 +152,6 @@ class PaymentService:
     audit trails, and automatic status updates for pawn transactions.
     """
     
-    @staticmethod
-    async def _invalidate_all_transaction_caches():
-        """CRITICAL: Comprehensive cache invalidation for real-time updates"""
-        try:
-            from app.core.redis_cache import get_cache_service
-            cache = get_cache_service()
-            
-            if cache and cache.is_available:
-                # Clear all transaction list caches
-                cache_patterns = [
-                    "transactions_list_*",      # All transaction lists
-                    "transaction:*",            # Individual transaction caches
-                    "balance:*",                # Balance calculation caches
-                    "customer_stats_*",         # Customer statistics
-                    "business_stats_*"          # Business statistics
-                ]
-                
-                for pattern in cache_patterns:
-                    await cache.delete_pattern(pattern)
-                
-                import structlog
-                logger = structlog.get_logger("payment_service")
-                logger.info("🚀 CACHE CLEARED: All transaction caches invalidated for payment real-time updates")
-            
-            # Also invalidate search caches
-            _invalidate_search_caches()
-            
-        except Exception as e:
-            import structlog
-            logger = structlog.get_logger("payment_service")
-            logger.error("❌ CACHE ERROR: Failed to invalidate transaction caches during payment", error=str(e))
-    
     @staticmethod
     async def _get_balance_info(transaction_id: str) -> Dict[str, Any]:
         """Helper method to get balance info without circular import"""
@@ -344,6 +295,7 @@ class PaymentService:
             )
             
             # Update transaction status if fully paid or overpaid
+            previous_status = fresh_transaction.status
             if balance_after_payment <= 0:
                 fresh_transaction.status = TransactionStatus.REDEEMED
                 # Add redemption audit entry using new notes service
@@ -362,6 +314,12 @@ class PaymentService:
 
             # Save transaction within session
             await fresh_transaction.save(session=session)
+
+            # Keep daily rollups current (revenue, and the redemption if fully paid)
+            await DailyRollupService.record_payment(payment)
+            await DailyRollupService.record_status_change(
+                fresh_transaction, previous_status, fresh_transaction.status, payment.payment_date
+            )
             
             return payment
         
@@ -371,10 +329,10 @@ class PaymentService:
             payment = await payment_operations(session=None)
             
             # CRITICAL: Comprehensive cache invalidation for real-time updates
-            await PaymentService._invalidate_all_transaction_caches()
-            
-            # Also invalidate search caches (legacy compatibility)
-            _invalidate_search_caches()
+            await BusinessCache.invalidate_transaction_caches(
+                transaction_ids=[transaction_id],
+                customer_phones=[transaction.customer_id]
+            )
             
             import structlog
             logger = structlog.get_logger("payment_service")
@@ -614,13 +572,9 @@ class PaymentService:
         Returns:
             Total payment amount in whole dollars
         """
-        payments = await PaymentService.get_transaction_payments(transaction_id)
-        # Only count non-voided payments
-        return sum(
-            payment.payment_amount 
-            for payment in payments 
-            if not getattr(payment, 'is_voided', False)
-        )
+        # Non-voided payments summed by a single $group
+        totals = await BalanceService.get_transaction_totals(transaction_id)
+        return totals["total_paid"]
     
     @staticmethod
     async def get_payment_by_id(payment_id: str) -> Optional[Payment]:
@@ -678,15 +632,14 @@ class PaymentService:
         Raises:
             TransactionNotFoundError: Transaction not found
         """
-        # Validate transaction exists
-        transaction = await PawnTransaction.find_one(
-            PawnTransaction.transaction_id == transaction_id
+        # Validate transaction exists while fetching its (non-voided) payments
+        transaction_exists, payments = await asyncio.gather(
+            PawnTransaction.find(PawnTransaction.transaction_id == transaction_id).count(),
+            PaymentService.get_transaction_payments(transaction_id)
         )
-        if not transaction:
+        if not transaction_exists:
             raise TransactionNotFoundError(f"Transaction {transaction_id} not found")
         
-        payments = await PaymentService.get_transaction_payments(transaction_id)
-        
         if not payments:
             return {
                 "transaction_id": transaction_id,
@@ -714,12 +667,8 @@ class PaymentService:
                 "created_at": payment.created_at.isoformat()
             })
         
-        # Only count non-voided payments
-        total_payments = sum(
-            p.payment_amount 
-            for p in payments 
-            if not getattr(p, 'is_voided', False)
-        )
+        # Payments are already limited to non-voided ones
+        total_payments = sum(p.payment_amount for p in payments)
         
         return {
             "transaction_id": transaction_id,
@@ -1011,10 +960,7 @@ class PaymentService:
             )
         
         # CRITICAL: Comprehensive cache invalidation for real-time updates
-        await PaymentService._invalidate_all_transaction_caches()
-        
-        # Also invalidate search caches (legacy compatibility)
-        _invalidate_search_caches()
+        await BusinessCache.invalidate_transaction_caches(transaction_ids=[payment.transaction_id])
         
         import structlog
         logger = structlog.get_logger("payment_service")
@@ -1325,6 +1271,7 @@ class PaymentService:
                 )
 
             # Update transaction status if fully paid
+            previous_status = fresh_transaction.status
             if balance_after_payment <= 0:
                 fresh_transaction.status = TransactionStatus.REDEEMED
                 await notes_service.add_redemption_audit(
@@ -1342,9 +1289,17 @@ class PaymentService:
 
             await fresh_transaction.save()
 
+            # Keep daily rollups current (revenue, and the redemption if fully paid)
+            await DailyRollupService.record_payment(payment)
+            await DailyRollupService.record_status_change(
+                fresh_transaction, previous_status, fresh_transaction.status, payment.payment_date
+            )
+
             # Invalidate caches
-            await PaymentService._invalidate_all_transaction_caches()
-            _invalidate_search_caches()
+            await BusinessCache.invalidate_transaction_caches(
+                transaction_ids=[fresh_transaction.transaction_id],
+                customer_phones=[fresh_transaction.customer_id]
+            )
 
             import structlog
             logger = structlog.get_logger("payment_service")
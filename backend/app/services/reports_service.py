@@ -18,8 +18,8 @@ from zoneinfo import ZoneInfo
 from app.core.exceptions import ValidationError
 from app.core.timezone_utils import get_user_now, utc_to_user_timezone
 from app.models.customer_model import Customer, CustomerStatus
-from app.models.pawn_item_model import PawnItem
-from app.models.pawn_transaction_model import PawnTransaction, TransactionStatus
+from app.models.pawn_item_model import PawnItem, PawnItemSummary
+from app.models.pawn_transaction_model import PawnTransaction, PawnTransactionListView, TransactionStatus
 from app.models.user_model import User
 
 # Configure logger
@@ -531,16 +531,17 @@ class ReportsService:
                 TransactionStatus.FORFEITED
             ]
 
+            # Projected views skip audit logs and notes the snapshot never reads
             transactions = await PawnTransaction.find(
                 {"status": {"$in": active_statuses}}
-            ).to_list()
+            ).project(PawnTransactionListView).to_list()
 
             # PERFORMANCE OPTIMIZATION: Pre-fetch ALL items in ONE query
             # This avoids N+1 query problem (N = number of transactions)
             transaction_ids = [tx.transaction_id for tx in transactions]
             all_items = await PawnItem.find(
                 {"transaction_id": {"$in": transaction_ids}}
-            ).to_list()
+            ).project(PawnItemSummary).to_list()
 
             # Build lookup dictionary for O(1) access
             items_by_transaction = {}
@@ -603,8 +604,8 @@ class ReportsService:
 
     @staticmethod
     async def _calculate_status_breakdown(
-        transactions: List[PawnTransaction],
-        items_by_transaction: Dict[str, List[PawnItem]],
+        transactions: List[PawnTransactionListView],
+        items_by_transaction: Dict[str, List[PawnItemSummary]],
         timezone_header: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """
@@ -679,8 +680,8 @@ class ReportsService:
 
     @staticmethod
     async def _calculate_age_breakdown(
-        transactions: List[PawnTransaction],
-        items_by_transaction: Dict[str, List[PawnItem]]
+        transactions: List[PawnTransactionListView],
+        items_by_transaction: Dict[str, List[PawnItemSummary]]
     ) -> List[Dict[str, Any]]:
         """
         Calculate inventory breakdown by storage age.
@@ -740,8 +741,8 @@ class ReportsService:
 
     @staticmethod
     async def _calculate_high_value_alert(
-        transactions: List[PawnTransaction],
-        items_by_transaction: Dict[str, List[PawnItem]],
+        transactions: List[PawnTransactionListView],
+        items_by_transaction: Dict[str, List[PawnItemSummary]],
         timezone_header: Optional[str] = None
     ) -> Dict[str, Any]:
         """
@@ -16,6 +16,7 @@ from app.models.user_activity_log_model import UserActivityType
 from app.core.exceptions import BusinessRuleError, ValidationError, AuthenticationError
 from app.core.timezone_utils import get_user_now, utc_to_user_timezone
 from app.services.user_activity_service import UserActivityService
+from app.services.daily_rollup_service import DailyRollupService
 
 logger = structlog.get_logger(__name__)
 
@@ -123,7 +124,7 @@ class ReversalService:
             raise AuthenticationError("Only administrators can reverse payments")
         
         # Verify admin PIN
-        if not current_user.verify_pin(admin_pin):
+        if not await current_user.verify_pin_async(admin_pin):
             raise AuthenticationError("Invalid admin PIN")
         
         # Check eligibility
@@ -190,6 +191,8 @@ class ReversalService:
             transaction.internal_notes = reversal_note.strip()[:500]
         
         # If transaction was redeemed, revert status (since we voided a payment, it's no longer fully paid)
+        previous_status = transaction.status
+        previous_changed_at = transaction.updated_at
         if transaction.status == TransactionStatus.REDEEMED:
             # Check if transaction has active extensions first
             from app.models.extension_model import Extension
@@ -217,15 +220,16 @@ class ReversalService:
         await payment.save()
         await transaction.save()
         
+        # Move the reverted redemption out of the daily rollups
+        await DailyRollupService.record_status_change(
+            transaction, previous_status, transaction.status, transaction.updated_at, previous_changed_at
+        )
+        
         # CRITICAL: Invalidate transaction cache to ensure fresh status reads
         try:
-            from app.core.redis_cache import get_cache_service
-            cache = get_cache_service()
-            if cache and cache.is_available:
-                # Clear specific transaction cache
-                transaction_cache_key = f"transaction:{payment.transaction_id}"
-                await cache.delete(transaction_cache_key)
-                logger.info(f"🚀 CACHE CLEARED: Transaction cache invalidated for {payment.transaction_id}")
+            from app.core.redis_cache import BusinessCache
+            await BusinessCache.invalidate_transaction_caches(transaction_ids=[payment.transaction_id])
+            logger.info(f"🚀 CACHE CLEARED: Transaction cache invalidated for {payment.transaction_id}")
         except Exception as e:
             logger.warning(f"Failed to invalidate transaction cache for {payment.transaction_id}: {str(e)}")
         
@@ -360,7 +364,7 @@ class ReversalService:
             raise AuthenticationError("Only administrators can cancel extensions")
         
         # Verify admin PIN
-        if not current_user.verify_pin(admin_pin):
+        if not await current_user.verify_pin_async(admin_pin):
             raise AuthenticationError("Invalid admin PIN")
         
         # Check eligibility
@@ -432,15 +436,14 @@ class ReversalService:
         await extension.save()
         await transaction.save()
         
+        # Remove the cancelled fee from the rollup of the original extension day
+        await DailyRollupService.record_extension(extension, sign=-1)
+        
         # CRITICAL: Invalidate transaction cache to ensure fresh status reads
         try:
-            from app.core.redis_cache import get_cache_service
-            cache = get_cache_service()
-            if cache and cache.is_available:
-                # Clear specific transaction cache
-                transaction_cache_key = f"transaction:{extension.transaction_id}"
-                await cache.delete(transaction_cache_key)
-                logger.info(f"🚀 CACHE CLEARED: Transaction cache invalidated for {extension.transaction_id}")
+            from app.core.redis_cache import BusinessCache
+            await BusinessCache.invalidate_transaction_caches(transaction_ids=[extension.transaction_id])
+            logger.info(f"🚀 CACHE CLEARED: Transaction cache invalidated for {extension.transaction_id}")
         except Exception as e:
             logger.warning(f"Failed to invalidate transaction cache for {extension.transaction_id}: {str(e)}")
         
@@ -0,0 +1,283 @@
+"""
+Search Index Service
+
+Keeps the in-process TransactionSearchIndex in step with MongoDB and serves
+typed search-bar queries (transaction ID, phone number, reference barcode and
+customer name) from it, with the same prefix matching as the MongoDB
+fallback in UnifiedSearchService.build_match_conditions. The index is loaded at startup from a Redis
+snapshot (or built from projection queries when there is none), then caught
+up incrementally from transactions and customers whose updated_at moved past
+the last sync point.
+
+Writes that invalidate transaction caches mark the index dirty, so the next
+search in this process catches up first; other processes catch up on their
+next search after CATCH_UP_INTERVAL_SECONDS.
+"""
+
+# Standard library imports
+import asyncio
+import time
+from datetime import datetime, timedelta, UTC
+from typing import Any, Dict, List, Optional, Tuple
+
+# Third-party imports
+import structlog
+
+# Local imports
+from app.core.redis_cache import BusinessCache, CacheConfig
+from app.core.search_index import SortKey, TransactionSearchIndex
+from app.models.customer_model import Customer
+from app.models.pawn_transaction_model import PawnTransaction
+from app.schemas.pawn_transaction_schema import UnifiedSearchType
+
+# Configure logger
+logger = structlog.get_logger("search_index")
+
+SNAPSHOT_CACHE_KEY = "search_index:snapshot"
+SNAPSHOT_VERSION = 2
+
+# The scheduler re-saves the snapshot this often
+SNAPSHOT_INTERVAL_MINUTES = 10
+
+# Cross-process freshness: searches catch up at least this often
+CATCH_UP_INTERVAL_SECONDS = 10
+
+# Resume a little before the last sync point to cover in-flight writes
+CATCH_UP_OVERLAP = timedelta(seconds=5)
+
+TRANSACTION_PROJECTION = {
+    "_id": 0,
+    "transaction_id": 1,
+    "formatted_id": 1,
+    "reference_barcode": 1,
+    "customer_id": 1,
+    "customer_name_search": 1,
+    "updated_at": 1,
+    "pawn_date": 1
+}
+
+# Index fields searched for each unified search type (others use MongoDB).
+# Full-text searches also match internal notes, which are not indexed.
+INDEX_FIELDS_BY_SEARCH_TYPE = {
+    UnifiedSearchType.TRANSACTION_ID: ("f",),
+    UnifiedSearchType.PHONE_NUMBER: ("p",),
+    UnifiedSearchType.REFERENCE_BARCODE: ("b",),
+    UnifiedSearchType.CUSTOMER_NAME: ("n",)
+}
+
+
+def _timestamp(value: Optional[datetime]) -> float:
+    """POSIX timestamp of a stored datetime (naive values are UTC)."""
+    if value is None:
+        return 0.0
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    return value.timestamp()
+
+
+def transaction_sort_key(document: Dict[str, Any]) -> SortKey:
+    """Ordering key matching the unified search sort stage."""
+    return (
+        _timestamp(document.get("updated_at")),
+        _timestamp(document.get("pawn_date")),
+        document["transaction_id"]
+    )
+
+
+def transaction_index_fields(document: Dict[str, Any]) -> Dict[str, Any]:
+    """Indexed field values of a projected transaction."""
+    return {
+        "f": document.get("formatted_id"),
+        "b": document.get("reference_barcode"),
+        "p": document.get("customer_id"),
+        "n": document.get("customer_name_search")
+    }
+
+
+class SearchIndexService:
+    """Service owning the process-wide transaction search index"""
+
+    _index: Optional[TransactionSearchIndex] = None
+    _synced_at: Optional[datetime] = None
+    _last_catch_up: float = 0.0
+    _dirty: bool = False
+    _lock: Optional[asyncio.Lock] = None
+
+    @classmethod
+    def _get_lock(cls) -> asyncio.Lock:
+        if cls._lock is None:
+            cls._lock = asyncio.Lock()
+        return cls._lock
+
+    @classmethod
+    def is_ready(cls) -> bool:
+        """Whether searches can be served from the index."""
+        return cls._index is not None
+
+    @classmethod
+    def mark_dirty(cls) -> None:
+        """Catch up before the next search (called when transaction data changes)."""
+        cls._dirty = True
+
+    @classmethod
+    def reset(cls) -> None:
+        """Drop the index; searches fall back to MongoDB until start() runs again."""
+        cls._index = None
+        cls._synced_at = None
+        cls._dirty = False
+
+    # ========== LOADING ==========
+
+    @staticmethod
+    async def _index_transactions(
+        index: TransactionSearchIndex,
+        query: Dict[str, Any]
+    ) -> int:
+        """
+        Stream projected transactions matching query into the index.
+
+        Returns:
+            Number of transactions indexed
+        """
+        count = 0
+        cursor = PawnTransaction.get_motor_collection().find(query, projection=TRANSACTION_PROJECTION)
+        async for document in cursor:
+            index.upsert(document["transaction_id"], transaction_index_fields(document), transaction_sort_key(document))
+            count += 1
+        return count
+
+    @classmethod
+    async def build(cls) -> TransactionSearchIndex:
+        """Build the index from every transaction and persist a snapshot."""
+        started = time.perf_counter()
+        synced_at = datetime.now(UTC)
+        index = TransactionSearchIndex()
+        count = await cls._index_transactions(index, {})
+
+        cls._index, cls._synced_at = index, synced_at
+        cls._last_catch_up = time.monotonic()
+        logger.info("Search index built", transactions=count,
+                    duration_ms=round((time.perf_counter() - started) * 1000, 2))
+        await cls.save_snapshot()
+        return index
+
+    @classmethod
+    async def start(cls) -> None:
+        """Load the index from the Redis snapshot, or build it when there is none."""
+        try:
+            async with cls._get_lock():
+                if await cls.load_snapshot():
+                    cls._dirty = True  # Catch up on writes made since the snapshot
+                    return
+                await cls.build()
+        except Exception as e:
+            logger.error("Search index unavailable, searches use MongoDB", error=str(e))
+
+    # ========== SNAPSHOTS ==========
+
+    @classmethod
+    async def save_snapshot(cls) -> bool:
+        """Persist the indexed documents to Redis for fast startup."""
+        if cls._index is None or cls._synced_at is None:
+            return False
+        try:
+            return await BusinessCache.set(SNAPSHOT_CACHE_KEY, {
+                "version": SNAPSHOT_VERSION,
+                "synced_at": cls._synced_at.isoformat(),
+                "documents": cls._index.to_snapshot()
+            }, ttl_seconds=CacheConfig.VERY_LONG_TTL)
+        except Exception as e:
+            logger.warning("Failed to save search index snapshot", error=str(e))
+            return False
+
+    @classmethod
+    async def load_snapshot(cls) -> bool:
+        """Load the index from Redis. Returns False when no usable snapshot exists."""
+        try:
+            snapshot = await BusinessCache.get(SNAPSHOT_CACHE_KEY)
+        except Exception as e:
+            logger.warning("Failed to read search index snapshot", error=str(e))
+            return False
+
+        if not snapshot or snapshot.get("version") != SNAPSHOT_VERSION:
+            return False
+
+        cls._index = TransactionSearchIndex.from_snapshot(snapshot["documents"])
+        cls._synced_at = datetime.fromisoformat(snapshot["synced_at"])
+        cls._last_catch_up = 0.0
+        logger.info("Search index loaded from snapshot", transactions=len(cls._index))
+        return True
+
+    # ========== INCREMENTAL SYNC ==========
+
+    @classmethod
+    async def catch_up(cls) -> int:
+        """
+        Re-index transactions changed since the last sync point.
+
+        Includes the transactions of customers updated since then, whose
+        denormalised names may have changed without touching the transaction.
+
+        Returns:
+            Number of transactions re-indexed
+        """
+        if cls._index is None or cls._synced_at is None:
+            return 0
+
+        async with cls._get_lock():
+            since = cls._synced_at - CATCH_UP_OVERLAP
+            synced_at = datetime.now(UTC)
+            cls._dirty = False
+
+            phones = await Customer.get_motor_collection().distinct(
+                "phone_number", {"updated_at": {"$gte": since}}
+            )
+            query: Dict[str, Any] = {"updated_at": {"$gte": since}}
+            if phones:
+                query = {"$or": [query, {"customer_id": {"$in": phones}}]}
+
+            count = await cls._index_transactions(cls._index, query)
+            cls._synced_at = synced_at
+            cls._last_catch_up = time.monotonic()
+            if count:
+                logger.debug("Search index caught up", transactions=count)
+            return count
+
+    @classmethod
+    async def _ensure_fresh(cls) -> None:
+        if cls._dirty or time.monotonic() - cls._last_catch_up >= CATCH_UP_INTERVAL_SECONDS:
+            await cls.catch_up()
+
+    # ========== QUERIES ==========
+
+    @classmethod
+    async def search(
+        cls,
+        search_text: str,
+        search_type: UnifiedSearchType,
+        page: int = 1,
+        page_size: int = 20
+    ) -> Optional[Tuple[int, List[str]]]:
+        """
+        Search the index for one page of transaction IDs.
+
+        Args:
+            search_text: Search text (already normalised for typed searches)
+            search_type: Resolved search type
+            page: Page number
+            page_size: Results per page
+
+        Returns:
+            Tuple of (total matches, page transaction IDs), or None when the
+            index is not ready or does not cover the search type
+        """
+        fields = INDEX_FIELDS_BY_SEARCH_TYPE.get(search_type)
+        if fields is None or cls._index is None:
+            return None
+
+        try:
+            await cls._ensure_fresh()
+        except Exception as e:
+            logger.warning("Search index catch-up failed, serving last synced state", error=str(e))
+
+        return cls._index.search(search_text, fields, offset=(page - 1) * page_size, limit=page_size)
@@ -12,8 +12,8 @@ from beanie import PydanticObjectId
 
 from app.models.service_alert_model import ServiceAlert, AlertStatus, AlertType
 from app.models.customer_model import Customer
-from app.models.pawn_transaction_model import PawnTransaction
-from app.models.pawn_item_model import PawnItem
+from app.models.pawn_transaction_model import PawnTransaction, PawnTransactionListView
+from app.models.pawn_item_model import PawnItem, PawnItemSummary
 from app.core.redis_cache import BusinessCache
 from app.schemas.service_alert_schema import (
     ServiceAlertCreate, ServiceAlertUpdate, ServiceAlertResolve,
@@ -357,14 +357,21 @@ class ServiceAlertService:
         # Find transactions for customer (all statuses for comprehensive view)
         transactions = await PawnTransaction.find(
             PawnTransaction.customer_id == customer_phone
-        ).sort(-PawnTransaction.pawn_date).to_list()  # Most recent first
+        ).sort(-PawnTransaction.pawn_date).project(PawnTransactionListView).to_list()  # Most recent first
+        
+        # Fetch items for all transactions in one query
+        transaction_ids = [transaction.transaction_id for transaction in transactions]
+        items_by_transaction = {}
+        if transaction_ids:
+            all_items = await PawnItem.find(
+                {"transaction_id": {"$in": transaction_ids}}
+            ).sort(PawnItem.item_number).project(PawnItemSummary).to_list()
+            for item in all_items:
+                items_by_transaction.setdefault(item.transaction_id, []).append(item)
         
         transaction_items = []
         for transaction in transactions:
-            # Find items for this transaction
-            pawn_items = await PawnItem.find(
-                PawnItem.transaction_id == transaction.transaction_id
-            ).sort(PawnItem.item_number).to_list()
+            pawn_items = items_by_transaction.get(transaction.transaction_id, [])
             
             if not pawn_items:
                 continue  # Skip transactions with no items
@@ -415,6 +422,22 @@ class ServiceAlertService:
         await alert.delete()
         return True
     
+    @staticmethod
+    async def count_customers_with_active_alerts() -> int:
+        """
+        Count unique customers with active service alerts, server-side.
+        
+        Returns:
+            Number of distinct customer phones with an active alert
+        """
+        pipeline = [
+            {"$match": {"status": AlertStatus.ACTIVE.value}},
+            {"$group": {"_id": "$customer_phone"}},
+            {"$count": "count"}
+        ]
+        result = await ServiceAlert.get_motor_collection().aggregate(pipeline).to_list(length=1)
+        return result[0]["count"] if result else 0
+    
     @staticmethod
     async def get_unique_customer_alert_count() -> dict:
         """
@@ -0,0 +1,449 @@
+"""
+Trends Aggregation Service
+
+Server-side aggregation engine for the /trends endpoints. Buckets are computed
+inside MongoDB with timezone-aware $dateTrunc so that only per-bucket counts and
+sums travel over the wire - full PawnTransaction documents (and their embedded
+system_audit_log) are never materialised for trend charts.
+"""
+
+import asyncio
+import structlog
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+
+from bson import Decimal128
+from beanie.operators import And, GTE, LTE, NE
+
+from app.core.timezone_utils import validate_and_get_timezone, utc_to_user_timezone
+from app.models.extension_model import Extension
+from app.models.pawn_transaction_model import PawnTransaction
+from app.models.payment_model import Payment
+
+# Configure logger
+logger = structlog.get_logger("trends_aggregation")
+
+# Status groupings (must match the semantics of the /trends/loans handler)
+ACTIVE_STATUSES = ["active", "overdue", "extended"]
+TERMINAL_STATUSES = ["redeemed", "forfeited", "sold", "voided"]
+CLOSED_EVENT_STATUSES = ["redeemed", "forfeited", "sold"]
+
+
+def get_timezone_name(timezone_header: Optional[str]) -> str:
+    """
+    Resolve the client timezone header to an IANA name MongoDB understands.
+
+    Uses the same validation as utc_to_user_timezone so that server-side
+    buckets line up exactly with the Python conversions (invalid -> UTC).
+    """
+    return validate_and_get_timezone(timezone_header).key
+
+
+def get_bucket_unit(date_format: str) -> str:
+    """Map a trends date format to the $dateTrunc unit used for bucketing."""
+    return "month" if date_format == "%Y-%m" else "day"
+
+
+def build_bucket_key_expression(date_expr: Any, date_format: str, timezone_name: str) -> Dict[str, Any]:
+    """
+    Build the aggregation expression that renders a date as a bucket key.
+
+    The result is identical to utc_to_user_timezone(date).strftime(date_format).
+    """
+    return {
+        "$dateToString": {
+            "format": date_format,
+            "date": {
+                "$dateTrunc": {
+                    "date": date_expr,
+                    "unit": get_bucket_unit(date_format),
+                    "timezone": timezone_name
+                }
+            },
+            "timezone": timezone_name
+        }
+    }
+
+
+def to_decimal(value: Any) -> Decimal:
+    """Convert an aggregation result (Decimal128, int, float or None) to Decimal."""
+    if value is None:
+        return Decimal("0")
+    if isinstance(value, Decimal128):
+        return value.to_decimal()
+    return Decimal(str(value))
+
+
+def empty_revenue_bucket(date_key: str) -> Dict[str, Any]:
+    """Create a zeroed revenue bucket (Decimal amounts, converted by the caller)."""
+    return {
+        "date": date_key,
+        "total_revenue": Decimal("0"),
+        "principal_collected": Decimal("0"),
+        "interest_collected": Decimal("0"),
+        "extension_fees": Decimal("0"),
+        "overdue_fees": Decimal("0"),
+        "payment_count": 0
+    }
+
+
+class TrendsAggregationService:
+    """Service for computing trend buckets with MongoDB aggregation pipelines"""
+
+    # ========== LOAN TRENDS ==========
+
+    @staticmethod
+    def build_loan_trends_match(start_date: datetime, end_date: datetime) -> Dict[str, Any]:
+        """
+        Build the $match stage selecting transactions relevant to a loan trend window.
+
+        Relevant transactions are those created during the window plus those
+        created earlier that are either still open or closed on/after the window
+        start. Each $or branch is served by trends_created_status_idx or
+        trends_updated_status_idx.
+        """
+        return {
+            "$or": [
+                # 1. Created during the period
+                {"created_at": {"$gte": start_date, "$lte": end_date}},
+                # 2. Created before the period and still open
+                {
+                    "created_at": {"$lte": start_date},
+                    "status": {"$nin": TERMINAL_STATUSES}
+                },
+                # 3. Created before the period and closed during/after it
+                {
+                    "updated_at": {"$gte": start_date},
+                    "status": {"$in": TERMINAL_STATUSES},
+                    "created_at": {"$lte": start_date}
+                }
+            ]
+        }
+
+    @staticmethod
+    def build_loan_trends_pipeline(
+        start_date: datetime,
+        end_date: datetime,
+        date_format: str,
+        timezone_name: str,
+        active_boundaries: List[datetime]
+    ) -> List[Dict[str, Any]]:
+        """
+        Build the single-round-trip loan trends pipeline.
+
+        Args:
+            start_date: Window start (naive UTC, as used by the handler)
+            end_date: Window end (naive UTC, as used by the handler)
+            date_format: Bucket key format ("%Y-%m-%d" or "%Y-%m")
+            timezone_name: IANA timezone for bucket boundaries
+            active_boundaries: Per-bucket end-of-period instants (naive UTC)
+
+        Returns:
+            Aggregation pipeline producing a single document with "closed" and
+            "totals" facets
+        """
+        closed_at = {"$ifNull": ["$updated_at", "$created_at"]}
+
+        totals_group: Dict[str, Any] = {
+            "_id": None,
+            "total_transactions": {"$sum": 1},
+            "transactions_in_period": {
+                "$sum": {"$cond": [{"$gte": ["$created_at", start_date]}, 1, 0]}
+            },
+            "current_active_loans": {
+                "$sum": {"$cond": [{"$in": ["$status", ACTIVE_STATUSES]}, 1, 0]}
+            }
+        }
+
+        # Active loans at each bucket boundary: created on/before the boundary and
+        # either still open, or closed strictly after the boundary.
+        for index, boundary in enumerate(active_boundaries):
+            totals_group[f"active_{index}"] = {
+                "$sum": {
+                    "$cond": [
+                        {
+                            "$and": [
+                                {"$lte": ["$created_at", boundary]},
+                                {
+                                    "$or": [
+                                        {"$in": ["$status", ACTIVE_STATUSES]},
+                                        {
+                                            "$and": [
+                                                {"$in": ["$status", TERMINAL_STATUSES]},
+                                                {"$gt": ["$updated_at", boundary]}
+                                            ]
+                                        }
+                                    ]
+                                }
+                            ]
+                        },
+                        1,
+                        0
+                    ]
+                }
+            }
+
+        return [
+            {"$match": TrendsAggregationService.build_loan_trends_match(start_date, end_date)},
+            {
+                "$project": {
+                    "_id": 0,
+                    "status": 1,
+                    "loan_amount": 1,
+                    "created_at": 1,
+                    "updated_at": 1
+                }
+            },
+            {
+                "$facet": {
+                    "closed": [
+                        {"$match": {"status": {"$in": CLOSED_EVENT_STATUSES}}},
+                        {"$addFields": {"closed_at": closed_at}},
+                        {"$match": {"closed_at": {"$gte": start_date, "$lte": end_date}}},
+                        {
+                            "$group": {
+                                "_id": {
+                                    "status": "$status",
+                                    "bucket": build_bucket_key_expression(
+                                        "$closed_at", date_format, timezone_name
+                                    )
+                                },
+                                "count": {"$sum": 1},
+                                "amount": {"$sum": "$loan_amount"}
+                            }
+                        }
+                    ],
+                    "totals": [
+                        {"$group": totals_group}
+                    ]
+                }
+            }
+        ]
+
+    @staticmethod
+    async def aggregate_loan_trends(
+        start_date: datetime,
+        end_date: datetime,
+        date_format: str,
+        timezone_header: Optional[str],
+        active_boundaries: List[Tuple[str, datetime]]
+    ) -> Dict[str, Any]:
+        """
+        Compute loan trend buckets server-side.
+
+        Args:
+            start_date: Window start (naive UTC)
+            end_date: Window end (naive UTC)
+            date_format: Bucket key format
+            timezone_header: Client timezone from X-Client-Timezone header
+            active_boundaries: (bucket key, boundary) pairs for active loan counts
+
+        Returns:
+            Dictionary with:
+            - closed: {(status, bucket_key): {"count": int, "amount": int}}
+            - active_loans: {bucket_key: int}
+            - total_transactions, transactions_in_period, current_active_loans
+        """
+        timezone_name = get_timezone_name(timezone_header)
+        pipeline = TrendsAggregationService.build_loan_trends_pipeline(
+            start_date,
+            end_date,
+            date_format,
+            timezone_name,
+            [boundary for _, boundary in active_boundaries]
+        )
+
+        result = await PawnTransaction.aggregate(pipeline).to_list()
+        facets = result[0] if result else {"closed": [], "totals": []}
+
+        closed = {
+            (row["_id"]["status"], row["_id"]["bucket"]): {
+                "count": row["count"],
+                "amount": int(row["amount"] or 0)
+            }
+            for row in facets.get("closed", [])
+        }
+
+        totals = facets["totals"][0] if facets.get("totals") else {}
+        active_loans = {
+            date_key: totals.get(f"active_{index}", 0)
+            for index, (date_key, _) in enumerate(active_boundaries)
+        }
+
+        logger.debug("Loan trends aggregated",
+                     timezone=timezone_name,
+                     closed_buckets=len(closed),
+                     boundaries=len(active_boundaries))
+
+        return {
+            "closed": closed,
+            "active_loans": active_loans,
+            "total_transactions": totals.get("total_transactions", 0),
+            "transactions_in_period": totals.get("transactions_in_period", 0),
+            "current_active_loans": totals.get("current_active_loans", 0)
+        }
+
+    # ========== REVENUE TRENDS ==========
+
+    @staticmethod
+    def build_payment_revenue_pipeline(
+        start_date: datetime,
+        end_date: datetime,
+        date_format: str,
+        timezone_name: str
+    ) -> List[Dict[str, Any]]:
+        """
+        Build the payments revenue pipeline.
+
+        Portions are summed as Decimal128 so totals are exact regardless of
+        whether legacy documents stored amounts as floats.
+        """
+        return [
+            {"$match": {"payment_date": {"$gte": start_date, "$lte": end_date}}},
+            {
+                "$group": {
+                    "_id": build_bucket_key_expression("$payment_date", date_format, timezone_name),
+                    "total_revenue": {"$sum": {"$toDecimal": {"$ifNull": ["$payment_amount", 0]}}},
+                    "principal_collected": {"$sum": {"$toDecimal": {"$ifNull": ["$principal_portion", 0]}}},
+                    "interest_collected": {"$sum": {"$toDecimal": {"$ifNull": ["$interest_portion", 0]}}},
+                    "overdue_fees": {"$sum": {"$toDecimal": {"$ifNull": ["$overdue_fee_portion", 0]}}},
+                    "payment_count": {"$sum": 1}
+                }
+            }
+        ]
+
+    @staticmethod
+    def build_extension_revenue_pipeline(
+        start_date: datetime,
+        end_date: datetime,
+        date_format: str,
+        timezone_name: str
+    ) -> List[Dict[str, Any]]:
+        """
+        Build the extensions revenue pipeline (extension fees per bucket).
+
+        Cancelled extensions are excluded, matching the daily rollups and the
+        balance calculation.
+        """
+        return [
+            {"$match": {"extension_date": {"$gte": start_date, "$lte": end_date}, "is_cancelled": {"$ne": True}}},
+            {
+                "$group": {
+                    "_id": build_bucket_key_expression("$extension_date", date_format, timezone_name),
+                    "extension_fees": {"$sum": {"$toDecimal": {"$ifNull": ["$total_extension_fee", 0]}}}
+                }
+            }
+        ]
+
+    @staticmethod
+    async def aggregate_revenue_buckets(
+        start_date: datetime,
+        end_date: datetime,
+        date_format: str,
+        timezone_header: Optional[str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Compute revenue buckets server-side.
+
+        The payments and extensions pipelines run concurrently; each returns one
+        small document per bucket.
+
+        Args:
+            start_date: Window start (naive UTC)
+            end_date: Window end (naive UTC)
+            date_format: Bucket key format ("%Y-%m-%d" or "%Y-%m")
+            timezone_header: Client timezone from X-Client-Timezone header
+
+        Returns:
+            Mapping of bucket key to revenue bucket with Decimal amounts
+        """
+        timezone_name = get_timezone_name(timezone_header)
+
+        payment_rows, extension_rows = await asyncio.gather(
+            Payment.aggregate(
+                TrendsAggregationService.build_payment_revenue_pipeline(
+                    start_date, end_date, date_format, timezone_name
+                )
+            ).to_list(),
+            Extension.aggregate(
+                TrendsAggregationService.build_extension_revenue_pipeline(
+                    start_date, end_date, date_format, timezone_name
+                )
+            ).to_list()
+        )
+
+        revenue_by_date: Dict[str, Dict[str, Any]] = {}
+
+        for row in payment_rows:
+            bucket = revenue_by_date.setdefault(row["_id"], empty_revenue_bucket(row["_id"]))
+            bucket["total_revenue"] += to_decimal(row["total_revenue"])
+            bucket["principal_collected"] += to_decimal(row["principal_collected"])
+            bucket["interest_collected"] += to_decimal(row["interest_collected"])
+            bucket["overdue_fees"] += to_decimal(row["overdue_fees"])
+            bucket["payment_count"] += row["payment_count"]
+
+        for row in extension_rows:
+            bucket = revenue_by_date.setdefault(row["_id"], empty_revenue_bucket(row["_id"]))
+            extension_fees = to_decimal(row["extension_fees"])
+            bucket["extension_fees"] += extension_fees
+            bucket["total_revenue"] += extension_fees
+
+        logger.debug("Revenue trends aggregated",
+                     timezone=timezone_name,
+                     payment_buckets=len(payment_rows),
+                     extension_buckets=len(extension_rows))
+
+        return revenue_by_date
+
+    @staticmethod
+    async def calculate_revenue_buckets_python(
+        start_date: datetime,
+        end_date: datetime,
+        date_format: str,
+        timezone_header: Optional[str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Compute revenue buckets by loading documents and summing in Python.
+
+        Reference implementation kept as a fallback for MongoDB deployments
+        without $dateTrunc (< 5.0) and for verifying the aggregation engine.
+        """
+        payments, extensions = await asyncio.gather(
+            Payment.find(
+                And(
+                    GTE(Payment.payment_date, start_date),
+                    LTE(Payment.payment_date, end_date)
+                )
+            ).to_list(),
+            Extension.find(
+                And(
+                    GTE(Extension.extension_date, start_date),
+                    LTE(Extension.extension_date, end_date),
+                    NE(Extension.is_cancelled, True)
+                )
+            ).to_list()
+        )
+
+        revenue_by_date: Dict[str, Dict[str, Any]] = {}
+
+        for payment in payments:
+            date_key = utc_to_user_timezone(payment.payment_date, timezone_header).strftime(date_format)
+            bucket = revenue_by_date.setdefault(date_key, empty_revenue_bucket(date_key))
+
+            # BLOCKER 3: Use Decimal for all financial calculations to avoid float precision issues
+            bucket["total_revenue"] += Decimal(str(payment.payment_amount))
+            bucket["principal_collected"] += Decimal(str(payment.principal_portion))
+            bucket["interest_collected"] += Decimal(str(payment.interest_portion))
+            bucket["overdue_fees"] += Decimal(str(payment.overdue_fee_portion))
+            bucket["payment_count"] += 1
+
+        for extension in extensions:
+            date_key = utc_to_user_timezone(extension.extension_date, timezone_header).strftime(date_format)
+            bucket = revenue_by_date.setdefault(date_key, empty_revenue_bucket(date_key))
+
+            extension_fee_decimal = Decimal(str(extension.total_extension_fee))
+            bucket["extension_fees"] += extension_fee_decimal
+            bucket["total_revenue"] += extension_fee_decimal
+
+        return revenue_by_date
@@ -6,6 +6,7 @@ optimized MongoDB aggregation pipelines, and comprehensive caching strategy.
 """
 
 # Standard library imports
+import asyncio
 import re
 import hashlib
 from datetime import datetime, UTC
@@ -14,13 +15,15 @@ from enum import Enum
 
 # Third-party imports
 import structlog
+from beanie.odm.utils.projection import get_projection
 from bson import ObjectId
 from bson.decimal128 import Decimal128
-import copy
 
 # Local imports
-from app.models.pawn_transaction_model import PawnTransaction
-from app.core.redis_cache import BusinessCache
+from app.models.pawn_transaction_model import PawnTransaction, PawnTransactionListView
+from app.core.redis_cache import BusinessCache, CacheTags
+from app.core.search_keys import customer_name_filter
+from app.services.search_index_service import SearchIndexService
 from app.core.timezone_utils import utc_to_user_timezone
 from app.schemas.pawn_transaction_schema import UnifiedSearchType
 
@@ -31,6 +34,15 @@ logger = structlog.get_logger("unified_search")
 # Use the SearchType from schema for consistency
 SearchType = UnifiedSearchType
 
+# Relevance and recency ordering, with the unique transaction_id keeping pages stable
+SEARCH_SORT_STAGE = {
+    "$sort": {
+        "updated_at": -1,      # Most recently updated first
+        "pawn_date": -1,       # Then by pawn date
+        "transaction_id": -1
+    }
+}
+
 
 class SearchResult:
     """Structured search result with metadata"""
@@ -140,7 +152,7 @@ class UnifiedSearchService:
             return {"formatted_id": clean_id}
         
         elif search_type == SearchType.EXTENSION_ID:
-            # Extension ID search requires joining with extensions collection
+            # Extension IDs are denormalised onto transactions (indexed array)
             # Supports: EX000001, ex000001, Ex000001, eX000001, ex1
             clean_id = search_text.lstrip('#').upper()
             if clean_id.startswith('EX'):
@@ -151,19 +163,19 @@ class UnifiedSearchService:
                 # No EX prefix, add it and zero-pad
                 clean_id = f"EX{clean_id.zfill(6)}"
             
-            # We'll handle this in the aggregation pipeline with a lookup
-            return {"_extension_search": clean_id}  # Special marker for extension search
+            return {"extension_formatted_ids": clean_id}
         
         elif search_type == SearchType.PHONE_NUMBER:
-            return {"customer_id": search_text}
+            # Phone number prefix (anchored, so it can use the customer_id index)
+            return {"customer_id": {"$regex": f"^{re.escape(search_text)}"}}
 
         elif search_type == SearchType.REFERENCE_BARCODE:
-            # Reference barcode search with case-insensitive exact match
-            return {"reference_barcode": {"$regex": f"^{re.escape(search_text)}$", "$options": "i"}}
+            # Reference barcode search with case-insensitive prefix match
+            return {"reference_barcode": {"$regex": f"^{re.escape(search_text)}", "$options": "i"}}
 
         elif search_type == SearchType.CUSTOMER_NAME:
-            # Customer name search requires joining with customers collection
-            return {"_customer_name_search": search_text.lower()}  # Special marker
+            # Indexed prefix tokens of the customer name stored on each transaction
+            return customer_name_filter(search_text)
 
         else:  # FULL_TEXT
             # Multi-field text search (storage location and loan amount searching removed)
@@ -176,95 +188,41 @@ class UnifiedSearchService:
             }
     
     @staticmethod
-    def build_search_pipeline(
-        search_text: str, 
-        search_type: SearchType, 
+    def build_match_stages(search_text: str, search_type: SearchType) -> List[Dict]:
+        """
+        Build the stages that select matching transactions.
+        
+        Every search type matches fields stored on the transaction itself, so
+        filtering never joins another collection.
+        
+        Args:
+            search_text: The search text
+            search_type: Detected or specified search type
+            
+        Returns:
+            List[Dict]: Filtering stages of the aggregation pipeline
+        """
+        match_conditions = UnifiedSearchService.build_match_conditions(search_text, search_type)
+        return [{"$match": match_conditions}]
+    
+    @staticmethod
+    def build_lookup_stages(
         include_extensions: bool = True,
         include_items: bool = True,
         include_customer: bool = True
     ) -> List[Dict]:
         """
-        Build optimized MongoDB aggregation pipeline based on search type.
+        Build the display lookups, run only on the documents of the current page.
         
         Args:
-            search_text: The search text
-            search_type: Detected or specified search type
             include_extensions: Whether to include extension data
             include_items: Whether to include item data  
             include_customer: Whether to include customer data
             
         Returns:
-            List[Dict]: MongoDB aggregation pipeline
+            List[Dict]: Lookup stages of the aggregation pipeline
         """
         pipeline = []
-        match_conditions = UnifiedSearchService.build_match_conditions(search_text, search_type)
-        
-        # Handle special search types that require lookups before matching
-        if search_type == SearchType.EXTENSION_ID:
-            # For extension ID search, we need to find transactions with matching extensions
-            extension_id = match_conditions["_extension_search"]
-            pipeline.extend([
-                {
-                    "$lookup": {
-                        "from": "extensions",
-                        "localField": "transaction_id",
-                        "foreignField": "transaction_id",
-                        "as": "temp_extensions"
-                    }
-                },
-                {
-                    "$match": {
-                        "temp_extensions.formatted_id": extension_id
-                    }
-                },
-                {
-                    "$unset": "temp_extensions"  # Remove temporary field
-                }
-            ])
-        
-        elif search_type == SearchType.CUSTOMER_NAME:
-            # For customer name search, lookup customers first
-            customer_search = match_conditions["_customer_name_search"]
-            pipeline.extend([
-                {
-                    "$lookup": {
-                        "from": "customers",
-                        "localField": "customer_id",
-                        "foreignField": "phone_number",
-                        "as": "temp_customer"
-                    }
-                },
-                {
-                    "$match": {
-                        "$or": [
-                            {
-                                "$expr": {
-                                    "$regexMatch": {
-                                        "input": {"$toLower": {"$arrayElemAt": ["$temp_customer.first_name", 0]}},
-                                        "regex": re.escape(customer_search)
-                                    }
-                                }
-                            },
-                            {
-                                "$expr": {
-                                    "$regexMatch": {
-                                        "input": {"$toLower": {"$arrayElemAt": ["$temp_customer.last_name", 0]}},
-                                        "regex": re.escape(customer_search)
-                                    }
-                                }
-                            }
-                        ]
-                    }
-                },
-                {
-                    "$unset": "temp_customer"  # Remove temporary field
-                }
-            ])
-        
-        else:
-            # Standard match for other search types
-            if "_extension_search" not in match_conditions and "_customer_name_search" not in match_conditions:
-                pipeline.append({"$match": match_conditions})
         
         # Customer lookup (almost always needed for display)
         if include_customer:
@@ -318,16 +276,94 @@ class UnifiedSearchService:
                 }
             })
         
-        # Sort by relevance and recency
-        pipeline.append({
-            "$sort": {
-                "updated_at": -1,  # Most recently updated first
-                "pawn_date": -1    # Then by pawn date
-            }
-        })
+        return pipeline
+    
+    @staticmethod
+    def build_page_pipeline(
+        search_text: str,
+        search_type: SearchType,
+        page: int = 1,
+        page_size: int = 20,
+        include_extensions: bool = True,
+        include_items: bool = True,
+        include_customer: bool = True
+    ) -> List[Dict]:
+        """
+        Build the pipeline for one page of results.
         
-        # Note: Pagination will be handled in the search method itself
+        Matches, sorts and paginates first, then projects and joins only the
+        page_size documents that are returned.
         
+        Args:
+            search_text: The search text
+            search_type: Detected or specified search type
+            page: Page number for pagination
+            page_size: Number of results per page
+            include_extensions: Whether to include extension data
+            include_items: Whether to include item data  
+            include_customer: Whether to include customer data
+            
+        Returns:
+            List[Dict]: MongoDB aggregation pipeline
+        """
+        pipeline = UnifiedSearchService.build_match_stages(search_text, search_type)
+        pipeline.extend([
+            SEARCH_SORT_STAGE,
+            {"$skip": (page - 1) * page_size},
+            {"$limit": page_size},
+            # Keep only list-view fields so audit logs and manual notes are never joined or returned
+            {"$project": get_projection(PawnTransactionListView)}
+        ])
+        pipeline.extend(UnifiedSearchService.build_lookup_stages(include_extensions, include_items, include_customer))
+        return pipeline
+    
+    @staticmethod
+    def build_hydrate_pipeline(
+        transaction_ids: List[str],
+        include_extensions: bool = True,
+        include_items: bool = True,
+        include_customer: bool = True
+    ) -> List[Dict]:
+        """
+        Build the pipeline loading a page of transactions found by the search index.
+        
+        Args:
+            transaction_ids: Transaction IDs of the page
+            include_extensions: Whether to include extension data
+            include_items: Whether to include item data  
+            include_customer: Whether to include customer data
+            
+        Returns:
+            List[Dict]: MongoDB aggregation pipeline (results are unordered)
+        """
+        pipeline = [
+            {"$match": {"transaction_id": {"$in": transaction_ids}}},
+            {"$project": get_projection(PawnTransactionListView)}
+        ]
+        pipeline.extend(UnifiedSearchService.build_lookup_stages(include_extensions, include_items, include_customer))
+        return pipeline
+    
+    @staticmethod
+    def _index_search_text(search_text: str, search_type: SearchType) -> str:
+        """Search text for the index (transaction IDs are normalised to PW000123 form)."""
+        if search_type == SearchType.TRANSACTION_ID:
+            return UnifiedSearchService.build_match_conditions(search_text, search_type)["formatted_id"]
+        return search_text
+    
+    @staticmethod
+    def build_count_pipeline(search_text: str, search_type: SearchType) -> List[Dict]:
+        """
+        Build the pipeline counting all matches, without sorting or display lookups.
+        
+        Args:
+            search_text: The search text
+            search_type: Detected or specified search type
+            
+        Returns:
+            List[Dict]: MongoDB aggregation pipeline
+        """
+        pipeline = UnifiedSearchService.build_match_stages(search_text, search_type)
+        pipeline.append({"$count": "total"})
         return pipeline
     
     @staticmethod
@@ -426,43 +462,42 @@ class UnifiedSearchService:
                     }
                 )
             
-            # Build and execute search pipeline
-            pipeline = UnifiedSearchService.build_search_pipeline(
-                search_text, search_type, include_extensions, include_items, include_customer
+            # Resolve matches from the in-process index when it covers this search type
+            index_result = await SearchIndexService.search(
+                UnifiedSearchService._index_search_text(search_text, search_type), search_type, page, page_size
             )
-
-            logger.info("🔍 UNIFIED SEARCH: Executing aggregation pipeline",
-                        search_text=search_text[:50],
-                        search_type=search_type,
-                        pipeline_stages=len(pipeline),
-                        page=page,
-                        page_size=page_size,
-                        skip_records=(page - 1) * page_size)
-            
-            # Create two pipelines: one for total count and one for paginated results
-            count_pipeline = copy.deepcopy(pipeline)
-            count_pipeline.append({"$count": "total"})
-            
-            # Add pagination to the main pipeline
-            pagination_pipeline = copy.deepcopy(pipeline)
-            skip_count = (page - 1) * page_size
-            pagination_pipeline.extend([
-                {"$skip": skip_count},
-                {"$limit": page_size}
-            ])
             
-            logger.info("📄 PAGINATION: Adding skip/limit to pipeline",
-                       page=page,
-                       page_size=page_size,
-                       skip_count=skip_count,
-                       pagination_stages=len([{"$skip": skip_count}, {"$limit": page_size}]))
-            
-            # Execute both aggregations concurrently
-            count_result = await PawnTransaction.aggregate(count_pipeline).to_list()
-            paginated_results = await PawnTransaction.aggregate(pagination_pipeline).to_list()
-            
-            # Extract total count
-            total_count = count_result[0]['total'] if count_result else 0
+            if index_result is not None:
+                # MongoDB only hydrates the page of IDs the index returned
+                total_count, page_ids = index_result
+                pagination_pipeline = UnifiedSearchService.build_hydrate_pipeline(
+                    page_ids, include_extensions, include_items, include_customer
+                )
+                paginated_results = await PawnTransaction.aggregate(pagination_pipeline).to_list() if page_ids else []
+                position = {transaction_id: rank for rank, transaction_id in enumerate(page_ids)}
+                paginated_results.sort(key=lambda result: position.get(result.get("transaction_id"), len(position)))
+            else:
+                # Count on the bare match and join only the requested page, concurrently
+                count_pipeline = UnifiedSearchService.build_count_pipeline(search_text, search_type)
+                pagination_pipeline = UnifiedSearchService.build_page_pipeline(
+                    search_text, search_type, page, page_size, include_extensions, include_items, include_customer
+                )
+
+                logger.info("🔍 UNIFIED SEARCH: Executing aggregation pipeline",
+                            search_text=search_text[:50],
+                            search_type=search_type,
+                            pipeline_stages=len(pagination_pipeline),
+                            page=page,
+                            page_size=page_size,
+                            skip_records=(page - 1) * page_size)
+                
+                count_result, paginated_results = await asyncio.gather(
+                    PawnTransaction.aggregate(count_pipeline).to_list(),
+                    PawnTransaction.aggregate(pagination_pipeline).to_list()
+                )
+                
+                # Extract total count
+                total_count = count_result[0]['total'] if count_result else 0
             
             # Process results for frontend consumption
             processed_results = []
@@ -498,7 +533,8 @@ class UnifiedSearchService:
                 "has_more": total_count > (page * page_size),
                 "execution_time_ms": round(execution_time, 2),
                 "cache_hit": False,
-                "pipeline_stages": len(pipeline)
+                "search_index_hit": index_result is not None,
+                "pipeline_stages": len(pagination_pipeline)
             }
             
             # Cache results (30-second TTL for searches)
@@ -506,7 +542,7 @@ class UnifiedSearchService:
                 "transactions": processed_results,
                 "search_metadata": search_metadata
             }
-            await BusinessCache.set(cache_key, cache_data, ttl_seconds=30)
+            await BusinessCache.set(cache_key, cache_data, ttl_seconds=30, tags=[CacheTags.SEARCH])
             
             logger.info("✅ UNIFIED SEARCH: Search completed",
                        search_text=search_text[:50],
@@ -530,16 +566,26 @@ class UnifiedSearchService:
             raise
     
     @staticmethod
-    async def invalidate_search_caches(pattern: str = "unified_search:*"):
+    async def invalidate_search_caches(pattern: Optional[str] = None):
         """
         Invalidate search caches when transaction data changes.
         
+        Search results are registered under CacheTags.SEARCH, so by default
+        only the tagged entries are dropped. Transaction, payment and
+        extension writes already do this through
+        BusinessCache.invalidate_transaction_caches. Both also make the
+        in-process search index catch up before its next search.
+        
         Args:
-            pattern: Cache key pattern to invalidate
+            pattern: Optional cache key pattern to scan and invalidate instead
         """
+        SearchIndexService.mark_dirty()
         try:
-            await BusinessCache.invalidate_by_pattern(pattern)
-            logger.info("🗑️ UNIFIED SEARCH: Cache invalidated", pattern=pattern)
+            if pattern:
+                await BusinessCache.invalidate_by_pattern(pattern)
+            else:
+                await BusinessCache.invalidate_tags(CacheTags.SEARCH)
+            logger.info("🗑️ UNIFIED SEARCH: Cache invalidated", pattern=pattern or CacheTags.SEARCH)
         except Exception as e:
             logger.error("❌ UNIFIED SEARCH: Cache invalidation failed", 
                         pattern=pattern, error=str(e))
\ No newline at end of file
@@ -14,6 +14,7 @@ from app.schemas.user_schema import (
 )
 from app.core.config import settings
 from app.core.account_security import AccountSecurityService, SecurityEventType
+from app.core.auth_cache import cache_user, get_cached_user, invalidate_cached_user
 from app.services.user_activity_service import UserActivityService
 from app.models.user_activity_log_model import UserActivityType
 
@@ -50,7 +51,7 @@ class UserService:
                     )
 
             # Hash the PIN
-            pin_hash = User.hash_pin(user_data.pin)
+            pin_hash = await User.hash_pin_async(user_data.pin)
 
             # Create user document (exclude None email to avoid sparse index issues)
             user_dict = {
@@ -182,7 +183,7 @@ class UserService:
             await AccountSecurityService.apply_progressive_delay(user, context)
 
             # Verify PIN
-            if not user.verify_pin(auth_data.pin):
+            if not await user.verify_pin_async(auth_data.pin):
                 user.increment_failed_login()
 
                 # Check if this failed attempt triggers lockout
@@ -214,6 +215,7 @@ class UserService:
                 else:
                     # Save failed attempt count
                     await user.save()
+                    await UserService.invalidate_cached_user(user.user_id)
 
                     attempts_remaining = AuthConfig.MAX_FAILED_LOGIN_ATTEMPTS - user.failed_login_attempts
 
@@ -262,6 +264,7 @@ class UserService:
                 # If save fails due to concurrent modification, generate token anyway
                 # The user was already validated, so authentication should succeed
                 pass
+            await UserService.invalidate_cached_user(user.user_id)
 
             return LoginResponse(
                 access_token=access_token,
@@ -346,6 +349,7 @@ class UserService:
             {"user_id": user_id},
             {"$set": update_dict}
         )
+        await UserService.invalidate_cached_user(user_id)
 
         # Fetch updated user to return
         updated_user = await User.find_one(User.user_id == user_id)
@@ -368,7 +372,7 @@ class UserService:
             )
         
         # Verify current PIN
-        if not user.verify_pin(pin_data.current_pin):
+        if not await user.verify_pin_async(pin_data.current_pin):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Current PIN is incorrect"
@@ -382,13 +386,53 @@ class UserService:
             )
         
         # Update PIN
-        user.pin_hash = User.hash_pin(pin_data.new_pin)
+        user.pin_hash = await User.hash_pin_async(pin_data.new_pin)
         user.password_changed_at = datetime.now(UTC)
         user.updated_at = datetime.now(UTC)
         await user.save()
+        await UserService.invalidate_cached_user(user_id)
         
         return {"message": "PIN changed successfully"}
     
+    @staticmethod
+    async def verify_admin_pin(admin_pin: str, admin_user_id: Optional[str] = None) -> Optional[User]:
+        """
+        Resolve the admin approving an action from their PIN.
+        
+        PIN hashes are salted, so an admin cannot be looked up by PIN. When
+        the approving admin's ID is supplied only that admin's hash is
+        checked; otherwise (clients that send only the PIN) active admins are
+        checked in turn. Either way bcrypt runs off the event loop.
+        
+        Args:
+            admin_pin: PIN entered by the approving admin
+            admin_user_id: User ID of the approving admin, if known
+            
+        Returns:
+            The approving admin, or None if no active admin matches
+        """
+        if not admin_pin or len(admin_pin) != AuthConfig.MIN_PIN_LENGTH or not admin_pin.isdigit():
+            return None
+        
+        if admin_user_id:
+            admin_user = await User.find_one(
+                User.user_id == admin_user_id,
+                User.role == UserRole.ADMIN,
+                User.status == UserStatus.ACTIVE
+            )
+            if admin_user and await admin_user.verify_pin_async(admin_pin):
+                return admin_user
+            return None
+        
+        admins = await User.find(
+            User.role == UserRole.ADMIN,
+            User.status == UserStatus.ACTIVE
+        ).to_list()
+        for admin_user in admins:
+            if await admin_user.verify_pin_async(admin_pin):
+                return admin_user
+        return None
+    
     @staticmethod
     async def get_users_list(filters: UserFilters, requester_role: UserRole = None) -> UserListResponse:
         """Get paginated list of users with advanced filtering"""
@@ -586,6 +630,7 @@ class UserService:
                 "updated_at": datetime.now(UTC)
             }}
         )
+        await UserService.invalidate_cached_user(user_id)
 
         return {"message": "User deactivated successfully"}
     
@@ -636,9 +681,29 @@ class UserService:
         if user:
             user.remove_session(session_id)
             await user.save()
+            await UserService.invalidate_cached_user(user_id)
         
         return {"message": "Logged out successfully"}
     
+    @staticmethod
+    async def terminate_sessions(user_id: str) -> None:
+        """Revoke every active session of a user"""
+        await User.get_motor_collection().update_one(
+            {"user_id": user_id},
+            {"$set": {"active_sessions": [], "updated_at": datetime.now(UTC)}}
+        )
+        await UserService.invalidate_cached_user(user_id)
+    
+    @staticmethod
+    async def invalidate_cached_user(user_id: str) -> None:
+        """
+        Drop the user's authentication cache entry.
+        
+        Call after every write to a user document, so status, role, session
+        and PIN changes apply to the next request.
+        """
+        await invalidate_cached_user(user_id)
+    
     @staticmethod
     def _create_access_token(user: User, session_id: str = None) -> str:
         """Create JWT access token with optional session tracking"""
@@ -675,7 +740,17 @@ class UserService:
     
     @staticmethod
     async def get_current_user(token: str) -> User:
-        """Get current user from JWT token"""
+        """
+        Get current user from JWT token.
+        
+        Served from the auth cache when the cached user is active and holds
+        the token's session; otherwise the user is loaded from MongoDB and
+        re-cached before the checks run, so a cache entry never rejects a
+        request on its own.
+        
+        A cached user only carries user_id, role, status and active_sessions
+        (see AUTH_CACHE_FIELDS); load the document for anything else.
+        """
         payload = UserService.decode_token(token)
         user_id = payload.get("sub")
         
@@ -685,12 +760,29 @@ class UserService:
                 detail="Invalid token payload"
             )
         
+        # Validate session is still active (if jti claim exists)
+        session_id = payload.get("jti")
+        
+        cached = await get_cached_user(user_id)
+        if (
+            cached
+            and cached.get("status") == UserStatus.ACTIVE
+            and (not session_id or session_id in (cached.get("active_sessions") or []))
+        ):
+            return User.model_construct(
+                user_id=cached["user_id"],
+                role=UserRole(cached["role"]),
+                status=UserStatus(cached["status"]),
+                active_sessions=list(cached.get("active_sessions") or [])
+            )
+        
         user = await User.find_one(User.user_id == user_id)
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="User not found"
             )
+        await cache_user(user)
 
         if user.status != UserStatus.ACTIVE:
             raise HTTPException(
@@ -698,8 +790,6 @@ class UserService:
                 detail=f"Account is {str(user.status)}"
             )
 
-        # Validate session is still active (if jti claim exists)
-        session_id = payload.get("jti")
         if session_id and session_id not in user.active_sessions:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Daily Rollups Backfill Script
+
+Builds the daily_rollups collection used by the /trends endpoints and the
+revenue stat cards. One document is written per business day per timezone,
+computed from payments, extensions and pawn_transactions with the same
+aggregations the application uses for the current day.
+
+A timezone is only served from rollups (and only kept up to date
+incrementally) once it has been backfilled. Run this script before starting
+the application, or restart the application afterwards so running instances
+pick up the new timezone immediately instead of after the coverage cache
+expires.
+
+Re-running the script is safe: each day is overwritten with freshly computed
+totals.
+
+Usage:
+    python scripts/backfill_daily_rollups.py [backfill|status] [--timezone TZ ...] [--days N]
+
+Environment:
+    Requires MONGO_CONNECTION_STRING in .env file
+"""
+
+import asyncio
+import sys
+from datetime import datetime, UTC
+from pathlib import Path
+from typing import List, Optional
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from beanie import init_beanie
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from app.core.config import settings
+from app.core.timezone_utils import validate_and_get_timezone
+from app.models.business_config_model import LocationConfig
+from app.models.daily_rollup_model import DailyRollup
+from app.models.extension_model import Extension
+from app.models.pawn_transaction_model import PawnTransaction
+from app.models.payment_model import Payment
+from app.services.daily_rollup_service import (
+    DailyRollupService,
+    iter_date_keys,
+    local_date_key,
+    shift_date_key,
+)
+
+# Days are written in chunks so progress is visible on large histories
+CHUNK_DAYS = 31
+
+
+async def init_db() -> AsyncIOMotorClient:
+    """Initialize database connection"""
+    client = AsyncIOMotorClient(settings.MONGO_CONNECTION_STRING)
+    db = client.get_default_database()
+    await init_beanie(
+        database=db,
+        document_models=[DailyRollup, PawnTransaction, Payment, Extension, LocationConfig]
+    )
+    print(f"✓ Connected to database: {db.name}")
+    return client
+
+
+async def resolve_timezones(requested: Optional[List[str]]) -> List[str]:
+    """Use the requested timezones, or the business location timezone (UTC if unset)."""
+    if requested:
+        timezones = []
+        for timezone_name in requested:
+            resolved = validate_and_get_timezone(timezone_name).key
+            if resolved != timezone_name:
+                print(f"  ✗ Unknown timezone '{timezone_name}', skipping")
+                continue
+            timezones.append(resolved)
+        return timezones
+
+    location = await LocationConfig.get_current_config()
+    if location and location.timezone:
+        return [validate_and_get_timezone(location.timezone).key]
+    return ["UTC"]
+
+
+async def backfill_daily_rollups(timezones: Optional[List[str]], days: int) -> bool:
+    """
+    Rebuild rollups for the last `days` business days (including today).
+
+    Returns:
+        bool: True if every timezone was backfilled successfully
+    """
+    print("=" * 70)
+    print("Backfilling Daily Rollups")
+    print("=" * 70)
+    print()
+
+    client = await init_db()
+    success = True
+
+    try:
+        for timezone_name in await resolve_timezones(timezones):
+            today_key = local_date_key(datetime.now(UTC), timezone_name)
+            start_key = shift_date_key(today_key, -(days - 1))
+            day_keys = iter_date_keys(start_key, today_key)
+
+            print(f"Timezone {timezone_name}: {start_key} to {today_key} ({len(day_keys)} days)")
+
+            try:
+                written = 0
+                for offset in range(0, len(day_keys), CHUNK_DAYS):
+                    chunk = day_keys[offset:offset + CHUNK_DAYS]
+                    written += await DailyRollupService.rebuild_range(chunk[0], chunk[-1], timezone_name)
+                    print(f"  ✓ {chunk[0]} to {chunk[-1]}")
+                print(f"  ✓ Wrote {written} rollup documents")
+            except Exception as e:
+                print(f"  ✗ Failed to backfill {timezone_name}: {e}")
+                success = False
+            print()
+    finally:
+        client.close()
+
+    return success
+
+
+async def show_status() -> bool:
+    """Print the tracked timezones and the date range each one covers."""
+    print("=" * 70)
+    print("Daily Rollup Coverage")
+    print("=" * 70)
+    print()
+
+    client = await init_db()
+
+    try:
+        rows = await DailyRollup.aggregate([
+            {
+                "$group": {
+                    "_id": "$timezone",
+                    "first_date": {"$min": "$date"},
+                    "last_date": {"$max": "$date"},
+                    "days": {"$sum": 1}
+                }
+            },
+            {"$sort": {"_id": 1}}
+        ]).to_list()
+
+        if not rows:
+            print("ℹ No rollups found - /trends and revenue metrics use live aggregation")
+            return True
+
+        for row in rows:
+            print(f"  ✓ {row['_id']}: {row['first_date']} to {row['last_date']} ({row['days']} days)")
+        return True
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Manage daily rollups for trends and metrics")
+    parser.add_argument(
+        "action",
+        choices=["backfill", "status"],
+        default="backfill",
+        nargs="?",
+        help="Action to perform (default: backfill)"
+    )
+    parser.add_argument(
+        "--timezone",
+        action="append",
+        help="IANA timezone to backfill (repeatable, default: business location timezone)"
+    )
+    parser.add_argument(
+        "--days",
+        type=int,
+        default=400,
+        help="Number of business days to rebuild, ending today (default: 400)"
+    )
+
+    args = parser.parse_args()
+
+    if args.action == "backfill":
+        success = asyncio.run(backfill_daily_rollups(args.timezone, args.days))
+        sys.exit(0 if success else 1)
+    elif args.action == "status":
+        success = asyncio.run(show_status())
+        sys.exit(0 if success else 1)
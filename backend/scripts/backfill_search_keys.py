@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Transaction Search Keys Backfill Script
+
+Populates the denormalised search keys on pawn_transactions used by
+customer-name and extension-ID search:
+
+- customer_name_search / customer_name_tokens from each customer's name
+- extension_formatted_ids from the extensions collection
+
+The application keeps these keys in sync for new transactions, customer name
+edits and new extensions. Run this script once after deploying, so existing
+transactions become searchable by name and extension ID.
+
+Re-running the script is safe: every key is recomputed from the source
+collections and overwritten.
+
+Usage:
+    python scripts/backfill_search_keys.py [backfill|status]
+
+Environment:
+    Requires MONGO_CONNECTION_STRING in .env file
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+from typing import List
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from beanie import init_beanie
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateMany, UpdateOne
+
+from app.core.config import settings
+from app.core.search_keys import customer_search_keys
+from app.models.customer_model import Customer
+from app.models.extension_model import Extension
+from app.models.pawn_transaction_model import PawnTransaction
+
+# Updates are sent in batches so progress is visible on large collections
+BATCH_SIZE = 500
+
+
+async def init_db() -> AsyncIOMotorClient:
+    """Initialize database connection"""
+    client = AsyncIOMotorClient(settings.MONGO_CONNECTION_STRING)
+    db = client.get_default_database()
+    await init_beanie(
+        database=db,
+        document_models=[Customer, Extension, PawnTransaction]
+    )
+    print(f"✓ Connected to database: {db.name}")
+    return client
+
+
+async def _flush(operations: List, label: str, total: int) -> int:
+    """Write a batch of updates and report progress."""
+    if not operations:
+        return total
+    result = await PawnTransaction.get_motor_collection().bulk_write(operations, ordered=False)
+    total += result.modified_count
+    print(f"  ✓ {label}: {total} transactions updated")
+    operations.clear()
+    return total
+
+
+async def backfill_customer_names() -> int:
+    """Set the customer-name search keys on every customer's transactions."""
+    operations = []
+    updated = 0
+    cursor = Customer.get_motor_collection().find(
+        {}, projection={"phone_number": 1, "first_name": 1, "last_name": 1}
+    )
+    async for customer in cursor:
+        operations.append(UpdateMany(
+            {"customer_id": customer["phone_number"]},
+            {"$set": customer_search_keys(customer.get("first_name"), customer.get("last_name"))}
+        ))
+        if len(operations) >= BATCH_SIZE:
+            updated = await _flush(operations, "customer names", updated)
+    return await _flush(operations, "customer names", updated)
+
+
+async def backfill_extension_ids() -> int:
+    """Set extension_formatted_ids from the extensions collection."""
+    operations = []
+    updated = 0
+    pipeline = [
+        {"$match": {"formatted_id": {"$ne": None}}},
+        {"$sort": {"formatted_id": 1}},
+        {"$group": {"_id": "$transaction_id", "formatted_ids": {"$push": "$formatted_id"}}}
+    ]
+    async for row in Extension.get_motor_collection().aggregate(pipeline):
+        operations.append(UpdateOne(
+            {"transaction_id": row["_id"]},
+            {"$set": {"extension_formatted_ids": row["formatted_ids"]}}
+        ))
+        if len(operations) >= BATCH_SIZE:
+            updated = await _flush(operations, "extension IDs", updated)
+    return await _flush(operations, "extension IDs", updated)
+
+
+async def backfill_search_keys() -> bool:
+    """
+    Recompute every transaction search key.
+
+    Returns:
+        bool: True if the backfill completed
+    """
+    print("=" * 70)
+    print("Backfilling Transaction Search Keys")
+    print("=" * 70)
+    print()
+
+    client = await init_db()
+
+    try:
+        names = await backfill_customer_names()
+        extensions = await backfill_extension_ids()
+        print()
+        print(f"✓ Done: {names} name updates, {extensions} extension ID updates")
+        return True
+    except Exception as e:
+        print(f"✗ Backfill failed: {e}")
+        return False
+    finally:
+        client.close()
+
+
+async def show_status() -> bool:
+    """Report transactions still missing their search keys."""
+    print("=" * 70)
+    print("Transaction Search Keys Status")
+    print("=" * 70)
+    print()
+
+    client = await init_db()
+
+    try:
+        transactions = PawnTransaction.get_motor_collection()
+        total = await transactions.count_documents({})
+        missing_names = await transactions.count_documents({"customer_name_search": None})
+        with_extensions = len(await Extension.get_motor_collection().distinct("transaction_id"))
+        keyed_extensions = await transactions.count_documents({"extension_formatted_ids.0": {"$exists": True}})
+
+        print(f"  Transactions: {total}")
+        print(f"  {'✓' if missing_names == 0 else '✗'} Missing customer name keys: {missing_names}")
+        print(f"  {'✓' if keyed_extensions >= with_extensions else '✗'} "
+              f"Extension ID keys: {keyed_extensions} of {with_extensions} extended transactions")
+        return missing_names == 0 and keyed_extensions >= with_extensions
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Manage transaction search keys")
+    parser.add_argument(
+        "action",
+        choices=["backfill", "status"],
+        default="backfill",
+        nargs="?",
+        help="Action to perform (default: backfill)"
+    )
+
+    args = parser.parse_args()
+
+    if args.action == "backfill":
+        success = asyncio.run(backfill_search_keys())
+    else:
+        success = asyncio.run(show_status())
+    sys.exit(0 if success else 1)
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Field Encryption Benchmark
+
+Measures FieldEncryptionService.decrypt_document_fields over synthetic
+customer documents with every sensitive field encrypted, comparing the
+legacy v1 format (PBKDF2 key derivation per field) with the v2 format
+(cached HKDF data key + AES-GCM).
+
+v1 decryption costs roughly one PBKDF2 run per field, so it is measured on a
+sample of documents and extrapolated to the full document count. The v2
+documents are also decrypted in one call to the batched decrypt_documents
+API, which splits the work across the encryption thread pool.
+
+Usage:
+    python scripts/benchmark_field_encryption.py [--documents 10000] [--v1-sample 50]
+
+Environment:
+    None (runs in-process with a generated master key)
+"""
+
+import asyncio
+import base64
+import logging
+import secrets
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from cryptography.hazmat.primitives.padding import PKCS7
+import structlog
+
+from app.core import field_encryption
+from app.core.field_encryption import EncryptionConfig, FieldEncryptionService, generate_master_key
+
+
+def encrypt_v1(service: FieldEncryptionService, plaintext: str) -> str:
+    """Produce a legacy v1 value (the format written before v2)"""
+    salt = secrets.token_bytes(EncryptionConfig.SALT_SIZE)
+    iv = secrets.token_bytes(EncryptionConfig.IV_SIZE)
+    padder = PKCS7(128).padder()
+    padded = padder.update(plaintext.encode('utf-8')) + padder.finalize()
+    encryptor = Cipher(algorithms.AES(service._derive_key(salt)), modes.CBC(iv)).encryptor()
+    encrypted = encryptor.update(padded) + encryptor.finalize()
+    return EncryptionConfig.ENCRYPTED_PREFIX + base64.b64encode(salt + iv + encrypted).decode('ascii')
+
+
+def customer_fields(index: int) -> Dict[str, str]:
+    """Plain values for every sensitive field of one customer"""
+    return {field: f"{field} value for customer {index:05d}" for field in EncryptionConfig.SENSITIVE_FIELDS}
+
+
+def time_decrypt(service: FieldEncryptionService, documents: List[Dict[str, Any]]) -> List[float]:
+    """Decrypt each document, returning per-document latency in milliseconds"""
+    samples = []
+    for document in documents:
+        started = time.perf_counter()
+        service.decrypt_document_fields(document)
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def print_report(label: str, samples: List[float], documents: int) -> None:
+    """Print per-document latency and the projected total"""
+    mean = statistics.mean(samples)
+    print(f"{label}")
+    print(f"  measured:   {len(samples)} documents")
+    print(f"  p50:        {statistics.median(samples):10.3f} ms/document")
+    print(f"  mean:       {mean:10.3f} ms/document")
+    print(f"  total:      {mean * documents / 1000:10.2f} s for {documents:,} documents")
+    print()
+
+
+def run_benchmark(documents: int, v1_sample: int) -> bool:
+    """Benchmark v1 and v2 document decryption"""
+    service = FieldEncryptionService(generate_master_key())
+    fields_per_document = len(EncryptionConfig.SENSITIVE_FIELDS)
+
+    print("=" * 70)
+    print(f"decrypt_document_fields: {documents:,} customers x {fields_per_document} sensitive fields")
+    print("=" * 70)
+    print()
+
+    v1_documents = [
+        {field: encrypt_v1(service, value) for field, value in customer_fields(i).items()}
+        for i in range(min(v1_sample, documents))
+    ]
+    v2_documents = [service.encrypt_document_fields(customer_fields(i)) for i in range(documents)]
+
+    v1_samples = time_decrypt(service, v1_documents)
+    v2_samples = time_decrypt(service, v2_documents)
+
+    print_report(f"v1 (PBKDF2 per field, extrapolated from {len(v1_documents)})", v1_samples, documents)
+    print_report("v2 (cached data key, AES-GCM)", v2_samples, documents)
+    print(f"Speedup: {statistics.mean(v1_samples) / statistics.mean(v2_samples):,.0f}x")
+    print()
+
+    field_encryption.encryption_service = service
+    started = time.perf_counter()
+    batched = asyncio.run(field_encryption.decrypt_documents(v2_documents))
+    batched_seconds = time.perf_counter() - started
+    field_encryption.shutdown_encryption_executor()
+    print(f"v2 batched (decrypt_documents, {field_encryption.ENCRYPTION_MAX_WORKERS} threads)")
+    print(f"  total:      {batched_seconds:10.2f} s for {documents:,} documents")
+    print()
+
+    # Round trip sanity check
+    expected = customer_fields(0)
+    return (
+        service.decrypt_document_fields(v1_documents[0]) == expected
+        and service.decrypt_document_fields(v2_documents[0]) == expected
+        and batched[0] == expected
+    )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark sensitive field decryption")
+    parser.add_argument("--documents", type=int, default=10000, help="Customer documents (default: 10000)")
+    parser.add_argument("--v1-sample", type=int, default=50, help="Documents measured for v1 (default: 50)")
+
+    args = parser.parse_args()
+
+    # Per-field and per-document logging would dominate the v2 timings
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+    sys.exit(0 if run_benchmark(args.documents, args.v1_sample) else 1)
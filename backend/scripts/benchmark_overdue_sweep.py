@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Overdue Status Sweep Benchmark
+
+Compares the nightly overdue sweep implementations on a synthetic book of
+loans that are all past maturity:
+
+    Before: load every candidate as a full PawnTransaction and save() each
+            one (one round trip per loan)
+    After:  PawnTransactionService.bulk_update_statuses (lean projection and
+            batched unordered bulk_write)
+
+The benchmark runs in a scratch database named after the configured one with
+an `_overdue_benchmark` suffix, which is dropped before each run and when
+the benchmark finishes. The application database is never touched.
+
+Usage:
+    python scripts/benchmark_overdue_sweep.py [--loans 50000]
+
+Environment:
+    Requires MONGO_CONNECTION_STRING in .env file
+"""
+
+import asyncio
+import sys
+import time
+from datetime import datetime, timedelta, UTC
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from beanie import init_beanie
+from beanie.odm.utils.encoder import Encoder
+from beanie.operators import In
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from app.core.config import settings
+from app.models.pawn_transaction_model import PawnTransaction, TransactionStatus
+from app.services.pawn_transaction_service import PawnTransactionService
+
+SEED_BATCH_SIZE = 5000
+
+
+async def init_db() -> tuple:
+    """Connect to the scratch benchmark database"""
+    client = AsyncIOMotorClient(settings.MONGO_CONNECTION_STRING)
+    db = client[f"{client.get_default_database().name}_overdue_benchmark"]
+    await init_beanie(database=db, document_models=[PawnTransaction])
+    print(f"✓ Connected to scratch database: {db.name}")
+    return client, db
+
+
+async def seed_loans(loans: int) -> None:
+    """Insert `loans` active/extended transactions that matured last month"""
+    await PawnTransaction.get_motor_collection().delete_many({})
+
+    pawn_date = datetime.now(UTC) - timedelta(days=130)
+    maturity_date = pawn_date + timedelta(days=90)
+    encoder = Encoder()
+    documents = []
+
+    for index in range(loans):
+        transaction = PawnTransaction(
+            formatted_id=f"PW{index + 1:06d}",
+            customer_id=f"555{index % 10000:07d}",
+            created_by_user_id="01",
+            pawn_date=pawn_date,
+            maturity_date=maturity_date,
+            grace_period_end=maturity_date + timedelta(days=7),
+            loan_amount=500,
+            monthly_interest_amount=50,
+            status=TransactionStatus.EXTENDED if index % 5 == 0 else TransactionStatus.ACTIVE,
+            storage_location=f"Shelf {index % 50}"
+        )
+        documents.append(encoder.encode(transaction))
+
+        if len(documents) >= SEED_BATCH_SIZE:
+            await PawnTransaction.get_motor_collection().insert_many(documents, ordered=False)
+            documents = []
+
+    if documents:
+        await PawnTransaction.get_motor_collection().insert_many(documents, ordered=False)
+
+
+async def sequential_sweep() -> int:
+    """Previous implementation: one save() per overdue candidate"""
+    candidates = await PawnTransaction.find(
+        In(PawnTransaction.status, [TransactionStatus.ACTIVE, TransactionStatus.EXTENDED]),
+        PawnTransaction.maturity_date < datetime.now(UTC)
+    ).to_list()
+
+    for transaction in candidates:
+        transaction.status = TransactionStatus.OVERDUE
+        await transaction.save()
+
+    return len(candidates)
+
+
+async def bulk_sweep() -> int:
+    """Current implementation"""
+    result = await PawnTransactionService.bulk_update_statuses()
+    return result["overdue"]
+
+
+async def run_benchmark(loans: int) -> bool:
+    """Seed, sweep and report wall time for both implementations"""
+    print("=" * 70)
+    print(f"Overdue status sweep over {loans:,} matured loans")
+    print("=" * 70)
+    print()
+
+    client, db = await init_db()
+    success = True
+
+    try:
+        for label, sweep in [("Before: sequential save()", sequential_sweep),
+                             ("After: batched bulk_write", bulk_sweep)]:
+            await seed_loans(loans)
+
+            started = time.perf_counter()
+            updated = await sweep()
+            elapsed = time.perf_counter() - started
+
+            print(f"{label}")
+            print(f"  updated:    {updated:,}")
+            print(f"  wall time:  {elapsed:8.2f} s")
+            print(f"  throughput: {updated / elapsed:,.0f} loans/s")
+            print()
+
+            if updated != loans:
+                print(f"✗ Expected {loans:,} updates")
+                success = False
+    finally:
+        await client.drop_database(db.name)
+        client.close()
+
+    return success
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark the nightly overdue status sweep")
+    parser.add_argument("--loans", type=int, default=50000, help="Number of matured loans to seed (default: 50000)")
+
+    args = parser.parse_args()
+
+    success = asyncio.run(run_benchmark(args.loans))
+    sys.exit(0 if success else 1)
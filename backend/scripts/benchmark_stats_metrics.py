@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Stats Metrics Latency Benchmark
+
+Measures request latency percentiles for GET /api/v1/stats/metrics under
+concurrent load, and the cost of the Redis cache layer in isolation.
+
+Modes:
+    http   Fire N concurrent /stats/metrics requests at a running server and
+           report p50/p95/p99/max latency. Run it once against a build using
+           the synchronous Redis client and once against the current build to
+           compare before/after.
+    cache  In-process comparison of the old pattern (synchronous redis.Redis
+           called from coroutines) against RedisCacheService on redis.asyncio,
+           with N concurrent cache reads. Needs only a reachable Redis.
+
+Usage:
+    python scripts/benchmark_stats_metrics.py http --base-url http://localhost:8000 --token <JWT> [--concurrency 200] [--rounds 5]
+    python scripts/benchmark_stats_metrics.py cache [--concurrency 200] [--rounds 5]
+
+Environment:
+    REDIS_URL is read from .env for cache mode
+"""
+
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, List
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of samples"""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def print_report(label: str, samples: List[float], wall_seconds: float) -> None:
+    """Print latency percentiles in milliseconds"""
+    print(f"{label}")
+    print(f"  requests:   {len(samples)}")
+    print(f"  throughput: {len(samples) / wall_seconds:,.0f} req/s")
+    print(f"  p50:        {percentile(samples, 50):8.2f} ms")
+    print(f"  p95:        {percentile(samples, 95):8.2f} ms")
+    print(f"  p99:        {percentile(samples, 99):8.2f} ms")
+    print(f"  max:        {max(samples):8.2f} ms")
+    print(f"  mean:       {statistics.mean(samples):8.2f} ms")
+    print()
+
+
+async def run_concurrent(
+    operation: Callable[[], Awaitable[None]],
+    concurrency: int,
+    rounds: int
+) -> tuple:
+    """Run `concurrency` copies of an operation at once, `rounds` times"""
+    samples: List[float] = []
+
+    async def timed() -> None:
+        started = time.perf_counter()
+        await operation()
+        samples.append((time.perf_counter() - started) * 1000)
+
+    wall_started = time.perf_counter()
+    for _ in range(rounds):
+        await asyncio.gather(*[timed() for _ in range(concurrency)])
+    return samples, time.perf_counter() - wall_started
+
+
+async def benchmark_http(base_url: str, token: str, concurrency: int, rounds: int) -> bool:
+    """Benchmark /stats/metrics on a running server"""
+    import httpx
+
+    print("=" * 70)
+    print(f"GET /api/v1/stats/metrics x {concurrency} concurrent, {rounds} rounds")
+    print("=" * 70)
+    print()
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    headers = {"Authorization": f"Bearer {token}", "X-Client-Timezone": "UTC"}
+    failures = 0
+
+    async with httpx.AsyncClient(base_url=base_url, headers=headers, limits=limits, timeout=60) as client:
+        async def request() -> None:
+            nonlocal failures
+            response = await client.get("/api/v1/stats/metrics")
+            if response.status_code != 200:
+                failures += 1
+
+        # Warm up connections and the metrics cache
+        await request()
+
+        samples, wall = await run_concurrent(request, concurrency, rounds)
+
+    print_report("/stats/metrics", samples, wall)
+    if failures:
+        print(f"✗ {failures} requests failed")
+    return failures == 0
+
+
+async def benchmark_cache(concurrency: int, rounds: int) -> bool:
+    """Compare sync-client-in-coroutine against the asyncio cache service"""
+    import redis
+
+    from app.core.config import settings
+    from app.core.redis_cache import RedisCacheService
+
+    print("=" * 70)
+    print(f"Cache reads x {concurrency} concurrent, {rounds} rounds ({settings.REDIS_URL})")
+    print("=" * 70)
+    print()
+
+    key = "benchmark:stats:all_metrics"
+    payload = {"metrics": {f"metric_{i}": {"value": i, "trend": "stable"} for i in range(11)}}
+
+    service = RedisCacheService(redis_url=settings.REDIS_URL)
+    if not await service.connect():
+        print("✗ Redis is not reachable")
+        return False
+
+    await service.set(key, payload, 60)
+
+    # Before: the synchronous client blocks the event loop on every call,
+    # so concurrent coroutines are serialised behind each round trip
+    sync_client = redis.from_url(settings.REDIS_URL)
+
+    async def sync_get() -> None:
+        sync_client.get(key)
+
+    samples, wall = await run_concurrent(sync_get, concurrency, rounds)
+    print_report("Before: redis.Redis inside async def", samples, wall)
+
+    # After: round trips are awaited on the shared connection pool
+    async def async_get() -> None:
+        await service.get(key)
+
+    samples, wall = await run_concurrent(async_get, concurrency, rounds)
+    print_report("After: RedisCacheService on redis.asyncio", samples, wall)
+
+    await service.delete(key)
+    await service.close()
+    sync_client.close()
+    return True
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark /stats/metrics latency")
+    parser.add_argument("mode", choices=["http", "cache"], help="What to benchmark")
+    parser.add_argument("--base-url", default="http://localhost:8000", help="Server URL (http mode)")
+    parser.add_argument("--token", help="Bearer access token (http mode)")
+    parser.add_argument("--concurrency", type=int, default=200, help="Concurrent requests (default: 200)")
+    parser.add_argument("--rounds", type=int, default=5, help="Number of concurrent bursts (default: 5)")
+
+    args = parser.parse_args()
+
+    if args.mode == "http":
+        if not args.token:
+            parser.error("--token is required for http mode")
+        success = asyncio.run(benchmark_http(args.base_url, args.token, args.concurrency, args.rounds))
+    else:
+        success = asyncio.run(benchmark_cache(args.concurrency, args.rounds))
+
+    sys.exit(0 if success else 1)
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Field Encryption Migration Script
+
+Re-encrypts sensitive fields (see EncryptionConfig.SENSITIVE_FIELDS) with the
+current v2 key: legacy v1 values (PBKDF2 per field) and v2 values of older
+key versions are decrypted and written back under FIELD_ENCRYPTION_KEY_VERSION.
+
+The application reads both formats, so the migration can run in the
+background while the API is serving. Updates are conditional on the old
+ciphertext; re-running the script is safe and only touches values that still
+need re-encryption.
+
+Usage:
+    python scripts/migrate_field_encryption.py [migrate|status] [--collection customers] [--batch-size 500]
+
+Environment:
+    Requires MONGO_CONNECTION_STRING and FIELD_ENCRYPTION_KEY in .env file
+    (plus FIELD_ENCRYPTION_KEY_VERSION / FIELD_ENCRYPTION_WRAPPED_KEYS if used)
+"""
+
+import asyncio
+import re
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from app.core.config import settings
+from app.core.field_encryption import (
+    EncryptionConfig,
+    FieldEncryptionService,
+    parse_wrapped_data_keys,
+    reencrypt_collection,
+)
+
+
+def build_service() -> FieldEncryptionService:
+    """Create the encryption service from settings"""
+    return FieldEncryptionService(
+        settings.FIELD_ENCRYPTION_KEY,
+        settings.FIELD_ENCRYPTION_KEY_VERSION,
+        parse_wrapped_data_keys(settings.FIELD_ENCRYPTION_WRAPPED_KEYS)
+    )
+
+
+async def migrate(collection_name: str, batch_size: int) -> bool:
+    """
+    Re-encrypt a collection's sensitive fields with the current key.
+
+    Returns:
+        bool: True if the migration completed
+    """
+    print("=" * 70)
+    print(f"Re-encrypting {collection_name} (key version {settings.FIELD_ENCRYPTION_KEY_VERSION})")
+    print("=" * 70)
+    print()
+
+    client = AsyncIOMotorClient(settings.MONGO_CONNECTION_STRING)
+    try:
+        collection = client.get_default_database()[collection_name]
+        updated = await reencrypt_collection(collection, build_service(), batch_size)
+        print(f"✓ Done: {updated} documents re-encrypted")
+        return True
+    except Exception as e:
+        print(f"✗ Migration failed: {e}")
+        return False
+    finally:
+        client.close()
+
+
+async def show_status(collection_name: str) -> bool:
+    """Count encrypted values per format for each sensitive field."""
+    print("=" * 70)
+    print(f"Field Encryption Status: {collection_name}")
+    print("=" * 70)
+    print()
+
+    service = build_service()
+    current_prefix = f"{EncryptionConfig.ENCRYPTED_V2_PREFIX}{service.key_version}:"
+    client = AsyncIOMotorClient(settings.MONGO_CONNECTION_STRING)
+    pending_total = 0
+
+    try:
+        collection = client.get_default_database()[collection_name]
+        for field in sorted(EncryptionConfig.SENSITIVE_FIELDS):
+            encrypted = await collection.count_documents({field: {"$regex": "^enc:"}})
+            current = await collection.count_documents({field: {"$regex": f"^{re.escape(current_prefix)}"}})
+            pending = encrypted - current
+            pending_total += pending
+            if encrypted:
+                print(f"  {'✓' if pending == 0 else '✗'} {field}: {current} current, {pending} pending")
+        print()
+        print(f"  Pending values: {pending_total}")
+        return pending_total == 0
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Re-encrypt sensitive fields with the current key")
+    parser.add_argument(
+        "action",
+        choices=["migrate", "status"],
+        default="migrate",
+        nargs="?",
+        help="Action to perform (default: migrate)"
+    )
+    parser.add_argument("--collection", default="customers", help="Collection to migrate (default: customers)")
+    parser.add_argument("--batch-size", type=int, default=500, help="Documents per bulk write (default: 500)")
+
+    args = parser.parse_args()
+
+    if args.action == "migrate":
+        success = asyncio.run(migrate(args.collection, args.batch_size))
+    else:
+        success = asyncio.run(show_status(args.collection))
+    sys.exit(0 if success else 1)
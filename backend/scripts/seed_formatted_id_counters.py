@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Formatted ID Counter Migration Script
+
+Seeds the `counters` collection that issues PW/EX formatted IDs. Each
+sequence is set to the highest formatted ID currently in use, so the next
+transaction or extension continues the existing numbering.
+
+Seeding uses $max, so re-running the script is safe and never moves a
+counter backwards, including while the application is serving traffic.
+The application also seeds a missing counter on first use; running this
+script during deployment keeps that lookup off the first request.
+
+Usage:
+    python scripts/seed_formatted_id_counters.py [seed|status]
+
+Environment:
+    Requires MONGO_CONNECTION_STRING in .env file
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from beanie import init_beanie
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from app.core.config import settings
+from app.models.counter_model import Counter
+from app.models.extension_model import Extension
+from app.models.pawn_transaction_model import PawnTransaction
+from app.services.formatted_id_service import (
+    EXTENSION_SEQUENCE,
+    PAWN_TRANSACTION_SEQUENCE,
+    FormattedIdService,
+    format_sequence_id,
+)
+
+SEQUENCES = [PAWN_TRANSACTION_SEQUENCE, EXTENSION_SEQUENCE]
+
+
+async def init_db() -> AsyncIOMotorClient:
+    """Initialize database connection"""
+    client = AsyncIOMotorClient(settings.MONGO_CONNECTION_STRING)
+    db = client.get_default_database()
+    await init_beanie(
+        database=db,
+        document_models=[Counter, PawnTransaction, Extension]
+    )
+    print(f"✓ Connected to database: {db.name}")
+    return client
+
+
+async def seed_counters() -> bool:
+    """
+    Seed every formatted ID sequence from the highest ID in use.
+
+    Returns:
+        bool: True if every sequence was seeded
+    """
+    print("=" * 70)
+    print("Seeding Formatted ID Counters")
+    print("=" * 70)
+    print()
+
+    client = await init_db()
+    success = True
+
+    try:
+        for sequence in SEQUENCES:
+            try:
+                value = await FormattedIdService.seed_sequence(sequence)
+                next_id = format_sequence_id(sequence, value + 1)
+                print(f"  ✓ {sequence}: counter at {value}, next ID {next_id}")
+            except Exception as e:
+                print(f"  ✗ Failed to seed {sequence}: {e}")
+                success = False
+    finally:
+        client.close()
+
+    return success
+
+
+async def show_status() -> bool:
+    """Compare each counter against the highest formatted ID in use."""
+    print("=" * 70)
+    print("Formatted ID Counter Status")
+    print("=" * 70)
+    print()
+
+    client = await init_db()
+    healthy = True
+
+    try:
+        for sequence in SEQUENCES:
+            counter = await Counter.get_motor_collection().find_one({"_id": sequence})
+            highest = await FormattedIdService.get_highest_issued_number(sequence)
+
+            if not counter:
+                print(f"  ℹ {sequence}: not seeded (highest in use {highest})")
+                continue
+
+            if counter["value"] < highest:
+                print(f"  ✗ {sequence}: counter {counter['value']} is behind highest in use {highest} - run seed")
+                healthy = False
+            else:
+                next_id = format_sequence_id(sequence, counter["value"] + 1)
+                print(f"  ✓ {sequence}: counter {counter['value']}, highest in use {highest}, next ID {next_id}")
+        return healthy
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Manage formatted ID counters")
+    parser.add_argument(
+        "action",
+        choices=["seed", "status"],
+        default="seed",
+        nargs="?",
+        help="Action to perform (default: seed)"
+    )
+
+    args = parser.parse_args()
+
+    if args.action == "seed":
+        success = asyncio.run(seed_counters())
+    else:
+        success = asyncio.run(show_status())
+    sys.exit(0 if success else 1)
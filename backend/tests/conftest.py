@@ -22,6 +22,7 @@ from app.models.pawn_item_model import PawnItem
 from app.models.payment_model import Payment
 from app.models.extension_model import Extension
 from app.models.service_alert_model import ServiceAlert
+from app.models.counter_model import Counter
 from app.core.config import settings
 
 
@@ -48,7 +49,7 @@ async def db_client():
     # Initialize Beanie with test database
     await init_beanie(
         database=database,
-        document_models=[User, Customer, PawnTransaction, PawnItem, Payment, Extension, ServiceAlert]
+        document_models=[User, Customer, PawnTransaction, PawnItem, Payment, Extension, ServiceAlert, Counter]
     )
     
     yield database
@@ -0,0 +1,222 @@
+"""
+Test the authenticated-user cache.
+
+Verifies TTL expiry and LRU eviction of the in-process cache, that only
+authorisation fields are cached, that invalidations reach other workers, and
+that UserService.get_current_user serves accepting entries from the cache
+while re-checking rejecting entries against the database.
+"""
+
+from datetime import datetime, UTC
+
+import pytest
+
+import app.core.auth_cache as auth_cache
+import app.models.user_model as user_model
+from app.core.auth_cache import AUTH_CACHE_FIELDS, AUTH_INVALIDATION_CHANNEL, LocalUserCache
+from app.models.user_model import User, UserRole, UserStatus
+from app.services.user_service import UserService
+
+
+class TestLocalUserCache:
+    """Test the in-process TTL + LRU map."""
+
+    def test_entries_expire(self, monkeypatch):
+        """Entries are dropped once their TTL has passed."""
+        now = [100.0]
+        monkeypatch.setattr(auth_cache.time, "monotonic", lambda: now[0])
+        cache = LocalUserCache(ttl_seconds=30, max_size=10)
+        cache.set("u1", {"user_id": "u1"})
+
+        now[0] += 29
+        assert cache.get("u1") == {"user_id": "u1"}
+        now[0] += 1
+        assert cache.get("u1") is None
+        assert len(cache) == 0
+
+    def test_least_recently_used_is_evicted(self):
+        """A full cache evicts the entry read or written longest ago."""
+        cache = LocalUserCache(ttl_seconds=30, max_size=2)
+        cache.set("u1", {})
+        cache.set("u2", {})
+        cache.get("u1")
+        cache.set("u3", {})
+
+        assert cache.get("u2") is None
+        assert cache.get("u1") == {}
+        assert cache.get("u3") == {}
+
+    def test_invalidate(self):
+        """Invalidated users are reloaded on their next request."""
+        cache = LocalUserCache(ttl_seconds=30, max_size=2)
+        cache.set("u1", {})
+        cache.invalidate("u1")
+        cache.invalidate("missing")
+
+        assert cache.get("u1") is None
+
+
+def _snapshot(**fields):
+    snapshot = {
+        "user_id": "12",
+        "pin_hash": "$2b$12$" + "a" * 53,
+        "first_name": "Ana",
+        "last_name": "Lee",
+        "phone": "5551234567",
+        "role": UserRole.STAFF,
+        "status": UserStatus.ACTIVE,
+        "created_at": datetime(2025, 1, 1, tzinfo=UTC),
+        "updated_at": datetime(2025, 1, 1, tzinfo=UTC),
+        "active_sessions": ["sess_a"]
+    }
+    snapshot.update(fields)
+    return snapshot
+
+
+class TestGetCurrentUser:
+    """Test token resolution through the cache."""
+
+    @pytest.fixture(autouse=True)
+    def local_cache(self, monkeypatch):
+        monkeypatch.setattr(auth_cache, "AUTH_CACHE_ENABLED", True)
+        monkeypatch.setattr(auth_cache, "AUTH_CACHE_SHARED", False)
+        monkeypatch.setattr(auth_cache, "_subscribed", True)
+        auth_cache.clear_local_cache()
+        yield
+        auth_cache.clear_local_cache()
+
+    @pytest.fixture
+    def database(self, monkeypatch):
+        """Count find_one calls, returning the user snapshot stored here."""
+        state = {"calls": 0, "snapshot": _snapshot()}
+
+        async def find_one(*args, **kwargs):
+            state["calls"] += 1
+            return User.model_construct(**state["snapshot"])
+
+        monkeypatch.setattr(User, "find_one", find_one)
+        # Stand-ins for what init_beanie sets up
+        monkeypatch.setattr(User, "user_id", "user_id", raising=False)
+        monkeypatch.setattr(User, "get_motor_collection", classmethod(lambda cls: None))
+        monkeypatch.setattr(UserService, "decode_token", lambda token: {"sub": "12", "jti": token})
+        return state
+
+    @pytest.mark.asyncio
+    async def test_repeat_requests_hit_cache(self, database):
+        """Only the first request for a user reads the database."""
+        first = await UserService.get_current_user("sess_a")
+        second = await UserService.get_current_user("sess_a")
+
+        assert database["calls"] == 1
+        assert second.user_id == first.user_id == "12"
+        assert second is not first
+
+    @pytest.mark.asyncio
+    async def test_new_session_rechecks_database(self, database):
+        """A session missing from the cached entry is looked up before rejecting."""
+        await UserService.get_current_user("sess_a")
+        database["snapshot"] = _snapshot(active_sessions=["sess_a", "sess_b"])
+
+        user = await UserService.get_current_user("sess_b")
+
+        assert database["calls"] == 2
+        assert "sess_b" in user.active_sessions
+
+    @pytest.mark.asyncio
+    async def test_invalidation_applies_revocation(self, database):
+        """After invalidation a revoked session is rejected."""
+        await UserService.get_current_user("sess_a")
+        database["snapshot"] = _snapshot(active_sessions=[])
+        await UserService.invalidate_cached_user("12")
+
+        with pytest.raises(Exception) as error:
+            await UserService.get_current_user("sess_a")
+
+        assert error.value.status_code == 401
+        assert database["calls"] == 2
+
+    @pytest.mark.asyncio
+    async def test_cache_holds_authorisation_fields_only(self, database):
+        """Entries carry status, role and sessions, never the PIN hash."""
+        await UserService.get_current_user("sess_a")
+        entry = await auth_cache.get_cached_user("12")
+
+        assert set(entry) == set(AUTH_CACHE_FIELDS)
+        cached = await UserService.get_current_user("sess_a")
+        assert cached.role == UserRole.STAFF
+        assert cached.status == UserStatus.ACTIVE
+        assert "pin_hash" not in cached.__dict__
+
+    @pytest.mark.asyncio
+    async def test_cached_user_verifies_pin_from_database(self, database, monkeypatch):
+        """PIN checks on a cached user load the hash instead of failing."""
+        checked = []
+
+        async def verify(pin, pin_hash):
+            checked.append(pin_hash)
+            return True
+
+        monkeypatch.setattr(user_model, "verify_pin_async", verify)
+        await UserService.get_current_user("sess_a")
+        cached = await UserService.get_current_user("sess_a")
+
+        assert await cached.verify_pin_async("1234")
+        assert checked == [_snapshot()["pin_hash"]]
+
+    @pytest.mark.asyncio
+    async def test_unsubscribed_worker_reads_database(self, database, monkeypatch):
+        """Without the invalidation channel the local cache is bypassed."""
+        monkeypatch.setattr(auth_cache, "_subscribed", False)
+        await UserService.get_current_user("sess_a")
+        await UserService.get_current_user("sess_a")
+
+        assert database["calls"] == 2
+
+
+class FakeRedis:
+    """Records pub/sub publishes."""
+
+    def __init__(self):
+        self.published = []
+
+    async def publish(self, channel, message):
+        self.published.append((channel, message))
+
+
+class FakeCacheService:
+    is_available = True
+
+    def __init__(self):
+        self.redis_client = FakeRedis()
+
+
+class TestCrossWorkerInvalidation:
+    """Test invalidation between workers in local mode."""
+
+    @pytest.fixture(autouse=True)
+    def local_cache(self, monkeypatch):
+        monkeypatch.setattr(auth_cache, "AUTH_CACHE_ENABLED", True)
+        monkeypatch.setattr(auth_cache, "AUTH_CACHE_SHARED", False)
+        auth_cache.clear_local_cache()
+        yield
+        auth_cache.clear_local_cache()
+
+    @pytest.mark.asyncio
+    async def test_invalidation_is_published(self, monkeypatch):
+        """Invalidating a user notifies the other workers."""
+        service = FakeCacheService()
+        monkeypatch.setattr(auth_cache, "get_cache_service", lambda: service)
+
+        await auth_cache.invalidate_cached_user("12")
+
+        assert service.redis_client.published == [(AUTH_INVALIDATION_CHANNEL, "12")]
+
+    def test_message_drops_entry(self):
+        """A published user id drops this worker's entry."""
+        auth_cache._local_cache.set("12", {"user_id": "12"})
+        auth_cache._local_cache.set("13", {"user_id": "13"})
+
+        auth_cache.handle_invalidation(b"12")
+
+        assert auth_cache._local_cache.get("12") is None
+        assert auth_cache._local_cache.get("13") == {"user_id": "13"}
@@ -0,0 +1,132 @@
+"""
+Test the shared balance engine.
+
+Verifies the payment/extension totals pipelines, the interest-due math and
+the balance built from aggregated payment totals.
+"""
+
+from datetime import datetime, UTC
+
+from app.models.pawn_transaction_model import PawnTransaction, PawnTransactionBalanceView
+from app.services.balance_service import (
+    build_extension_fees_pipeline,
+    build_payment_totals_pipeline,
+    build_transaction_balance,
+    calculate_interest_due,
+    empty_payment_totals,
+)
+
+
+PAWN_DATE = datetime(2025, 1, 15, tzinfo=UTC)
+
+
+def _transaction() -> PawnTransaction:
+    return PawnTransaction.model_construct(
+        transaction_id="txn-1",
+        customer_id="5551234567",
+        loan_amount=500,
+        monthly_interest_amount=50,
+        overdue_fee=20,
+        status="active",
+        pawn_date=PAWN_DATE,
+        maturity_date=datetime(2025, 4, 15, tzinfo=UTC),
+        grace_period_end=datetime(2025, 5, 22, tzinfo=UTC)
+    )
+
+
+class TestPipelines:
+    """Test the totals aggregations."""
+
+    def test_single_transaction_uses_equality_match(self):
+        """One transaction matches on equality, excluding voided payments."""
+        pipeline = build_payment_totals_pipeline(["txn-1"])
+
+        assert pipeline[0] == {"$match": {"transaction_id": "txn-1", "is_voided": {"$ne": True}}}
+        assert pipeline[1]["$group"]["interest_paid"] == {"$sum": "$interest_portion"}
+        assert pipeline[1]["$group"]["payment_count"] == {"$sum": 1}
+
+    def test_batch_uses_in(self):
+        """Several transactions are totalled by one $in aggregation."""
+        pipeline = build_payment_totals_pipeline(["txn-1", "txn-2"])
+
+        assert pipeline[0]["$match"]["transaction_id"] == {"$in": ["txn-1", "txn-2"]}
+        assert pipeline[1]["$group"]["_id"] == "$transaction_id"
+
+    def test_extension_fees_exclude_cancelled(self):
+        """Cancelled extensions do not add fees."""
+        pipeline = build_extension_fees_pipeline(["txn-1"])
+
+        assert pipeline[0]["$match"]["is_cancelled"] == {"$ne": True}
+        assert pipeline[1]["$group"]["extension_fees"] == {"$sum": "$total_extension_fee"}
+
+
+class TestInterestDue:
+    """Test the interest-month math."""
+
+    def test_minimum_one_month(self):
+        """Interest for at least one month is always due."""
+        assert calculate_interest_due(50, PAWN_DATE, PAWN_DATE, PAWN_DATE) == 50
+
+    def test_partial_month_counts(self):
+        """Passing the pawn day starts another month."""
+        assert calculate_interest_due(50, PAWN_DATE, PAWN_DATE, datetime(2025, 2, 16, tzinfo=UTC)) == 100
+
+    def test_capped_at_maturity(self):
+        """Interest stops after three months when the loan has a maturity date."""
+        as_of = datetime(2025, 9, 1, tzinfo=UTC)
+
+        assert calculate_interest_due(50, PAWN_DATE, PAWN_DATE, as_of) == 150
+        assert calculate_interest_due(50, PAWN_DATE, None, as_of) == 400
+
+
+class TestTransactionBalance:
+    """Test balances built from payment totals."""
+
+    def test_without_payments(self):
+        """A new loan owes principal, one month of interest and its overdue fee."""
+        balance = build_transaction_balance(_transaction(), empty_payment_totals(), PAWN_DATE)
+
+        assert balance["total_due"] == 570
+        assert balance["current_balance"] == 570
+        assert balance["interest_due"] == 50
+        assert balance["payment_count"] == 0
+        assert balance["is_overdue"] is False
+
+    def test_with_payment_totals(self):
+        """Portions paid reduce the matching balances."""
+        totals = {**empty_payment_totals(), "total_paid": 180, "interest_paid": 100,
+                  "overdue_fee_paid": 20, "principal_paid": 60, "payment_count": 2}
+        as_of = datetime(2025, 4, 20, tzinfo=UTC)
+
+        balance = build_transaction_balance(_transaction(), totals, as_of)
+
+        assert balance["total_due"] == 670
+        assert balance["current_balance"] == 490
+        assert balance["interest_balance"] == 50
+        assert balance["principal_balance"] == 440
+        assert balance["overdue_fee_balance"] == 0
+        assert balance["is_in_grace_period"] is True
+        assert balance["days_until_forfeiture"] == 32
+
+    def test_missing_maturity_date(self):
+        """A row without maturity or grace dates still builds a balance."""
+        fields = _transaction().model_dump(include=set(PawnTransactionBalanceView.model_fields))
+        view = PawnTransactionBalanceView.model_construct(**{**fields, "maturity_date": None, "grace_period_end": None})
+
+        balance = build_transaction_balance(view, empty_payment_totals(), datetime(2025, 9, 1, tzinfo=UTC))
+
+        assert balance["maturity_date"] is None
+        assert balance["grace_period_end"] is None
+        assert balance["is_overdue"] is False
+        assert balance["is_in_grace_period"] is False
+        assert balance["days_until_forfeiture"] == 0
+        assert balance["interest_due"] == 400
+
+    def test_balance_projection_matches_document(self):
+        """Batch balances built from the projection equal the full-document balance."""
+        transaction = _transaction()
+        view = PawnTransactionBalanceView(**transaction.model_dump(include=set(PawnTransactionBalanceView.model_fields)))
+        as_of = datetime(2025, 3, 1, tzinfo=UTC)
+
+        assert build_transaction_balance(view, empty_payment_totals(), as_of) == \
+            build_transaction_balance(transaction, empty_payment_totals(), as_of)
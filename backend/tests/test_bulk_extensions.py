@@ -0,0 +1,210 @@
+"""
+Test the in-memory extension step shared by single and bulk extension payments.
+
+Verifies date and status changes, the audit entries appended to the
+transaction and chaining several extensions of the same transaction, and
+that bulk writes never leave an extension without its transaction update.
+"""
+
+from datetime import datetime, UTC
+
+import pytest
+from bson import ObjectId
+from pymongo.errors import BulkWriteError
+
+from app.models.extension_model import Extension
+from app.models.pawn_transaction_model import PawnTransaction
+from app.services import extension_service
+from app.services.extension_service import ExtensionService
+
+
+NOW = datetime(2025, 5, 1, tzinfo=UTC)
+
+
+def _transaction(transaction_id: str = "txn-1") -> PawnTransaction:
+    return PawnTransaction.model_construct(
+        id=ObjectId(),
+        transaction_id=transaction_id,
+        updated_at=datetime(2025, 4, 30),
+        status="overdue",
+        maturity_date=datetime(2025, 4, 15, tzinfo=UTC),
+        grace_period_end=datetime(2025, 5, 15, tzinfo=UTC),
+        extension_formatted_ids=[],
+        system_audit_log=[],
+        manual_notes=None,
+        internal_notes=None
+    )
+
+
+def _extension(transaction: PawnTransaction, months: int = 1, formatted_id: str = "EX000001", **fields) -> Extension:
+    extension = Extension.model_construct(
+        extension_id=f"ext-{formatted_id}",
+        formatted_id=formatted_id,
+        transaction_id=transaction.transaction_id,
+        processed_by_user_id="staff-1",
+        extension_months=months,
+        extension_fee_per_month=50,
+        total_extension_fee=50 * months,
+        discount_amount=fields.get("discount_amount", 0),
+        overdue_fee_collected=fields.get("overdue_fee_collected", 0),
+        net_amount_collected=None,
+        discount_approved_by=fields.get("discount_approved_by"),
+        original_maturity_date=transaction.maturity_date,
+        new_maturity_date=None,
+        new_grace_period_end=None,
+        extension_date=NOW
+    )
+    extension.prepare_for_save()
+    return extension
+
+
+class TestApplyExtension:
+    """Test applying an extension to a transaction in memory."""
+
+    def test_caught_up_transaction_becomes_extended(self):
+        """Dates move forward, the EX ID is recorded and the status changes."""
+        transaction = _transaction()
+        extension = _extension(transaction)
+
+        ExtensionService._apply_extension_to_transaction(transaction, extension, "staff-1", NOW)
+
+        assert transaction.maturity_date == datetime(2025, 5, 15, tzinfo=UTC)
+        assert transaction.grace_period_end == datetime(2025, 6, 15, tzinfo=UTC)
+        assert transaction.extension_formatted_ids == ["EX000001"]
+        assert transaction.status == "extended"
+        assert transaction.system_audit_log == []
+
+    def test_still_behind_keeps_status(self):
+        """A maturity date still in the past leaves the status unchanged."""
+        transaction = _transaction()
+        extension = _extension(transaction)
+
+        ExtensionService._apply_extension_to_transaction(
+            transaction, extension, "staff-1", datetime(2025, 6, 1, tzinfo=UTC)
+        )
+
+        assert transaction.status == "overdue"
+
+    def test_fee_and_discount_audit_entries(self):
+        """Overdue fees and approved discounts are each audited once."""
+        transaction = _transaction()
+        extension = _extension(
+            transaction, overdue_fee_collected=20, discount_amount=10, discount_approved_by="admin-1"
+        )
+
+        ExtensionService._apply_extension_to_transaction(transaction, extension, "staff-1", NOW, "Loyal customer")
+
+        assert [entry.action_type for entry in transaction.system_audit_log] == ["overdue_fee_set", "discount_applied"]
+        assert extension.net_amount_collected == 50 - 10 + 20
+
+    def test_extensions_of_same_transaction_chain(self):
+        """A second extension starts from the maturity date the first produced."""
+        transaction = _transaction()
+        ExtensionService._apply_extension_to_transaction(transaction, _extension(transaction), "staff-1", NOW)
+        second = _extension(transaction, months=2, formatted_id="EX000002")
+        ExtensionService._apply_extension_to_transaction(transaction, second, "staff-1", NOW)
+
+        assert second.original_maturity_date == datetime(2025, 5, 15, tzinfo=UTC)
+        assert transaction.maturity_date == datetime(2025, 7, 15, tzinfo=UTC)
+        assert transaction.extension_formatted_ids == ["EX000001", "EX000002"]
+
+
+class FakeBulkWriteResult:
+    def __init__(self, matched_count):
+        self.matched_count = matched_count
+
+
+class FakeTransactions:
+    """Transactions collection stand-in applying only the listed transactions."""
+
+    def __init__(self, applied):
+        self.applied = applied
+        self.operations = []
+
+    async def bulk_write(self, operations, ordered=True):
+        self.operations = list(operations)
+        return FakeBulkWriteResult(len(self.applied))
+
+    async def distinct(self, key, query):
+        return [transaction_id for transaction_id in query["transaction_id"]["$in"] if transaction_id in self.applied]
+
+
+class FakeExtensions:
+    """Extensions collection stand-in recording deletes."""
+
+    def __init__(self):
+        self.deleted = []
+
+    async def delete_many(self, query):
+        self.deleted.extend(query["extension_id"]["$in"])
+
+
+class TestWriteBulkExtensions:
+    """Test the bulk write step and its compensation on partial failure."""
+
+    @pytest.fixture
+    def batch(self, monkeypatch):
+        """Two items extending txn-1 and one extending txn-2."""
+        first, second = _transaction("txn-1"), _transaction("txn-2")
+        planned = [
+            {"index": 0, "transaction": first, "extension": _extension(first, formatted_id="EX000001")},
+            {"index": 1, "transaction": first, "extension": _extension(first, formatted_id="EX000002")},
+            {"index": 2, "transaction": second, "extension": _extension(second, formatted_id="EX000003")},
+        ]
+        read_versions = {
+            transaction.transaction_id: (transaction.updated_at, transaction.status)
+            for transaction in (first, second)
+        }
+        extensions = FakeExtensions()
+        monkeypatch.setattr(PawnTransaction, "prepare_for_save", lambda self: None)
+        # Stand-in for the document encoding init_beanie sets up
+        monkeypatch.setattr(
+            extension_service, "get_dict",
+            lambda document, to_db=False: {"maturity_date": document.maturity_date}
+        )
+        monkeypatch.setattr(Extension, "get_motor_collection", classmethod(lambda cls: extensions))
+        return planned, read_versions, extensions
+
+    def _use_transactions(self, monkeypatch, applied):
+        transactions = FakeTransactions(applied)
+        monkeypatch.setattr(PawnTransaction, "get_motor_collection", classmethod(lambda cls: transactions))
+        return transactions
+
+    @pytest.mark.asyncio
+    async def test_failed_insert_removes_sibling_extensions(self, batch, monkeypatch):
+        """One failed insert fails every item of its transaction and deletes the inserted ones."""
+        planned, read_versions, extensions = batch
+        transactions = self._use_transactions(monkeypatch, {"txn-2"})
+
+        async def insert_many(documents, ordered=True):
+            raise BulkWriteError({"writeErrors": [{"index": 1, "errmsg": "duplicate key"}]})
+
+        monkeypatch.setattr(Extension, "insert_many", insert_many)
+        item_errors = {}
+
+        await ExtensionService._write_bulk_extensions(planned, read_versions, item_errors)
+
+        assert set(item_errors) == {0, 1}
+        assert "duplicate key" in item_errors[1]
+        assert extensions.deleted == ["ext-EX000001"]
+        assert [operation._filter["_id"] for operation in transactions.operations] == [planned[2]["transaction"].id]
+
+    @pytest.mark.asyncio
+    async def test_changed_transaction_is_not_overwritten(self, batch, monkeypatch):
+        """Updates are guarded on the read version; a skipped update rolls back its extensions."""
+        planned, read_versions, extensions = batch
+        transactions = self._use_transactions(monkeypatch, {"txn-2"})
+
+        async def insert_many(documents, ordered=True):
+            return None
+
+        monkeypatch.setattr(Extension, "insert_many", insert_many)
+        item_errors = {}
+
+        await ExtensionService._write_bulk_extensions(planned, read_versions, item_errors)
+
+        guard = transactions.operations[0]._filter
+        assert guard["updated_at"] == datetime(2025, 4, 30)
+        assert guard["status"] == "overdue"
+        assert set(item_errors) == {0, 1}
+        assert sorted(extensions.deleted) == ["ext-EX000001", "ext-EX000002"]
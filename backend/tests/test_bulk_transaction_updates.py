@@ -0,0 +1,113 @@
+"""
+Test the bulk status and notes update helpers.
+
+Verifies the bulk_write operations built for status changes, note additions
+and the customer counter release that follows a bulk move to a terminal status.
+"""
+
+from datetime import datetime, UTC
+
+from bson import ObjectId
+
+from app.models.audit_entry_model import create_status_change_audit
+from app.models.pawn_transaction_model import PawnTransaction, TransactionStatus
+from app.services.pawn_transaction_service import (
+    VALID_STATUS_TRANSITIONS,
+    build_customer_release_update,
+    build_notes_update,
+    build_status_update,
+)
+
+
+class TestBuildStatusUpdate:
+    """Test the per-transaction status operation."""
+
+    def setup_method(self):
+        self.now = datetime(2025, 6, 1, 15, 0, tzinfo=UTC)
+        self.transaction = PawnTransaction.model_construct(
+            id=ObjectId(),
+            transaction_id="txn-1",
+            status=TransactionStatus.FORFEITED,
+            total_due=650,
+            internal_notes="[SYSTEM] status changed",
+            updated_at=self.now
+        )
+        self.audit_entry = create_status_change_audit("staff-1", "overdue", "forfeited", "Customer unreachable")
+        self.operation = build_status_update(self.transaction, TransactionStatus.OVERDUE, self.audit_entry)
+
+    def test_filter_rechecks_previous_status(self):
+        """Transactions whose status moved after the read are not touched."""
+        assert self.operation._filter == {"_id": self.transaction.id, "status": "overdue"}
+
+    def test_sets_status_and_calculated_fields(self):
+        """The status and the fields save() would refresh are set with plain values."""
+        assert self.operation._doc["$set"] == {
+            "status": "forfeited",
+            "total_due": 650,
+            "internal_notes": "[SYSTEM] status changed",
+            "updated_at": self.now
+        }
+
+    def test_appends_audit_entry(self):
+        """The status-change audit entry is pushed rather than rewriting the log."""
+        entry = self.operation._doc["$push"]["system_audit_log"]
+        assert entry["action_type"] == "status_changed"
+        assert entry["staff_member"] == "staff-1"
+        assert entry["new_value"] == "forfeited"
+
+
+class TestBuildNotesUpdate:
+    """Test the per-transaction notes operation."""
+
+    def setup_method(self):
+        self.read_at = datetime(2025, 6, 1, 14, 0, tzinfo=UTC)
+        self.now = datetime(2025, 6, 1, 15, 0, tzinfo=UTC)
+        self.transaction = PawnTransaction.model_construct(
+            id=ObjectId(),
+            transaction_id="txn-1",
+            total_due=650,
+            manual_notes="[2025-06-01 15:00 UTC by staff-1] Called customer",
+            internal_notes="[2025-06-01 15:00 UTC by staff-1] Called customer",
+            updated_at=self.now
+        )
+        self.operation = build_notes_update(self.transaction, self.read_at)
+
+    def test_filter_rechecks_read_version(self):
+        """Transactions written after the read are not overwritten."""
+        assert self.operation._filter == {"_id": self.transaction.id, "updated_at": self.read_at}
+
+    def test_sets_notes_fields(self):
+        """Only the notes and the fields save() would refresh are set."""
+        assert self.operation._doc["$set"] == {
+            "manual_notes": self.transaction.manual_notes,
+            "internal_notes": self.transaction.internal_notes,
+            "total_due": 650,
+            "updated_at": self.now
+        }
+
+
+class TestBuildCustomerReleaseUpdate:
+    """Test the per-customer counter release operation."""
+
+    def test_decrements_are_clamped_at_zero(self):
+        """Counters drop by the batch totals without going negative."""
+        operation = build_customer_release_update("5551234567", 3, 1200)
+        assert operation._filter == {"phone_number": "5551234567"}
+
+        updates = operation._doc[0]["$set"]
+        assert updates["active_loans"] == {
+            "$max": [0, {"$subtract": [{"$ifNull": ["$active_loans", 0]}, 3]}]
+        }
+        assert updates["total_loan_value"] == {
+            "$max": [0, {"$subtract": [{"$ifNull": ["$total_loan_value", 0]}, 1200]}]
+        }
+
+
+class TestStatusTransitions:
+    """Test the shared status transition table."""
+
+    def test_terminal_statuses(self):
+        """Redeemed and sold loans cannot change status; forfeited loans can only be sold."""
+        assert VALID_STATUS_TRANSITIONS[TransactionStatus.REDEEMED] == []
+        assert VALID_STATUS_TRANSITIONS[TransactionStatus.SOLD] == []
+        assert VALID_STATUS_TRANSITIONS[TransactionStatus.FORFEITED] == [TransactionStatus.SOLD]
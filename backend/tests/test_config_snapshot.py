@@ -0,0 +1,120 @@
+"""
+Test the in-process business configuration snapshot.
+
+Verifies that snapshot views are read-only, that reads are served without
+querying MongoDB once loaded, and that change notifications reload the
+snapshot only for a new version.
+"""
+
+import pytest
+
+from app.models.business_config_model import (
+    CompanyConfig,
+    FinancialPolicyConfig,
+    ForfeitureConfig,
+)
+from app.services import config_snapshot_service
+from app.services.config_snapshot_service import ConfigSnapshotService, ConfigView
+
+
+@pytest.fixture
+def loads(monkeypatch):
+    """Count get_current_config queries and serve a fixed financial policy."""
+    calls = []
+
+    def fake_current(model, document=None):
+        async def get_current_config():
+            calls.append(model.__name__)
+            return document
+        return get_current_config
+
+    policy = FinancialPolicyConfig.model_construct(
+        customer_credit_limit=5000,
+        max_active_loans_per_customer=6,
+        updated_by="admin",
+        reason="test"
+    )
+    for model in config_snapshot_service.CONFIG_MODELS:
+        document = policy if model is FinancialPolicyConfig else None
+        monkeypatch.setattr(model, "get_current_config", fake_current(model, document))
+    monkeypatch.setattr(config_snapshot_service, "get_cache_service", lambda: None)
+
+    ConfigSnapshotService.reset()
+    yield calls
+    ConfigSnapshotService.reset()
+
+
+class TestConfigView:
+    """Test the read-only configuration view."""
+
+    def test_attributes_are_read_only(self):
+        """Fields read like a document but cannot be assigned."""
+        view = ConfigView({"forfeiture_days": 97})
+        assert view.forfeiture_days == 97
+        with pytest.raises(AttributeError):
+            view.forfeiture_days = 30
+
+    def test_nested_values_are_frozen(self):
+        """Lists become tuples and dicts become read-only mappings."""
+        view = ConfigView({"tags": ["a", "b"], "limits": {"max": 10}})
+        assert view.tags == ("a", "b")
+        with pytest.raises(TypeError):
+            view.limits["max"] = 20
+
+    def test_unknown_field(self):
+        """Missing fields raise AttributeError like a model would."""
+        with pytest.raises(AttributeError):
+            ConfigView({}).missing_field
+
+
+class TestConfigSnapshotService:
+    """Test snapshot loading and refresh."""
+
+    @pytest.mark.asyncio
+    async def test_reads_served_from_snapshot(self, loads):
+        """The five configurations are loaded once and then read without queries."""
+        config = await ConfigSnapshotService.get(FinancialPolicyConfig)
+        assert config.customer_credit_limit == 5000
+        assert await ConfigSnapshotService.get(CompanyConfig) is None
+        assert await ConfigSnapshotService.get(FinancialPolicyConfig) is config
+        assert len(loads) == len(config_snapshot_service.CONFIG_MODELS)
+
+    @pytest.mark.asyncio
+    async def test_stale_snapshot_reloads(self, loads, monkeypatch):
+        """A snapshot older than the maximum age is reloaded on next use."""
+        await ConfigSnapshotService.get(ForfeitureConfig)
+        monkeypatch.setattr(config_snapshot_service, "SNAPSHOT_MAX_AGE_SECONDS", 0)
+        await ConfigSnapshotService.get(ForfeitureConfig)
+        assert len(loads) == 2 * len(config_snapshot_service.CONFIG_MODELS)
+
+    @pytest.mark.asyncio
+    async def test_change_message_reloads_new_version_only(self, loads):
+        """Only a version different from the loaded one triggers a reload."""
+        await ConfigSnapshotService.load(version=3)
+        loads.clear()
+
+        assert await ConfigSnapshotService.handle_message(b"3") is False
+        assert loads == []
+        assert await ConfigSnapshotService.handle_message(b"4") is True
+        assert len(loads) == len(config_snapshot_service.CONFIG_MODELS)
+
+    @pytest.mark.asyncio
+    async def test_publish_without_redis_reloads_locally(self, loads):
+        """Publishing a change refreshes this worker even when Redis is unavailable."""
+        await ConfigSnapshotService.load(version=1)
+        loads.clear()
+
+        await ConfigSnapshotService.publish_change()
+        assert len(loads) == len(config_snapshot_service.CONFIG_MODELS)
+        assert ConfigSnapshotService._version == 2
+
+    @pytest.mark.asyncio
+    async def test_customer_defaults_use_snapshot(self, loads):
+        """Customer credit and loan defaults come from the snapshot."""
+        from decimal import Decimal
+        from app.models.customer_model import Customer
+
+        customer = Customer.model_construct(credit_limit=None, custom_loan_limit=None)
+        assert await Customer.get_default_credit_limit() == Decimal("5000")
+        assert await customer.get_effective_loan_limit() == 6
+        assert len(loads) == len(config_snapshot_service.CONFIG_MODELS)
@@ -0,0 +1,259 @@
+"""
+Test set-based customer consistency validation.
+
+Verifies the expected-counters $group, the field comparison, and that full
+validation merges the sorted customer and counter streams, repairs in
+bulk_write batches and reports progress.
+"""
+
+from datetime import datetime
+
+import pytest
+
+from app.core.redis_cache import BusinessCache
+from app.models.customer_model import Customer
+from app.models.pawn_transaction_model import PawnTransaction
+from app.services import consistency_validation_service
+from app.services.consistency_validation_service import (
+    ConsistencyValidationService,
+    build_expected_counters_pipeline,
+    empty_expected_counters,
+    find_discrepancies,
+)
+
+PAWN_DATE = datetime(2026, 1, 5, 12, 0)
+
+
+class FakeCursor:
+    """Async cursor stand-in over fixed documents."""
+
+    def __init__(self, documents):
+        self.documents = list(documents)
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for document in self.documents:
+            yield document
+
+    def __anext__(self):
+        if not hasattr(self, "_iterator"):
+            self._iterator = self._iterate()
+        return self._iterator.__anext__()
+
+    async def to_list(self, length=None):
+        return self.documents[:length] if length else self.documents
+
+
+class FakeBulkWriteResult:
+    def __init__(self, matched_count):
+        self.matched_count = matched_count
+
+
+class FakeCustomers:
+    """Customers collection stand-in recording bulk writes."""
+
+    def __init__(self, documents):
+        self.documents = sorted(documents, key=lambda document: document["phone_number"])
+        self.bulk_writes = []
+        # Customers whose counters change before their repair is written
+        self.changed = set()
+
+    def find(self, query, projection=None, sort=None, limit=0):
+        return FakeCursor(self.documents[:limit] if limit else self.documents)
+
+    async def count_documents(self, query):
+        return len(self.documents)
+
+    async def bulk_write(self, operations, ordered=True):
+        self.bulk_writes.append(list(operations))
+        return FakeBulkWriteResult(len(operations) - len(self.changed))
+
+    async def distinct(self, key, query):
+        return [phone for phone in query["phone_number"]["$in"] if phone not in self.changed]
+
+
+class FakeTransactions:
+    """Transactions collection stand-in returning fixed $group rows."""
+
+    def __init__(self, rows):
+        self.rows = sorted(rows, key=lambda row: row["_id"])
+        self.pipelines = []
+
+    def aggregate(self, pipeline, **kwargs):
+        self.pipelines.append(pipeline)
+        return FakeCursor(self.rows)
+
+
+def customer(phone_number, total=0, active=0, value=0, last=None):
+    return {
+        "phone_number": phone_number,
+        "first_name": "Test",
+        "last_name": phone_number[-4:],
+        "total_transactions": total,
+        "active_loans": active,
+        "total_loan_value": value,
+        "last_transaction_date": last,
+    }
+
+
+def counters(phone_number, total, active, value, last=PAWN_DATE):
+    return {
+        "_id": phone_number,
+        "total_transactions": total,
+        "active_loans": active,
+        "total_loan_value": value,
+        "last_transaction_date": last,
+    }
+
+
+class TestExpectedCounters:
+    """Test the pipeline and the comparison."""
+
+    def test_pipeline_groups_by_customer(self):
+        """One $group computes every counter, sorted by phone for merging."""
+        match, group, sort = build_expected_counters_pipeline()
+        assert match == {"$match": {"customer_id": {"$type": "string"}}}
+        assert group["$group"]["_id"] == "$customer_id"
+        assert group["$group"]["last_transaction_date"] == {"$max": "$pawn_date"}
+        slot_statuses = group["$group"]["active_loans"]["$sum"]["$cond"][0]["$in"][1]
+        assert "active" in slot_statuses and "redeemed" not in slot_statuses
+        assert sort == {"$sort": {"_id": 1}}
+
+    def test_pipeline_for_selected_customers(self):
+        """Limited runs only group the selected customers."""
+        assert build_expected_counters_pipeline(["5550000001"])[0] == {"$match": {"customer_id": "5550000001"}}
+        assert build_expected_counters_pipeline(["1", "2"])[0] == {"$match": {"customer_id": {"$in": ["1", "2"]}}}
+
+    def test_find_discrepancies(self):
+        """Mismatched counters are reported; consistent ones are not."""
+        stored = customer("5550000001", total=2, active=1, value=100.0, last=PAWN_DATE)
+        assert find_discrepancies(stored, counters("5550000001", 2, 1, 100)) == []
+
+        discrepancies = find_discrepancies(stored, counters("5550000001", 3, 0, 100))
+        assert [(d["field"], d["difference"]) for d in discrepancies] == [
+            ("total_transactions", 1), ("active_loans", -1)
+        ]
+        assert find_discrepancies(customer("5550000002"), empty_expected_counters()) == []
+
+
+class TestValidateAllCustomers:
+    """Test the streaming validation and batched repair."""
+
+    @pytest.fixture
+    def collections(self, monkeypatch):
+        customers = FakeCustomers([
+            customer("5550000001", total=1, active=1, value=500.0, last=PAWN_DATE),
+            customer("5550000002", total=0),
+            customer("5550000003", total=4, active=2, value=900.0, last=PAWN_DATE),
+            customer("5550000004", total=1, active=1, value=50.0),
+        ])
+        transactions = FakeTransactions([
+            counters("5550000000", 1, 1, 10),  # transactions of a missing customer
+            counters("5550000001", 1, 1, 500),
+            counters("5550000003", 4, 1, 400),
+        ])
+        monkeypatch.setattr(Customer, "get_motor_collection", classmethod(lambda cls: customers))
+        monkeypatch.setattr(PawnTransaction, "get_motor_collection", classmethod(lambda cls: transactions))
+
+        invalidated = []
+
+        async def invalidate_tags(*tags):
+            invalidated.extend(tags)
+
+        monkeypatch.setattr(BusinessCache, "invalidate_tags", staticmethod(invalidate_tags))
+        return customers, transactions, invalidated
+
+    @pytest.mark.asyncio
+    async def test_merge_join(self, collections):
+        """Each customer is compared with its own counters, or zeros without transactions."""
+        customers, transactions, _ = collections
+
+        results = await ConsistencyValidationService.validate_all_customers()
+
+        assert results["total_customers"] == 4
+        assert results["consistent"] == 2
+        assert results["inconsistent"] == 2
+        assert [info["phone_number"] for info in results["customers_with_discrepancies"]] == [
+            "5550000003", "5550000004"
+        ]
+        assert len(transactions.pipelines) == 1
+        assert customers.bulk_writes == []
+        progress = ConsistencyValidationService.get_progress()
+        assert progress["status"] == "completed"
+        assert progress["processed"] == 4
+
+    @pytest.mark.asyncio
+    async def test_repairs_in_batches(self, collections, monkeypatch):
+        """Repairs go out as bulk_write batches and invalidate the repaired customers."""
+        customers, transactions, invalidated = collections
+        monkeypatch.setattr(consistency_validation_service, "REPAIR_BATCH_SIZE", 1)
+
+        results = await ConsistencyValidationService.validate_all_customers(
+            fix_automatically=True, admin_user_id="admin"
+        )
+
+        assert results["fixed"] == 2
+        assert [len(batch) for batch in customers.bulk_writes] == [1, 1]
+        assert len(transactions.pipelines) == 3
+        repair = customers.bulk_writes[0][0]
+        assert repair._filter == {
+            "phone_number": "5550000003",
+            "total_transactions": 4,
+            "active_loans": 2,
+            "total_loan_value": 900.0,
+            "last_transaction_date": PAWN_DATE
+        }
+        assert repair._doc["$set"]["active_loans"] == 1
+        assert repair._doc["$set"]["total_loan_value"] == 400.0
+        assert customers.bulk_writes[1][0]._doc["$set"]["total_transactions"] == 0
+        assert "customer:5550000003" in invalidated and "customer:5550000004" in invalidated
+        assert all(info["fixed"] for info in results["customers_with_discrepancies"])
+
+    @pytest.mark.asyncio
+    async def test_fix_requires_admin(self):
+        """Automatic fixes need the admin performing them."""
+        result = await ConsistencyValidationService.validate_all_customers(fix_automatically=True)
+        assert "error" in result
+
+    @pytest.mark.asyncio
+    async def test_counters_caught_up_before_repair(self, collections):
+        """A customer consistent by the time its batch is re-checked is not written."""
+        customers, transactions, _ = collections
+        initial_rows = list(transactions.rows)
+
+        def aggregate(pipeline, **kwargs):
+            transactions.pipelines.append(pipeline)
+            if len(transactions.pipelines) == 1:
+                return FakeCursor(initial_rows)
+            # 5550000003 closed a loan and 5550000004 pawned one during the run
+            return FakeCursor(initial_rows[:2] + [
+                counters("5550000003", 4, 2, 900), counters("5550000004", 1, 1, 50, last=None)
+            ])
+
+        transactions.aggregate = aggregate
+
+        results = await ConsistencyValidationService.validate_all_customers(
+            fix_automatically=True, admin_user_id="admin"
+        )
+
+        assert customers.bulk_writes == []
+        assert results["fixed"] == 0
+        assert results["consistent"] == 4
+        assert results["customers_with_discrepancies"] == []
+
+    @pytest.mark.asyncio
+    async def test_changed_customer_is_not_overwritten(self, collections):
+        """A repair whose guard no longer matches is reported, not counted as fixed."""
+        customers, _, _ = collections
+        customers.changed = {"5550000004"}
+
+        results = await ConsistencyValidationService.validate_all_customers(
+            fix_automatically=True, admin_user_id="admin"
+        )
+
+        assert results["fixed"] == 1
+        outcome = {info["phone_number"]: info for info in results["customers_with_discrepancies"]}
+        assert outcome["5550000003"]["fixed"] is True
+        assert "fix_error" in outcome["5550000004"]
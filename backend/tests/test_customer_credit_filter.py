@@ -0,0 +1,53 @@
+"""
+Test the server-side credit utilization filter for customer lists.
+
+Verifies the $expr built for each tier: the effective limit falls back to
+the system default and percentages are compared without division.
+"""
+
+from decimal import Decimal
+
+from app.services.customer_service import build_credit_utilization_filter
+
+
+def _let(tier):
+    return build_credit_utilization_filter(tier, Decimal("3000.00"))["$expr"]["$let"]
+
+
+class TestCreditUtilizationFilter:
+    """Test the tier expressions."""
+
+    def test_effective_limit_uses_default(self):
+        """Customers without a custom limit use the whole-dollar system default."""
+        variables = _let("high")["vars"]
+        assert variables["limit"] == {"$trunc": {"$ifNull": ["$credit_limit", 3000]}}
+        assert variables["scaled_loans"] == {"$multiply": [{"$ifNull": ["$total_loan_value", 0]}, 100]}
+
+    def test_high_tier(self):
+        """High utilization is above 80% of a positive limit."""
+        assert _let("high")["in"] == {"$and": [
+            {"$gt": ["$$limit", 0]},
+            {"$gt": ["$$scaled_loans", {"$multiply": ["$$limit", 80]}]}
+        ]}
+
+    def test_medium_tier_is_inclusive(self):
+        """Medium utilization includes both the 50% and 80% boundaries."""
+        conditions = _let("medium")["in"]["$and"]
+        assert {"$gte": ["$$scaled_loans", {"$multiply": ["$$limit", 50]}]} in conditions
+        assert {"$lte": ["$$scaled_loans", {"$multiply": ["$$limit", 80]}]} in conditions
+
+    def test_low_tier_excludes_unused_credit(self):
+        """Low utilization requires some outstanding loan value."""
+        conditions = _let("low")["in"]["$and"]
+        assert {"$gt": ["$$scaled_loans", 0]} in conditions
+        assert {"$lt": ["$$scaled_loans", {"$multiply": ["$$limit", 50]}]} in conditions
+
+    def test_none_tier(self):
+        """No utilization is no outstanding loan value, whatever the limit."""
+        assert build_credit_utilization_filter("none", Decimal("3000")) == {
+            "$expr": {"$eq": [{"$ifNull": ["$total_loan_value", 0]}, 0]}
+        }
+
+    def test_unknown_tier(self):
+        """Unknown tiers produce no filter."""
+        assert build_credit_utilization_filter("extreme", Decimal("3000")) is None
@@ -0,0 +1,105 @@
+"""
+Test the semi-join filters for the follow-up and alerts customer lists.
+
+Verifies the $lookup/$match stages and that filtered lists are served from
+one aggregation instead of a materialised phone_number $in list.
+"""
+
+from datetime import datetime, UTC
+
+import pytest
+from pymongo import DESCENDING
+
+from app.models.customer_model import Customer
+from app.services.customer_service import (
+    CustomerService,
+    build_customer_semi_joins,
+    build_semi_join_page_pipeline,
+)
+
+
+class TestSemiJoinStages:
+    """Test the semi-join pipeline builders."""
+
+    def test_no_filters(self):
+        """Without alerts/follow-up filters there are no semi-join stages."""
+        assert build_customer_semi_joins(False, False) == []
+
+    def test_follow_up_stage(self):
+        """Follow-up keeps customers with at least one overdue transaction."""
+        lookup, match = build_customer_semi_joins(False, True)
+        assert lookup["$lookup"]["from"] == "pawn_transactions"
+        assert lookup["$lookup"]["let"] == {"key": "$phone_number"}
+        assert lookup["$lookup"]["pipeline"] == [
+            {"$match": {"status": "overdue", "$expr": {"$eq": ["$customer_id", "$$key"]}}},
+            {"$limit": 1},
+            {"$project": {"_id": 1}}
+        ]
+        assert match == {"$match": {"_overdue_transactions.0": {"$exists": True}}}
+
+    def test_alerts_and_follow_up_combine(self):
+        """Both filters apply together rather than one replacing the other."""
+        stages = build_customer_semi_joins(True, True)
+        assert [stage["$lookup"]["from"] for stage in stages if "$lookup" in stage] == [
+            "service_alerts", "pawn_transactions"
+        ]
+        assert stages[0]["$lookup"]["pipeline"][0] == {
+            "$match": {"status": "active", "$expr": {"$eq": ["$customer_phone", "$$key"]}}
+        }
+
+    def test_page_pipeline(self):
+        """Filters and sort run before the semi-joins; total and page share one $facet."""
+        semi_joins = build_customer_semi_joins(True, False)
+        pipeline = build_semi_join_page_pipeline(
+            {"status": "active"}, semi_joins, [("created_at", DESCENDING)], 20, 10
+        )
+        assert pipeline[0] == {"$match": {"status": "active"}}
+        assert pipeline[1] == {"$sort": {"created_at": DESCENDING}}
+        assert pipeline[2:4] == semi_joins
+        assert pipeline[4] == {"$project": {"_active_alerts": 0}}
+        assert pipeline[5] == {"$facet": {
+            "total": [{"$count": "count"}],
+            "customers": [{"$skip": 20}, {"$limit": 10}]
+        }}
+
+
+class TestFollowUpList:
+    """Test get_customers_list with a semi-join filter."""
+
+    @pytest.mark.asyncio
+    async def test_single_aggregation(self, monkeypatch):
+        """The follow-up list is one customers aggregation with no $in list."""
+        pipelines = []
+        options = {}
+        now = datetime.now(UTC)
+        document = {
+            "phone_number": "5551234567",
+            "first_name": "Ada",
+            "last_name": "Lovelace",
+            "status": "active",
+            "created_by": "admin",
+            "created_at": now,
+            "updated_at": now,
+        }
+
+        class FakeCursor:
+            async def to_list(self, length=None):
+                return [{"total": [{"count": 11}], "customers": [document]}]
+
+        class FakeCollection:
+            def aggregate(self, pipeline, **kwargs):
+                pipelines.append(pipeline)
+                options.update(kwargs)
+                return FakeCursor()
+
+        monkeypatch.setattr(Customer, "get_motor_collection", classmethod(lambda cls: FakeCollection()))
+
+        result = await CustomerService.get_customers_list(follow_up_only=True, page=2, per_page=10)
+
+        assert result.total == 11
+        assert result.pages == 2
+        assert [customer.phone_number for customer in result.customers] == ["5551234567"]
+        assert len(pipelines) == 1
+        assert options == {"allowDiskUse": True}
+        assert pipelines[0][0] == {"$match": {}}
+        assert "phone_number" not in str(pipelines[0][0])
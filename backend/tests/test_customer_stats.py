@@ -0,0 +1,141 @@
+"""
+Test the single-round-trip customer dashboard statistics.
+
+Verifies the $facet pipeline and its parsing, that the three aggregations
+run from one call, and that a cached result is served without querying.
+"""
+
+from datetime import datetime, timedelta, UTC
+
+import pytest
+
+from app.core.redis_cache import BusinessCache, CacheTags
+from app.models.customer_model import Customer
+from app.models.pawn_transaction_model import PawnTransaction
+from app.services.customer_service import (
+    CustomerService,
+    build_customer_stats_pipeline,
+    parse_customer_stats_facets,
+)
+from app.services.service_alert_service import ServiceAlertService
+
+TODAY = datetime(2026, 3, 14, 5, 0, tzinfo=UTC)
+
+
+class FakeCursor:
+    """Motor aggregation cursor stand-in returning fixed rows."""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    async def to_list(self, length=None):
+        return self.rows
+
+
+class FakeCollection:
+    """Collection stand-in recording aggregation pipelines."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.pipelines = []
+
+    def aggregate(self, pipeline):
+        self.pipelines.append(pipeline)
+        return FakeCursor(self.rows)
+
+
+class TestCustomerStatsPipeline:
+    """Test the $facet pipeline."""
+
+    def test_facets(self):
+        """Every count is a facet of a single projected pass."""
+        pipeline = build_customer_stats_pipeline(TODAY, TODAY + timedelta(days=1), TODAY.replace(day=1))
+        assert pipeline[0] == {"$project": {"status": 1, "created_at": 1, "total_loan_value": 1}}
+        facets = pipeline[1]["$facet"]
+        assert set(facets) == {"total", "by_status", "created_today", "new_this_month", "vip"}
+        assert facets["created_today"][0] == {
+            "$match": {"created_at": {"$gte": TODAY, "$lt": TODAY + timedelta(days=1)}}
+        }
+        assert facets["vip"][0] == {"$match": {"total_loan_value": {"$gte": 5000}}}
+
+    def test_parse(self):
+        """Facet rows map to response fields; empty facets count as zero."""
+        counts = parse_customer_stats_facets({
+            "total": [{"count": 12}],
+            "by_status": [{"_id": "active", "count": 10}, {"_id": "archived", "count": 2}],
+            "created_today": [],
+            "new_this_month": [{"count": 4}],
+            "vip": [{"count": 1}],
+        })
+        assert counts == {
+            "total_customers": 12,
+            "active_customers": 10,
+            "suspended_customers": 0,
+            "archived_customers": 2,
+            "customers_created_today": 0,
+            "new_this_month": 4,
+            "vip_customers": 1,
+        }
+
+
+class TestGetCustomerStatistics:
+    """Test the statistics service method."""
+
+    @pytest.fixture
+    def collections(self, monkeypatch):
+        customers = FakeCollection([{"total": [{"count": 3}], "by_status": [{"_id": "active", "count": 3}]}])
+        transactions = FakeCollection([{"count": 2}])
+        monkeypatch.setattr(Customer, "get_motor_collection", classmethod(lambda cls: customers))
+        monkeypatch.setattr(PawnTransaction, "get_motor_collection", classmethod(lambda cls: transactions))
+
+        async def count_alerts():
+            return 1
+
+        monkeypatch.setattr(ServiceAlertService, "count_customers_with_active_alerts", staticmethod(count_alerts))
+        return customers, transactions
+
+    @pytest.mark.asyncio
+    async def test_computes_and_caches(self, collections, monkeypatch):
+        """A miss runs the aggregations and caches the result under the stats tag."""
+        cached = {}
+
+        async def cache_get(key):
+            return None
+
+        async def cache_set(key, value, ttl_seconds=None, tags=None):
+            cached.update(key=key, value=value, tags=tags)
+
+        monkeypatch.setattr(BusinessCache, "get", staticmethod(cache_get))
+        monkeypatch.setattr(BusinessCache, "set", staticmethod(cache_set))
+
+        stats = await CustomerService.get_customer_statistics("UTC")
+
+        assert stats.total_customers == 3
+        assert stats.active_customers == 3
+        assert stats.service_alerts == 1
+        assert stats.needs_follow_up == 2
+        customers, transactions = collections
+        assert len(customers.pipelines) == 1 and len(transactions.pipelines) == 1
+        assert cached["key"].startswith(f"{CacheTags.CUSTOMER_STATS}:")
+        assert cached["tags"] == [CacheTags.CUSTOMER_STATS]
+        assert cached["value"] == stats.model_dump()
+
+    @pytest.mark.asyncio
+    async def test_cache_hit_skips_queries(self, collections, monkeypatch):
+        """A cached result is returned without running any aggregation."""
+        payload = dict(
+            total_customers=7, active_customers=6, suspended_customers=1, archived_customers=0,
+            customers_created_today=0, avg_transactions_per_customer=0.0, new_this_month=2,
+            service_alerts=0, needs_follow_up=0, vip_customers=0
+        )
+
+        async def cache_get(key):
+            return payload
+
+        monkeypatch.setattr(BusinessCache, "get", staticmethod(cache_get))
+
+        stats = await CustomerService.get_customer_statistics("UTC")
+
+        assert stats.total_customers == 7
+        customers, transactions = collections
+        assert customers.pipelines == [] and transactions.pipelines == []
@@ -0,0 +1,192 @@
+"""
+Test daily rollup helpers.
+
+Verifies the per-day key/boundary helpers, the counters produced by status
+transitions and the shape of the backfill pipelines.
+"""
+
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from app.api.api_v1.handlers import pawn_transaction as pawn_transaction_handlers
+from app.core.redis_cache import BusinessCache
+from app.models.daily_rollup_model import DailyRollup
+from app.models.pawn_transaction_model import TransactionStatus
+from app.schemas.pawn_transaction_schema import TransactionVoidRequest
+from app.services.pawn_transaction_service import PawnTransactionService
+from app.services.payment_service import PaymentService
+from app.services.daily_rollup_service import (
+    DailyRollupService,
+    bucket_end_key,
+    build_status_change_increments,
+    iter_date_keys,
+    local_date_key,
+    local_day_bounds,
+)
+
+
+class TestDateHelpers:
+    """Test business date helpers."""
+
+    def test_local_date_key_uses_timezone(self):
+        """A late-evening UTC instant belongs to the next day in Tokyo."""
+        instant = datetime(2025, 3, 15, 20, 0, 0)
+        assert local_date_key(instant, "UTC") == "2025-03-15"
+        assert local_date_key(instant, "Asia/Tokyo") == "2025-03-16"
+
+    def test_local_day_bounds_are_naive_utc(self):
+        """Day bounds are converted to naive UTC for MongoDB queries."""
+        start, end = local_day_bounds("2025-01-10", "America/New_York")
+        assert start == datetime(2025, 1, 10, 5, 0, 0)
+        assert end == datetime(2025, 1, 11, 5, 0, 0)
+        assert start.tzinfo is None
+
+    def test_iter_date_keys_is_inclusive(self):
+        """Date ranges include both ends and cross month boundaries."""
+        assert iter_date_keys("2025-01-30", "2025-02-02") == [
+            "2025-01-30", "2025-01-31", "2025-02-01", "2025-02-02"
+        ]
+
+    def test_resolve_window_uses_rollup_timezone(self):
+        """Custom (naive UTC) and preset (aware local) bounds map to local business dates."""
+        start_key, end_key, _ = DailyRollupService._resolve_window(
+            datetime(2025, 3, 15, 20, 0, 0),
+            datetime(2025, 3, 20, 20, 0, 0, tzinfo=ZoneInfo("Asia/Tokyo")),
+            "Asia/Tokyo"
+        )
+        assert start_key == "2025-03-16"
+        assert end_key == "2025-03-20"
+
+    def test_bucket_end_key(self):
+        """Monthly buckets end on the last day of the month."""
+        assert bucket_end_key("2024-02") == "2024-02-29"
+        assert bucket_end_key("2025-03-15") == "2025-03-15"
+
+
+class TestStatusChangeIncrements:
+    """Test rollup counters for status transitions."""
+
+    def test_new_loan_enters_active_population(self):
+        """Creating an active loan adds one active loan."""
+        assert build_status_change_increments(None, "active", 500) == {"active_loans_delta": 1}
+
+    def test_redemption_counts_event_and_leaves_active(self):
+        """Redeeming records the event amount and removes an active loan."""
+        assert build_status_change_increments("overdue", "redeemed", 500) == {
+            "redeemed": 1,
+            "redeemed_amount": 500,
+            "active_loans_delta": -1
+        }
+
+    def test_move_between_active_statuses_is_noop(self):
+        """Active -> extended does not change any counter."""
+        assert build_status_change_increments("active", "extended", 500) == {}
+
+    def test_forfeited_to_sold_counts_sale_only(self):
+        """Selling a forfeited item is a new event but not an active change."""
+        assert build_status_change_increments("forfeited", "sold", 300) == {"sold": 1, "sold_amount": 300}
+
+
+class TestRollupPipelines:
+    """Test the backfill/live pipelines."""
+
+    def setup_method(self):
+        self.start = datetime(2025, 1, 1, 5, 0, 0)
+        self.end = datetime(2025, 1, 2, 5, 0, 0)
+        self.pipelines = DailyRollupService.build_rollup_pipelines(self.start, self.end, "America/New_York")
+
+    def test_pipelines_use_half_open_window(self):
+        """Windows include the start and exclude the end."""
+        window = {"$gte": self.start, "$lt": self.end}
+        assert self.pipelines["payments"][0]["$match"] == {"payment_date": window}
+        assert self.pipelines["new_loans"][0]["$match"] == {"created_at": window}
+
+    def test_cancelled_extensions_are_excluded(self):
+        """Cancelled extension fees never reach the rollups."""
+        match = self.pipelines["extensions"][0]["$match"]
+        assert match["is_cancelled"] == {"$ne": True}
+
+    def test_days_keyed_in_timezone(self):
+        """Day keys are rendered in the rollup timezone."""
+        group_id = self.pipelines["payments"][1]["$group"]["_id"]
+        assert group_id["$dateToString"]["timezone"] == "America/New_York"
+        assert group_id["$dateToString"]["format"] == "%Y-%m-%d"
+
+
+class FakeRollups:
+    """Rollup collection stand-in recording $inc updates."""
+
+    def __init__(self):
+        self.updates = []
+
+    async def update_one(self, query, update, upsert=False):
+        self.updates.append((query, update["$inc"]))
+
+
+class FakeTransaction:
+    """Transaction stand-in for the void handler."""
+
+    def __init__(self):
+        self.transaction_id = "txn-1"
+        self.status = TransactionStatus.ACTIVE
+        self.loan_amount = 500
+        self.internal_notes = None
+        self.updated_at = datetime(2025, 1, 1, 12, 0, 0)
+        self.saved = False
+
+    def add_system_audit_entry(self, entry):
+        pass
+
+    async def save(self):
+        self.saved = True
+
+
+class FakeAdmin:
+    """Admin user stand-in with a valid PIN."""
+
+    user_id = "01"
+
+    async def verify_pin_async(self, pin):
+        return True
+
+
+class TestStatusWriters:
+    """Test that status writers outside the services keep rollups in step."""
+
+    @pytest.mark.asyncio
+    async def test_void_active_loan_leaves_active_population(self, monkeypatch):
+        """Voiding an active loan decrements the active loans of the void day."""
+        transaction = FakeTransaction()
+        rollups = FakeRollups()
+
+        async def get_transaction_by_id(transaction_id):
+            return transaction
+
+        async def get_payment_summary(transaction_id):
+            return None
+
+        async def get_coverage(cls, force_refresh=False):
+            return {"UTC": "2025-01-01"}
+
+        async def invalidate_transaction_caches(**kwargs):
+            pass
+
+        monkeypatch.setattr(PawnTransactionService, "get_transaction_by_id", staticmethod(get_transaction_by_id))
+        monkeypatch.setattr(PaymentService, "get_payment_summary", staticmethod(get_payment_summary))
+        monkeypatch.setattr(DailyRollupService, "get_coverage", classmethod(get_coverage))
+        monkeypatch.setattr(DailyRollup, "get_motor_collection", classmethod(lambda cls: rollups))
+        monkeypatch.setattr(BusinessCache, "invalidate_transaction_caches", staticmethod(invalidate_transaction_caches))
+
+        response = await pawn_transaction_handlers.void_transaction(
+            "txn-1",
+            TransactionVoidRequest(void_reason="Entered twice", admin_pin="1234"),
+            FakeAdmin()
+        )
+
+        assert response.new_status == TransactionStatus.VOIDED.value
+        assert transaction.saved
+        assert rollups.updates == [
+            ({"timezone": "UTC", "date": local_date_key(transaction.updated_at, "UTC")}, {"active_loans_delta": -1})
+        ]
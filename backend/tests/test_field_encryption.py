@@ -0,0 +1,200 @@
+"""
+Test field encryption formats.
+
+Verifies v2 values (cached data key, AES-GCM) round trip, legacy v1 values
+(PBKDF2 + AES-CBC) stay readable, and re-encryption moves values to the
+current key version.
+"""
+
+import base64
+import secrets
+import threading
+
+import pytest
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from cryptography.hazmat.primitives.padding import PKCS7
+
+from app.core import field_encryption
+from app.core.field_encryption import (
+    EncryptionConfig,
+    FieldEncryptionError,
+    FieldEncryptionService,
+    decrypt_documents,
+    encrypt_documents,
+    parse_wrapped_data_keys,
+    reencrypt_collection,
+)
+
+MASTER_KEY = "k" * 44
+
+
+def encrypt_v1(service, plaintext):
+    """Build a value in the legacy v1 format."""
+    salt = secrets.token_bytes(EncryptionConfig.SALT_SIZE)
+    iv = secrets.token_bytes(EncryptionConfig.IV_SIZE)
+    padder = PKCS7(128).padder()
+    padded = padder.update(plaintext.encode("utf-8")) + padder.finalize()
+    encryptor = Cipher(algorithms.AES(service._derive_key(salt)), modes.CBC(iv)).encryptor()
+    encrypted = encryptor.update(padded) + encryptor.finalize()
+    return "enc:" + base64.b64encode(salt + iv + encrypted).decode("ascii")
+
+
+class TestV2Format:
+    """Test the key-caching v2 format."""
+
+    def test_round_trip(self):
+        """New values use the v2 prefix with the key version and decrypt back."""
+        service = FieldEncryptionService(MASTER_KEY)
+        encrypted = service.encrypt_field("123 Main St")
+        assert encrypted.startswith("enc:v2:1:")
+        assert service.is_field_encrypted(encrypted)
+        assert service.decrypt_field(encrypted) == "123 Main St"
+
+    def test_unique_nonce_per_field(self):
+        """Encrypting the same value twice gives different ciphertexts."""
+        service = FieldEncryptionService(MASTER_KEY)
+        assert service.encrypt_field("same") != service.encrypt_field("same")
+
+    def test_data_key_derived_once(self):
+        """The data key is derived on first use and reused for every field."""
+        service = FieldEncryptionService(MASTER_KEY)
+        document = service.encrypt_document_fields({"email": "a@b.com", "city": "Springfield"})
+        data_key = service._data_keys["1"]
+        service.decrypt_document_fields(document)
+        assert service._data_keys == {"1": data_key}
+
+    def test_key_version_is_authenticated(self):
+        """Changing the key version in the header fails decryption."""
+        service = FieldEncryptionService(MASTER_KEY)
+        tampered = service.encrypt_field("secret").replace("enc:v2:1:", "enc:v2:2:", 1)
+        with pytest.raises(FieldEncryptionError):
+            service.decrypt_field(tampered)
+
+    def test_wrapped_data_key(self):
+        """A wrapped data key decrypts with the same master key only."""
+        wrapper = FieldEncryptionService(MASTER_KEY)
+        wrapped = wrapper.wrap_data_key("2")
+        service = FieldEncryptionService(MASTER_KEY, "2", {"2": wrapped})
+        encrypted = service.encrypt_field("secret")
+        assert FieldEncryptionService(MASTER_KEY, "2", {"2": wrapped}).decrypt_field(encrypted) == "secret"
+        with pytest.raises(FieldEncryptionError):
+            FieldEncryptionService(MASTER_KEY, "2").decrypt_field(encrypted)
+
+    def test_invalid_key_version(self):
+        """Key versions cannot contain the format separator."""
+        with pytest.raises(FieldEncryptionError):
+            FieldEncryptionService(MASTER_KEY, "1:2")
+
+
+class TestMigration:
+    """Test reading v1 values and moving them to v2."""
+
+    def test_v1_still_readable(self):
+        """Legacy values decrypt with the PBKDF2 path."""
+        service = FieldEncryptionService(MASTER_KEY)
+        assert service.decrypt_field(encrypt_v1(service, "legacy")) == "legacy"
+
+    def test_reencrypt_document_fields(self):
+        """v1 and old-version v2 values are re-encrypted; current values are not."""
+        old = FieldEncryptionService(MASTER_KEY, "1")
+        service = FieldEncryptionService(MASTER_KEY, "2")
+        current = service.encrypt_field("current")
+        document = {
+            "email": encrypt_v1(service, "legacy@example.com"),
+            "city": old.encrypt_field("Springfield"),
+            "state": current,
+            "zip_code": "12345",
+        }
+
+        updates = service.reencrypt_document_fields(document)
+
+        assert set(updates) == {"email", "city"}
+        assert all(value.startswith("enc:v2:2:") for value in updates.values())
+        assert service.decrypt_field(updates["email"]) == "legacy@example.com"
+        assert service.decrypt_field(updates["city"]) == "Springfield"
+        assert not service.needs_reencryption(current)
+        assert not service.needs_reencryption("12345")
+
+    @pytest.mark.asyncio
+    async def test_reencrypt_collection_conditional_updates(self):
+        """Updates match on the old ciphertext so concurrent edits are not overwritten."""
+        service = FieldEncryptionService(MASTER_KEY, "2")
+        legacy = FieldEncryptionService(MASTER_KEY, "1").encrypt_field("old@example.com")
+
+        class FakeResult:
+            modified_count = 1
+
+        class FakeCollection:
+            name = "customers"
+            operations = []
+
+            async def _documents(self):
+                yield {"_id": "c1", "email": legacy}
+
+            def find(self, query, projection=None):
+                self.query = query
+                return self._documents()
+
+            async def bulk_write(self, operations, ordered=True):
+                self.operations.extend(operations)
+                return FakeResult()
+
+        collection = FakeCollection()
+        assert await reencrypt_collection(collection, service) == 1
+
+        operation = collection.operations[0]
+        assert operation._filter == {"_id": "c1", "email": legacy}
+        assert service.decrypt_field(operation._doc["$set"]["email"]) == "old@example.com"
+        assert {"email": {"$regex": "^enc:", "$not": {"$regex": "^enc:v2:2:"}}} in collection.query["$or"]
+
+    def test_parse_wrapped_data_keys(self):
+        """The settings value maps key versions to wrapped keys."""
+        assert parse_wrapped_data_keys("") == {}
+        assert parse_wrapped_data_keys("1:abc=, 2:d/e+") == {"1": "abc=", "2": "d/e+"}
+
+
+class TestBatchedDocuments:
+    """Test the batched, thread-pooled document API."""
+
+    @pytest.fixture
+    def service(self, monkeypatch):
+        service = FieldEncryptionService(MASTER_KEY)
+        monkeypatch.setattr(field_encryption, "encryption_service", service)
+        return service
+
+    @pytest.mark.asyncio
+    async def test_round_trip_preserves_order(self, service):
+        """Documents come back in input order with only sensitive fields changed."""
+        documents = [{"phone_number": f"555000{i:04d}", "email": f"c{i}@example.com", "city": None} for i in range(10)]
+
+        encrypted = await encrypt_documents(documents)
+
+        assert [doc["phone_number"] for doc in encrypted] == [doc["phone_number"] for doc in documents]
+        assert all(doc["email"].startswith("enc:v2:") and doc["city"] is None for doc in encrypted)
+        assert documents[0]["email"] == "c0@example.com"
+        assert await decrypt_documents(encrypted) == documents
+
+    @pytest.mark.asyncio
+    async def test_runs_on_encryption_threads(self, service, monkeypatch):
+        """Crypto work runs on field-encryption worker threads, not the event loop."""
+        threads = []
+        decrypt_field = service.decrypt_field
+
+        def recording_decrypt(value):
+            threads.append(threading.current_thread().name)
+            return decrypt_field(value)
+
+        encrypted = service.encrypt_documents([{"notes": f"note {i}"} for i in range(8)])
+        monkeypatch.setattr(service, "decrypt_field", recording_decrypt)
+
+        await decrypt_documents(encrypted)
+
+        assert len(threads) == 8
+        assert all(name.startswith("field-encryption") for name in threads)
+
+    @pytest.mark.asyncio
+    async def test_failed_decryption_is_masked(self, service):
+        """Undecryptable values are replaced rather than failing the batch."""
+        documents = [{"email": "enc:v2:1:bm90LXZhbGlk"}, {"email": service.encrypt_field("ok@example.com")}]
+        decrypted = await decrypt_documents(documents)
+        assert decrypted == [{"email": "[ENCRYPTED]"}, {"email": "ok@example.com"}]
@@ -0,0 +1,111 @@
+"""
+Test formatted ID counters.
+
+Verifies that IDs come from an atomic counter, stay unique under concurrent
+issue, continue from the highest existing ID when a sequence is first seeded
+and that pre-allocated blocks hand out contiguous numbers.
+"""
+
+import asyncio
+
+import pytest
+
+from app.models.counter_model import Counter
+from app.services.formatted_id_service import (
+    EXTENSION_SEQUENCE,
+    PAWN_TRANSACTION_SEQUENCE,
+    FormattedIdBlock,
+    FormattedIdService,
+    format_sequence_id,
+)
+
+
+class FakeCountersCollection:
+    """In-memory stand-in for the counters collection ($inc/$max/$set upserts)."""
+
+    def __init__(self):
+        self.documents = {}
+        self.update_calls = 0
+
+    async def find_one(self, query, projection=None):
+        document = self.documents.get(query["_id"])
+        return dict(document) if document else None
+
+    async def find_one_and_update(self, query, update, upsert=False, return_document=None):
+        self.update_calls += 1
+        # Yield so concurrent callers interleave like real round trips
+        await asyncio.sleep(0)
+        document = self.documents.setdefault(query["_id"], {"_id": query["_id"], "value": 0})
+        for field, amount in update.get("$inc", {}).items():
+            document[field] = document.get(field, 0) + amount
+        for field, value in update.get("$max", {}).items():
+            document[field] = max(document.get(field, value), value)
+        document.update(update.get("$set", {}))
+        return dict(document)
+
+
+@pytest.fixture
+def counters(monkeypatch):
+    collection = FakeCountersCollection()
+    monkeypatch.setattr(Counter, "get_motor_collection", classmethod(lambda cls: collection))
+    monkeypatch.setattr(FormattedIdService, "_seeded_sequences", set())
+
+    highest = {PAWN_TRANSACTION_SEQUENCE: 104, EXTENSION_SEQUENCE: 0}
+
+    async def fake_highest(sequence):
+        return highest[sequence]
+
+    monkeypatch.setattr(FormattedIdService, "get_highest_issued_number", staticmethod(fake_highest))
+    return collection
+
+
+class TestFormattedIdCounters:
+    """Test counter-backed formatted IDs."""
+
+    def test_format_sequence_id(self):
+        """Numbers are zero-padded behind the sequence prefix."""
+        assert format_sequence_id(PAWN_TRANSACTION_SEQUENCE, 105) == "PW000105"
+        assert format_sequence_id(EXTENSION_SEQUENCE, 1) == "EX000001"
+
+    @pytest.mark.asyncio
+    async def test_unseeded_sequence_continues_from_highest(self, counters):
+        """The first ID after seeding follows the highest one in use."""
+        assert await FormattedIdService.get_next_formatted_id() == "PW000105"
+        assert await FormattedIdService.get_next_extension_formatted_id() == "EX000001"
+
+    @pytest.mark.asyncio
+    async def test_concurrent_ids_are_unique(self, counters):
+        """Parallel creations never receive the same ID."""
+        ids = await asyncio.gather(*[FormattedIdService.get_next_formatted_id() for _ in range(50)])
+
+        assert len(set(ids)) == 50
+        assert sorted(ids) == [f"PW{n:06d}" for n in range(105, 155)]
+
+    @pytest.mark.asyncio
+    async def test_seeding_never_moves_counter_backwards(self, counters):
+        """Re-seeding leaves a counter that is already ahead untouched."""
+        await FormattedIdService.reserve_numbers(PAWN_TRANSACTION_SEQUENCE, 10)
+        assert await FormattedIdService.seed_sequence(PAWN_TRANSACTION_SEQUENCE) == 114
+
+    @pytest.mark.asyncio
+    async def test_reserve_formatted_ids_in_one_round_trip(self, counters):
+        """A batch of IDs costs a single counter update once seeded."""
+        await FormattedIdService.seed_sequence(EXTENSION_SEQUENCE)
+        calls_before = counters.update_calls
+
+        ids = await FormattedIdService.reserve_formatted_ids(EXTENSION_SEQUENCE, 3)
+
+        assert ids == ["EX000001", "EX000002", "EX000003"]
+        assert counters.update_calls == calls_before + 1
+
+    @pytest.mark.asyncio
+    async def test_block_reserves_in_chunks(self, counters):
+        """A pre-allocated block only touches the counter once per block."""
+        await FormattedIdService.seed_sequence(EXTENSION_SEQUENCE)
+        calls_before = counters.update_calls
+        block = FormattedIdBlock(EXTENSION_SEQUENCE, block_size=4)
+
+        ids = [await block.next_id() for _ in range(6)]
+
+        assert ids == [f"EX{n:06d}" for n in range(1, 7)]
+        assert counters.update_calls == calls_before + 2
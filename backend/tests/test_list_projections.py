@@ -0,0 +1,36 @@
+"""
+Test the list projection models.
+
+Verifies that the list and item summary views never request audit logs or
+manual notes, and cover the fields of their response schemas.
+"""
+
+from beanie.odm.utils.projection import get_projection
+
+from app.models.pawn_item_model import PawnItemSummary
+from app.models.pawn_transaction_model import PawnTransactionListView
+from app.schemas.pawn_transaction_schema import PawnItemResponse, PawnTransactionResponse
+
+
+class TestProjectionModels:
+    """Test the projected field sets."""
+
+    def test_list_view_excludes_heavy_fields(self):
+        """Audit log and manual notes are not part of the list projection."""
+        projection = get_projection(PawnTransactionListView)
+
+        assert "system_audit_log" not in projection
+        assert "manual_notes" not in projection
+        assert {"transaction_id", "pawn_date", "created_at", "status", "loan_amount"} <= set(projection)
+
+    def test_list_view_covers_response_fields(self):
+        """Every stored field of the list response is projected."""
+        derived = {"items", "customer_first_name", "customer_last_name", "customer_name"}
+        response_fields = set(PawnTransactionResponse.model_fields) - derived
+
+        assert response_fields <= set(get_projection(PawnTransactionListView))
+
+    def test_item_summary_covers_response_fields(self):
+        """The item summary projects every field of the item response."""
+        assert set(PawnItemResponse.model_fields) <= set(get_projection(PawnItemSummary))
+
@@ -0,0 +1,77 @@
+"""
+Test the nightly overdue sweep helpers.
+
+Verifies the shared interest-month calculation and the bulk_write operation
+built for each overdue candidate.
+"""
+
+from datetime import datetime, UTC
+
+from app.models.pawn_transaction_model import calculate_interest_months
+from app.services.pawn_transaction_service import build_overdue_update
+
+
+class TestCalculateInterestMonths:
+    """Test the pure interest-month function."""
+
+    def test_exact_pawn_day_does_not_add_month(self):
+        """Reaching the pawn day completes exactly one calendar month."""
+        assert calculate_interest_months(datetime(2025, 1, 23), datetime(2025, 2, 23, tzinfo=UTC)) == 1
+
+    def test_past_pawn_day_adds_month(self):
+        """A day past the pawn day counts the partial month."""
+        assert calculate_interest_months(datetime(2025, 1, 23), datetime(2025, 2, 24, tzinfo=UTC)) == 2
+
+    def test_capped_at_maturity(self):
+        """Grace period time never charges more than three months."""
+        assert calculate_interest_months(datetime(2025, 1, 1), datetime(2025, 9, 1, tzinfo=UTC)) == 3
+        assert calculate_interest_months(
+            datetime(2025, 1, 1), datetime(2025, 9, 1, tzinfo=UTC), cap_at_maturity=False
+        ) == 8
+
+    def test_minimum_one_month(self):
+        """Missing or same-day pawn dates still charge one month."""
+        assert calculate_interest_months(None) == 1
+        assert calculate_interest_months(datetime(2025, 1, 1), datetime(2025, 1, 1, tzinfo=UTC)) == 1
+
+
+class TestBuildOverdueUpdate:
+    """Test the per-transaction overdue operation."""
+
+    def setup_method(self):
+        self.now = datetime(2025, 6, 1, 2, 0, tzinfo=UTC)
+        self.candidate = {
+            "transaction_id": "txn-1",
+            "customer_id": "5551234567",
+            "status": "extended",
+            "loan_amount": 500,
+            "monthly_interest_amount": 50,
+            "overdue_fee": 20,
+            "pawn_date": datetime(2025, 1, 10),
+            "maturity_date": datetime(2025, 4, 10)
+        }
+        self.operation = build_overdue_update(self.candidate, self.now)
+
+    def test_filter_rechecks_status(self):
+        """Transactions that already left active/extended are not touched."""
+        assert self.operation._filter == {
+            "transaction_id": "txn-1",
+            "status": {"$in": ["active", "extended"]}
+        }
+
+    def test_sets_status_and_total_due(self):
+        """Status, total due (capped interest plus fee) and timestamp are set."""
+        assert self.operation._doc["$set"] == {
+            "status": "overdue",
+            "total_due": 500 + 50 * 3 + 20,
+            "updated_at": self.now
+        }
+
+    def test_appends_status_change_audit(self):
+        """A system status-change audit entry is pushed with plain values."""
+        entry = self.operation._doc["$push"]["system_audit_log"]
+        assert entry["action_type"] == "status_changed"
+        assert entry["staff_member"] == "system"
+        assert entry["previous_value"] == "extended"
+        assert entry["new_value"] == "overdue"
+        assert isinstance(entry["timestamp"], datetime)
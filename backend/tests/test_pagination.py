@@ -0,0 +1,164 @@
+"""
+Test keyset pagination helpers.
+
+Verifies the sort orders used for cursor pagination, cursor round-trips and
+validation, and the range filter that seeks past a cursor, including pages
+that cross from non-null to null sort values.
+"""
+
+from datetime import datetime
+
+import pytest
+
+from app.core.pagination import (
+    DEFAULT_SORT_KEYS,
+    build_keyset_filter,
+    build_sort_keys,
+    cursor_values,
+    decode_cursor,
+    encode_cursor,
+)
+
+
+class TestBuildSortKeys:
+    """Test sort key construction."""
+
+    def test_default_ordering(self):
+        """No sort field uses pawn date, creation time and transaction ID descending."""
+        assert build_sort_keys(None, -1) == DEFAULT_SORT_KEYS
+
+    def test_pawn_date_uses_full_tuple_in_requested_direction(self):
+        """Pawn date sorts break ties on creation time, then transaction ID."""
+        assert build_sort_keys("pawn_date", 1) == [("pawn_date", 1), ("created_at", 1), ("transaction_id", 1)]
+
+    def test_other_fields_end_with_tiebreaker(self):
+        """Non-unique sort fields are followed by the transaction ID."""
+        assert build_sort_keys("loan_amount", -1) == [("loan_amount", -1), ("transaction_id", -1)]
+
+
+class TestCursorEncoding:
+    """Test cursor round-trips and validation."""
+
+    def test_round_trip_preserves_datetimes(self):
+        """Datetimes and plain values survive encoding."""
+        values = [datetime(2025, 3, 1, 10, 30), datetime(2025, 3, 1, 10, 31, 5, 120000), "txn-9"]
+        cursor = encode_cursor(values, DEFAULT_SORT_KEYS)
+
+        assert "=" not in cursor
+        assert decode_cursor(cursor, DEFAULT_SORT_KEYS) == values
+
+    def test_cursor_rejected_for_other_sort(self):
+        """A cursor cannot be reused with a different sort order."""
+        cursor = encode_cursor([500, "txn-1"], build_sort_keys("loan_amount", -1))
+
+        with pytest.raises(ValueError, match="sort order"):
+            decode_cursor(cursor, build_sort_keys("loan_amount", 1))
+
+    def test_malformed_cursor_rejected(self):
+        """Garbage cursors raise ValueError."""
+        with pytest.raises(ValueError, match="Invalid pagination cursor"):
+            decode_cursor("not-a-cursor", DEFAULT_SORT_KEYS)
+
+    def test_cursor_values_from_model_or_dict(self):
+        """Values are read in sort-key order from documents or objects."""
+        document = {"loan_amount": 250, "transaction_id": "txn-2", "status": "active"}
+        assert cursor_values(document, build_sort_keys("loan_amount", 1)) == [250, "txn-2"]
+
+
+class TestKeysetFilter:
+    """Test the seek filter."""
+
+    def test_single_key(self):
+        """A single sort key becomes a plain range condition."""
+        assert build_keyset_filter([("transaction_id", 1)], ["txn-5"]) == {"transaction_id": {"$gt": "txn-5"}}
+
+    def test_compound_keys_descending(self):
+        """Each branch fixes the earlier keys and moves past the next one."""
+        pawn_date = datetime(2025, 3, 1)
+        created_at = datetime(2025, 3, 1, 9, 0)
+
+        assert build_keyset_filter(DEFAULT_SORT_KEYS, [pawn_date, created_at, "txn-5"]) == {
+            "$or": [
+                {"$or": [{"pawn_date": {"$lt": pawn_date}}, {"pawn_date": None}]},
+                {"pawn_date": pawn_date, "$or": [{"created_at": {"$lt": created_at}}, {"created_at": None}]},
+                {
+                    "pawn_date": pawn_date,
+                    "created_at": created_at,
+                    "$or": [{"transaction_id": {"$lt": "txn-5"}}, {"transaction_id": None}]
+                }
+            ]
+        }
+
+    def test_null_cursor_value(self):
+        """Null sorts first: ascending moves on to non-null values, descending has nothing after it."""
+        assert build_keyset_filter(build_sort_keys("storage_location", 1), [None, "txn-5"]) == {
+            "$or": [
+                {"storage_location": {"$ne": None}},
+                {"storage_location": None, "transaction_id": {"$gt": "txn-5"}}
+            ]
+        }
+        assert build_keyset_filter(build_sort_keys("storage_location", -1), [None, "txn-5"]) == {
+            "storage_location": None,
+            "$or": [{"transaction_id": {"$lt": "txn-5"}}, {"transaction_id": None}]
+        }
+
+    @pytest.mark.parametrize("direction", [1, -1])
+    def test_pages_cross_null_boundary(self, direction):
+        """Paging a nullable field visits every document once, in MongoDB sort order."""
+        documents = [
+            {"transaction_id": "txn-1", "maturity_date": datetime(2025, 4, 1)},
+            {"transaction_id": "txn-2", "maturity_date": None},
+            {"transaction_id": "txn-3", "maturity_date": datetime(2025, 3, 1)},
+            {"transaction_id": "txn-4"},
+            {"transaction_id": "txn-5", "maturity_date": datetime(2025, 4, 1)},
+            {"transaction_id": "txn-6", "maturity_date": None},
+        ]
+        sort_keys = build_sort_keys("maturity_date", direction)
+        expected = _mongo_sorted(documents, sort_keys)
+
+        seen, cursor = [], None
+        while True:
+            query = build_keyset_filter(sort_keys, decode_cursor(cursor, sort_keys)) if cursor else {}
+            page = [document for document in expected if _matches(document, query)][:2]
+            if not page:
+                break
+            seen.extend(page)
+            cursor = encode_cursor(cursor_values(page[-1], sort_keys), sort_keys)
+
+        assert [document["transaction_id"] for document in seen] == [
+            document["transaction_id"] for document in expected
+        ]
+
+
+def _mongo_sorted(documents, sort_keys):
+    """Sort documents as MongoDB does, with null and missing values first."""
+    ordered = list(documents)
+    for field, direction in reversed(sort_keys):
+        ordered.sort(
+            key=lambda document: (document.get(field) is not None, document.get(field) or ""),
+            reverse=direction == -1
+        )
+    return ordered
+
+
+def _matches(document, query):
+    """Evaluate the subset of MongoDB query syntax produced by build_keyset_filter."""
+    for field, condition in query.items():
+        if field == "$or":
+            if not any(_matches(document, branch) for branch in condition):
+                return False
+            continue
+        value = document.get(field)
+        if not isinstance(condition, dict):
+            if value != condition:
+                return False
+        elif "$ne" in condition:
+            if value == condition["$ne"]:
+                return False
+        elif value is None:
+            return False
+        elif "$gt" in condition and not value > condition["$gt"]:
+            return False
+        elif "$lt" in condition and not value < condition["$lt"]:
+            return False
+    return True
@@ -0,0 +1,64 @@
+"""
+Test async PIN hashing.
+
+Verifies that PIN checks run on the bounded PIN hashing thread pool instead
+of the event loop, and that malformed PINs are rejected without hashing.
+The bcrypt call itself is replaced by a recording stand-in; what is under
+test is where it runs.
+"""
+
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from app.core import security
+from app.core.security import get_pin_async, verify_pin_async
+from app.models.user_model import User
+
+
+class RecordingHasher:
+    """Stand-in for the bcrypt helpers recording the calling thread."""
+
+    def __init__(self):
+        self.threads = []
+
+    def hash(self, pin):
+        self.threads.append(threading.current_thread().name)
+        return f"hashed:{pin}"
+
+    def verify(self, pin, hashed_pin):
+        self.threads.append(threading.current_thread().name)
+        return hashed_pin == f"hashed:{pin}"
+
+
+class TestAsyncPinVerification:
+    """Test the async PIN hashing API."""
+
+    @pytest.mark.asyncio
+    async def test_hash_and_verify_run_off_event_loop(self):
+        """Hashing and verification run on pin-hash worker threads."""
+        hasher = RecordingHasher()
+        with patch.object(security, "get_pin", hasher.hash), \
+                patch.object(security, "verify_pin", hasher.verify):
+            hashed = await get_pin_async("1234")
+            assert await verify_pin_async("1234", hashed) is True
+            assert await verify_pin_async("5678", hashed) is False
+
+        assert len(hasher.threads) == 3
+        assert all(name.startswith("pin-hash") for name in hasher.threads)
+        assert threading.current_thread().name not in hasher.threads
+
+    def test_executor_is_bounded(self):
+        """The PIN hashing pool never exceeds PIN_HASH_MAX_WORKERS threads."""
+        executor = security._get_pin_executor()
+        assert executor._max_workers == security.PIN_HASH_MAX_WORKERS
+
+    @pytest.mark.asyncio
+    async def test_user_rejects_malformed_pin_without_hashing(self):
+        """Malformed PINs fail before any bcrypt work is scheduled."""
+        user = User.model_construct(pin_hash="hashed:1234")
+        with patch.object(security, "verify_pin") as mock_verify:
+            assert await user.verify_pin_async("12a4") is False
+            assert await user.verify_pin_async("123") is False
+        mock_verify.assert_not_called()
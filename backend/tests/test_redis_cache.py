@@ -0,0 +1,187 @@
+"""
+Test the asyncio Redis cache service.
+
+Verifies the disabled-cache fallback when Redis is unreachable, that
+pattern deletes walk the keyspace with SCAN/UNLINK instead of KEYS, and that
+tag invalidation only touches the keys registered under a tag.
+"""
+
+import pytest
+import pytest_asyncio
+
+import app.core.redis_cache as redis_cache
+from app.core.redis_cache import BusinessCache, CacheConfig, CacheTags, RedisCacheService, cached_result
+
+
+class FakeAsyncRedis:
+    """Minimal asyncio Redis double recording SCAN/UNLINK usage."""
+
+    def __init__(self, keys=()):
+        self.keys_store = set(keys)
+        self.sets = {}
+        self.unlink_calls = []
+
+    async def ping(self):
+        return True
+
+    async def scan_iter(self, match=None, count=None):
+        prefix = match.rstrip("*")
+        for key in sorted(self.keys_store):
+            if key.startswith(prefix):
+                yield key
+
+    async def unlink(self, *keys):
+        self.unlink_calls.append(keys)
+        removed = len(self.keys_store.intersection(keys))
+        self.keys_store.difference_update(keys)
+        for key in keys:
+            self.sets.pop(key, None)
+        return removed
+
+    async def get(self, key):
+        return None
+
+    async def delete(self, key):
+        return await self.unlink(key)
+
+    async def keys(self, pattern):
+        raise AssertionError("KEYS must not be used")
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    """Queues commands and applies them to the FakeAsyncRedis on execute()."""
+
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def setex(self, key, ttl, value):
+        self.commands.append(lambda: self.client.keys_store.add(key) or True)
+
+    def sadd(self, key, member):
+        self.commands.append(lambda: self.client.sets.setdefault(key, set()).add(member) or 1)
+
+    def expire(self, key, ttl):
+        self.commands.append(lambda: True)
+
+    def smembers(self, key):
+        self.commands.append(lambda: set(self.client.sets.get(key, set())))
+
+    def unlink(self, *keys):
+        self.commands.append(lambda: [self.client.sets.pop(key, None) for key in keys] and len(keys))
+
+    async def execute(self):
+        return [command() for command in self.commands]
+
+
+class TestRedisCacheService:
+    """Test RedisCacheService behaviour."""
+
+    @pytest.mark.asyncio
+    async def test_unreachable_redis_disables_cache(self):
+        """Operations are no-ops when Redis cannot be reached."""
+        service = RedisCacheService(redis_url="redis://127.0.0.1:1")
+        assert await service.connect() is False
+        assert await service.get("missing") is None
+        assert await service.set("key", {"a": 1}) is False
+        assert await service.delete_pattern("transactions_list_*") == 0
+        await service.close()
+
+    @pytest.mark.asyncio
+    async def test_url_creates_shared_pool(self):
+        """A URL-configured service owns a bounded connection pool."""
+        service = RedisCacheService(redis_url="redis://127.0.0.1:1")
+        assert service.connection_pool is not None
+        assert service.connection_pool.max_connections == CacheConfig.MAX_CONNECTIONS
+        await service.close()
+
+    @pytest.mark.asyncio
+    async def test_delete_pattern_scans_and_unlinks_in_batches(self):
+        """Matching keys are unlinked in SCAN-sized batches."""
+        keys = [f"transactions_list_{i}" for i in range(CacheConfig.SCAN_BATCH_SIZE + 5)] + ["balance:1"]
+        client = FakeAsyncRedis(keys)
+        service = RedisCacheService(redis_client=client)
+        assert await service.connect() is True
+
+        deleted = await service.delete_pattern("transactions_list_*")
+
+        assert deleted == CacheConfig.SCAN_BATCH_SIZE + 5
+        assert len(client.unlink_calls) == 2
+        assert client.keys_store == {"balance:1"}
+
+
+class TestTagInvalidation:
+    """Test tag-based invalidation."""
+
+    @pytest_asyncio.fixture
+    async def service(self, monkeypatch):
+        service = RedisCacheService(redis_client=FakeAsyncRedis())
+        await service.connect()
+        monkeypatch.setattr(redis_cache, "cache_service", service)
+        return service
+
+    @pytest.mark.asyncio
+    async def test_set_registers_key_under_tags(self, service):
+        """Tagged writes add the key to each tag set."""
+        await service.set("transaction:PW000001", {"a": 1}, 60, tags=[CacheTags.transaction("PW000001")])
+
+        assert service.redis_client.sets == {"tag:txn:PW000001": {"transaction:PW000001"}}
+
+    @pytest.mark.asyncio
+    async def test_invalidate_tags_deletes_only_tagged_keys(self, service):
+        """Only keys registered under the tag are removed, along with the tag set."""
+        await service.set("transaction:PW000001", {}, 60, tags=[CacheTags.transaction("PW000001")])
+        await service.set("balance:PW000001", {}, 60, tags=[CacheTags.transaction("PW000001")])
+        await service.set("transaction:PW000002", {}, 60, tags=[CacheTags.transaction("PW000002")])
+
+        deleted = await service.invalidate_tags(CacheTags.transaction("PW000001"))
+
+        assert deleted == 2
+        assert service.redis_client.keys_store == {"transaction:PW000002"}
+        assert "tag:txn:PW000001" not in service.redis_client.sets
+
+    @pytest.mark.asyncio
+    async def test_transaction_caches_entry_point(self, service):
+        """The shared entry point drops list views and the given transactions without scanning."""
+        await BusinessCache.set("transactions_list_abc_UTC", {}, 60, tags=[CacheTags.TRANSACTION_LISTS])
+        await BusinessCache.set("unified_search:xyz", {}, 30, tags=[CacheTags.SEARCH])
+        await BusinessCache.set_transaction_balance("PW000001", {})
+        await BusinessCache.set_transaction_balance("PW000002", {})
+        await BusinessCache.set_customer("5551234567", {})
+
+        deleted = await BusinessCache.invalidate_transaction_caches(
+            transaction_ids=["PW000001"], customer_phones=["5551234567"]
+        )
+
+        assert deleted == 4
+        assert service.redis_client.keys_store == {"balance:PW000002"}
+
+    @pytest.mark.asyncio
+    async def test_set_transaction_balances_in_one_pipeline(self, service):
+        """Batch balance writes tag each entry so transaction invalidation still drops it."""
+        written = await BusinessCache.set_transaction_balances({"PW000001": {}, "PW000002": {}})
+
+        assert written == 2
+        assert service.redis_client.keys_store == {"balance:PW000001", "balance:PW000002"}
+
+        await BusinessCache.invalidate_transaction_data("PW000001")
+
+        assert service.redis_client.keys_store == {"balance:PW000002"}
+
+    @pytest.mark.asyncio
+    async def test_cached_result_tags_are_invalidated(self, service):
+        """Results cached by the decorator are dropped by their tags."""
+        @cached_result(prefix="customer:", tags=lambda phone_number: [CacheTags.customer(phone_number)])
+        async def load_customer(phone_number):
+            return {"phone_number": phone_number}
+
+        await load_customer("5551234567")
+        assert service.redis_client.keys_store == {"customer:5551234567"}
+
+        deleted = await BusinessCache.invalidate_customer("5551234567")
+
+        assert deleted == 1
+        assert service.redis_client.keys_store == set()
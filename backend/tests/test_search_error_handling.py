@@ -354,7 +354,7 @@ class TestCacheErrorHandling:
             assert result.search_metadata.cache_hit is False
     
     @pytest.mark.asyncio
-    @patch('app.services.unified_search_service.BusinessCache.invalidate_by_pattern')
+    @patch('app.services.unified_search_service.BusinessCache.invalidate_tags')
     async def test_cache_invalidation_error_handling(self, mock_invalidate):
         """Test cache invalidation error handling"""
         # Mock cache invalidation failure
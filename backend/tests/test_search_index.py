@@ -0,0 +1,179 @@
+"""
+Test the in-process transaction search index.
+
+Verifies prefix matching per field, multi-word searches, result ordering,
+re-indexing and removal, the Redis snapshot round trip, and that indexed
+search types match the same transactions as the MongoDB fallback.
+"""
+
+import re
+
+import pytest
+
+from app.core.search_index import TransactionSearchIndex, document_keys, field_terms
+from app.core.search_keys import customer_search_keys
+from app.services.search_index_service import (
+    INDEX_FIELDS_BY_SEARCH_TYPE,
+    transaction_index_fields,
+    transaction_sort_key,
+)
+from app.services.unified_search_service import SearchType, UnifiedSearchService
+
+
+def _fields(formatted_id, name, phone="5551234567", barcode=None, descriptions=()):
+    return {"f": formatted_id, "b": barcode, "p": phone, "n": name, "d": list(descriptions)}
+
+
+def _index():
+    index = TransactionSearchIndex()
+    index.upsert("t1", _fields("PW000101", "john smith", descriptions=["Gold ring"]), (100.0, 10.0, "t1"))
+    index.upsert("t2", _fields("PW000102", "jane smithers", "5559876543"), (300.0, 20.0, "t2"))
+    index.upsert("t3", _fields("PW000201", "bob jones", barcode="ABC123"), (200.0, 30.0, "t3"))
+    return index
+
+
+class TestTerms:
+    """Test term and key generation."""
+
+    def test_whole_value_fields(self):
+        """IDs are lowercased with the leading # removed."""
+        assert field_terms("f", " #PW000101 ") == ["pw000101"]
+
+    def test_word_fields(self):
+        """Names and descriptions are split into normalised words."""
+        assert field_terms("d", "14K Gold-Ring") == ["14k", "gold", "ring"]
+
+    def test_document_keys_are_prefixes(self):
+        """Every prefix of every term becomes a key."""
+        assert document_keys({"n": "Al Bo", "f": None}) == ["n:a", "n:al", "n:b", "n:bo"]
+
+
+class TestSearch:
+    """Test index searches."""
+
+    def test_prefix_search_is_newest_first(self):
+        """Matches are ordered by updated_at, newest first."""
+        assert _index().search("smi", ("n",)) == (2, ["t2", "t1"])
+
+    def test_field_restriction(self):
+        """Searches only look at the requested fields."""
+        index = _index()
+
+        assert index.search("PW0002", ("f",)) == (1, ["t3"])
+        assert index.search("PW0002", ("n",)) == (0, [])
+
+    def test_every_word_must_match(self):
+        """Words can match different fields but all of them must match."""
+        index = _index()
+
+        assert index.search("john gold")[1] == ["t1"]
+        assert index.search("john jones") == (0, [])
+
+    def test_pagination(self):
+        """Offset and limit slice the ordered matches, total is unaffected."""
+        assert _index().search("555", ("p",), offset=1, limit=1) == (3, ["t3"])
+
+    def test_empty_search(self):
+        """Blank text matches nothing."""
+        assert _index().search("   ") == (0, [])
+
+
+class TestUpdates:
+    """Test re-indexing and removal."""
+
+    def test_upsert_replaces_old_terms(self):
+        """Re-indexing drops terms the transaction no longer has."""
+        index = _index()
+        index.upsert("t1", _fields("PW000101", "john doe"), (400.0, 10.0, "t1"))
+
+        assert index.search("smith", ("n",)) == (1, ["t2"])
+        assert index.search("doe", ("n",)) == (1, ["t1"])
+        assert index.search("5", ("p",))[1][0] == "t1"
+        assert len(index) == 3
+
+    def test_remove(self):
+        """Removed transactions no longer match."""
+        index = _index()
+        index.remove("t2")
+        index.remove("missing")
+
+        assert "t2" not in index
+        assert index.search("smi", ("n",)) == (1, ["t1"])
+
+    def test_snapshot_round_trip(self):
+        """An index rebuilt from its snapshot answers the same searches."""
+        index = _index()
+        index.remove("t3")
+        restored = TransactionSearchIndex.from_snapshot(index.to_snapshot())
+
+        assert len(restored) == 2
+        assert restored.search("smi") == index.search("smi")
+        assert restored.search("gold", ("d",)) == (1, ["t1"])
+
+
+def _matches(document, query):
+    """Evaluate the subset of MongoDB query syntax used by build_match_conditions."""
+    for field, condition in query.items():
+        value = document.get(field)
+        if isinstance(condition, dict) and "$regex" in condition:
+            flags = re.IGNORECASE if "i" in condition.get("$options", "") else 0
+            if value is None or not re.search(condition["$regex"], value, flags):
+                return False
+        elif isinstance(condition, dict) and "$all" in condition:
+            if not set(condition["$all"]) <= set(value or []):
+                return False
+        elif isinstance(condition, dict) and "$in" in condition:
+            if not set(condition["$in"]) & set(value if isinstance(value, list) else [value]):
+                return False
+        elif isinstance(value, list):
+            if condition not in value:
+                return False
+        elif value != condition:
+            return False
+    return True
+
+
+class TestMongoFallbackParity:
+    """Test that the index and the MongoDB fallback agree."""
+
+    def setup_method(self):
+        self.documents = [
+            {"transaction_id": "t1", "formatted_id": "PW000101", "customer_id": "5551234567",
+             "reference_barcode": "ABC123", **customer_search_keys("John", "Smith")},
+            {"transaction_id": "t2", "formatted_id": "PW000102", "customer_id": "5551234000",
+             "reference_barcode": "ABC1239", **customer_search_keys("Jane", "Smithers")},
+            {"transaction_id": "t3", "formatted_id": "PW000201", "customer_id": "5559876543",
+             "reference_barcode": None, **customer_search_keys("Bob", "Jones")},
+        ]
+        self.index = TransactionSearchIndex()
+        for document in self.documents:
+            self.index.upsert(document["transaction_id"], transaction_index_fields(document), transaction_sort_key(document))
+
+    @pytest.mark.parametrize("search_text, search_type", [
+        ("101", SearchType.TRANSACTION_ID),
+        ("pw000102", SearchType.TRANSACTION_ID),
+        ("5551234", SearchType.PHONE_NUMBER),
+        ("5551234567", SearchType.PHONE_NUMBER),
+        ("abc1", SearchType.REFERENCE_BARCODE),
+        ("ABC123", SearchType.REFERENCE_BARCODE),
+        ("jo", SearchType.CUSTOMER_NAME),
+        ("j smith", SearchType.CUSTOMER_NAME),
+    ])
+    def test_same_matches(self, search_text, search_type):
+        """Each indexed search type returns the transactions its MongoDB match selects."""
+        query = UnifiedSearchService.build_match_conditions(search_text, search_type)
+        expected = {document["transaction_id"] for document in self.documents if _matches(document, query)}
+
+        total, page_ids = self.index.search(
+            UnifiedSearchService._index_search_text(search_text, search_type),
+            INDEX_FIELDS_BY_SEARCH_TYPE[search_type],
+            limit=len(self.documents)
+        )
+
+        assert expected
+        assert total == len(expected)
+        assert set(page_ids) == expected
+
+    def test_full_text_is_not_indexed(self):
+        """Full-text searches also match internal notes, so they always use MongoDB."""
+        assert SearchType.FULL_TEXT not in INDEX_FIELDS_BY_SEARCH_TYPE
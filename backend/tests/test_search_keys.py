@@ -0,0 +1,65 @@
+"""
+Test the denormalised transaction search keys.
+
+Verifies name normalisation, the prefix tokens stored on transactions and
+the filters built for customer-name searches.
+"""
+
+from app.core.search_keys import (
+    build_name_tokens,
+    customer_name_filter,
+    customer_search_keys,
+    normalize_name_words,
+)
+
+
+class TestNormalizeNameWords:
+    """Test name normalisation."""
+
+    def test_lowercases_and_strips_accents(self):
+        """Accented and mixed-case names normalise to plain lowercase words."""
+        assert normalize_name_words("  José  MARÍA ") == ["jose", "maria"]
+
+    def test_joins_apostrophes_and_splits_hyphens(self):
+        """Apostrophes stay inside a word, hyphens separate words."""
+        assert normalize_name_words("O'Brien-Smith") == ["obrien", "smith"]
+
+    def test_empty_values(self):
+        """Missing names produce no words."""
+        assert normalize_name_words(None) == []
+        assert normalize_name_words(" - ") == []
+
+
+class TestCustomerSearchKeys:
+    """Test the keys stored on transactions."""
+
+    def test_tokens_are_word_prefixes(self):
+        """Every prefix of every name word is a token."""
+        assert build_name_tokens("Al", "Bo") == ["a", "al", "b", "bo"]
+
+    def test_search_keys(self):
+        """The stored full name is normalised and tokens are de-duplicated."""
+        keys = customer_search_keys("Ann", "Anders")
+
+        assert keys["customer_name_search"] == "ann anders"
+        assert keys["customer_name_tokens"] == ["a", "an", "and", "ande", "ander", "anders", "ann"]
+
+    def test_missing_name(self):
+        """Customers without a name store no search keys."""
+        assert customer_search_keys(None, "") == {"customer_name_search": None, "customer_name_tokens": []}
+
+
+class TestCustomerNameFilter:
+    """Test the name search filter."""
+
+    def test_single_word(self):
+        """A single word is an equality match on the multikey index."""
+        assert customer_name_filter("Smi") == {"customer_name_tokens": "smi"}
+
+    def test_multiple_words_must_all_match(self):
+        """Each word of the search must prefix some word of the name."""
+        assert customer_name_filter("john sm") == {"customer_name_tokens": {"$all": ["john", "sm"]}}
+
+    def test_no_words_matches_nothing(self):
+        """Punctuation-only searches cannot match any transaction."""
+        assert customer_name_filter("!!") == {"customer_name_tokens": {"$in": []}}
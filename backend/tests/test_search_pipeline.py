@@ -0,0 +1,60 @@
+"""
+Test the unified search pipeline builders.
+
+Verifies that counts never run display lookups and that page pipelines
+paginate and project before joining customers, extensions and items.
+"""
+
+from app.services.unified_search_service import SearchType, UnifiedSearchService
+
+
+def stage_names(pipeline):
+    """Operator name of each pipeline stage."""
+    return [next(iter(stage)) for stage in pipeline]
+
+
+class TestCountPipeline:
+    """Test the bare count pipeline."""
+
+    def test_count_has_no_lookups(self):
+        """Plain searches count straight from the match."""
+        pipeline = UnifiedSearchService.build_count_pipeline("PW000105", SearchType.TRANSACTION_ID)
+
+        assert stage_names(pipeline) == ["$match", "$count"]
+
+    def test_customer_name_count_matches_search_keys(self):
+        """Name searches match the denormalised name tokens without a join."""
+        pipeline = UnifiedSearchService.build_count_pipeline("Jo Smith", SearchType.CUSTOMER_NAME)
+
+        assert stage_names(pipeline) == ["$match", "$count"]
+        assert pipeline[0]["$match"] == {"customer_name_tokens": {"$all": ["jo", "smith"]}}
+
+    def test_extension_id_count_matches_search_keys(self):
+        """Extension searches match the denormalised extension IDs."""
+        pipeline = UnifiedSearchService.build_count_pipeline("ex12", SearchType.EXTENSION_ID)
+
+        assert pipeline[0] == {"$match": {"extension_formatted_ids": "EX000012"}}
+
+
+class TestPagePipeline:
+    """Test the paginated results pipeline."""
+
+    def test_lookups_run_after_pagination(self):
+        """Sort, skip, limit and projection all precede the display lookups."""
+        pipeline = UnifiedSearchService.build_page_pipeline("PW000105", SearchType.TRANSACTION_ID, page=3, page_size=20)
+        stages = stage_names(pipeline)
+
+        assert stages[:5] == ["$match", "$sort", "$skip", "$limit", "$project"]
+        assert stages[5:] == ["$lookup", "$addFields", "$lookup", "$lookup"]
+        assert pipeline[2] == {"$skip": 40}
+        assert pipeline[3] == {"$limit": 20}
+        assert "system_audit_log" not in pipeline[4]["$project"]
+
+    def test_optional_lookups_omitted(self):
+        """Disabled includes add no lookup stages."""
+        pipeline = UnifiedSearchService.build_page_pipeline(
+            "PW000105", SearchType.TRANSACTION_ID,
+            include_extensions=False, include_items=False, include_customer=False
+        )
+
+        assert "$lookup" not in stage_names(pipeline)
@@ -0,0 +1,114 @@
+"""
+Test trends aggregation pipeline builders.
+
+Verifies that the server-side trend pipelines bucket in the client timezone
+and only project the fields needed for per-bucket counts and sums.
+"""
+
+from datetime import datetime
+from decimal import Decimal
+
+from bson import Decimal128
+
+from app.services.trends_aggregation_service import (
+    TrendsAggregationService,
+    build_bucket_key_expression,
+    get_bucket_unit,
+    get_timezone_name,
+    to_decimal,
+)
+
+
+class TestBucketHelpers:
+    """Test bucket key helpers."""
+
+    def test_timezone_name_valid(self):
+        """Valid timezone headers are passed through."""
+        assert get_timezone_name("America/New_York") == "America/New_York"
+
+    def test_timezone_name_invalid_falls_back_to_utc(self):
+        """Invalid or missing timezone headers fall back to UTC."""
+        assert get_timezone_name("Invalid/Timezone") == "UTC"
+        assert get_timezone_name(None) == "UTC"
+
+    def test_bucket_unit(self):
+        """Monthly formats truncate by month, everything else by day."""
+        assert get_bucket_unit("%Y-%m") == "month"
+        assert get_bucket_unit("%Y-%m-%d") == "day"
+
+    def test_bucket_key_expression_uses_timezone(self):
+        """Bucket keys are truncated and formatted in the client timezone."""
+        expr = build_bucket_key_expression("$payment_date", "%Y-%m-%d", "Asia/Tokyo")
+        assert expr["$dateToString"]["timezone"] == "Asia/Tokyo"
+        assert expr["$dateToString"]["date"]["$dateTrunc"]["timezone"] == "Asia/Tokyo"
+        assert expr["$dateToString"]["date"]["$dateTrunc"]["unit"] == "day"
+
+
+class TestLoanTrendsPipeline:
+    """Test the loan trends pipeline."""
+
+    def setup_method(self):
+        self.start = datetime(2025, 1, 1)
+        self.end = datetime(2025, 1, 31)
+        self.boundaries = [datetime(2025, 1, 1, 23, 59, 59), datetime(2025, 1, 2, 23, 59, 59)]
+
+    def test_match_covers_all_relevant_transactions(self):
+        """The $match has one branch per index-backed population."""
+        match = TrendsAggregationService.build_loan_trends_match(self.start, self.end)
+        assert len(match["$or"]) == 3
+        assert match["$or"][0] == {"created_at": {"$gte": self.start, "$lte": self.end}}
+
+    def test_pipeline_projects_before_facet(self):
+        """Audit logs are dropped before any grouping happens."""
+        pipeline = TrendsAggregationService.build_loan_trends_pipeline(
+            self.start, self.end, "%Y-%m-%d", "UTC", self.boundaries
+        )
+        projection = pipeline[1]["$project"]
+        assert "system_audit_log" not in projection
+        assert set(projection) == {"_id", "status", "loan_amount", "created_at", "updated_at"}
+
+    def test_pipeline_has_one_accumulator_per_boundary(self):
+        """Active loan counts are computed for every bucket boundary."""
+        pipeline = TrendsAggregationService.build_loan_trends_pipeline(
+            self.start, self.end, "%Y-%m-%d", "UTC", self.boundaries
+        )
+        totals_group = pipeline[2]["$facet"]["totals"][0]["$group"]
+        assert "active_0" in totals_group
+        assert "active_1" in totals_group
+        assert "active_2" not in totals_group
+
+
+class TestRevenuePipelines:
+    """Test the revenue trends pipelines."""
+
+    def setup_method(self):
+        self.start = datetime(2025, 1, 1)
+        self.end = datetime(2025, 12, 31)
+
+    def test_payment_pipeline_sums_as_decimal128(self):
+        """Payment portions are summed server-side as exact decimals."""
+        pipeline = TrendsAggregationService.build_payment_revenue_pipeline(
+            self.start, self.end, "%Y-%m", "America/Chicago"
+        )
+        assert pipeline[0]["$match"] == {"payment_date": {"$gte": self.start, "$lte": self.end}}
+        group = pipeline[1]["$group"]
+        assert "$toDecimal" in group["total_revenue"]["$sum"]
+        assert group["payment_count"] == {"$sum": 1}
+        assert group["_id"]["$dateToString"]["date"]["$dateTrunc"]["unit"] == "month"
+
+    def test_extension_pipeline_groups_by_extension_date(self):
+        """Extension fees are bucketed by extension_date, excluding cancelled extensions."""
+        pipeline = TrendsAggregationService.build_extension_revenue_pipeline(
+            self.start, self.end, "%Y-%m-%d", "UTC"
+        )
+        assert pipeline[0]["$match"] == {
+            "extension_date": {"$gte": self.start, "$lte": self.end},
+            "is_cancelled": {"$ne": True}
+        }
+        assert set(pipeline[1]["$group"]) == {"_id", "extension_fees"}
+
+    def test_to_decimal_handles_aggregation_types(self):
+        """Decimal128, numeric and missing sums all convert exactly."""
+        assert to_decimal(Decimal128("10.10")) == Decimal("10.10")
+        assert to_decimal(5) == Decimal("5")
+        assert to_decimal(None) == Decimal("0")